@@ -0,0 +1,51 @@
+"""
+    Синтетические документы разметки для бенчмарков (LabelMe, COCO, VOC) в виде python-словарей.
+"""
+
+import random
+from typing import Any, Dict
+
+
+def labelme_doc(n_shapes: int, n_vertices: int = 8, seed: int = 0) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    shapes = []
+    for i in range(n_shapes):
+        shapes.append({
+            "label": rnd.choice(("person", "car", "crop", "zone")),
+            "points": [[rnd.uniform(0, 1920), rnd.uniform(0, 1080)] for _ in range(n_vertices)],
+            "group_id": i if i % 3 else None,
+            "description": "",
+            "shape_type": "polygon",
+            "flags": {},
+            "mask": None,
+        })
+    return {"version": "5.5.0", "flags": {}, "shapes": shapes, "imagePath": "cam.jpg", "imageData": None,
+            "imageHeight": 1080, "imageWidth": 1920}
+
+
+def coco_doc(n_shapes: int, n_images: int = 100, seed: int = 0) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    return {
+        "images": [{"id": i, "file_name": f"{i:012d}.jpg", "width": 1920, "height": 1080} for i in range(n_images)],
+        "annotations": [
+            {"id": i, "image_id": rnd.randrange(n_images), "category_id": rnd.randrange(1, 4),
+             "bbox": [rnd.uniform(0, 1800), rnd.uniform(0, 1000), rnd.uniform(1, 100), rnd.uniform(1, 80)],
+             "area": 1.0, "iscrowd": 0}
+            for i in range(n_shapes)
+        ],
+        "categories": [{"id": 1, "name": "person"}, {"id": 2, "name": "car"}, {"id": 3, "name": "dog"}],
+    }
+
+
+def voc_doc(n_shapes: int, seed: int = 0) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    objects = []
+    for _ in range(n_shapes):
+        x, y = rnd.uniform(0, 1800), rnd.uniform(0, 1000)
+        objects.append({"name": rnd.choice(("person", "car", "dog")), "bndbox_xmin": x, "bndbox_ymin": y,
+                        "bndbox_xmax": x + rnd.uniform(1, 100), "bndbox_ymax": y + rnd.uniform(1, 80)})
+    return {"folder": "VOC", "filename": "img.jpg", "size": {"width": 1920, "height": 1080, "depth": 3},
+            "objects": objects}
+
+
+DOCS = {"labelme": labelme_doc, "coco": coco_doc, "voc": voc_doc}
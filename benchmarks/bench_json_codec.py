@@ -0,0 +1,67 @@
+"""
+    Бенчмарк JSON-библиотек (JsonCodec): чтение файла, полный парсинг в Shape и запись — по каждому адаптеру.
+
+    Запуск из корня проекта:
+        PYTHONPATH=src python -m benchmarks.bench_json_codec --shapes 20000 --repeat 5
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from annotation_parser.adapters import AdapterFactory
+from annotation_parser.utils import JsonCodec
+
+from ._datasets import DOCS
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """ Лучшее время из repeat запусков, секунды. """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_adapter(name: str, n_shapes: int, repeat: int, tmp_dir: Path) -> Dict[str, Dict[str, float]]:
+    doc = DOCS[name](n_shapes)
+    adapter = AdapterFactory.get_adapter(name)
+    path = tmp_dir / f"{name}.json"
+    out_path = tmp_dir / f"{name}_out.json"
+    results = {}
+    for backend in JsonCodec.available_backends():
+        JsonCodec.set_backend(backend)
+        JsonCodec.dump_file(doc, path)
+        results[backend.value] = {
+            "load_file": best_of(lambda: JsonCodec.load_file(path), repeat),
+            "parse": best_of(lambda: adapter.load(JsonCodec.load_file(path)), repeat),
+            "dump_pretty": best_of(lambda: JsonCodec.dump_file(doc, out_path), repeat),
+            "dump_compact": best_of(lambda: JsonCodec.dump_file(doc, out_path, pretty=False), repeat),
+        }
+    JsonCodec.set_backend(None)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON backends per adapter")
+    parser.add_argument("--shapes", type=int, default=20000, help="Shapes per document")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in DOCS:
+            results = bench_adapter(name, args.shapes, args.repeat, Path(tmp))
+            baseline = results["json"]
+            print(f"\n{name}: {args.shapes} shapes")
+            print(f"{'backend':<8} " + " ".join(f"{op:>22}" for op in baseline))
+            for backend, timings in results.items():
+                cells = [f"{timings[op] * 1000:9.1f} ms (x{baseline[op] / timings[op]:5.2f})" for op in timings]
+                print(f"{backend:<8} " + " ".join(f"{cell:>22}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+    Сводный бенчмарк горячих путей: загрузка и сохранение по адаптерам, фильтры shapes_api и геометрия Shape.
+    Перебирает размеры набора (число фигур) и сложность полигонов (число вершин); для каждого случая пишет
+    пропускную способность, перцентили задержки и пиковый RSS в JSON-файл результата.
+
+    Каждый случай по умолчанию выполняется в отдельном процессе (spawn): пиковый RSS процесса монотонен,
+    и только так он относится к одной операции, а не ко всем предыдущим.
+
+    Запуск из корня проекта:
+        PYTHONPATH=src python -m benchmarks.bench_suite --output bench_results.json
+        PYTHONPATH=src python -m benchmarks.bench_suite --quick
+        PYTHONPATH=src python -m benchmarks.bench_suite --ops load,save --adapters labelme --sizes 1000,100000
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows: пиковый RSS не измеряется
+    resource = None
+
+from annotation_parser.adapters import AdapterFactory
+from annotation_parser.api.shapes_api import filter_shapes, get_shapes_by_label, get_shapes_by_number
+from annotation_parser.core.annotation_saver import AnnotationSaver
+from annotation_parser.utils import JsonCodec
+from annotation_parser.version import __version__
+
+from ._datasets import DOCS
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+VERTICES = (4, 64, 512, 5_000)
+QUICK_SIZES = (1_000, 10_000)
+QUICK_VERTICES = (4, 64)
+
+# Операция -> адаптеры. COCO и VOC хранят только bbox, поэтому сложность полигона для них не перебирается.
+OPS: Dict[str, Tuple[str, ...]] = {
+    "load": ("labelme", "coco", "voc"),
+    "save": ("labelme", "coco", "voc"),
+    "filter_label": ("shapes_api",),
+    "filter_number": ("shapes_api",),
+    "filter_predicate": ("shapes_api",),
+    "rect": ("shape",),
+    "contour": ("shape",),
+    "line": ("shape",),
+}
+BBOX_ONLY = frozenset({"coco", "voc"})
+BBOX_VERTICES = 2
+
+
+@dataclass(frozen=True)
+class Case:
+    op: str
+    adapter: str
+    shapes: int
+    vertices: int
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parse, save, filter and geometry hot paths")
+    parser.add_argument("--sizes", type=_int_list, default=None, help="Shapes per dataset, comma separated")
+    parser.add_argument("--vertices", type=_int_list, default=None, help="Polygon vertices, comma separated")
+    parser.add_argument("--ops", type=_str_list, default=tuple(OPS), help=f"Operations ({','.join(OPS)})")
+    parser.add_argument("--adapters", type=_str_list, default=None, help="Restrict to these adapters")
+    parser.add_argument("--quick", action="store_true",
+                        help="Small sweep for a smoke run (explicit --sizes/--vertices still apply)")
+    parser.add_argument("--repeat", type=int, default=7, help="Maximum timed runs per case")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before measuring")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="Seconds per case: stop repeating once exceeded (at least one timed run)")
+    parser.add_argument("--max-points", type=int, default=20_000_000,
+                        help="Skip cases with more shapes x vertices than this")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run cases in this process (faster, but peak RSS is cumulative)")
+    parser.add_argument("--output", default="bench_results.json", help="JSON result file")
+    args = parser.parse_args()
+    # --quick меняет только значения по умолчанию: явно переданные --sizes/--vertices не переопределяются
+    if args.sizes is None:
+        args.sizes = QUICK_SIZES if args.quick else SIZES
+    if args.vertices is None:
+        args.vertices = QUICK_VERTICES if args.quick else VERTICES
+    unknown = set(args.ops) - set(OPS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"{'op':<17} {'adapter':<10} {'shapes':>9} {'vert':>5} {'runs':>4} {'p50':>10} {'p90':>10} "
+          f"{'p99':>10} {'shapes/s':>12} {'peak RSS':>10}")
+    for case in iter_cases(args.sizes, args.vertices, args.ops, args.adapters):
+        if case.shapes * case.vertices > args.max_points:
+            result = {**asdict(case), "skipped": f"shapes x vertices > --max-points ({args.max_points})"}
+        elif args.in_process:
+            result = run_case(case, args.repeat, args.warmup, args.budget)
+        else:
+            result = run_isolated(case, args.repeat, args.warmup, args.budget)
+        results.append(result)
+        print(format_row(result), flush=True)
+
+    report = {"meta": environment(args), "results": results}
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults: {args.output}")
+
+
+def iter_cases(sizes, vertices, ops, adapters: Optional[List[str]]) -> Iterator[Case]:
+    for op in ops:
+        for adapter in OPS[op]:
+            if adapters and adapter not in adapters:
+                continue
+            for n_shapes in sizes:
+                for n_vertices in ((BBOX_VERTICES,) if adapter in BBOX_ONLY else vertices):
+                    yield Case(op, adapter, n_shapes, n_vertices)
+
+
+def run_isolated(case: Case, repeat: int, warmup: int, budget: float) -> Dict[str, Any]:
+    """ Случай в свежем процессе: пиковый RSS относится только к нему. """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        try:
+            return pool.submit(run_case, case, repeat, warmup, budget).result()
+        except Exception as e:  # в том числе BrokenProcessPool при нехватке памяти
+            return {**asdict(case), "error": f"{type(e).__name__}: {e}"}
+
+
+def run_case(case: Case, repeat: int, warmup: int, budget: float) -> Dict[str, Any]:
+    """ Готовит данные, затем замеряет операцию: warmup запусков без учёта и до repeat запусков в пределах budget. """
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            operation = prepare(case, Path(tmp))
+        except Exception as e:
+            return {**asdict(case), "error": f"{type(e).__name__}: {e}"}
+        rss_before = peak_rss()
+        for _ in range(warmup):
+            operation()
+        latencies = []
+        started = time.perf_counter()
+        while len(latencies) < max(repeat, 1):
+            start = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - start)
+            if time.perf_counter() - started > budget:
+                break
+        rss_after = peak_rss()
+    return {**asdict(case), **summarize(latencies, case),
+            "peak_rss_bytes": rss_after,
+            "peak_rss_delta_bytes": None if rss_after is None else rss_after - rss_before}
+
+
+def prepare(case: Case, tmp_dir: Path) -> Callable[[], Any]:
+    """ Данные случая и замыкание с замеряемой операцией. """
+    if case.op in ("load", "save"):
+        adapter = AdapterFactory.get_adapter(case.adapter)
+        doc = make_doc(case.adapter, case.shapes, case.vertices)
+        if case.op == "load":
+            return lambda: adapter.load(doc)
+        shapes = adapter.load(doc)
+        path = tmp_dir / f"{case.adapter}.json"
+        return lambda: AnnotationSaver.save(shapes, adapter, path, json_data=doc)
+
+    shapes = AdapterFactory.get_adapter("labelme").load(make_doc("labelme", case.shapes, case.vertices))
+    if case.op == "filter_label":
+        return lambda: get_shapes_by_label(shapes, "car")
+    if case.op == "filter_number":
+        return lambda: get_shapes_by_number(shapes, case.shapes // 2 + 1)
+    if case.op == "filter_predicate":
+        return lambda: filter_shapes(shapes, lambda s: s.label == "car" and len(s.coords) > 3)
+
+    def geometry() -> None:
+        # Свойства кэшируются в экземпляре: каждый запуск считает их заново
+        for shape in shapes:
+            shape._cache.clear()
+            getattr(shape, case.op)
+    return geometry
+
+
+def make_doc(adapter: str, n_shapes: int, n_vertices: int) -> Dict[str, Any]:
+    if adapter == "labelme":
+        return DOCS[adapter](n_shapes, n_vertices=n_vertices)
+    return DOCS[adapter](n_shapes)
+
+
+def summarize(latencies: List[float], case: Case) -> Dict[str, Any]:
+    values = np.asarray(latencies)
+    p50, p90, p99 = np.percentile(values, (50, 90, 99)).tolist()
+    return {
+        "runs": len(latencies),
+        "latency_s": {"min": float(values.min()), "mean": float(values.mean()), "p50": p50, "p90": p90,
+                      "p99": p99, "max": float(values.max())},
+        "throughput": {"shapes_per_s": case.shapes / p50, "vertices_per_s": case.shapes * case.vertices / p50},
+    }
+
+
+def peak_rss() -> Optional[int]:
+    """ Пиковый RSS процесса в байтах (None, если недоступен). """
+    if resource is None:
+        return None
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты
+    return value if sys.platform == "darwin" else value * 1024
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "annotation_parser": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "json_backend": JsonCodec.get_backend().value,
+        "isolated": not args.in_process,
+        "args": {k: list(v) if isinstance(v, tuple) else v for k, v in vars(args).items()},
+    }
+
+
+def format_row(result: Dict[str, Any]) -> str:
+    head = f"{result['op']:<17} {result['adapter']:<10} {result['shapes']:>9} {result['vertices']:>5}"
+    if "skipped" in result:
+        return f"{head} skipped: {result['skipped']}"
+    if "error" in result:
+        return f"{head} error: {result['error']}"
+    latency = result["latency_s"]
+    rss = result["peak_rss_bytes"]
+    return (f"{head} {result['runs']:>4} " + " ".join(f"{latency[p] * 1000:8.2f}ms" for p in ("p50", "p90", "p99"))
+            + f" {result['throughput']['shapes_per_s']:12,.0f} "
+            + (f"{rss / 2 ** 20:8.0f}MB" if rss is not None else f"{'n/a':>10}"))
+
+
+def _int_list(value: str) -> Tuple[int, ...]:
+    return tuple(int(item.replace("_", "")) for item in value.split(",") if item)
+
+
+def _str_list(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+    Бенчмарк режимов проверки (ValidationMode): пропускная способность adapter.load по каждому адаптеру.
+
+    Запуск из корня проекта:
+        PYTHONPATH=src python -m benchmarks.bench_validation --shapes 20000 --repeat 5
+"""
+
+import argparse
+
+from annotation_parser.adapters import AdapterFactory
+from annotation_parser.public_enums import ValidationMode
+
+from ._datasets import DOCS
+from .bench_json_codec import best_of
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark validation modes per adapter")
+    parser.add_argument("--shapes", type=int, default=20000, help="Shapes per document")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'adapter':<8} {'mode':<6} {'time':>10} {'shapes/s':>12} {'speedup':>8}")
+    for name, make_doc in DOCS.items():
+        doc = make_doc(args.shapes)
+        adapter = AdapterFactory.get_adapter(name)
+        baseline = None
+        for mode in (ValidationMode.FULL, ValidationMode.LIGHT, ValidationMode.NONE):
+            elapsed = best_of(lambda: adapter.load(doc, validate=mode), args.repeat)
+            baseline = baseline or elapsed
+            print(f"{name:<8} {mode.value:<6} {elapsed * 1000:8.1f}ms {args.shapes / elapsed:12,.0f} "
+                  f"x{baseline / elapsed:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
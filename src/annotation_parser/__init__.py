@@ -1,4 +1,28 @@
-from .public_enums import *
-from .api import *
-from .types import Coords
-from .shape import *
+from .utils.lazy_import import lazy_exports
+from .version import __version__ as __version__
+
+# Модули загружаются при первом обращении к имени: import annotation_parser не тянет numpy, shapely и pydantic
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.public_enums': ('ShapeType', 'ShapePosition', 'Adapters', 'JsonBackend', 'ValidationMode', 'BackupStrategy',
+                      'PipelineStage'),
+    '.api.shapes_api': ('set_shift_point', 'get_shapes_by_label', 'get_shapes_by_number', 'get_shapes_by_wz_number',
+                        'filter_shapes', 'resolve_shift_points', 'shifted_coords_many', 'apply_shift_points', 'decode_masks'),
+    '.api.parser_api': ('parse', 'parse_labelme', 'parse_coco', 'parse_voc', 'parse_many', 'iter_parse_coco',
+                        'parse_batch', 'aparse', 'aparse_many', 'iter_parse_voc', 'parse_voc_dir'),
+    '.api.saver_api': ('save', 'save_labelme', 'save_coco', 'save_voc', 'asave', 'save_stream'),
+    '.api.convert_api': ('convert', 'convert_many'),
+    '.api.api': ('available_adapters', 'create', 'set_json_backend'),
+    '.types': ('Coords',),
+    '.shape': ('Shape',),
+    '.shape_batch': ('ShapeBatch', 'ShapeBatchBuilder', 'ShapeRow'),
+    '.index.spatial_index': ('ShapeSpatialIndex',),
+    '.index.shape_index': ('ShapeIndex',),
+    '.query.conditions': ('Condition', 'Field', 'F', 'has_meta', 'where_fn'),
+    '.query.where': ('parse_where',),
+    '.query.shape_query': ('ShapeQuery',),
+    '.core.parse_cache': ('ParseCache',),
+    '.core.backup': ('BackupPolicy', 'BackupManager'),
+    '.core.shape_diff': ('ShapeDiff',),
+    '.utils.instrumentation': ('PipelineCollector', 'instrument'),
+    '.utils.mask_codec': ('LazyMask',),
+})
@@ -1,4 +1,10 @@
-from .labelme_adapter import *
-from .coco_adapter import *
-from .voc_adapter import *
-from .adapter_factory import *
+from ..utils.lazy_import import lazy_exports
+
+# Адаптер загружается при первом обращении (здесь или через AdapterFactory.get_adapter)
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.labelme_adapter': ('LabelMeAdapter',),
+    '.coco_adapter': ('CocoAdapter',),
+    '.coco_index': ('CocoIndex',),
+    '.voc_adapter': ('VocAdapter',),
+    '.adapter_factory': ('AdapterFactory',),
+})
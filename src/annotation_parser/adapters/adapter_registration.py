@@ -1,6 +1,7 @@
 __all__ = ['AdapterRegistration']
 
 from abc import ABCMeta
+from importlib import import_module
 from typing import Dict
 
 from .base_adapter import AdapterType
@@ -11,6 +12,7 @@ class AdapterRegistration(ABCMeta):
         Метакласс для автоматической регистрации адаптеров разметки.
         Все адаптеры с объявленным adapter_name автоматически добавляются в реестр.
         Позволяет получать адаптеры по имени и вручную регистрировать новые.
+        Встроенные адаптеры импортируются при первом запросе по имени (см. _builtin_modules).
         Samples:
             class MyAdapter(BaseAdapter, metaclass=AdapterRegistration):
                 adapter_name = "my"
@@ -18,6 +20,12 @@ class AdapterRegistration(ABCMeta):
     """
 
     _registry: Dict[str, AdapterType] = {}
+    # Встроенные адаптеры: имя -> модуль, регистрирующий адаптер при импорте
+    _builtin_modules: Dict[str, str] = {
+        "labelme": ".labelme_adapter",
+        "coco": ".coco_adapter",
+        "voc": ".voc_adapter",
+    }
 
     def __new__(mcs, name, bases, namespace, **kwargs):
         cls = super().__new__(mcs, name, bases, namespace)
@@ -33,7 +41,7 @@ class AdapterRegistration(ABCMeta):
             Returns:
                 List[str]: Список имён.
         """
-        return list(cls._registry.keys())
+        return list({**dict.fromkeys(cls._builtin_modules), **cls._registry})
 
     @classmethod
     def get_adapter(cls, name: str) -> AdapterType:
@@ -47,8 +55,10 @@ class AdapterRegistration(ABCMeta):
                 ValueError: Если адаптер не зарегистрирован.
         """
         key = name.lower()
+        if key not in cls._registry and key in cls._builtin_modules:
+            import_module(cls._builtin_modules[key], __package__)
         if key not in cls._registry:
-            raise ValueError(f'Adapter "{key}" is not registered. Available: {", ".join(cls._registry.keys())}')
+            raise ValueError(f'Adapter "{key}" is not registered. Available: {", ".join(cls.list_adapters())}')
         return cls._registry[key]
 
     @classmethod
@@ -1,10 +1,17 @@
+from __future__ import annotations
+
 __all__ = ['BaseAdapter', 'AdapterType']
 
 from abc import ABC, abstractmethod
-from typing import Any, Tuple, Dict, TypeVar, Generic
+from typing import Any, Tuple, Dict, Iterable, Iterator, TypeVar, Generic, TYPE_CHECKING
+
 
 from ..shape import Shape
 from ..types import ShiftPointType
+from ..public_enums import ValidationMode
+
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
 
 AdapterType = TypeVar('AdapterType', bound='BaseAdapter')
 
@@ -15,24 +22,62 @@ class BaseAdapter(ABC, Generic[AdapterType]):
         Контракт:
             - load: превращает json-данные в кортеж Shape.
             - shapes_to_json: сериализует кортеж Shape обратно в json (для сохранения).
+            - load_batch (необязательно): то же, что load, но в колоночный ShapeBatch.
+            - iter_json (необязательно, при заданном items_key): то же, что shapes_to_json, но по частям —
+              для потоковой записи (AnnotationSaver.save_stream).
         Для регистрации адаптеров используется AdapterFactory.
     """
 
     adapter_name: str = ""
+    # Ключ списка фигур в json-документе ("shapes", "annotations", ...); "" — потоковая запись не поддерживается
+    items_key: str = ""
 
     @staticmethod
     @abstractmethod
-    def load(json_data: Any, shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+    def load(json_data: Any,
+             shift_point: ShiftPointType = None,
+             validate: ValidationMode | str = ValidationMode.FULL,
+             numpy_coords: bool = False) -> Tuple[Shape, ...]:
         """
             Преобразует json-данные в кортеж Shape.
             Args:
                 json_data: Входные данные (dict или list).
                 shift_point: Точка смещения для фигур (если требуется).
+                validate: Строгость проверки элементов (см. ValidationMode).
+                          AnnotationParser передаёт его только в режимах, отличных от FULL.
+                numpy_coords: True — coords фигур хранятся как неизменяемые массивы (N, 2) float64.
+                              AnnotationParser передаёт его только при значении True.
             Returns:
                 Tuple[Shape, ...]: Кортеж бизнес-объектов Shape.
             """
         raise NotImplementedError("Adapter must implement load()")
 
+    @classmethod
+    def load_batch(cls,
+                   json_data: Any,
+                   shift_point: ShiftPointType = None,
+                   validate: ValidationMode | str = ValidationMode.FULL,
+                   dtype: Any = "float64") -> ShapeBatch:
+        """
+            Преобразует json-данные в колоночный ShapeBatch.
+            Реализация по умолчанию строит кортеж Shape через load и упаковывает его;
+            адаптеры могут переопределить метод и заполнять ShapeBatchBuilder напрямую.
+            Args:
+                json_data: Входные данные (dict или list).
+                shift_point: Точка смещения для фигур (если требуется).
+                validate: Строгость проверки элементов (см. ValidationMode).
+                dtype: Тип координат (np.float64 или np.float32).
+            Returns:
+                ShapeBatch: Фигуры в колоночном представлении.
+        """
+        from ..shape_batch import ShapeBatch
+        validate = ValidationMode(validate)
+        if validate is ValidationMode.FULL:
+            shapes = cls.load(json_data, shift_point=shift_point)
+        else:
+            shapes = cls.load(json_data, shift_point=shift_point, validate=validate)
+        return ShapeBatch.from_shapes(shapes, dtype=dtype)
+
     @staticmethod
     @abstractmethod
     def shapes_to_json(original_json: Any, shapes: Tuple[Shape, ...]) -> Dict:
@@ -46,6 +91,29 @@ class BaseAdapter(ABC, Generic[AdapterType]):
         """
         raise NotImplementedError("Adapter must implement shapes_to_json()")
 
+    @classmethod
+    def iter_json(cls, original_json: Any, shapes: Iterable[Shape]) -> Tuple[Dict, Iterator[Any]]:
+        """
+            Сериализует фигуры для потоковой записи: заголовок документа и итератор элементов списка items_key.
+            Реализация по умолчанию собирает документ через shapes_to_json целиком;
+            адаптеры переопределяют метод, чтобы элементы строились по одному.
+            Args:
+                original_json: Оригинальный json (или только его заголовок, без списка items_key).
+                shapes: Фигуры (любой итерируемый объект, в том числе генератор).
+            Returns:
+                Tuple[dict, Iterator]: Заголовок (место списка items_key в нём задаёт порядок полей) и элементы.
+        """
+        document = dict(cls.shapes_to_json(original_json, tuple(shapes)))
+        return document, iter(document.get(cls.items_key) or ())
+
+    @staticmethod
+    def _make_coords(points: Any, numpy_coords: bool = False) -> Any:
+        """ Координаты для Shape: массив numpy (одно векторное преобразование) или исходный список. """
+        if not numpy_coords:
+            return points
+        import numpy as np
+        return np.asarray(points, dtype=np.float64)
+
     @staticmethod
     def _get_field(obj: Any, name: str, default: Any = None) -> Any:
         """
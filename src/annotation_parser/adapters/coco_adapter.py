@@ -1,14 +1,28 @@
+from __future__ import annotations
+
 __all__ = ['CocoAdapter']
 
-from typing import Any, Tuple, Dict
+from pathlib import Path
+from typing import Any, Tuple, Dict, Iterable, Iterator, Optional, Union, List, TYPE_CHECKING
+
+from pydantic import TypeAdapter
 
 from ..shape import Shape
 from ..types import ShiftPointType
-from ..public_enums import ShapeType
-from ..models import JsonCocoAnnotation
+from ..public_enums import PipelineStage, ShapeType, ValidationMode
+from ..models.coco_model import JsonCocoAnnotation, CocoAnnotationDict
+from ..utils import JsonStreamReader, stage
 from .adapter_registration import AdapterRegistration
 from .base_adapter import BaseAdapter
 
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
+
+
+_LIGHT_ANNOTATION = TypeAdapter(CocoAnnotationDict)
+_LIGHT_ANNOTATIONS = TypeAdapter(List[CocoAnnotationDict])
+_MODEL_FIELDS = frozenset(JsonCocoAnnotation.model_fields)
+
 
 class CocoAdapter(BaseAdapter, metaclass=AdapterRegistration):
     """
@@ -17,14 +31,22 @@ class CocoAdapter(BaseAdapter, metaclass=AdapterRegistration):
     """
 
     adapter_name = "coco"
+    items_key = "annotations"
 
     @staticmethod
-    def load(json_data: Any, shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+    def load(json_data: Any,
+             shift_point: ShiftPointType = None,
+             validate: ValidationMode | str = ValidationMode.FULL,
+             numpy_coords: bool = False) -> Tuple[Shape, ...]:
         """
             Преобразует COCO-аннотации (dict с annotations и categories) в кортеж Shape.
             Args:
                 json_data (dict): Данные COCO ({"annotations": [...], "categories": [...], ...}).
                 shift_point (ShiftPointType): Смещение.
+                validate (ValidationMode): FULL — pydantic-модель на каждую аннотацию;
+                                           LIGHT — одна проверка всего списка через TypeAdapter;
+                                           NONE — без проверок (доверенные файлы).
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
             Returns:
                 Tuple[Shape, ...]: Кортеж Shape.
             Raises:
@@ -34,22 +56,180 @@ class CocoAdapter(BaseAdapter, metaclass=AdapterRegistration):
             raise ValueError("COCO JSON должен содержать ключ 'annotations'")
         # Маппинг категорий (id -> name)
         category_map = {cat['id']: cat['name'] for cat in json_data.get("categories", [])}
-        result = []
-        for ann in json_data["annotations"]:
+        annotations = json_data["annotations"]
+        validate = ValidationMode(validate)
+        if validate is ValidationMode.LIGHT:
+            with stage(PipelineStage.VALIDATE, shapes=len(annotations)):
+                checked = _LIGHT_ANNOTATIONS.validate_python(annotations)
+            with stage(PipelineStage.BUILD, shapes=len(annotations)):
+                return tuple(CocoAdapter._raw_to_shape(raw, item, category_map, shift_point, numpy_coords)
+                             for raw, item in zip(annotations, checked))
+        if validate is ValidationMode.FULL:
+            # Сначала модели всех аннотаций, затем Shape: этапы VALIDATE и BUILD замеряются раздельно
+            with stage(PipelineStage.VALIDATE, shapes=len(annotations)):
+                annotations = [ann if isinstance(ann, JsonCocoAnnotation) else JsonCocoAnnotation.model_validate(ann)
+                               for ann in annotations]
+        with stage(PipelineStage.BUILD, shapes=len(annotations)):
+            return tuple(CocoAdapter._ann_to_shape(ann, category_map, shift_point, validate, numpy_coords)
+                         for ann in annotations)
+
+    @staticmethod
+    def load_batch(json_data: Any,
+                   shift_point: ShiftPointType = None,
+                   validate: ValidationMode | str = ValidationMode.FULL,
+                   dtype: Any = "float64") -> ShapeBatch:
+        """
+            Преобразует COCO-аннотации в колоночный ShapeBatch.
+            В режимах LIGHT и NONE аннотации пишутся в ShapeBatchBuilder напрямую, без объектов Shape.
+            Args:
+                json_data (dict): Данные COCO.
+                shift_point (ShiftPointType): Смещение.
+                validate (ValidationMode): Строгость проверки (см. load).
+                dtype: Тип координат (np.float64 или np.float32).
+            Returns:
+                ShapeBatch: Фигуры в колоночном представлении.
+            Raises:
+                ValueError: Если структура данных не поддерживается.
+        """
+        from ..shape_batch import ShapeBatch, ShapeBatchBuilder
+        validate = ValidationMode(validate)
+        if validate is ValidationMode.FULL:
+            return ShapeBatch.from_shapes(CocoAdapter.load(json_data, shift_point), dtype=dtype)
+        if not isinstance(json_data, dict) or "annotations" not in json_data:
+            raise ValueError("COCO JSON должен содержать ключ 'annotations'")
+        category_map = {cat['id']: cat['name'] for cat in json_data.get("categories", [])}
+        annotations = json_data["annotations"]
+        checked = _LIGHT_ANNOTATIONS.validate_python(annotations) if validate is ValidationMode.LIGHT else annotations
+        builder = ShapeBatchBuilder(dtype=dtype)
+        for raw, item in zip(annotations, checked):
+            builder.append(**CocoAdapter._raw_fields(raw, item, category_map, shift_point))
+        return builder.build()
+
+    @staticmethod
+    def iter_load(file_path: Union[str, Path],
+                  shift_point: ShiftPointType = None,
+                  chunk_size: int = 1 << 20,
+                  validate: ValidationMode | str = ValidationMode.FULL) -> Iterator[Shape]:
+        """
+            Потоково читает COCO-файл и выдаёт Shape по одной аннотации, не загружая весь JSON в память.
+            Сначала читаются categories: если в файле они идут после annotations, массив annotations
+            пропускается без декодирования, а после чтения categories файл дочитывается повторно с его начала.
+            Секция images не загружается; image_id и category_id аннотации сохраняются в meta фигуры (как в load).
+            Args:
+                file_path: Путь к COCO-файлу.
+                shift_point (ShiftPointType): Смещение.
+                chunk_size (int): Размер блока чтения в байтах.
+                validate (ValidationMode): Строгость проверки каждой аннотации.
+            Returns:
+                Iterator[Shape]: Фигуры в порядке следования аннотаций в файле.
+            Raises:
+                ValueError: Если в файле нет ключа 'annotations'.
+                json.JSONDecodeError: Если файл некорректный JSON.
+        """
+        validate = ValidationMode(validate)
+        with open(file_path, "rb") as f:
+            reader = JsonStreamReader(f, chunk_size=chunk_size)
+            category_map: Optional[Dict[Any, str]] = None
+            annotations_offset = None
+            annotations_done = False
+            for key in reader.iter_object():
+                if key == "categories":
+                    category_map = {cat['id']: cat['name'] for cat in reader.iter_array_values()}
+                elif key == "annotations" and category_map is not None:
+                    for ann in reader.iter_array_values():
+                        yield CocoAdapter._ann_to_shape(ann, category_map, shift_point, validate)
+                    annotations_done = True
+                elif key == "annotations":
+                    annotations_offset, _ = reader.skip_value()
+                else:
+                    reader.skip_value()
+            if annotations_done:
+                return
+            if annotations_offset is None:
+                raise ValueError("COCO JSON должен содержать ключ 'annotations'")
+            f.seek(annotations_offset)
+            reader = JsonStreamReader(f, chunk_size=chunk_size)
+            for ann in reader.iter_array_values():
+                yield CocoAdapter._ann_to_shape(ann, category_map or {}, shift_point, validate)
+
+    @staticmethod
+    def _ann_to_shape(ann: Any,
+                      category_map: Dict[Any, str],
+                      shift_point: ShiftPointType = None,
+                      validate: ValidationMode = ValidationMode.FULL,
+                      numpy_coords: bool = False) -> Shape:
+        """ Проверяет одну аннотацию (dict или модель) согласно validate и строит по ней Shape. """
+        if isinstance(ann, JsonCocoAnnotation) or validate is ValidationMode.FULL:
             if not isinstance(ann, JsonCocoAnnotation):
                 ann = JsonCocoAnnotation.model_validate(ann)
-            label = category_map.get(ann.category_id, str(ann.category_id))
-            result.append(CocoAdapter.to_shape(ann, label, shift_point))
-        return tuple(result)
+            return CocoAdapter.to_shape(ann, CocoAdapter._label(category_map, ann.category_id), shift_point,
+                                        numpy_coords)
+        item = _LIGHT_ANNOTATION.validate_python(ann) if validate is ValidationMode.LIGHT else ann
+        return CocoAdapter._raw_to_shape(ann, item, category_map, shift_point, numpy_coords)
+
+    @staticmethod
+    def _raw_to_shape(raw: dict,
+                      item: dict,
+                      category_map: Dict[Any, str],
+                      shift_point: ShiftPointType = None,
+                      numpy_coords: bool = False) -> Shape:
+        """ Строит Shape из сырого dict аннотации без pydantic-модели (режимы LIGHT и NONE), как to_shape. """
+        return Shape.construct(**CocoAdapter._raw_fields(raw, item, category_map, shift_point, numpy_coords))
+
+    @staticmethod
+    def _raw_fields(raw: dict,
+                    item: dict,
+                    category_map: Dict[Any, str],
+                    shift_point: ShiftPointType = None,
+                    numpy_coords: bool = False) -> Dict[str, Any]:
+        """
+            Поля Shape из сырого dict аннотации (аргументы Shape.construct / ShapeBatchBuilder.append).
+            Args:
+                raw: Словарь аннотации из JSON (источник meta).
+                item: Проверенные значения схемы CocoAnnotationDict (LIGHT) или тот же raw (NONE).
+                category_map: Маппинг category_id -> name.
+                shift_point (ShiftPointType): Смещение.
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
+        """
+        x, y, w, h = item["bbox"]
+        return dict(
+            label=CocoAdapter._label(category_map, item["category_id"]),
+            coords=BaseAdapter._make_coords([[x, y], [x + w, y + h]], numpy_coords),
+            type=ShapeType.RECTANGLE,
+            number=item["id"],
+            flags={},
+            shift_point=shift_point,
+            meta=CocoAdapter._meta({k: v for k, v in raw.items() if k not in _MODEL_FIELDS},
+                                   item.get("image_id"), item.get("category_id"))
+        )
 
     @staticmethod
-    def to_shape(obj: JsonCocoAnnotation, label: str, shift_point: ShiftPointType = None) -> Shape:
+    def _meta(extra: Dict[str, Any], image_id: Any, category_id: Any) -> Dict[str, Any]:
+        """
+            meta фигуры: дополнительные поля аннотации, а также image_id и category_id.
+            Это поля модели, в model_extra они не попадают; без них shape_to_raw не восстановит image_id
+            для файлов с несколькими изображениями.
+        """
+        extra["image_id"] = image_id
+        extra["category_id"] = category_id
+        return extra
+
+    @staticmethod
+    def _label(category_map: Dict[Any, str], category_id: Any) -> str:
+        return category_map.get(category_id, str(category_id))
+
+    @staticmethod
+    def to_shape(obj: JsonCocoAnnotation,
+                 label: str,
+                 shift_point: ShiftPointType = None,
+                 numpy_coords: bool = False) -> Shape:
         """
             Преобразует JsonCocoAnnotation в Shape.
             Args:
                 obj (JsonCocoAnnotation): Аннотация COCO.
                 label (str): Название категории.
                 shift_point (ShiftPointType): Смещение.
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
             Returns:
                 Shape: Бизнес-объект.
         """
@@ -57,7 +237,7 @@ class CocoAdapter(BaseAdapter, metaclass=AdapterRegistration):
         x, y, w, h = obj.bbox
         return Shape(
             label=label,
-            coords=[[x, y], [x + w, y + h]],
+            coords=BaseAdapter._make_coords([[x, y], [x + w, y + h]], numpy_coords),
             type=ShapeType.RECTANGLE,
             number=obj.id,
             description=None,
@@ -66,41 +246,73 @@ class CocoAdapter(BaseAdapter, metaclass=AdapterRegistration):
             position=None,
             wz_number=None,
             shift_point=shift_point,
-            meta=getattr(obj, "model_extra", {})
+            meta=CocoAdapter._meta(dict(obj.model_extra or {}), obj.image_id, obj.category_id)
         )
 
     @staticmethod
     def shapes_to_json(original_json: Any, shapes: Tuple[Shape, ...]) -> Dict:
         """
             Сериализует кортеж Shape обратно в COCO-структуру.
+            Оригинал не копируется и не изменяется: новый dict ссылается на его секции (images, categories, ...).
+            category_id берётся по label из categories оригинала, а если метки там нет — из meta фигуры;
+            image_id — из meta фигуры (его туда кладёт load), а если его там нет и в оригинале ровно одно
+            изображение — id этого изображения.
             Args:
                 original_json: Оригинальный json (сохраняет все поля кроме "annotations").
                 shapes: Кортеж Shape.
             Returns:
                 dict: COCO-JSON c обновлённым "annotations".
         """
-        import copy
-        json_out = copy.deepcopy(original_json) if original_json else {}
-        json_out["annotations"] = [CocoAdapter.shape_to_raw(shape).model_dump() for shape in shapes]
+        json_out, annotations = CocoAdapter.iter_json(original_json, shapes)
+        json_out["annotations"] = list(annotations)
         return json_out
 
     @staticmethod
-    def shape_to_raw(shape: Shape) -> JsonCocoAnnotation:
+    def iter_json(original_json: Any, shapes: Iterable[Shape]) -> Tuple[Dict, Iterator[Dict]]:
+        """
+            Заголовок COCO-документа (все поля оригинала, без копирования) и аннотации, которые строятся
+            по одной при обходе итератора. Используется shapes_to_json и потоковой записью.
+            Args:
+                original_json: Оригинальный json или его заголовок (images, categories, ...).
+                shapes: Фигуры (любой итерируемый объект, в том числе генератор).
+            Returns:
+                Tuple[dict, Iterator[dict]]: Заголовок и аннотации.
+        """
+        header = dict(original_json) if original_json else {}
+        # Пустой список — место аннотаций в порядке полей; старые аннотации не копируются
+        header["annotations"] = []
+        category_ids = {cat["name"]: cat["id"] for cat in header.get("categories") or ()}
+        images = header.get("images") or ()
+        image_id = images[0].get("id") if len(images) == 1 else None
+        annotations = (CocoAdapter.shape_to_raw(shape, category_ids, image_id).model_dump() for shape in shapes)
+        return header, annotations
+
+    @staticmethod
+    def shape_to_raw(shape: Shape,
+                     category_ids: Optional[Dict[str, Any]] = None,
+                     image_id: Any = None) -> JsonCocoAnnotation:
         """
             Преобразует Shape обратно в COCO-аннотацию.
             Args:
                 shape (Shape): Бизнес-объект.
+                category_ids: Маппинг label -> category_id (обратный categories оригинала).
+                image_id: id изображения для фигур, у которых его нет в meta.
+                Из meta также берётся category_id для меток, которых нет в category_ids.
             Returns:
                 JsonCocoAnnotation: Модель COCO.
         """
         x1, y1 = shape.coords[0]
         x2, y2 = shape.coords[2]
         bbox = [float(x1), float(y1), float(x2 - x1), float(y2 - y1)]
-        # Сюда можно добавить category_id если есть маппинг label -> id
+        meta = shape.meta or {}
+        category_id = (category_ids or {}).get(shape.label, meta.get("category_id"))
+        if category_id is None and shape.label.isdigit():
+            # load подставляет id вместо имени для категорий, которых нет в categories
+            category_id = int(shape.label)
         return JsonCocoAnnotation(
             id=int(shape.number) if shape.number is not None else None,
-            image_id=None,
-            category_id=None,  # нужно прокидывать, если есть маппинг label->id
+            image_id=meta.get("image_id", image_id),
+            category_id=category_id,
             bbox=bbox,
             segmentation=None,
             area=None,
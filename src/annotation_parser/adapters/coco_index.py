@@ -0,0 +1,195 @@
+__all__ = ['CocoIndex']
+
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+from ..shape import Shape
+from ..types import ShiftPointType
+from ..utils import JsonCodec, JsonStreamReader
+from .coco_adapter import CocoAdapter
+
+
+class CocoIndex:
+    """
+        Индекс COCO-файла для произвольного доступа к аннотациям одного изображения.
+        Строится один раз за потоковый проход по файлу и хранит:
+            - image_id -> смещения (начало, длина в байтах) аннотаций изображения в файле;
+            - file_name -> image_id;
+            - category_id -> name.
+        Фигуры изображения собираются лениво при первом обращении (чтение только нужных байтов файла)
+        и держатся в LRU-кэше последних изображений.
+        Samples:
+            with CocoIndex("instances_train.json") as index:
+                shapes = index.shapes(42)              # по image_id
+                shapes = index["000000000042.jpg"]     # по file_name
+    """
+
+    def __init__(self,
+                 file_path: Union[str, Path],
+                 shift_point: ShiftPointType = None,
+                 cache_size: int = 256,
+                 chunk_size: int = 1 << 20) -> None:
+        """
+            Args:
+                file_path: Путь к COCO-файлу.
+                shift_point (ShiftPointType): Смещение для всех фигур.
+                cache_size (int): Сколько изображений держать в LRU-кэше фигур (0 — без кэша).
+                chunk_size (int): Размер блока чтения при построении индекса.
+            Raises:
+                FileNotFoundError: Если файл не найден.
+                ValueError: Если в файле нет ключа 'annotations'.
+        """
+        self._file_path = str(file_path)
+        self._shift_point = shift_point
+        self._cache_size = cache_size
+        self._categories: Dict[Any, str] = {}
+        self._file_names: Dict[str, Any] = {}
+        self._offsets: Dict[Any, array] = {}
+        self._image_ids: Dict[Any, None] = {}
+        self._cache: "OrderedDict[Any, Tuple[Shape, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fp: Optional[BinaryIO] = None
+        self._fp_pid: Optional[int] = None
+        self._build(chunk_size)
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    @property
+    def categories(self) -> Dict[Any, str]:
+        """ Маппинг category_id -> name. """
+        return dict(self._categories)
+
+    @property
+    def image_ids(self) -> Tuple[Any, ...]:
+        """ image_id всех изображений, у которых есть аннотации или описание в images. """
+        return tuple(self._image_ids)
+
+    def image_id(self, image: Any) -> Any:
+        """
+            Приводит ключ изображения (image_id или file_name) к image_id.
+            Raises:
+                KeyError: Если изображение не найдено в индексе.
+        """
+        if image in self._image_ids:
+            return image
+        if isinstance(image, str) and image in self._file_names:
+            return self._file_names[image]
+        raise KeyError(f"Image not found in COCO index: {image!r}")
+
+    def offsets(self, image: Any) -> Tuple[Tuple[int, int], ...]:
+        """ Смещения (начало, длина в байтах) аннотаций изображения в файле. """
+        flat = self._offsets.get(self.image_id(image), array('q'))
+        return tuple(zip(flat[::2], flat[1::2]))
+
+    def shapes(self, image: Any) -> Tuple[Shape, ...]:
+        """
+            Фигуры одного изображения (по image_id или file_name).
+            Returns:
+                Tuple[Shape, ...]: Фигуры в порядке следования аннотаций в файле.
+            Raises:
+                KeyError: Если изображение не найдено в индексе.
+        """
+        image_id = self.image_id(image)
+        with self._lock:
+            cached = self._cache.get(image_id)
+            if cached is not None:
+                self._cache.move_to_end(image_id)
+                return cached
+            shapes = self._read_shapes(image_id)
+            if self._cache_size > 0:
+                self._cache[image_id] = shapes
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            return shapes
+
+    def clear_cache(self) -> None:
+        """ Очищает LRU-кэш фигур. """
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        """ Закрывает файл, открытый для чтения аннотаций. """
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+            self._fp = None
+
+    def __getitem__(self, image: Any) -> Tuple[Shape, ...]:
+        return self.shapes(image)
+
+    def __contains__(self, image: Any) -> bool:
+        try:
+            self.image_id(image)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._image_ids)
+
+    def __enter__(self) -> "CocoIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Файл и блокировка не переносятся в другие процессы (например, воркеры DataLoader)
+        state = self.__dict__.copy()
+        state.update(_fp=None, _fp_pid=None, _lock=None, _cache=OrderedDict())
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _build(self, chunk_size: int) -> None:
+        """ Один потоковый проход по файлу: categories, images и смещения всех аннотаций. """
+        has_annotations = False
+        with open(self._file_path, "rb") as f:
+            reader = JsonStreamReader(f, chunk_size=chunk_size)
+            for key in reader.iter_object():
+                if key == "categories":
+                    self._categories = {cat['id']: cat['name'] for cat in reader.iter_array_values()}
+                elif key == "images":
+                    for img in reader.iter_array_values():
+                        self._image_ids[img['id']] = None
+                        if 'file_name' in img:
+                            self._file_names[img['file_name']] = img['id']
+                elif key == "annotations":
+                    has_annotations = True
+                    for _ in reader.iter_array():
+                        start = reader.tell()
+                        ann = reader.read_value()
+                        image_id = ann.get('image_id')
+                        self._image_ids[image_id] = None
+                        self._offsets.setdefault(image_id, array('q')).extend((start, reader.tell() - start))
+                else:
+                    reader.skip_value()
+        if not has_annotations:
+            raise ValueError("COCO JSON должен содержать ключ 'annotations'")
+
+    def _read_shapes(self, image_id: Any) -> Tuple[Shape, ...]:
+        flat = self._offsets.get(image_id)
+        if not flat:
+            return ()
+        fp = self._get_fp()
+        shapes = []
+        for start, length in zip(flat[::2], flat[1::2]):
+            fp.seek(start)
+            ann = JsonCodec.loads(fp.read(length))
+            shapes.append(CocoAdapter._ann_to_shape(ann, self._categories, self._shift_point))
+        return tuple(shapes)
+
+    def _get_fp(self) -> BinaryIO:
+        """ Файл для чтения аннотаций; после fork открывается заново, чтобы не делить позицию с родителем. """
+        if self._fp is None or self._fp_pid != os.getpid():
+            self._fp = open(self._file_path, "rb")
+            self._fp_pid = os.getpid()
+        return self._fp
@@ -1,14 +1,27 @@
+from __future__ import annotations
+
 __all__ = ['LabelMeAdapter']
 
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, List, Dict, Iterable, Iterator, TYPE_CHECKING
+
+from pydantic import TypeAdapter
 
 from ..shape import Shape
+from ..utils import coords_to_list, stage
+from ..utils.mask_codec import LazyMask
 from ..types import ShiftPointType
-from ..public_enums import ShapeType, ShapePosition
-from ..models.labelme_model import JsonLabelmeShape, JsonLabelme
+from ..public_enums import PipelineStage, ShapeType, ShapePosition, ValidationMode
+from ..models.labelme_model import JsonLabelmeShape, JsonLabelme, LabelmeShapeDict
 from .adapter_registration import AdapterRegistration
 from .base_adapter import BaseAdapter
 
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
+
+
+_LIGHT_SHAPES = TypeAdapter(List[LabelmeShapeDict])
+_MODEL_FIELDS = frozenset(JsonLabelmeShape.model_fields)
+
 
 class LabelMeAdapter(BaseAdapter, metaclass=AdapterRegistration):
     """
@@ -17,14 +30,22 @@ class LabelMeAdapter(BaseAdapter, metaclass=AdapterRegistration):
     """
 
     adapter_name = "labelme"
+    items_key = "shapes"
 
     @staticmethod
-    def load(json_data: Any, shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+    def load(json_data: Any,
+             shift_point: ShiftPointType = None,
+             validate: ValidationMode | str = ValidationMode.FULL,
+             numpy_coords: bool = False) -> Tuple[Shape, ...]:
         """
             Преобразует LabelMe-JSON в кортеж Shape.
             Args:
                 json_data (dict): LabelMe-данные.
                 shift_point (ShiftPointType): Смещение координат (если требуется).
+                validate (ValidationMode): FULL — pydantic-модель на каждую фигуру;
+                                           LIGHT — одна проверка всего списка shapes через TypeAdapter;
+                                           NONE — Shape строится из сырых dict без проверок (доверенные файлы).
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
             Returns:
                 Tuple[Shape, ...]: Кортеж фигур Shape.
             Raises:
@@ -32,7 +53,53 @@ class LabelMeAdapter(BaseAdapter, metaclass=AdapterRegistration):
         """
         if not isinstance(json_data, dict) or "shapes" not in json_data:
             raise ValueError("LabelMe JSON должен содержать ключ 'shapes'")
-        return tuple(LabelMeAdapter._to_shape(js, shift_point=shift_point) for js in json_data["shapes"])
+        validate = ValidationMode(validate)
+        shapes = json_data["shapes"]
+        if validate is ValidationMode.FULL:
+            # Сначала модели всех фигур, затем Shape: этапы VALIDATE и BUILD замеряются раздельно
+            with stage(PipelineStage.VALIDATE, shapes=len(shapes)):
+                models = [js if isinstance(js, JsonLabelmeShape) else JsonLabelmeShape.model_validate(js)
+                          for js in shapes]
+            with stage(PipelineStage.BUILD, shapes=len(models)):
+                return tuple(LabelMeAdapter._to_shape(js, shift_point=shift_point, numpy_coords=numpy_coords)
+                             for js in models)
+        if validate is ValidationMode.LIGHT:
+            with stage(PipelineStage.VALIDATE, shapes=len(shapes)):
+                items = LabelMeAdapter._checked_items(shapes, validate)
+        else:
+            items = LabelMeAdapter._checked_items(shapes, validate)
+        with stage(PipelineStage.BUILD, shapes=len(shapes)):
+            return tuple(Shape.construct(**LabelMeAdapter._raw_fields(raw, item, shift_point, numpy_coords))
+                         for raw, item in items)
+
+    @staticmethod
+    def load_batch(json_data: Any,
+                   shift_point: ShiftPointType = None,
+                   validate: ValidationMode | str = ValidationMode.FULL,
+                   dtype: Any = "float64") -> ShapeBatch:
+        """
+            Преобразует LabelMe-JSON в колоночный ShapeBatch.
+            В режимах LIGHT и NONE фигуры пишутся в ShapeBatchBuilder напрямую, без объектов Shape.
+            Args:
+                json_data (dict): LabelMe-данные.
+                shift_point (ShiftPointType): Смещение координат (если требуется).
+                validate (ValidationMode): Строгость проверки (см. load).
+                dtype: Тип координат (np.float64 или np.float32).
+            Returns:
+                ShapeBatch: Фигуры в колоночном представлении.
+            Raises:
+                ValueError: Если структура json_data некорректна.
+        """
+        from ..shape_batch import ShapeBatch, ShapeBatchBuilder
+        validate = ValidationMode(validate)
+        if validate is ValidationMode.FULL:
+            return ShapeBatch.from_shapes(LabelMeAdapter.load(json_data, shift_point), dtype=dtype)
+        if not isinstance(json_data, dict) or "shapes" not in json_data:
+            raise ValueError("LabelMe JSON должен содержать ключ 'shapes'")
+        builder = ShapeBatchBuilder(dtype=dtype)
+        for raw, item in LabelMeAdapter._checked_items(json_data["shapes"], validate):
+            builder.append(**LabelMeAdapter._raw_fields(raw, item, shift_point))
+        return builder.build()
 
     @staticmethod
     def shapes_to_json(original_json: Any, shapes: Tuple[Shape, ...]) -> dict:
@@ -44,30 +111,39 @@ class LabelMeAdapter(BaseAdapter, metaclass=AdapterRegistration):
             Returns:
                 dict: LabelMe-JSON c обновлённым shapes и всеми обязательными полями.
         """
-        # Собираем shapes-модели по pydantic
-        shapes_models = [LabelMeAdapter._shape_to_raw(shape) for shape in shapes]
-
-        # Используем только реально существующие поля, иначе дефолты от pydantic
-        fields = {}
-        if original_json:
-            for k in (
-            "version", "flags", "imagePath", "imageData", "imageHeight", "imageWidth", "lineColor", "fillColor"):
-                v = original_json.get(k, None)
-                if v is not None:
-                    fields[k] = v
-        fields["shapes"] = shapes_models
-
-        # Собираем объект по полной модели (дефолты модели будут использоваться если значения нет)
-        labelme_obj = JsonLabelme(**fields)
-        return labelme_obj.model_dump(mode='json', by_alias=True)
+        json_out, items = LabelMeAdapter.iter_json(original_json, shapes)
+        json_out["shapes"] = list(items)
+        return json_out
 
     @staticmethod
-    def _to_shape(js: Any, shift_point: ShiftPointType = None) -> Shape:
+    def iter_json(original_json: Any, shapes: Iterable[Shape]) -> Tuple[Dict, Iterator[Dict]]:
+        """
+            Заголовок LabelMe-документа (все поля оригинала, без копирования — в том числе многомегабайтный imageData)
+            и фигуры, сериализуемые по одной. Отсутствующие в оригинале (или null) обязательные поля берутся
+            из дефолтов модели JsonLabelme.
+            Args:
+                original_json: Исходный json для передачи доп. полей.
+                shapes: Фигуры (любой итерируемый объект, в том числе генератор).
+            Returns:
+                Tuple[dict, Iterator[dict]]: Заголовок и элементы "shapes".
+        """
+        header = dict(original_json) if original_json else {}
+        for key, value in JsonLabelme().model_dump(mode='json', by_alias=True).items():
+            if header.get(key) is None:
+                header[key] = value
+        # Пустой список — место фигур в порядке полей; старые фигуры не копируются
+        header["shapes"] = []
+        items = (LabelMeAdapter._shape_to_raw(shape).model_dump(mode='json', by_alias=True) for shape in shapes)
+        return header, items
+
+    @staticmethod
+    def _to_shape(js: Any, shift_point: ShiftPointType = None, numpy_coords: bool = False) -> Shape:
         """
             Преобразует JsonLabelmeShape (pydantic) в Shape.
             Args:
                 js: Модель фигуры LabelMe.
                 shift_point: Опциональный Point для смещения.
+                numpy_coords: True — coords как массив numpy.
             Returns:
                 Shape: Бизнес-объект.
             """
@@ -75,18 +151,55 @@ class LabelMeAdapter(BaseAdapter, metaclass=AdapterRegistration):
             js = JsonLabelmeShape.model_validate(js)
         return Shape(
             label=BaseAdapter._get_field(js, "label"),
-            coords=js.points,
+            coords=BaseAdapter._make_coords(js.points, numpy_coords),
             type=LabelMeAdapter._parse_shape_type(BaseAdapter._get_field(js, "shape_type")),
             number=BaseAdapter._get_field(js, "group_id"),
             description=BaseAdapter._get_field(js, "description"),
             flags=BaseAdapter._get_field(js, "flags", {}),
-            mask=BaseAdapter._get_field(js, "mask"),
+            mask=LazyMask.wrap(BaseAdapter._get_field(js, "mask")),
             position=LabelMeAdapter._parse_position(BaseAdapter._get_field(js, "position", None)),
             wz_number=BaseAdapter._get_field(js, "wz"),
             shift_point=shift_point,
             meta=getattr(js, "model_extra", {})
         )
 
+    @staticmethod
+    def _checked_items(shapes: List[dict], validate: ValidationMode) -> Iterable[Tuple[dict, dict]]:
+        """ Пары (raw, item) для режимов LIGHT (item проверен TypeAdapter) и NONE (item — тот же raw). """
+        if validate is ValidationMode.LIGHT:
+            return zip(shapes, _LIGHT_SHAPES.validate_python(shapes))
+        return ((raw, raw) for raw in shapes)
+
+    @staticmethod
+    def _raw_fields(raw: dict,
+                    item: dict,
+                    shift_point: ShiftPointType = None,
+                    numpy_coords: bool = False) -> Dict[str, Any]:
+        """
+            Поля Shape из сырого dict фигуры LabelMe (аргументы Shape.construct / ShapeBatchBuilder.append).
+            Поля и meta совпадают с результатом _to_shape.
+            Args:
+                raw: Словарь фигуры из JSON (источник дополнительных полей и meta).
+                item: Проверенные значения схемы LabelmeShapeDict (LIGHT) или тот же raw (NONE).
+                shift_point: Опциональный Point для смещения.
+                numpy_coords: True — coords как массив numpy.
+            Returns:
+                Dict[str, Any]: Именованные поля фигуры.
+        """
+        return dict(
+            label=item["label"],
+            coords=BaseAdapter._make_coords(item["points"], numpy_coords),
+            type=LabelMeAdapter._parse_shape_type(item["shape_type"]),
+            number=item.get("group_id"),
+            description=item.get("description"),
+            flags=item.get("flags") or {},
+            mask=LazyMask.wrap(raw.get("mask")),
+            position=LabelMeAdapter._parse_position(raw.get("position")),
+            wz_number=raw.get("wz"),
+            shift_point=shift_point,
+            meta={k: v for k, v in raw.items() if k not in _MODEL_FIELDS}
+        )
+
     @staticmethod
     def _shape_to_raw(shape: Shape) -> JsonLabelmeShape:
         """
@@ -98,12 +211,13 @@ class LabelMeAdapter(BaseAdapter, metaclass=AdapterRegistration):
             """
         return JsonLabelmeShape(
             label=shape.label,
-            points=shape.coords,
+            points=coords_to_list(shape.coords),
             group_id=shape.number,
             description=shape.description,
             shape_type=shape.type.value if hasattr(shape.type, 'value') else str(shape.type),
             flags=shape.flags or {},
-            mask=shape.mask
+            # Маска перекодируется, только если её заменили массивом; нетронутая LazyMask отдаёт исходный текст
+            mask=LazyMask.to_json(shape.mask)
         )
 
     @staticmethod
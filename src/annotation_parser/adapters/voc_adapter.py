@@ -1,14 +1,32 @@
+from __future__ import annotations
+
 __all__ = ['VocAdapter']
 
-from typing import Any, Tuple, Dict
+from pathlib import Path
+from typing import Any, Tuple, Dict, Iterable, Iterator, List, Union, TYPE_CHECKING
+from xml.etree.ElementTree import Element, iterparse
+
+from pydantic import TypeAdapter
 
 from ..shape import Shape
+from ..utils import coords_to_list, stage
 from ..types import ShiftPointType
-from ..public_enums import ShapeType
-from ..models.voc_model import JsonVocObject
+from ..public_enums import PipelineStage, ShapeType, ValidationMode
+from ..models.voc_model import JsonVocObject, VocObjectDict
 from .adapter_registration import AdapterRegistration
 from .base_adapter import BaseAdapter
 
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
+
+
+_LIGHT_OBJECTS = TypeAdapter(List[VocObjectDict])
+_LIGHT_OBJECT = TypeAdapter(VocObjectDict)
+_MODEL_FIELDS = frozenset(JsonVocObject.model_fields)
+# Теги со стандартными числовыми значениями (плюс всё внутри <bndbox>); текст прочих тегов не приводится к числу,
+# чтобы filename «000123» или name «42» не превращались в int
+_NUMERIC_TAGS = frozenset({"width", "height", "depth", "truncated", "difficult", "occluded", "segmented"})
+
 
 class VocAdapter(BaseAdapter, metaclass=AdapterRegistration):
     """
@@ -17,14 +35,22 @@ class VocAdapter(BaseAdapter, metaclass=AdapterRegistration):
     """
 
     adapter_name = "voc"
+    items_key = "objects"
 
     @staticmethod
-    def load(json_data: Any, shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+    def load(json_data: Any,
+             shift_point: ShiftPointType = None,
+             validate: ValidationMode | str = ValidationMode.FULL,
+             numpy_coords: bool = False) -> Tuple[Shape, ...]:
         """
             Преобразует VOC-аннотацию (dict с объектами) в кортеж Shape.
             Args:
                 json_data (dict): Данные VOC (например, {"objects": [...]}).
                 shift_point (ShiftPointType): Опциональное смещение координат.
+                validate (ValidationMode): FULL — pydantic-модель на каждый объект;
+                                           LIGHT — одна проверка всего списка через TypeAdapter;
+                                           NONE — без проверок (доверенные файлы).
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
             Returns:
                 Tuple[Shape, ...]: Кортеж Shape.
             Raises:
@@ -35,27 +61,136 @@ class VocAdapter(BaseAdapter, metaclass=AdapterRegistration):
             raise ValueError("VOC JSON должен содержать ключ 'objects'")
 
         objects = json_data["objects"]
-        result = []
-        for obj in objects:
-            # Если obj — dict, превращаем в модель
-            if not isinstance(obj, JsonVocObject):
-                obj = JsonVocObject.model_validate(obj)
-            result.append(VocAdapter.to_shape(obj, shift_point=shift_point))
-        return tuple(result)
+        validate = ValidationMode(validate)
+        if validate is ValidationMode.LIGHT:
+            with stage(PipelineStage.VALIDATE, shapes=len(objects)):
+                checked = _LIGHT_OBJECTS.validate_python(objects)
+            with stage(PipelineStage.BUILD, shapes=len(objects)):
+                return tuple(VocAdapter._raw_to_shape(raw, item, shift_point, numpy_coords)
+                             for raw, item in zip(objects, checked))
+        if validate is ValidationMode.NONE:
+            with stage(PipelineStage.BUILD, shapes=len(objects)):
+                return tuple(VocAdapter._raw_to_shape(raw, raw, shift_point, numpy_coords) for raw in objects)
+        # Сначала модели всех объектов (dict превращаем в модель), затем Shape: VALIDATE и BUILD раздельно
+        with stage(PipelineStage.VALIDATE, shapes=len(objects)):
+            models = [obj if isinstance(obj, JsonVocObject) else JsonVocObject.model_validate(obj) for obj in objects]
+        with stage(PipelineStage.BUILD, shapes=len(models)):
+            return tuple(VocAdapter.to_shape(obj, shift_point=shift_point, numpy_coords=numpy_coords)
+                         for obj in models)
 
     @staticmethod
-    def to_shape(obj: JsonVocObject, shift_point: ShiftPointType = None) -> Shape:
+    def load_batch(json_data: Any,
+                   shift_point: ShiftPointType = None,
+                   validate: ValidationMode | str = ValidationMode.FULL,
+                   dtype: Any = "float64") -> ShapeBatch:
+        """
+            Преобразует VOC-аннотацию в колоночный ShapeBatch.
+            В режимах LIGHT и NONE объекты пишутся в ShapeBatchBuilder напрямую, без объектов Shape.
+            Args:
+                json_data (dict): Данные VOC.
+                shift_point (ShiftPointType): Опциональное смещение координат.
+                validate (ValidationMode): Строгость проверки (см. load).
+                dtype: Тип координат (np.float64 или np.float32).
+            Returns:
+                ShapeBatch: Фигуры в колоночном представлении.
+            Raises:
+                ValueError: Если структура данных не поддерживается.
+        """
+        from ..shape_batch import ShapeBatch, ShapeBatchBuilder
+        validate = ValidationMode(validate)
+        if validate is ValidationMode.FULL:
+            return ShapeBatch.from_shapes(VocAdapter.load(json_data, shift_point), dtype=dtype)
+        if not isinstance(json_data, dict) or "objects" not in json_data:
+            raise ValueError("VOC JSON должен содержать ключ 'objects'")
+        objects = json_data["objects"]
+        checked = _LIGHT_OBJECTS.validate_python(objects) if validate is ValidationMode.LIGHT else objects
+        builder = ShapeBatchBuilder(dtype=dtype)
+        for raw, item in zip(objects, checked):
+            builder.append(**VocAdapter._raw_fields(raw, item, shift_point))
+        return builder.build()
+
+    @staticmethod
+    def read_xml(file_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+            Читает VOC XML-файл в ту же dict-структуру, что принимает load: {"objects": [...], ...}.
+            Объекты — плоские dict в формате JsonVocObject (name, bndbox_xmin, ..., прочие теги — в дополнительных полях);
+            остальные теги корня (folder, filename, size с width/height/depth, segmented, ...) — ключи верхнего уровня.
+            Args:
+                file_path: Путь к XML-файлу.
+            Returns:
+                dict: VOC-структура.
+            Raises:
+                xml.etree.ElementTree.ParseError: Если файл некорректный XML.
+        """
+        result: Dict[str, Any] = {"objects": []}
+        for tag, value in VocAdapter._iter_xml(file_path):
+            if tag == "object":
+                result["objects"].append(value)
+            else:
+                _add_value(result, tag, value)
+        return result
+
+    @staticmethod
+    def iter_xml(file_path: Union[str, Path],
+                 shift_point: ShiftPointType = None,
+                 validate: ValidationMode | str = ValidationMode.FULL,
+                 numpy_coords: bool = False) -> Iterator[Shape]:
+        """
+            Потоково читает VOC XML-файл (iterparse) и выдаёт Shape по одному <object>.
+            Разобранные элементы сразу освобождаются, в памяти держится только текущий объект.
+            Args:
+                file_path: Путь к XML-файлу.
+                shift_point (ShiftPointType): Смещение.
+                validate (ValidationMode): Строгость проверки каждого объекта (см. load).
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
+            Returns:
+                Iterator[Shape]: Фигуры в порядке следования объектов в файле.
+            Raises:
+                xml.etree.ElementTree.ParseError: Если файл некорректный XML.
+        """
+        validate = ValidationMode(validate)
+        for tag, raw in VocAdapter._iter_xml(file_path):
+            if tag != "object":
+                continue
+            if validate is ValidationMode.FULL:
+                yield VocAdapter.to_shape(JsonVocObject.model_validate(raw), shift_point, numpy_coords)
+            else:
+                item = _LIGHT_OBJECT.validate_python(raw) if validate is ValidationMode.LIGHT else raw
+                yield VocAdapter._raw_to_shape(raw, item, shift_point, numpy_coords)
+
+    @staticmethod
+    def _iter_xml(file_path: Union[str, Path]) -> Iterator[Tuple[str, Any]]:
+        """ Обходит дочерние теги корня <annotation>: (тег, значение); для <object> значение — плоский dict. """
+        depth = 0
+        root = None
+        for event, elem in iterparse(str(file_path), events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            yield elem.tag, (_object_to_raw(elem) if elem.tag == "object" else _element_value(elem))
+            # Разобранный элемент больше не нужен: корень не должен копить дерево всего файла
+            root.clear()
+
+    @staticmethod
+    def to_shape(obj: JsonVocObject, shift_point: ShiftPointType = None, numpy_coords: bool = False) -> Shape:
         """
             Преобразует JsonVocObject в Shape.
             Args:
                 obj (JsonVocObject): Объект VOC.
                 shift_point (ShiftPointType): Смещение.
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
             Returns:
                 Shape: Бизнес-объект.
         """
         return Shape(
             label=obj.name,
-            coords=[[obj.bndbox_xmin, obj.bndbox_ymin], [obj.bndbox_xmax, obj.bndbox_ymax]],
+            coords=BaseAdapter._make_coords(
+                [[obj.bndbox_xmin, obj.bndbox_ymin], [obj.bndbox_xmax, obj.bndbox_ymax]], numpy_coords),
             type=ShapeType.RECTANGLE,
             number=None,
             description=None,
@@ -67,22 +202,62 @@ class VocAdapter(BaseAdapter, metaclass=AdapterRegistration):
             meta=getattr(obj, "model_extra", {})
         )
 
+    @staticmethod
+    def _raw_to_shape(raw: dict, item: dict, shift_point: ShiftPointType = None, numpy_coords: bool = False) -> Shape:
+        """ Строит Shape из сырого dict объекта VOC без pydantic-модели (режимы LIGHT и NONE), как to_shape. """
+        return Shape.construct(**VocAdapter._raw_fields(raw, item, shift_point, numpy_coords))
+
+    @staticmethod
+    def _raw_fields(raw: dict,
+                    item: dict,
+                    shift_point: ShiftPointType = None,
+                    numpy_coords: bool = False) -> Dict[str, Any]:
+        """
+            Поля Shape из сырого dict объекта VOC (аргументы Shape.construct / ShapeBatchBuilder.append).
+            Args:
+                raw: Словарь объекта (источник meta).
+                item: Проверенные значения схемы VocObjectDict (LIGHT) или тот же raw (NONE).
+                shift_point (ShiftPointType): Смещение.
+                numpy_coords (bool): True — coords как неизменяемые массивы (N, 2) float64.
+        """
+        return dict(
+            label=item["name"],
+            coords=BaseAdapter._make_coords(
+                [[item["bndbox_xmin"], item["bndbox_ymin"]], [item["bndbox_xmax"], item["bndbox_ymax"]]], numpy_coords),
+            type=ShapeType.RECTANGLE,
+            shift_point=shift_point,
+            meta={k: v for k, v in raw.items() if k not in _MODEL_FIELDS}
+        )
+
     @staticmethod
     def shapes_to_json(original_json: Any, shapes: Tuple[Shape, ...]) -> Dict:
         """
             Сериализует кортеж Shape обратно в VOC-структуру.
+            Оригинал не копируется и не изменяется: новый dict ссылается на его поля.
             Args:
                 original_json: Оригинальный json для поддержки дополнительных полей.
                 shapes: Кортеж Shape для сохранения.
             Returns:
                 dict: VOC-JSON c обновлённым objects.
         """
-        # Глубокое копирование оригинала, если он был
-        import copy
-        json_out = copy.deepcopy(original_json) if original_json else {}
-        json_out["objects"] = [VocAdapter.shape_to_raw(shape).model_dump() for shape in shapes]
+        json_out, objects = VocAdapter.iter_json(original_json, shapes)
+        json_out["objects"] = list(objects)
         return json_out
 
+    @staticmethod
+    def iter_json(original_json: Any, shapes: Iterable[Shape]) -> Tuple[Dict, Iterator[Dict]]:
+        """
+            Заголовок VOC-структуры (все поля оригинала, без копирования) и объекты, сериализуемые по одному.
+            Args:
+                original_json: Оригинальный json или его заголовок.
+                shapes: Фигуры (любой итерируемый объект, в том числе генератор).
+            Returns:
+                Tuple[dict, Iterator[dict]]: Заголовок и элементы "objects".
+        """
+        header = dict(original_json) if original_json else {}
+        header["objects"] = []
+        return header, (VocAdapter.shape_to_raw(shape).model_dump() for shape in shapes)
+
     @staticmethod
     def shape_to_raw(shape: Shape) -> JsonVocObject:
         """
@@ -92,10 +267,11 @@ class VocAdapter(BaseAdapter, metaclass=AdapterRegistration):
             Returns:
                 JsonVocObject: Модель VOC.
         """
-        if not (isinstance(shape.coords, (list, tuple)) and len(shape.coords) == 4):
+        coords = coords_to_list(shape.coords)
+        if not (isinstance(coords, (list, tuple)) and len(coords) == 4):
             raise ValueError("Некорректные координаты для VOC: должны быть 2 или 4 точки")
-        xmin, ymin = shape.coords[0]
-        xmax, ymax = shape.coords[2]
+        xmin, ymin = coords[0]
+        xmax, ymax = coords[2]
         return JsonVocObject(
             name=shape.label,
             bndbox_xmin=float(xmin),
@@ -103,3 +279,55 @@ class VocAdapter(BaseAdapter, metaclass=AdapterRegistration):
             bndbox_xmax=float(xmax),
             bndbox_ymax=float(ymax)
         )
+
+
+def _object_to_raw(elem: Element) -> Dict[str, Any]:
+    """ <object> в плоский dict формата JsonVocObject: <bndbox> раскрывается в bndbox_xmin, ..., прочие теги — как есть. """
+    raw: Dict[str, Any] = {}
+    for child in elem:
+        if child.tag == "bndbox":
+            for coord in child:
+                raw[f"bndbox_{coord.tag}"] = _scalar(coord.text)
+        elif child.tag == "name":
+            raw["name"] = (child.text or "").strip()
+        else:
+            _add_value(raw, child.tag, _element_value(child))
+    return raw
+
+
+def _element_value(elem: Element, numeric: bool = False) -> Any:
+    """
+        Значение XML-элемента: текст или dict дочерних тегов. К int/float приводится только текст числовых тегов
+        (_NUMERIC_TAGS, координаты <bndbox>) и numeric=True; остальное — строка без пробелов по краям.
+    """
+    if len(elem) == 0:
+        if numeric or elem.tag in _NUMERIC_TAGS:
+            return _scalar(elem.text)
+        return elem.text.strip() if elem.text is not None else None
+    value: Dict[str, Any] = {}
+    for child in elem:
+        _add_value(value, child.tag, _element_value(child, elem.tag == "bndbox"))
+    return value
+
+
+def _add_value(target: Dict[str, Any], tag: str, value: Any) -> None:
+    """ Повторяющиеся теги (несколько <part>, <object> вне корня и т. п.) собираются в список. """
+    if tag not in target:
+        target[tag] = value
+    elif isinstance(target[tag], list):
+        target[tag].append(value)
+    else:
+        target[tag] = [target[tag], value]
+
+
+def _scalar(text: Any) -> Any:
+    """ Текст числового тега: int, float или (если не число) строка без пробелов по краям. """
+    if text is None:
+        return None
+    text = text.strip()
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
@@ -1,4 +1,12 @@
-from .shapes_api import *
-from .parser_api import *
-from .saver_api import *
-from .api import *
+from ..utils.lazy_import import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.shapes_api': ('set_shift_point', 'get_shapes_by_label', 'get_shapes_by_number', 'get_shapes_by_wz_number',
+                    'filter_shapes', 'resolve_shift_points', 'shifted_coords_many', 'apply_shift_points',
+                    'decode_masks'),
+    '.parser_api': ('parse', 'parse_labelme', 'parse_coco', 'parse_voc', 'parse_many', 'iter_parse_coco', 'parse_batch',
+                    'aparse', 'aparse_many', 'iter_parse_voc', 'parse_voc_dir'),
+    '.saver_api': ('save', 'save_labelme', 'save_coco', 'save_voc', 'asave', 'save_stream'),
+    '.convert_api': ('convert', 'convert_many'),
+    '.api': ('available_adapters', 'create', 'set_json_backend'),
+})
@@ -5,23 +5,27 @@
     This module provides entry points for:
         - Listing all available annotation adapters (including user extensions).
         - Creating an annotation parser (AnnotationFile) for a specific file and markup type.
+        - Selecting the JSON library used for reading and writing files.
 
     Typical usage:
         adapters = available_adapters()
         parser = create('annotations.json', 'labelme')
         shapes = parser.parse()
+        set_json_backend('json')  # force stdlib json
 """
 
 
-__all__ = ['available_adapters', 'create']
+__all__ = ['available_adapters', 'create', 'set_json_backend']
 
 from pathlib import Path
 from typing import Union
 
 from ..core.annotation_file import AnnotationFile
+from ..core.parse_cache import ParseCache
 from ..adapters import AdapterFactory
-from ..public_enums import Adapters
+from ..public_enums import Adapters, JsonBackend, ValidationMode
 from ..types import ShiftPointType
+from ..utils import JsonCodec
 
 
 def available_adapters() -> list[str]:
@@ -35,14 +39,34 @@ def available_adapters() -> list[str]:
 def create(
         file_path: Union[str, Path],
         markup_type: str | Adapters,
-        shift_point: ShiftPointType = None) -> AnnotationFile:
+        shift_point: ShiftPointType = None,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        numpy_coords: bool = False,
+        cache: ParseCache | bool | None = None) -> AnnotationFile:
     """
         Create an annotation parser object for the given file and markup type.
         Args:
             file_path: Path to the annotation file.
             markup_type: Markup type as a string ('labelme', 'coco', 'voc') or Adapters enum.
             shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
         Returns:
             AnnotationFile: Parser instance ready to parse shapes.
     """
-    return AnnotationFile(file_path, markup_type, keep_json=True, shift_point=shift_point)
+    return AnnotationFile(file_path, markup_type, keep_json=True, shift_point=shift_point, validate=validate,
+                          numpy_coords=numpy_coords, cache=cache)
+
+
+def set_json_backend(backend: str | JsonBackend | None = None) -> JsonBackend:
+    """
+        Select the JSON library used to read and write annotation files.
+        Args:
+            backend: 'orjson', 'ujson', 'json' or JsonBackend. None — the fastest installed one (default).
+        Returns:
+            JsonBackend: The selected backend.
+        Raises:
+            ValueError: If the backend is unknown or not installed.
+    """
+    return JsonCodec.set_backend(backend)
@@ -0,0 +1,147 @@
+"""
+    Annotation Conversion API
+    =========================
+
+    Convert annotation files between formats: one file, or a whole dataset over a process pool.
+
+    Features:
+        - Any registered source adapter to any target adapter (LabelMe, COCO, VOC, plugins).
+        - Directory, glob or list input; the input tree is mirrored under the output directory.
+        - Outputs newer than their inputs are skipped (make-style), so an interrupted run resumes cheaply.
+        - Per-file errors do not stop the run: they come back in ConvertResult.error.
+
+    Usage examples:
+        convert('a.json', 'a_voc.json', 'labelme', 'voc')
+        for result in convert_many('labelme/', 'voc_out/', 'labelme', 'voc', workers=8):
+            if not result.ok:
+                print(result.source, result.error)
+"""
+
+__all__ = ['convert', 'convert_many']
+
+import os
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..adapters.adapter_factory import AdapterFactory
+from ..core.annotation_batch import AnnotationBatch, ConvertResult
+from ..core.annotation_file import AnnotationFile
+from ..core.annotation_saver import AnnotationSaver
+from ..public_enums import Adapters, ValidationMode
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def convert(
+        source: Union[str, Path],
+        target: Union[str, Path],
+        source_type: str | Adapters,
+        target_type: str | Adapters,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        pretty: bool = True) -> int:
+    """
+        Convert one annotation file to another format.
+        The target is written atomically (temporary file + rename); missing parent directories are created.
+        Args:
+            source: Input annotation file.
+            target: Output file.
+            source_type: Markup type of the input.
+            target_type: Markup type of the output.
+            validate: Validation level for parsing the input ('full', 'light', 'none').
+            pretty: If True, writes indented JSON (default), otherwise compact JSON.
+        Returns:
+            int: Number of shapes written.
+        Raises:
+            ValueError: If an adapter is unknown or the shapes cannot be represented in the target format.
+    """
+    shapes = AnnotationFile(source, source_type, keep_json=True, validate=validate).parse()
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    AnnotationSaver.save(shapes, AdapterFactory.get_adapter(target_type), target, json_data=None, pretty=pretty)
+    return len(shapes)
+
+
+def convert_many(
+        inputs: Union[str, Path, Iterable[Union[str, Path]]],
+        output_dir: Union[str, Path],
+        source_type: str | Adapters,
+        target_type: str | Adapters,
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        pattern: str = "**/*.json",
+        skip_up_to_date: bool = True,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        pretty: bool = True) -> Iterator[ConvertResult]:
+    """
+        Convert many annotation files over a process pool, yielding results as they complete.
+        Each input is written to output_dir under its path relative to the input directory (or the fixed
+        prefix of the glob), with a .json suffix.
+        Args:
+            inputs: Directory, glob pattern ('data/**/*.json'), single file or iterable of paths.
+            output_dir: Root directory for the converted files.
+            source_type: Markup type of the inputs.
+            target_type: Markup type of the outputs.
+            workers: Number of processes. None — CPU count; 0 or 1 — in the current process.
+            chunksize: Files handed to a worker at a time. None — chosen automatically.
+            pattern: File name pattern for directory input (default: all .json files, recursively).
+            skip_up_to_date: If True (default), an output newer than its input is not rewritten.
+            validate: Validation level for parsing the inputs.
+            pretty: If True, writes indented JSON (default), otherwise compact JSON.
+        Returns:
+            Iterator[ConvertResult]: One result per input file; skipped files first, then in completion order.
+    """
+    # Адаптеры проверяются сразу, а не ошибкой в каждом файле
+    AdapterFactory.get_adapter(source_type)
+    AdapterFactory.get_adapter(target_type)
+    paths = AnnotationBatch.resolve_paths(inputs, pattern=pattern)
+    base = _input_base(inputs, paths)
+    tasks: List[Tuple[str, str]] = []
+    for path in paths:
+        target = str((Path(output_dir) / Path(os.path.relpath(path, base))).with_suffix(".json"))
+        if skip_up_to_date and _up_to_date(path, target):
+            yield ConvertResult(source=path, target=target, skipped=True)
+        else:
+            tasks.append((path, target))
+    worker = partial(_convert_task, source_type=source_type, target_type=target_type,
+                     validate=ValidationMode(validate), pretty=pretty)
+    yield from AnnotationBatch.run(worker, tasks, workers=workers, chunksize=chunksize, ordered=False,
+                                   on_error=ConvertResult.from_exception)
+
+
+def _convert_task(task: Tuple[str, str],
+                  source_type: str | Adapters,
+                  target_type: str | Adapters,
+                  validate: ValidationMode,
+                  pretty: bool) -> ConvertResult:
+    """ Точка входа воркера: ошибка в файле возвращается в результате и не прерывает пакет. """
+    source, target = task
+    try:
+        shapes = convert(source, target, source_type, target_type, validate=validate, pretty=pretty)
+    except Exception as e:
+        return ConvertResult.from_exception(task, e)
+    return ConvertResult(source=source, target=target, shapes=shapes)
+
+
+def _input_base(inputs: Union[str, Path, Iterable[Union[str, Path]]], paths: List[str]) -> str:
+    """ Каталог, относительно которого входные файлы раскладываются в output_dir. """
+    if isinstance(inputs, (str, Path)):
+        path = Path(inputs)
+        if path.is_dir():
+            return str(path)
+        text = str(inputs)
+        if _GLOB_CHARS.intersection(text):
+            # Неизменяемая часть шаблона: data/**/*.json -> data
+            prefix = text[:min(text.index(c) for c in _GLOB_CHARS if c in text)]
+            return os.path.dirname(prefix) or "."
+        return str(path.parent)
+    if not paths:
+        return "."
+    return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+
+
+def _up_to_date(source: str, target: str) -> bool:
+    try:
+        return os.stat(target).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except OSError:
+        return False
@@ -9,71 +9,372 @@
         - Parse annotation files by format or path.
         - Format-specific one-line parsing (LabelMe, COCO, VOC).
         - Optional shift_point for coordinate normalization.
+        - Bulk parsing of whole directories over a process pool.
+        - Streaming (generator) COCO parsing with bounded memory.
+        - Native Pascal VOC XML reading, streamed or a whole Annotations/ folder in parallel.
+        - Validation levels ('full', 'light', 'none') for trusted files.
+        - Columnar ShapeBatch output for large annotation sets.
+        - Optional numpy (N, 2) coordinate arrays instead of nested lists.
+        - Persistent on-disk parse cache keyed by file fingerprint.
+        - asyncio coroutines (aparse, aparse_many) with bounded concurrency.
 
     Example usage:
         shapes = parse('file.json', 'labelme')
         shapes = parse_labelme('file.json')
         shapes = parse_coco('file.json')
+        shapes = parse('trusted.json', 'labelme', validate='none')
+        batch = parse_batch('file.json', 'labelme')
+        shapes = parse('big_polygons.json', 'labelme', numpy_coords=True)
+        shapes = parse('file.json', 'labelme', cache=True)
+        for shape in iter_parse_coco('instances_train.json'):
+            ...
+        shapes = parse_voc('VOC2012/Annotations/2007_000027.xml')
+        for result in parse_voc_dir('VOC2012/Annotations', workers=8):
+            ...
+        for result in parse_many('annotations/', 'labelme', workers=8):
+            ...
+        shapes = await aparse('file.json', 'labelme')
+        async for result in aparse_many('annotations/', 'labelme', concurrency=8, timeout=30):
+            ...
 """
 
-__all__ = ['parse', 'parse_labelme', 'parse_coco', 'parse_voc']
+from __future__ import annotations
 
+__all__ = ['parse', 'parse_labelme', 'parse_coco', 'parse_voc', 'parse_many', 'iter_parse_coco', 'parse_batch',
+           'aparse', 'aparse_many', 'iter_parse_voc', 'parse_voc_dir']
+
+from collections import deque
+from functools import partial
 from pathlib import Path
-from typing import Union, Tuple
+from typing import Any, AsyncIterator, Deque, Union, Tuple, Iterable, Iterator, Optional, TYPE_CHECKING
 
+from ..core.annotation_batch import AnnotationBatch, ParseResult
 from ..core.annotation_file import AnnotationFile
-from ..public_enums import Adapters
+from ..core.parse_cache import ParseCache
+from ..public_enums import Adapters, ValidationMode
 from ..shape import Shape
 from ..types import ShiftPointType
 
+# asyncio, numpy и адаптеры COCO/VOC импортируются там, где нужны: parse_labelme не должен их загружать
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor
+    from ..shape_batch import ShapeBatch
+
 
 def parse(
         file_path: Union[str, Path],
         markup_type: str | Adapters,
-        shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+        shift_point: ShiftPointType = None,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        numpy_coords: bool = False,
+        cache: ParseCache | bool | None = None) -> Tuple[Shape, ...]:
     """
         Parse the annotation file and return a tuple of Shape objects.
         Args:
             file_path: Path to the annotation file.
             markup_type: Markup type as a string ('labelme', 'coco', 'voc') or Adapters enum.
             shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
         Returns:
             Tuple[Shape, ...]: Tuple of parsed and normalized shapes.
     """
-    return AnnotationFile(file_path, markup_type, keep_json=True, shift_point=shift_point).parse()
+    return AnnotationFile(file_path, markup_type, keep_json=True, shift_point=shift_point, validate=validate,
+                          numpy_coords=numpy_coords, cache=cache).parse()
+
+
+def parse_batch(
+        file_path: Union[str, Path],
+        markup_type: str | Adapters,
+        shift_point: ShiftPointType = None,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        dtype: Any = "float64",
+        cache: ParseCache | bool | None = None) -> ShapeBatch:
+    """
+        Parse the annotation file into a columnar ShapeBatch (flat coordinate buffer, coded labels).
+        Args:
+            file_path: Path to the annotation file.
+            markup_type: Markup type as a string ('labelme', 'coco', 'voc') or Adapters enum.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            dtype: Coordinate dtype, np.float64 (lossless) or np.float32 (half the memory).
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
+        Returns:
+            ShapeBatch: Shapes in struct-of-arrays form; batch.to_shapes() gives a tuple of Shape.
+    """
+    return AnnotationFile(file_path, markup_type, keep_json=True, shift_point=shift_point,
+                          validate=validate, cache=cache).parse_batch(dtype=dtype)
 
 
-def parse_labelme(file_path: Union[str, Path], shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+def parse_labelme(file_path: Union[str, Path],
+                 shift_point: ShiftPointType = None,
+                 validate: ValidationMode | str = ValidationMode.FULL,
+                 numpy_coords: bool = False) -> Tuple[Shape, ...]:
     """
         Parse a LabelMe annotation file and return a tuple of Shape objects.
         Args:
             file_path: Path to the LabelMe annotation file.
             shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
         Returns:
             Tuple[Shape, ...]: Tuple of parsed and normalized shapes.
     """
-    return parse(file_path, Adapters.labelme, shift_point=shift_point)
+    return parse(file_path, Adapters.labelme, shift_point=shift_point, validate=validate,
+                 numpy_coords=numpy_coords)
 
 
-def parse_coco(file_path: Union[str, Path], shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+def parse_coco(file_path: Union[str, Path],
+              shift_point: ShiftPointType = None,
+              validate: ValidationMode | str = ValidationMode.FULL,
+              numpy_coords: bool = False) -> Tuple[Shape, ...]:
     """
         Parse a COCO annotation file and return a tuple of Shape objects.
         Args:
             file_path: Path to the COCO annotation file.
             shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
         Returns:
             Tuple[Shape, ...]: Tuple of parsed and normalized shapes.
     """
-    return parse(file_path, Adapters.coco, shift_point=shift_point)
+    return parse(file_path, Adapters.coco, shift_point=shift_point, validate=validate,
+                 numpy_coords=numpy_coords)
 
 
-def parse_voc(file_path: Union[str, Path], shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+def iter_parse_coco(file_path: Union[str, Path],
+                    shift_point: ShiftPointType = None,
+                    validate: ValidationMode | str = ValidationMode.FULL) -> Iterator[Shape]:
     """
-        Parse a VOC annotation file and return a tuple of Shape objects.
+        Stream a COCO annotation file, yielding Shape objects one annotation at a time.
+        The whole JSON document is never materialised, so memory stays bounded for multi-GB files.
+        Args:
+            file_path: Path to the COCO annotation file.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+        Returns:
+            Iterator[Shape]: Shapes in annotation order.
+    """
+    from ..adapters.coco_adapter import CocoAdapter
+    return CocoAdapter.iter_load(file_path, shift_point=shift_point, validate=validate)
+
+
+def parse_voc(file_path: Union[str, Path],
+             shift_point: ShiftPointType = None,
+             validate: ValidationMode | str = ValidationMode.FULL,
+             numpy_coords: bool = False) -> Tuple[Shape, ...]:
+    """
+        Parse a VOC annotation file (.xml or the JSON form) and return a tuple of Shape objects.
         Args:
             file_path: Path to the VOC annotation file.
             shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
         Returns:
             Tuple[Shape, ...]: Tuple of parsed and normalized shapes.
     """
-    return parse(file_path, Adapters.voc, shift_point=shift_point)
+    return parse(file_path, Adapters.voc, shift_point=shift_point, validate=validate,
+                 numpy_coords=numpy_coords)
+
+
+def iter_parse_voc(file_path: Union[str, Path],
+                   shift_point: ShiftPointType = None,
+                   validate: ValidationMode | str = ValidationMode.FULL,
+                   numpy_coords: bool = False) -> Iterator[Shape]:
+    """
+        Stream a Pascal VOC XML file, yielding Shape objects one <object> at a time.
+        Args:
+            file_path: Path to the VOC .xml file.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+        Returns:
+            Iterator[Shape]: Shapes in object order.
+    """
+    from ..adapters.voc_adapter import VocAdapter
+    return VocAdapter.iter_xml(file_path, shift_point=shift_point, validate=validate, numpy_coords=numpy_coords)
+
+
+def parse_voc_dir(
+        directory: Union[str, Path],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        ordered: bool = True,
+        shift_point: ShiftPointType = None,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        numpy_coords: bool = False,
+        cache: ParseCache | bool | None = None) -> Iterator[ParseResult]:
+    """
+        Parse every *.xml file of a VOC Annotations/ folder over a process pool (see parse_many).
+        Args:
+            directory: Folder with VOC .xml files.
+            workers: Number of worker processes. None — one per CPU; 0 or 1 — parse in the current process.
+            chunksize: Files handed to a worker at a time. None — chosen automatically.
+            ordered: True — results in file name order, False — in completion order.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
+        Returns:
+            Iterator[ParseResult]: One result per file.
+    """
+    return parse_many(directory, Adapters.voc, workers=workers, chunksize=chunksize, ordered=ordered,
+                      shift_point=shift_point, pattern="*.xml", validate=validate, numpy_coords=numpy_coords,
+                      cache=cache)
+
+
+def parse_many(
+        paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+        markup_type: str | Adapters,
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        ordered: bool = True,
+        shift_point: ShiftPointType = None,
+        pattern: str = "*.json",
+        validate: ValidationMode | str = ValidationMode.FULL,
+        numpy_coords: bool = False,
+        cache: ParseCache | bool | None = None) -> Iterator[ParseResult]:
+    """
+        Parse many annotation files over a process pool, streaming results back.
+        A failure in one file does not abort the batch: it is reported in ParseResult.error.
+        Args:
+            paths_or_glob: Directory (files matching pattern), glob pattern, single path or iterable of paths.
+            markup_type: Markup type as a string ('labelme', 'coco', 'voc') or Adapters enum.
+            workers: Number of worker processes. None — one per CPU; 0 or 1 — parse in the current process.
+            chunksize: Files handed to a worker at a time. None — chosen automatically.
+            ordered: True — results in input order, False — in completion order.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            pattern: File name pattern used in directory mode.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
+        Returns:
+            Iterator[ParseResult]: One result per file.
+    """
+    return AnnotationFile.parse_many(paths_or_glob, markup_type, workers=workers, chunksize=chunksize,
+                                     ordered=ordered, shift_point=shift_point, pattern=pattern, validate=validate,
+                                     numpy_coords=numpy_coords, cache=cache)
+
+
+async def aparse(
+        file_path: Union[str, Path],
+        markup_type: str | Adapters,
+        shift_point: ShiftPointType = None,
+        validate: ValidationMode | str = ValidationMode.FULL,
+        numpy_coords: bool = False,
+        cache: ParseCache | bool | None = None,
+        executor: Optional[Executor] = None,
+        semaphore: Optional[asyncio.Semaphore] = None) -> Tuple[Shape, ...]:
+    """
+        Coroutine version of parse(): file reading and decoding run in an executor, the event loop is not blocked.
+        Cancelling the awaiting task raises CancelledError at once; a read already running in a worker
+        finishes in the background and its result is discarded.
+        Args:
+            file_path: Path to the annotation file.
+            markup_type: Markup type as a string ('labelme', 'coco', 'voc') or Adapters enum.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
+            executor: Executor for the blocking work. None — the loop's default thread pool;
+                a ProcessPoolExecutor also takes the decoding off the GIL.
+            semaphore: Optional semaphore shared between calls to bound concurrent parses service-wide.
+        Returns:
+            Tuple[Shape, ...]: Tuple of parsed and normalized shapes.
+    """
+    import asyncio
+    import contextvars
+    from concurrent.futures import ProcessPoolExecutor
+    call = partial(parse, file_path, markup_type, shift_point=shift_point, validate=validate,
+                   numpy_coords=numpy_coords, cache=cache)
+    if not isinstance(executor, ProcessPoolExecutor):
+        # run_in_executor не переносит ContextVar в поток: без копии контекста instrument() не видит этапы
+        call = partial(contextvars.copy_context().run, call)
+    if semaphore is None:
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+    async with semaphore:
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+async def aparse_many(
+        paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+        markup_type: str | Adapters,
+        concurrency: int = 8,
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+        shift_point: ShiftPointType = None,
+        pattern: str = "*.json",
+        validate: ValidationMode | str = ValidationMode.FULL,
+        numpy_coords: bool = False,
+        cache: ParseCache | bool | None = None,
+        executor: Optional[Executor] = None) -> AsyncIterator[ParseResult]:
+    """
+        Coroutine version of parse_many(): parse many files with at most `concurrency` in flight,
+        yielding results as an async iterator. A failure or timeout in one file is reported in
+        ParseResult.error and does not abort the batch. Leaving the loop early (break, cancellation)
+        cancels the files still in flight.
+        Args:
+            paths_or_glob: Directory (files matching pattern), glob pattern, single path or iterable of paths.
+            markup_type: Markup type as a string ('labelme', 'coco', 'voc') or Adapters enum.
+            concurrency: Maximum number of files parsed at the same time.
+            ordered: True — results in input order, False — in completion order.
+            timeout: Per-file time limit in seconds; a slow file becomes a TimeoutError result. None — no limit.
+            shift_point: Optional function or coordinates for shifting points during parsing.
+            pattern: File name pattern used in directory mode.
+            validate: Validation level: 'full' (default), 'light' or 'none' for trusted files.
+            numpy_coords: Store coords as read-only (N, 2) float64 numpy arrays instead of lists.
+            cache: Persistent on-disk parse cache: a ParseCache, True for the default one, None to disable.
+            executor: Executor for the blocking work (see aparse).
+        Returns:
+            AsyncIterator[ParseResult]: One result per file.
+        Raises:
+            ValueError: If concurrency is less than 1.
+    """
+    import asyncio
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    loop = asyncio.get_running_loop()
+    paths = await loop.run_in_executor(executor, AnnotationBatch.resolve_paths, paths_or_glob, pattern)
+    pending = iter(paths)
+    in_flight: Deque[asyncio.Task] = deque()
+
+    def submit() -> None:
+        for path in pending:
+            call = partial(aparse, path, markup_type, shift_point=shift_point, validate=validate,
+                           numpy_coords=numpy_coords, cache=cache, executor=executor)
+            in_flight.append(asyncio.ensure_future(_parse_result(path, call, timeout)))
+            return
+
+    try:
+        for _ in range(concurrency):
+            submit()
+        while in_flight:
+            if ordered:
+                await asyncio.wait([in_flight[0]])
+                done = [in_flight.popleft()]
+            else:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.remove(task)
+            for task in done:
+                submit()
+                yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+async def _parse_result(file_path: Union[str, Path], call: Any, timeout: Optional[float]) -> ParseResult:
+    """ Awaits one parse, turning errors (but not cancellation) into ParseResult, like parse_many. """
+    import asyncio
+    try:
+        shapes = await asyncio.wait_for(call(), timeout)
+    except asyncio.TimeoutError:
+        return ParseResult.from_exception(file_path, TimeoutError(f"parsing took longer than {timeout} s"))
+    except Exception as exc:
+        return ParseResult.from_exception(file_path, exc)
+    return ParseResult(file_path=str(file_path), shapes=shapes)
@@ -8,29 +8,45 @@
     Features:
         - Stateless saving interface (works without manual creation of AnnotationFile object).
         - Format-specific save functions (save_labelme, save_coco, save_voc).
-        - Optional file backup on overwrite.
+        - Optional file backup on overwrite (copy, rename, hardlink, reflink or deduplicated, with retention).
+        - Pretty-printed (default) or compact JSON output.
+        - asyncio coroutine (asave) that keeps the event loop free.
+        - Streaming save (save_stream) with bounded memory for very large files.
 
     Usage examples:
         save(shapes, 'file.json', 'labelme')
         save_labelme(shapes, 'labelme.json')
         save_coco(shapes, 'coco.json')
+        await asave(shapes, 'file.json', 'labelme')
+        save_stream((fix(s) for s in iter_parse_coco('big.json')), 'big_fixed.json', 'coco', header=header)
 """
 
-__all__ = ['save', 'save_labelme', 'save_coco', 'save_voc']
+from __future__ import annotations
 
+__all__ = ['save', 'save_labelme', 'save_coco', 'save_voc', 'asave', 'save_stream']
+
+from functools import partial
 from pathlib import Path
-from typing import Union, Tuple
+from typing import Any, Dict, Iterable, Optional, Union, Tuple, TYPE_CHECKING
 
 from ..core.annotation_file import AnnotationFile
+from ..core.annotation_saver import AnnotationSaver
+from ..core.backup import BackupPolicy
+from ..adapters.adapter_factory import AdapterFactory
 from ..public_enums import Adapters
 from ..shape import Shape
 
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor
+
 
 def save(
         shapes: Tuple[Shape, ...],
         file_path: Union[str, Path],
         markup_type: str | Adapters,
-        backup: bool = True) -> None:
+        backup: Union[bool, BackupPolicy] = True,
+        pretty: bool = True) -> None:
     """
         Save a tuple of Shape objects to an annotation file using the specified format.
         Stateless: for use when you don't have a saved AnnotationFile object.
@@ -38,7 +54,9 @@ def save(
             shapes: Tuple of Shape objects to save.
             file_path: Path to save the annotation file.
             markup_type: Markup type as a string or Adapters enum.
-            backup: If True, creates a backup before overwrite (default: True).
+            backup: If True, creates a backup copy before overwrite (default: True);
+                a BackupPolicy selects the strategy (rename, hardlink, reflink, dedup) and retention.
+            pretty: If True, writes indented JSON (default), otherwise compact JSON.
         Raises:
             ValueError: If neither file_path nor markup_type are provided or cannot be resolved.
     """
@@ -46,19 +64,92 @@ def save(
         raise ValueError("file_path must be provided for stateless save().")
     if not markup_type:
         raise ValueError("markup_type must be provided for stateless save().")
-    AnnotationFile(file_path, markup_type, keep_json=True, validate_file=False).save(shapes, backup=backup)
+    AnnotationFile(file_path, markup_type, keep_json=True, validate_file=False).save(shapes, backup=backup,
+                                                                                      pretty=pretty)
 
 
-def save_labelme(shapes: Tuple[Shape, ...], file_path: Union[str, Path], backup: bool = False) -> None:
+def save_stream(
+        shapes: Iterable[Shape],
+        file_path: Union[str, Path],
+        markup_type: str | Adapters,
+        header: Optional[Dict[str, Any]] = None,
+        backup: Union[bool, BackupPolicy] = False,
+        pretty: bool = True) -> int:
+    """
+        Save shapes incrementally: the header fields are written first, then each shape is serialised
+        as it is drawn from `shapes` (which may be a generator), so memory stays bounded.
+        The output is byte-identical to save() and replaces the file atomically when complete.
+        Args:
+            shapes: Iterable of Shape objects to save.
+            file_path: Path to save the annotation file.
+            markup_type: Markup type as a string or Adapters enum.
+            header: Document fields other than the shape list (e.g. COCO images/categories).
+                None — taken from the existing file, read without decoding its shape list.
+            backup: If True, creates a backup copy before overwrite (default: False);
+                a BackupPolicy selects the strategy (rename, hardlink, reflink, dedup) and retention.
+            pretty: If True, writes indented JSON (default), otherwise compact JSON.
+        Returns:
+            int: Number of shapes written.
+        Raises:
+            NotImplementedError: If the format does not support streaming save.
+    """
+    if header is None:
+        return AnnotationFile(file_path, markup_type, validate_file=False).save_stream(shapes, backup=backup,
+                                                                                      pretty=pretty)
+    return AnnotationSaver.save_stream(shapes, AdapterFactory.get_adapter(markup_type), file_path, json_data=header,
+                                       backup=backup, pretty=pretty)
+
+
+def save_labelme(shapes: Tuple[Shape, ...], file_path: Union[str, Path], backup: Union[bool, BackupPolicy] = False,
+                 pretty: bool = True) -> None:
     """Save shapes in LabelMe format."""
-    save(shapes, file_path, Adapters.labelme, backup)
+    save(shapes, file_path, Adapters.labelme, backup, pretty)
 
 
-def save_coco(shapes: Tuple[Shape, ...], file_path: Union[str, Path], backup: bool = False) -> None:
+def save_coco(shapes: Tuple[Shape, ...], file_path: Union[str, Path], backup: Union[bool, BackupPolicy] = False,
+              pretty: bool = True) -> None:
     """Save shapes in COCO format."""
-    save(shapes, file_path, Adapters.coco, backup)
+    save(shapes, file_path, Adapters.coco, backup, pretty)
 
 
-def save_voc(shapes: Tuple[Shape, ...], file_path: Union[str, Path], backup: bool = False) -> None:
+def save_voc(shapes: Tuple[Shape, ...], file_path: Union[str, Path], backup: Union[bool, BackupPolicy] = False,
+             pretty: bool = True) -> None:
     """Save shapes in VOC format."""
-    save(shapes, file_path, Adapters.voc, backup)
+    save(shapes, file_path, Adapters.voc, backup, pretty)
+
+
+async def asave(
+        shapes: Tuple[Shape, ...],
+        file_path: Union[str, Path],
+        markup_type: str | Adapters,
+        backup: Union[bool, BackupPolicy] = True,
+        pretty: bool = True,
+        executor: Optional[Executor] = None,
+        semaphore: Optional[asyncio.Semaphore] = None) -> None:
+    """
+        Coroutine version of save(): serialisation and writing run in an executor, the event loop is not blocked.
+        Cancelling the awaiting task raises CancelledError at once; a write already running in a worker
+        is not interrupted and completes in the background.
+        Args:
+            shapes: Tuple of Shape objects to save.
+            file_path: Path to save the annotation file.
+            markup_type: Markup type as a string or Adapters enum.
+            backup: If True, creates a backup copy before overwrite (default: True);
+                a BackupPolicy selects the strategy (rename, hardlink, reflink, dedup) and retention.
+            pretty: If True, writes indented JSON (default), otherwise compact JSON.
+            executor: Executor for the blocking work. None — the loop's default thread pool.
+            semaphore: Optional semaphore shared between calls to bound concurrent saves service-wide.
+        Raises:
+            ValueError: If neither file_path nor markup_type are provided or cannot be resolved.
+    """
+    import asyncio
+    import contextvars
+    from concurrent.futures import ProcessPoolExecutor
+    call = partial(save, shapes, file_path, markup_type, backup=backup, pretty=pretty)
+    if not isinstance(executor, ProcessPoolExecutor):
+        # run_in_executor не переносит ContextVar в поток: без копии контекста instrument() не видит этапы
+        call = partial(contextvars.copy_context().run, call)
+    if semaphore is None:
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+    async with semaphore:
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
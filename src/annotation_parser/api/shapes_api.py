@@ -5,14 +5,24 @@
     Functions for advanced operations on Shape objects.
 
     This module provides utilities to:
-        - Filter shapes by label, number, or working zone number (wz_number)
+        - Filter shapes by label, number, or working zone number (wz_number); pass a ShapeIndex instead of
+          the tuple to answer repeated filters from precomputed buckets
+        - Filter with declarative conditions (F.label.isin(...) & F.area.between(...)) evaluated as numpy masks
         - Set (batch) shift_point for multiple shapes, with flexible filtering by label, number, wz_number, or custom filter
+        - Apply one or many shift points (per wz_number, label, number or an aligned array) in a single
+          vectorised numpy operation
+        - Decode all lazy LabelMe masks of a file at once across threads
 
     Usage examples:
         new_shapes = set_shift_point(shapes, (100, 200), label='person')
         persons = get_shapes_by_label(shapes, 'person')
         specific = get_shapes_by_number(shapes, 5)
         wz_shapes = get_shapes_by_wz_number(shapes, 3)
+        index = ShapeIndex(shapes); zone = get_shapes_by_wz_number(index, 3, common=False)
+        big_cars = filter_shapes(shapes, (F.label == 'car') & (F.area > 5000))
+        shifted = shifted_coords_many(shapes, {1: (100, 200), 2: (300, 0)}, by='wz_number')
+        new_shapes = apply_shift_points(shapes, offsets_array)
+        decode_masks(shapes, workers=8)
 """
 
 
@@ -22,11 +32,30 @@ __all__ = [
     'get_shapes_by_number',
     'get_shapes_by_wz_number',
     'filter_shapes',
+    'resolve_shift_points',
+    'shifted_coords_many',
+    'apply_shift_points',
+    'decode_masks',
 ]
 
-from typing import Any, Optional, Tuple, List, Callable
+from itertools import chain
+from typing import Any, Optional, Tuple, List, Callable, Dict, Mapping, Sequence, Union
+
+import numpy as np
+from shapely.geometry import Point
 
 from ..shape import Shape
+from ..shape_batch import ShapeBatch, MISSING
+from ..index import ShapeIndex
+from ..query import Condition, F, ShapeQuery
+from ..utils import to_point, shift_coords_many
+from ..utils.mask_codec import LazyMask
+
+_SHIFT_KEYS = ('wz_number', 'label', 'number')
+
+ShapesInput = Union[Sequence[Shape], ShapeBatch]
+# Фильтры get_shapes_by_* / filter_shapes принимают и ShapeIndex: выборка по готовым корзинам без прохода по фигурам
+FilterInput = Union[Tuple[Shape, ...], ShapeIndex]
 
 
 def set_shift_point(
@@ -62,20 +91,22 @@ def set_shift_point(
 
 
 def get_shapes_by_label(
-        shapes: Tuple[Shape, ...],
+        shapes: FilterInput,
         label: str,
         individual: bool = True,
         common: bool = True) -> Tuple[Shape, ...]:
     """
         Фильтрует кортеж фигур по label и признакам индивидуальности.
         Args:
-            shapes: Кортеж Shape для фильтрации.
+            shapes: Кортеж Shape для фильтрации или ShapeIndex.
             label: Искомый label.
             individual: Включать индивидуальные фигуры (с number).
             common: Включать общие фигуры (без number).
         Returns:
             Tuple[Shape, ...]: Отфильтрованный кортеж фигур.
     """
+    if isinstance(shapes, ShapeIndex):
+        return shapes.select(label=label, individual=individual, common=common)
     if not individual and not common:
         return ()
     return tuple(
@@ -85,20 +116,22 @@ def get_shapes_by_label(
 
 
 def get_shapes_by_number(
-        shapes: Tuple[Shape, ...],
+        shapes: FilterInput,
         number: Optional[int],
         individual: bool = True,
         common: bool = True) -> Tuple[Shape, ...]:
     """
         Фильтрует кортеж фигур по значению number (индивидуальный номер), с поддержкой индивидуальных и общих фигур.
         Args:
-            shapes: Кортеж Shape для фильтрации.
+            shapes: Кортеж Shape для фильтрации или ShapeIndex.
             number: Искомый номер (number).
             individual: Включать индивидуальные фигуры (number совпадает).
             common: Включать общие фигуры (number=None).
         Returns:
             Tuple[Shape, ...]: Отфильтрованный кортеж фигур.
     """
+    if isinstance(shapes, ShapeIndex):
+        return shapes.select(number=number, individual=individual, common=common)
     if not individual and not common:
         return ()
     return tuple(
@@ -108,20 +141,22 @@ def get_shapes_by_number(
 
 
 def get_shapes_by_wz_number(
-        shapes: Tuple[Shape, ...],
+        shapes: FilterInput,
         wz_number: Optional[int],
         individual: bool = True,
         common: bool = True) -> Tuple[Shape, ...]:
     """
         Фильтрует кортеж фигур по номеру рабочей зоны (wz_number), с поддержкой индивидуальных и общих фигур.
         Args:
-            shapes: Кортеж Shape для фильтрации.
+            shapes: Кортеж Shape для фильтрации или ShapeIndex.
             wz_number: Искомый номер рабочей зоны (wz_number).
             individual: Включать индивидуальные фигуры (wz_number совпадает).
             common: Включать общие фигуры (wz_number=None).
         Returns:
             Tuple[Shape, ...]: Отфильтрованный кортеж фигур.
     """
+    if isinstance(shapes, ShapeIndex):
+        return shapes.select(wz_number=wz_number, individual=individual, common=common)
     if not individual and not common:
         return ()
     return tuple(
@@ -131,15 +166,16 @@ def get_shapes_by_wz_number(
 
 
 def filter_shapes(
-            shapes: Tuple[Shape, ...],
-            predicate: Callable[[Shape], bool],
+            shapes: FilterInput,
+            predicate: Union[Callable[[Shape], bool], Condition, ShapeQuery],
             individual: bool = True,
             common: bool = True) -> Tuple[Shape, ...]:
     """
         Возвращает кортеж фигур, удовлетворяющих произвольному предикату и фильтрам individual/common.
         Args:
-            shapes: Кортеж фигур (Shape).
-            predicate: функция-условие от Shape -> bool.
+            shapes: Кортеж фигур (Shape) или ShapeIndex (предикат вызывается только для фигур нужной корзины).
+            predicate: функция-условие от Shape -> bool или декларативное условие (Condition, ShapeQuery, см. query):
+                       оно проверяется масками numpy по колонкам, без вызова Python на каждую фигуру.
             individual: Включать индивидуальные фигуры (по number).
             common: Включать общие фигуры (без number).
         Returns:
@@ -147,7 +183,198 @@ def filter_shapes(
     """
     if not individual and not common:
         return ()
+    if isinstance(predicate, (Condition, ShapeQuery)):
+        # Декларативное условие: одна векторная маска по колонкам вместо вызова Python на каждую фигуру
+        source = shapes.shapes if isinstance(shapes, ShapeIndex) else shapes
+        query = ShapeQuery(predicate)
+        if not (individual and common):
+            query = query & (F.number != None if individual else F.number == None)  # noqa: E711
+        return tuple(source[i] for i in query.indices(source).tolist())
+    if isinstance(shapes, ShapeIndex):
+        return shapes.filter(predicate, individual=individual, common=common)
     return tuple(
         shape for shape in shapes
         if predicate(shape) and ((individual and shape.is_individual) or (common and not shape.is_individual))
     )
+
+
+def resolve_shift_points(
+        shapes: ShapesInput,
+        shift_points: Any = None,
+        *,
+        by: Optional[str] = None) -> np.ndarray:
+    """
+        Приводит описание точек смещения к массиву (N, 2) — по строке на фигуру; NaN — у фигуры нет смещения.
+        Args:
+            shapes: Фигуры (последовательность Shape или ShapeBatch).
+            shift_points: Что применить:
+                - None — собственные shift_point фигур;
+                - одна точка (tuple, list, Point, объект с .x/.y) — ко всем фигурам;
+                - словарь ключ -> точка вместе с by ('wz_number', 'label', 'number');
+                  фигуры, чьего ключа нет в словаре, сохраняют собственный shift_point;
+                - массив (N, 2), выровненный с shapes; строки NaN сохраняют собственный shift_point.
+            by: Поле фигуры, по которому выбирается точка из словаря.
+        Returns:
+            np.ndarray: Массив (N, 2) float64.
+        Raises:
+            ValueError: Если by неизвестен, словарь передан без by или размер массива не совпадает с числом фигур.
+    """
+    own = _own_shift_points(shapes)
+    if shift_points is None:
+        return own
+    if isinstance(shift_points, Mapping):
+        if by not in _SHIFT_KEYS:
+            raise ValueError(f"A mapping of shift points needs by= one of {_SHIFT_KEYS}, got {by!r}")
+        keys = _shift_keys(shapes, by)
+        table = np.array([_point_xy(p) for p in shift_points.values()], dtype=np.float64).reshape(-1, 2)
+        lookup = {key: i for i, key in enumerate(shift_points)}
+        index = np.fromiter((lookup.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+        resolved = own.copy()
+        hit = index >= 0
+        resolved[hit] = table[index[hit]]
+        return resolved
+    if by is not None:
+        raise ValueError("by= is only used together with a mapping of shift points")
+    if not isinstance(shift_points, np.ndarray) and not _is_point_like(shift_points):
+        shift_points = np.asarray(shift_points, dtype=np.float64)
+    if isinstance(shift_points, np.ndarray) and shift_points.ndim == 2:
+        if shift_points.shape != (len(shapes), 2):
+            raise ValueError(f"Expected shift points of shape ({len(shapes)}, 2), got {shift_points.shape}")
+        resolved = shift_points.astype(np.float64)
+        missing = np.isnan(resolved).any(axis=1)
+        resolved[missing] = own[missing]
+        return resolved
+    resolved = np.empty((len(shapes), 2), dtype=np.float64)
+    resolved[:] = _point_xy(shift_points)
+    return resolved
+
+
+def shifted_coords_many(
+        shapes: ShapesInput,
+        shift_points: Any = None,
+        *,
+        by: Optional[str] = None) -> List[np.ndarray]:
+    """
+        Смещённые координаты многих фигур, посчитанные одной векторной операцией numpy
+        по склеенным координатам всех фигур. Фигуры не изменяются.
+        Args:
+            shapes: Фигуры (последовательность Shape или ShapeBatch; у ShapeBatch общий буфер координат
+                    используется без копирования).
+            shift_points: Точки смещения (см. resolve_shift_points); None — собственные shift_point фигур.
+            by: Поле фигуры для словаря точек ('wz_number', 'label', 'number').
+        Returns:
+            List[np.ndarray]: По массиву (N_i, 2) только для чтения на фигуру (представления одного общего массива).
+    """
+    shifts = np.nan_to_num(resolve_shift_points(shapes, shift_points, by=by), nan=0.0)
+    coords, counts = _concat_coords(shapes)
+    shifted = shift_coords_many(coords, counts, shifts)
+    shifted.flags.writeable = False
+    return np.split(shifted, np.cumsum(counts)[:-1]) if len(counts) else []
+
+
+def apply_shift_points(
+        shapes: ShapesInput,
+        shift_points: Any,
+        *,
+        by: Optional[str] = None) -> Union[List[Shape], ShapeBatch]:
+    """
+        Возвращает новые фигуры с установленными точками смещения (одна или много точек за один вызов).
+        В отличие от set_shift_point, фигуры не проходят нормализацию повторно: coords и meta переиспользуются
+        (не копируются). Фигурам с coords-массивом (numpy_coords) смещённые координаты считаются сразу,
+        одной векторной операцией, и кладутся в кэш shifted_coords.
+        Args:
+            shapes: Фигуры (последовательность Shape или ShapeBatch).
+            shift_points: Точки смещения (см. resolve_shift_points).
+            by: Поле фигуры для словаря точек ('wz_number', 'label', 'number').
+        Returns:
+            List[Shape] | ShapeBatch: Новые фигуры в том же виде, что и вход; фигуры без новой точки
+            возвращаются как есть.
+    """
+    own = _own_shift_points(shapes)
+    shifts = resolve_shift_points(shapes, shift_points, by=by)
+    # Фигуры, у которых точка не меняется, не пересоздаются
+    unchanged = np.isnan(shifts).any(axis=1) | (shifts == own).all(axis=1)
+    points = _points_from_array(shifts, unchanged)
+    if isinstance(shapes, ShapeBatch):
+        own_points = shapes.column('shift_point')
+        points = [own_points[i] if point is None else point for i, point in enumerate(points)]
+        objects = dict(shapes._objects)
+        objects['shift_point'] = points
+        return ShapeBatch(shapes.coords, shapes.offsets, shapes.label_codes, shapes.labels, shapes.type_codes,
+                          shapes.numbers, shapes.wz_numbers, objects)
+    result = [shape if points[i] is None else shape._with_shift_point(points[i]) for i, shape in enumerate(shapes)]
+    array_backed = [i for i, shape in enumerate(result) if points[i] is not None and isinstance(shape.coords, np.ndarray)]
+    if array_backed:
+        shifted = shifted_coords_many([result[i] for i in array_backed], shifts[array_backed])
+        for i, coords in zip(array_backed, shifted):
+            result[i]._cache['shifted_coords'] = coords
+    return result
+
+
+def decode_masks(shapes: ShapesInput, workers: Optional[int] = None) -> int:
+    """
+        Декодирует все ещё не декодированные маски фигур (LazyMask) в пуле потоков.
+        Дальнейшие обращения к shape.mask.array берут готовый массив из кэша маски.
+        Args:
+            shapes: Фигуры (последовательность Shape или ShapeBatch).
+            workers: Число потоков (None — по умолчанию ThreadPoolExecutor; 0 или 1 — в текущем потоке).
+        Returns:
+            int: Число декодированных масок.
+    """
+    masks = shapes.column('mask') if isinstance(shapes, ShapeBatch) else (shape.mask for shape in shapes)
+    return LazyMask.decode_many(masks, workers=workers)
+
+
+def _own_shift_points(shapes: ShapesInput) -> np.ndarray:
+    """ Собственные shift_point фигур массивом (N, 2); NaN — смещения нет. """
+    points = shapes.column('shift_point') if isinstance(shapes, ShapeBatch) else [s.shift_point for s in shapes]
+    own = np.full((len(points), 2), np.nan)
+    for i, point in enumerate(points):
+        if point is not None:
+            own[i] = point.x, point.y
+    return own
+
+
+def _shift_keys(shapes: ShapesInput, by: str) -> List[Any]:
+    if isinstance(shapes, ShapeBatch):
+        if by == 'label':
+            return shapes.label_array().tolist()
+        column = shapes.wz_numbers if by == 'wz_number' else shapes.numbers
+        return [None if value == MISSING else value for value in column.tolist()]
+    return [getattr(shape, by) for shape in shapes]
+
+
+def _concat_coords(shapes: ShapesInput) -> Tuple[np.ndarray, np.ndarray]:
+    """ Координаты всех фигур подряд (M, 2) и число вершин каждой фигуры. """
+    if isinstance(shapes, ShapeBatch):
+        return shapes.coords, shapes.counts
+    counts = np.fromiter((len(shape.coords) for shape in shapes), dtype=np.int64, count=len(shapes))
+    if any(isinstance(shape.coords, np.ndarray) for shape in shapes):
+        parts = [np.asarray(shape.coords, dtype=np.float64).reshape(-1, 2) for shape in shapes]
+        return (np.concatenate(parts) if parts else np.empty((0, 2))), counts
+    flat = chain.from_iterable(chain.from_iterable(shape.coords for shape in shapes))
+    return np.fromiter(flat, dtype=np.float64, count=2 * int(counts.sum())).reshape(-1, 2), counts
+
+
+def _points_from_array(shifts: np.ndarray, skip_rows: np.ndarray) -> List[Optional[Point]]:
+    """ Point на каждую строку (одинаковые точки — один объект); None для пропускаемых строк. """
+    cache: Dict[Tuple[float, float], Point] = {}
+    points: List[Optional[Point]] = []
+    for (x, y), skip in zip(shifts.tolist(), skip_rows.tolist()):
+        if skip:
+            points.append(None)
+            continue
+        point = cache.get((x, y))
+        if point is None:
+            point = cache[(x, y)] = Point(x, y)
+        points.append(point)
+    return points
+
+
+def _is_point_like(value: Any) -> bool:
+    return isinstance(value, Point) or (hasattr(value, 'x') and hasattr(value, 'y'))
+
+
+def _point_xy(value: Any) -> Tuple[float, float]:
+    point = to_point(value if not isinstance(value, np.ndarray) else value.tolist())
+    return point.x, point.y
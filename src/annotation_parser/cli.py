@@ -3,25 +3,28 @@
 CLI for AnnotationParser
 ========================
 
-Позволяет парсить, сохранять, фильтровать аннотации через командную строку.
+Позволяет парсить, сохранять, фильтровать, конвертировать аннотации и генерировать синтетические наборы
+через командную строку.
 Все функции можно вызывать по отдельности.
 """
 
 import argparse
+import json
 from pathlib import Path
 import sys
+import time
 
-from ..annotation_parser import create, parse_labelme, save_labelme
-from ..annotation_parser.api.shapes_api import (
-    filter_shapes,
-    get_shapes_by_label,
-)
-from ..annotation_parser.public_enums import ShapeType
+# Здесь только лёгкие модули: numpy и shapely (query, synthetic) импортируются в командах, которым они нужны,
+# pydantic — вместе с первым используемым адаптером
+from ..annotation_parser import create, save
+from ..annotation_parser.api.convert_api import convert_many
+
+_MAX_LISTED_FAILURES = 20
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="AnnotationParser CLI: parse, save, filter annotation files."
+        description="AnnotationParser CLI: parse, save, filter, convert annotation files, generate datasets."
     )
     subparsers = parser.add_subparsers(dest='command', required=True)
 
@@ -35,6 +38,7 @@ def main():
     save_p.add_argument("--file", required=True, help="Path to annotation file to parse")
     save_p.add_argument("--adapter", required=True, help="Adapter name")
     save_p.add_argument("--out", required=True, help="Path to output file")
+    save_p.add_argument("--to", default="labelme", help="Output adapter name (default: labelme)")
     save_p.add_argument("--backup", action="store_true", help="Save backup .bak file")
 
     # filter
@@ -44,6 +48,45 @@ def main():
     filter_p.add_argument("--label", help="Filter by label")
     filter_p.add_argument("--number", type=int, help="Filter by number")
     filter_p.add_argument("--wz_number", type=int, help="Filter by working zone number (wz_number)")
+    filter_p.add_argument("--where", help="Condition over label, number, wz_number, type, area, width, height, "
+                                          "vertices and meta keys, e.g. "
+                                          "\"label in {'car', 'bus'} and 100 <= area <= 5000 and 'score' in meta\"")
+
+    # convert
+    convert_p = subparsers.add_parser("convert", help="Convert a dataset between formats in parallel")
+    convert_p.add_argument("--input", required=True, help="Input directory, glob ('data/**/*.json') or file")
+    convert_p.add_argument("--output", required=True, help="Output directory (input tree is mirrored)")
+    convert_p.add_argument("--from", dest="source", required=True, help="Source adapter name")
+    convert_p.add_argument("--to", required=True, help="Target adapter name")
+    convert_p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    convert_p.add_argument("--pattern", default="**/*.json", help="File pattern for directory input")
+    convert_p.add_argument("--force", action="store_true", help="Rewrite outputs that are already up to date")
+    convert_p.add_argument("--compact", action="store_true", help="Write compact JSON")
+    convert_p.add_argument("--report", help="Write failures as JSON to this file")
+
+    # generate
+    gen_p = subparsers.add_parser("generate", help="Generate a deterministic synthetic dataset")
+    gen_p.add_argument("--format", required=True, choices=("labelme", "coco", "voc"), help="Markup format")
+    gen_p.add_argument("--output", required=True, help="Output directory")
+    gen_p.add_argument("--files", type=int, default=10, help="Number of files")
+    gen_p.add_argument("--shapes", type=int, default=100, help="Mean shapes per file")
+    gen_p.add_argument("--shapes-spread", type=float, default=0.0, help="Relative +/- spread of shapes per file")
+    gen_p.add_argument("--labels", help="Comma separated label vocabulary")
+    gen_p.add_argument("--label-skew", type=float, default=1.0, help="Zipf exponent of label frequencies")
+    gen_p.add_argument("--vertices", default="4,32", help="Min,max polygon vertices")
+    gen_p.add_argument("--vertex-distribution", default="uniform", choices=("uniform", "loguniform"))
+    gen_p.add_argument("--rectangle-share", type=float, default=0.2, help="Share of LabelMe rectangles")
+    gen_p.add_argument("--group-id-share", type=float, default=0.5, help="Share of shapes with group_id")
+    gen_p.add_argument("--max-group-id", type=int, default=100, help="group_id range 1..N")
+    gen_p.add_argument("--wz-share", type=float, default=0.0, help="Share of LabelMe shapes with wz")
+    gen_p.add_argument("--wz-count", type=int, default=4, help="wz range 1..N")
+    gen_p.add_argument("--image-data-bytes", type=int, default=0, help="Embedded LabelMe imageData size")
+    gen_p.add_argument("--image-size", default="1920x1080", help="Image WIDTHxHEIGHT")
+    gen_p.add_argument("--images-per-file", type=int, default=1, help="Images per COCO file")
+    gen_p.add_argument("--seed", type=int, default=0, help="Random seed")
+    gen_p.add_argument("--pretty", action="store_true", help="Write indented JSON (or XML)")
+    gen_p.add_argument("--voc-xml", action="store_true", help="Write VOC as Pascal VOC XML (.xml) instead of JSON")
+    gen_p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
 
     args = parser.parse_args()
 
@@ -53,6 +96,10 @@ def main():
         do_save(args)
     elif args.command == "filter":
         do_filter(args)
+    elif args.command == "convert":
+        do_convert(args)
+    elif args.command == "generate":
+        do_generate(args)
     else:
         parser.print_help()
 
@@ -76,7 +123,7 @@ def do_save(args):
     try:
         parser = create(file, args.adapter)
         shapes = parser.parse()
-        save_labelme(shapes, out_file, backup=args.backup)
+        save(shapes, out_file, args.to, backup=args.backup)
         print(f"Saved {len(shapes)} shapes to '{out_file}'. Backup: {args.backup}")
     except Exception as e:
         print(f"[ERROR] {e}")
@@ -86,17 +133,11 @@ def do_save(args):
 def do_filter(args):
     file = Path(args.file)
     try:
+        query = build_filter_query(args)
         parser = create(file, args.adapter)
-        shapes = parser.parse()
-        filtered = shapes
-        # Логика фильтрации
-        if args.label:
-            filtered = get_shapes_by_label(filtered, args.label)
-        if args.number is not None:
-            # Применяем фильтрацию по номеру (custom predicate)
-            filtered = tuple(s for s in filtered if getattr(s, "number", None) == args.number)
-        if args.wz_number is not None:
-            filtered = tuple(s for s in filtered if getattr(s, "wz_number", None) == args.wz_number)
+        # Все условия — одна векторная маска по колоночному представлению, без прохода Python по фигурам
+        batch = parser.parse_batch()
+        filtered = query.filter(batch).to_shapes() if query is not None else batch.to_shapes()
         print(f"Filtered shapes ({len(filtered)}):")
         for shape in filtered:
             print(shape)
@@ -105,5 +146,117 @@ def do_filter(args):
         sys.exit(1)
 
 
+def do_convert(args):
+    started = time.perf_counter()
+    converted = skipped = shapes = 0
+    failures = []
+    progress = _Progress(started)
+    try:
+        for result in convert_many(args.input, args.output, args.source, args.to, workers=args.workers,
+                                   pattern=args.pattern, skip_up_to_date=not args.force,
+                                   pretty=not args.compact):
+            if result.error is not None:
+                failures.append(result)
+            elif result.skipped:
+                skipped += 1
+            else:
+                converted += 1
+                shapes += result.shapes
+            progress.update(lambda elapsed: _convert_progress(converted, skipped, len(failures), shapes, elapsed))
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    progress.update(lambda elapsed: _convert_progress(converted, skipped, len(failures), shapes, elapsed),
+                    final=True)
+    elapsed = time.perf_counter() - started
+    print(f"Converted {converted} files ({shapes} shapes), skipped {skipped} up to date, "
+          f"failed {len(failures)} in {elapsed:.2f}s")
+    if failures:
+        print("Failures:")
+        for result in failures[:_MAX_LISTED_FAILURES]:
+            print(f"  {result.source}: {result.error}")
+        if len(failures) > _MAX_LISTED_FAILURES:
+            print(f"  ... and {len(failures) - _MAX_LISTED_FAILURES} more" + ("" if args.report else " (use --report)"))
+        if args.report:
+            report = [{"source": r.source, "target": r.target, "error": r.error} for r in failures]
+            Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        sys.exit(1)
+
+
+def _convert_progress(converted, skipped, failed, shapes, elapsed):
+    return (f"{converted + skipped + failed} files | {converted / elapsed:.1f} files/s | "
+            f"{shapes / elapsed:.0f} shapes/s | skipped {skipped} | failed {failed}")
+
+
+def do_generate(args):
+    from ..annotation_parser.synthetic import DatasetGenerator, DatasetSpec
+    try:
+        width, height = (int(v) for v in args.image_size.lower().split("x"))
+        spec = DatasetSpec(
+            markup_type=args.format, files=args.files, shapes_per_file=args.shapes,
+            shapes_spread=args.shapes_spread, label_skew=args.label_skew,
+            vertices=tuple(int(v) for v in args.vertices.split(",")),
+            vertex_distribution=args.vertex_distribution, rectangle_share=args.rectangle_share,
+            group_id_share=args.group_id_share, max_group_id=args.max_group_id, wz_share=args.wz_share,
+            wz_count=args.wz_count, image_data_bytes=args.image_data_bytes, image_size=(width, height),
+            images_per_file=args.images_per_file, seed=args.seed, pretty=args.pretty, voc_xml=args.voc_xml,
+            **({"labels": tuple(v.strip() for v in args.labels.split(",") if v.strip())} if args.labels else {}))
+        started = time.perf_counter()
+        progress = _Progress(started)
+        files = shapes = size = 0
+        for item in DatasetGenerator.write(spec, args.output, workers=args.workers):
+            files, shapes, size = files + 1, shapes + item.shapes, size + item.size
+            progress.update(lambda elapsed: _generate_progress(files, spec.files, shapes, size, elapsed))
+        progress.update(lambda elapsed: _generate_progress(files, spec.files, shapes, size, elapsed), final=True)
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"Generated {files} {spec.markup_type.value} files ({shapes} shapes, {size / 2 ** 20:.1f} MB) "
+          f"in '{args.output}' in {time.perf_counter() - started:.2f}s")
+
+
+def _generate_progress(files, total, shapes, size, elapsed):
+    return (f"{files}/{total} files | {size / 2 ** 20 / elapsed:.1f} MB/s | "
+            f"{shapes / elapsed:.0f} shapes/s")
+
+
+class _Progress:
+    """ Строка прогресса в stderr (обновляется на месте, не чаще раза в interval секунд). """
+
+    def __init__(self, started, interval=0.2):
+        self._started = started
+        self._interval = interval
+        self._last = 0.0
+
+    def update(self, render, final=False):
+        """ render(elapsed) -> текст строки; вызывается только когда строка действительно выводится. """
+        now = time.perf_counter()
+        if not final and now - self._last < self._interval:
+            return
+        self._last = now
+        sys.stderr.write("\r" + render(max(now - self._started, 1e-9)) + ("\n" if final else ""))
+        sys.stderr.flush()
+
+
+def build_filter_query(args):
+    """ Собирает из --label, --number, --wz_number и --where один запрос ShapeQuery (None — фильтров нет). """
+    from ..annotation_parser.query import F, ShapeQuery
+    conditions = []
+    if args.label:
+        conditions.append(F.label == args.label)
+    if args.number is not None:
+        conditions.append(F.number == args.number)
+    if args.wz_number is not None:
+        conditions.append(F.wz_number == args.wz_number)
+    if args.where:
+        conditions.append(ShapeQuery(args.where).condition)
+    if not conditions:
+        return None
+    query = ShapeQuery(conditions[0])
+    for condition in conditions[1:]:
+        query = query & condition
+    return query
+
+
 if __name__ == "__main__":
     main()
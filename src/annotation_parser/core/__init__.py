@@ -1 +1,9 @@
-from .annotation_file import *
+from ..utils.lazy_import import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.annotation_batch': ('AnnotationBatch', 'ParseResult', 'ConvertResult'),
+    '.annotation_file': ('AnnotationFile',),
+    '.parse_cache': ('ParseCache',),
+    '.backup': ('BackupPolicy', 'BackupManager'),
+    '.shape_diff': ('ShapeDiff',),
+})
@@ -0,0 +1,181 @@
+__all__ = ['AnnotationBatch', 'ParseResult', 'ConvertResult']
+
+import glob
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..shape import Shape
+from ..utils.instrumentation import active_hook, instrument
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+@dataclass(frozen=True, slots=True)
+class ParseResult:
+    """
+        Результат обработки одного файла в пакетном режиме.
+        Args:
+            file_path (str): Путь к файлу разметки.
+            shapes (Tuple[Shape, ...]): Распарсенные фигуры (пустой кортеж при ошибке).
+            error (Optional[str]): Текст ошибки ("ExceptionType: message") или None, если файл обработан успешно.
+    """
+    file_path: str
+    shapes: Tuple[Shape, ...] = ()
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """ True, если файл обработан без ошибок. """
+        return self.error is None
+
+    @staticmethod
+    def from_exception(file_path: Union[str, Path], exc: BaseException) -> "ParseResult":
+        """ Формирует результат-ошибку. Исключение хранится строкой: не все исключения переживают pickle. """
+        return ParseResult(file_path=str(file_path), error=f"{type(exc).__name__}: {exc}")
+
+
+@dataclass(frozen=True, slots=True)
+class ConvertResult:
+    """
+        Результат конвертации одного файла в пакетном режиме.
+        Args:
+            source (str): Исходный файл.
+            target (str): Файл результата.
+            shapes (int): Число записанных фигур.
+            skipped (bool): True — результат уже актуален (новее исходного файла), конвертация не выполнялась.
+            error (Optional[str]): Текст ошибки ("ExceptionType: message") или None.
+    """
+    source: str
+    target: str
+    shapes: int = 0
+    skipped: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """ True, если файл сконвертирован или пропущен без ошибок. """
+        return self.error is None
+
+    @staticmethod
+    def from_exception(task: Tuple[str, str], exc: BaseException) -> "ConvertResult":
+        """ Формирует результат-ошибку для задачи (source, target). """
+        source, target = task
+        return ConvertResult(source=str(source), target=str(target), error=f"{type(exc).__name__}: {exc}")
+
+
+class AnnotationBatch:
+    """
+        Пакетная обработка файлов разметки:
+        - раскрывает директории, glob-шаблоны и списки путей в список файлов;
+        - раздаёт обработку файлов пулу процессов и возвращает результаты потоком.
+    """
+
+    @staticmethod
+    def resolve_paths(paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+                      pattern: str = "*.json") -> List[str]:
+        """
+            Раскрывает вход в список путей к файлам.
+            Args:
+                paths_or_glob: Директория (берутся файлы по pattern), glob-шаблон ('data/**/*.json'),
+                               путь к одному файлу или итерируемый набор путей.
+                pattern: Шаблон имён файлов для режима директории.
+            Returns:
+                List[str]: Пути к файлам (для директорий и glob — отсортированные).
+        """
+        if isinstance(paths_or_glob, (str, Path)):
+            path = Path(paths_or_glob)
+            if path.is_dir():
+                return sorted(str(p) for p in path.glob(pattern) if p.is_file())
+            if _GLOB_CHARS.intersection(str(paths_or_glob)):
+                return sorted(p for p in glob.glob(str(paths_or_glob), recursive=True) if os.path.isfile(p))
+            return [str(path)]
+        return [str(p) for p in paths_or_glob]
+
+    @staticmethod
+    def run(func: Callable[[Any], Any],
+            items: Iterable[Any],
+            workers: Optional[int] = None,
+            chunksize: Optional[int] = None,
+            ordered: bool = True,
+            on_error: Optional[Callable[[Any, BaseException], Any]] = None) -> Iterator[Any]:
+        """
+            Применяет func к каждому элементу items в пуле процессов и возвращает результаты потоком.
+            Args:
+                func: Функция уровня модуля (должна сериализоваться pickle), вызывается как func(item).
+                items: Элементы для обработки.
+                workers: Число процессов. None — os.cpu_count(); 0 или 1 — обработка в текущем процессе.
+                chunksize: Сколько элементов отдаётся процессу за раз. None — подбирается автоматически.
+                ordered: True — результаты в порядке items, False — в порядке готовности.
+                on_error: Функция (item, exc) -> результат для элементов, чей пакет упал целиком
+                          (например, процесс-воркер аварийно завершился). None — исключение пробрасывается.
+            Note:
+                Если включено инструментирование (utils.instrument), замеры этапов из процессов-воркеров
+                передаются вместе с результатами и воспроизводятся в хуке текущего контекста.
+            Returns:
+                Iterator: Результаты func по одному на элемент.
+        """
+        items = list(items)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(items) <= 1:
+            yield from AnnotationBatch._run_inline(func, items, on_error)
+            return
+        if chunksize is None:
+            chunksize = AnnotationBatch._auto_chunksize(len(items), workers)
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        # multiprocessing загружается только для настоящего пула (десятки мс на старте процесса)
+        from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+        hook = active_hook()
+        run_chunk = _run_chunk if hook is None else _run_chunk_recorded
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures: List[Future] = [executor.submit(run_chunk, func, chunk) for chunk in chunks]
+            chunk_of = {future: chunk for future, chunk in zip(futures, chunks)}
+            try:
+                for future in (futures if ordered else as_completed(futures)):
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        if on_error is None:
+                            raise
+                        results = [on_error(item, e) for item in chunk_of[future]]
+                    else:
+                        if hook is not None:
+                            results, records = results
+                            for record in records:
+                                hook(*record)
+                    yield from results
+            finally:
+                # Потребитель мог прервать итерацию: не ждём ещё не начатые пакеты
+                for future in futures:
+                    future.cancel()
+
+    @staticmethod
+    def _run_inline(func: Callable[[Any], Any],
+                    items: List[Any],
+                    on_error: Optional[Callable[[Any, BaseException], Any]]) -> Iterator[Any]:
+        for item in items:
+            try:
+                yield func(item)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                yield on_error(item, e)
+
+    @staticmethod
+    def _auto_chunksize(n_items: int, workers: int) -> int:
+        """ Около 4 пакетов на процесс: баланс между накладными расходами pickle и равномерностью загрузки. """
+        return max(1, min(64, n_items // (workers * 4)))
+
+
+def _run_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    """ Точка входа процесса-воркера: обрабатывает один пакет элементов. """
+    return [func(item) for item in chunk]
+
+
+def _run_chunk_recorded(func: Callable[[Any], Any], chunk: List[Any]) -> Tuple[List[Any], List[Tuple]]:
+    """ Как _run_chunk, но с записью замеров этапов: (результаты, [(stage, seconds, nbytes, shapes), ...]). """
+    records: List[Tuple] = []
+    with instrument(lambda *record: records.append(record)):
+        return _run_chunk(func, chunk), records
@@ -1,16 +1,28 @@
+from __future__ import annotations
+
 __all__ = ['AnnotationFile']
 
-from typing import Tuple, Any, Optional, Union, Callable
+from typing import Tuple, Any, Optional, Union, Iterable, Iterator, TYPE_CHECKING
+from functools import partial
 from pathlib import Path
 import json
+import os
 
 from ..adapters.base_adapter import AdapterType
-from ..public_enums import Adapters
+from ..public_enums import Adapters, PipelineStage, ValidationMode
 from ..shape import Shape
 from ..adapters.adapter_factory import AdapterFactory
 from .annotation_parser import AnnotationParser
 from .annotation_saver import AnnotationSaver
+from .annotation_batch import AnnotationBatch, ParseResult
+from .parse_cache import ParseCache
+from .backup import BackupPolicy
+from .shape_diff import ShapeDiff
 from ..types import ShiftPointType
+from ..utils import JsonCodec, stage
+
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
 
 
 class AnnotationFile:
@@ -25,7 +37,11 @@ class AnnotationFile:
                  markup_type: str | Adapters,
                  keep_json: bool = False,
                  validate_file: bool = True,
-                 shift_point: ShiftPointType = None) -> None:
+                 shift_point: ShiftPointType = None,
+                 validate: ValidationMode | str = ValidationMode.FULL,
+                 numpy_coords: bool = False,
+                 cache: ParseCache | bool | None = None,
+                 auto_refresh: bool = False) -> None:
         """
             Инициализация объекта для работы с файлом разметки.
             Args:
@@ -39,18 +55,39 @@ class AnnotationFile:
                     - False: используется для сценариев записи/сохранения по новому пути, когда файл может ещё
                              не существовать (например, при экспорте или копировании).
                 shift_point (Any, optional): Смещение координат (если требуется по задаче).
+                validate (ValidationMode, optional): Строгость проверки данных при парсинге:
+                    'full' (по умолчанию), 'light' или 'none' для доверенных файлов.
+                numpy_coords (bool, optional): True — coords фигур хранятся как неизменяемые массивы (N, 2) float64.
+                cache (ParseCache | bool, optional): Дисковый кэш результатов парсинга
+                    (True — кэш по умолчанию, см. ParseCache.default). С кэшем json читается лениво:
+                    только при промахе кэша или при сохранении.
+                auto_refresh (bool, optional): True — parse() сначала вызывает refresh(): изменённый на диске файл
+                    перечитывается, иначе возвращаются ранее распарсенные фигуры (проверка — один os.stat).
             Raises:
                 FileNotFoundError: Если validate_file=True и файл не найден.
                 ValueError: Если не удалось создать адаптер для указанного типа разметки.
         """
         self._file_path: str = (self._get_file_path(file_path) if validate_file else str(Path(file_path)))
         self._adapter: AdapterType = AdapterFactory.get_adapter(markup_type)
+        self._cache: Optional[ParseCache] = ParseCache.resolve(cache)
+        self._json_data = None
+        self._json_pending: bool = False
+        # (size, mtime_ns) файла в момент чтения json — для побайтового переноса неизменённых секций при save
+        self._source_state: Optional[Tuple[int, int]] = None
         if keep_json and (validate_file or Path(file_path).exists()):
-            self._json_data = self._load_json(self._file_path)
-        else:
-            self._json_data = None
+            if self._cache is None:
+                self._json_data = self._read_file()
+            else:
+                self._json_pending = True
+        self._keep_json: bool = keep_json
         self._shapes: Optional[Tuple[Shape, ...]] = None
+        # (size, mtime_ns) файла, из которого получены _shapes, — для refresh
+        self._shapes_state: Optional[Tuple[int, int]] = None
+        self._auto_refresh: bool = auto_refresh
+        self._last_diff: ShapeDiff = ShapeDiff()
         self._shift_point: ShiftPointType = shift_point
+        self._validate: ValidationMode = ValidationMode(validate)
+        self._numpy_coords: bool = numpy_coords
 
     def parse(self) -> Tuple[Shape, ...]:
         """
@@ -59,35 +96,248 @@ class AnnotationFile:
               так как объект всегда создаётся через create(..., keep_json=True).
             - Преобразует данные через адаптер в кортеж фигур.
             - Кэширует результат для повторных вызовов (self._shapes).
+            - С auto_refresh=True перед выдачей проверяет, не изменился ли файл (см. refresh).
             Returns:
                 Tuple[Shape, ...]: Кортеж фигур (Shape), извлечённых из файла разметки.
             Raises:
                 ValueError: Если возникли ошибки при обработке структуры файла или адаптера.
         """
         if self._shapes is None:
-            self._shapes = AnnotationParser.parse(self._json_data, self._adapter, shift_point=self._shift_point)
+            self._shapes = self._load_shapes()
+        elif self._auto_refresh:
+            self.refresh()
         return self._shapes
 
-    def save(self, shapes: Tuple[Shape, ...], backup: bool = False) -> None:
+    def refresh(self) -> ShapeDiff:
+        """
+            Перечитывает файл, только если он изменился (другие size или mtime_ns), и обновляет фигуры.
+            Неизменённые фигуры остаются теми же объектами Shape, что и до обновления, так что кэши,
+            построенные на них (производная геометрия Shape, словари по id(shape) и т.п.), остаются верными.
+            Если фигуры ещё не парсились — парсит файл (все фигуры в added).
+            Returns:
+                ShapeDiff: Добавленные, удалённые и изменённые фигуры (пустой, если файл не менялся).
+            Raises:
+                FileNotFoundError: Если файл удалён.
+        """
+        if self._shapes is not None and self._shapes_state is not None \
+                and self._shapes_state == self._file_state():
+            self._last_diff = ShapeDiff(unchanged=len(self._shapes))
+            return self._last_diff
+        old = self._shapes or ()
+        # Загруженный json относится к прежней версии файла
+        self._json_data = None
+        self._json_pending = True
+        new = self._load_shapes()
+        if not self._keep_json:
+            self._json_data = None
+            self._json_pending = False
+        diff, self._shapes = ShapeDiff.compute(old, new)
+        self._last_diff = diff
+        return diff
+
+    @property
+    def last_diff(self) -> ShapeDiff:
+        """ Результат последнего refresh (в том числе вызванного из parse с auto_refresh). """
+        return self._last_diff
+
+    def _load_shapes(self) -> Tuple[Shape, ...]:
+        """
+            Фигуры текущей версии файла (из ParseCache или парсингом json).
+            Запоминает состояние файла, из которого данные действительно прочитаны: ключа кэша при попадании,
+            иначе — момента чтения json (он мог быть прочитан раньше, в __init__ с keep_json=True).
+        """
+        state = key_state = self._file_state()
+        key = self._cache_key(state)
+        batch = None
+        if key is not None:
+            with stage(PipelineStage.CACHE) as timer:
+                batch = self._cache.load(key)
+                if batch is not None:
+                    shapes = batch.to_shapes(numpy_coords=self._numpy_coords)
+                    timer.set(shapes=len(shapes))
+        if batch is None:
+            json_data = self._get_json_data()
+            state = self._source_state
+            shapes = AnnotationParser.parse(json_data, self._adapter,
+                                            shift_point=self._shift_point, validate=self._validate,
+                                            numpy_coords=self._numpy_coords)
+            if key is not None:
+                from ..shape_batch import ShapeBatch
+                # Под ключ версии файла, из которой прочитан json, а не той, что на диске сейчас
+                self._cache.store(self._cache_key(state) if state != key_state else key,
+                                  ShapeBatch.from_shapes(shapes))
+        # Состояние берётся до чтения: изменение во время или после чтения будет замечено следующим refresh
+        self._shapes_state = state
+        return shapes
+
+    def parse_batch(self, dtype: Any = "float64") -> ShapeBatch:
+        """
+            Парсит аннотационный файл в колоночный ShapeBatch (каждый вызов — новый батч; с cache — из дискового кэша).
+            Args:
+                dtype: Тип координат (np.float64 или np.float32).
+            Returns:
+                ShapeBatch: Фигуры файла в колоночном представлении.
+        """
+        key = self._cache_key()
+        if key is None:
+            return AnnotationParser.parse_batch(self._get_json_data(), self._adapter, shift_point=self._shift_point,
+                                                validate=self._validate, dtype=dtype)
+        batch = self._cache.load(key)
+        if batch is None:
+            # В кэше всегда float64 (без потерь), к dtype приводится при выдаче
+            batch = AnnotationParser.parse_batch(self._get_json_data(), self._adapter, shift_point=self._shift_point,
+                                                 validate=self._validate)
+            self._cache.store(key, batch)
+        return batch.astype(dtype)
+
+    def save(self, shapes: Tuple[Shape, ...], backup: Union[bool, BackupPolicy] = False, pretty: bool = True) -> None:
         """
             Сохраняет фигуры в файл разметки, заменяя аннотационные данные.
             Если backup=True и файл существует, автоматически создаёт резервную копию с меткой времени.
+            Если файл не менялся с чтения json и записан в том же форматировании, что задаёт pretty, секции,
+            которые адаптер не меняет (например, images и categories в COCO), переносятся из него байтами;
+            перекодируется только список фигур.
             Args:
                 shapes: Кортеж фигур для сохранения.
-                backup: Делать ли резервную копию перед перезаписью (по умолчанию — НЕТ).
+                backup: Резервная копия перед перезаписью: True или BackupPolicy (по умолчанию — НЕТ).
+                pretty: True — JSON с отступами (по умолчанию), False — компактный JSON.
             Raises:
                 FileNotFoundError, OSError, ValueError — если возникли ошибки при записи или доступе к файлу.
+                NotImplementedError: Для XML-файлов (запись VOC XML не поддерживается, сохраняйте в .json).
         """
+        if self._is_xml():
+            raise NotImplementedError(f"Запись XML не поддерживается, сохраните разметку в .json: {self._file_path}")
+        json_data = self._get_json_data()
+        if getattr(self._adapter, "items_key", "") and self._source_unchanged():
+            # Файл не менялся с чтения: секции, кроме списка фигур, переносятся из него байтами
+            AnnotationSaver.save_stream(shapes=shapes,
+                                        adapter=self._adapter,
+                                        file_path=self._file_path,
+                                        json_data=json_data,
+                                        backup=backup,
+                                        pretty=pretty,
+                                        source=self._file_path,
+                                        source_state=self._source_state)
+            return
         AnnotationSaver.save(shapes=shapes,
                              adapter=self._adapter,
                              file_path=self._file_path,
-                             json_data=self._json_data,
-                             backup=backup)
+                             json_data=json_data,
+                             backup=backup,
+                             pretty=pretty)
+
+    def save_stream(self, shapes: Iterable[Shape], backup: Union[bool, BackupPolicy] = False,
+                    pretty: bool = True) -> int:
+        """
+            Потоковое сохранение фигур (см. AnnotationSaver.save_stream): shapes может быть генератором,
+            весь документ в памяти не собирается. Поля заголовка берутся из загруженного json, а без него —
+            из существующего файла потоковым чтением (список фигур при этом не декодируется).
+            Args:
+                shapes: Фигуры для сохранения.
+                backup: Резервная копия перед перезаписью: True или BackupPolicy (по умолчанию — НЕТ).
+                pretty: True — JSON с отступами (по умолчанию), False — компактный JSON.
+            Returns:
+                int: Число записанных фигур.
+            Raises:
+                NotImplementedError: Если адаптер не поддерживает потоковую запись или файл — XML.
+        """
+        if self._is_xml():
+            raise NotImplementedError(f"Запись XML не поддерживается, сохраните разметку в .json: {self._file_path}")
+        header = self._json_data
+        items_key = getattr(self._adapter, "items_key", "")
+        if header is None and items_key and Path(self._file_path).is_file():
+            header = AnnotationSaver.read_header(self._file_path, items_key)
+        return AnnotationSaver.save_stream(shapes=shapes,
+                                           adapter=self._adapter,
+                                           file_path=self._file_path,
+                                           json_data=header,
+                                           backup=backup,
+                                           pretty=pretty)
+
+    @staticmethod
+    def parse_many(paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+                   markup_type: str | Adapters,
+                   workers: Optional[int] = None,
+                   chunksize: Optional[int] = None,
+                   ordered: bool = True,
+                   shift_point: ShiftPointType = None,
+                   pattern: str = "*.json",
+                   validate: ValidationMode | str = ValidationMode.FULL,
+                   numpy_coords: bool = False,
+                   cache: ParseCache | bool | None = None) -> Iterator[ParseResult]:
+        """
+            Парсит набор файлов разметки в пуле процессов и возвращает результаты потоком.
+            Ошибка в отдельном файле не прерывает пакет: она возвращается в ParseResult.error.
+            Args:
+                paths_or_glob: Директория, glob-шаблон, путь к файлу или итерируемый набор путей.
+                markup_type (str | Adapters): Тип формата разметки.
+                workers (int, optional): Число процессов. None — по числу ядер; 0 или 1 — в текущем процессе.
+                chunksize (int, optional): Сколько файлов отдаётся процессу за раз. None — автоматически.
+                ordered (bool): True — результаты в порядке входных путей, False — по мере готовности.
+                shift_point (Any, optional): Смещение координат для всех фигур.
+                pattern (str): Шаблон имён файлов для режима директории.
+                validate (ValidationMode): Строгость проверки данных при парсинге.
+                numpy_coords (bool): True — coords фигур как массивы numpy.
+                cache (ParseCache | bool): Дисковый кэш результатов парсинга (общий для всех воркеров).
+            Returns:
+                Iterator[ParseResult]: По одному результату на файл.
+            Note:
+                Адаптеры, зарегистрированные вручную, доступны воркерам только при старте процессов через fork.
+        """
+        paths = AnnotationBatch.resolve_paths(paths_or_glob, pattern=pattern)
+        worker = partial(_parse_file_safe, markup_type=markup_type, shift_point=shift_point,
+                         validate=ValidationMode(validate), numpy_coords=numpy_coords,
+                         cache=ParseCache.resolve(cache))
+        return AnnotationBatch.run(worker, paths, workers=workers, chunksize=chunksize, ordered=ordered,
+                                   on_error=ParseResult.from_exception)
+
+    def _get_json_data(self) -> Any:
+        """ Исходный json; при работе с кэшем загружается при первом обращении. """
+        if self._json_pending:
+            self._json_data = self._read_file()
+            self._json_pending = False
+        return self._json_data
+
+    def _read_file(self) -> Any:
+        """
+            Читает файл разметки: XML — через read_xml адаптера (VOC), остальное — как JSON.
+            Запоминает (size, mtime_ns) файла, взятые до чтения, в _source_state.
+        """
+        state = self._file_state()
+        if self._is_xml():
+            with stage(PipelineStage.DECODE):
+                data = self._adapter.read_xml(self._file_path)
+        else:
+            data = self._load_json(self._file_path)
+        self._source_state = state
+        return data
+
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self._file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _source_unchanged(self) -> bool:
+        """ True, если json загружен из файла и файл с тех пор не менялся. """
+        return self._json_data is not None and self._source_state is not None \
+            and self._source_state == self._file_state()
+
+    def _is_xml(self) -> bool:
+        return Path(self._file_path).suffix.lower() == ".xml" and hasattr(self._adapter, "read_xml")
+
+    def _cache_key(self, state: Optional[Tuple[int, int]] = None) -> Optional[Path]:
+        """ Ключ ParseCache для текущей версии файла (берётся до чтения файла) или None без кэша. """
+        if self._cache is None:
+            return None
+        return self._cache.key(self._file_path, self._adapter.adapter_name, shift_point=self._shift_point,
+                               validate=self._validate, state=state)
 
     @staticmethod
     def _load_json(file_path: str) -> Any:
         """
-            Загружает JSON-файл.
+            Загружает JSON-файл через JsonCodec (orjson/ujson, если установлены).
             Args:
                 file_path: Путь к файлу.
             Returns:
@@ -98,8 +348,7 @@ class AnnotationFile:
                 OSError: если ошибка доступа к файлу.
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return JsonCodec.load_file(file_path)
         except FileNotFoundError:
             print(f"[ERROR] File not found: {file_path}")
             raise
@@ -125,3 +374,18 @@ class AnnotationFile:
         if not path.is_file():
             raise FileNotFoundError(f'Файл разметки не найден: {file_path}')
         return str(path)
+
+
+def _parse_file_safe(file_path: str,
+                     markup_type: str | Adapters,
+                     shift_point: ShiftPointType = None,
+                     validate: ValidationMode = ValidationMode.FULL,
+                     numpy_coords: bool = False,
+                     cache: Optional[ParseCache] = None) -> ParseResult:
+    """ Воркер пакетного парсинга: парсит один файл, ошибки превращает в ParseResult. """
+    try:
+        shapes = AnnotationFile(file_path, markup_type, keep_json=True, shift_point=shift_point,
+                                validate=validate, numpy_coords=numpy_coords, cache=cache).parse()
+    except Exception as e:
+        return ParseResult.from_exception(file_path, e)
+    return ParseResult(file_path=file_path, shapes=shapes)
@@ -1,10 +1,18 @@
+from __future__ import annotations
+
 __all__ = ['AnnotationParser']
 
-from typing import Tuple, Any
+from typing import Tuple, Any, TYPE_CHECKING
+
 
 from ..adapters.base_adapter import AdapterType
+from ..public_enums import PipelineStage, ValidationMode
 from ..shape import Shape
 from ..types import ShiftPointType
+from ..utils import stage
+
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
 
 
 class AnnotationParser:
@@ -13,13 +21,21 @@ class AnnotationParser:
     """
 
     @staticmethod
-    def parse(json_data: Any, adapter: AdapterType, shift_point: ShiftPointType = None) -> Tuple[Shape, ...]:
+    def parse(json_data: Any,
+              adapter: AdapterType,
+              shift_point: ShiftPointType = None,
+              validate: ValidationMode | str = ValidationMode.FULL,
+              numpy_coords: bool = False) -> Tuple[Shape, ...]:
         """
             Преобразует json-данные аннотаций в кортеж фигур через указанный адаптер.
             Args:
                 json_data: Загруженный json-словарь/список аннотаций.
                 adapter: Класс-адаптер (например, LabelMeAdapter), реализующий load.
                 shift_point: Дополнительная информация для смещения точек (по необходимости).
+                validate: Строгость проверки данных (см. ValidationMode). В адаптер передаётся только
+                          в режимах, отличных от FULL, поэтому адаптеры без этого параметра продолжают работать.
+                numpy_coords: True — coords как неизменяемые массивы (N, 2) float64; передаётся в адаптер
+                              только при значении True.
             Returns:
                 Кортеж фигур (Shape, ...).
             Raises:
@@ -28,8 +44,39 @@ class AnnotationParser:
         if not hasattr(adapter, "load"):
             raise ValueError(f"Adapter '{adapter.__name__}' does not implement 'load' method.")
 
-        shapes = adapter.load(json_data, shift_point=shift_point)
-        if not isinstance(shapes, (list, tuple)):
-            raise ValueError(f"Adapter '{adapter.__name__}' returned unsupported type: {type(shapes)}")
-
+        kwargs = {}
+        validate = ValidationMode(validate)
+        if validate is not ValidationMode.FULL:
+            kwargs['validate'] = validate
+        if numpy_coords:
+            kwargs['numpy_coords'] = True
+        with stage(PipelineStage.PARSE) as timer:
+            shapes = adapter.load(json_data, shift_point=shift_point, **kwargs)
+            if not isinstance(shapes, (list, tuple)):
+                raise ValueError(f"Adapter '{adapter.__name__}' returned unsupported type: {type(shapes)}")
+            timer.set(shapes=len(shapes))
         return tuple(shapes)
+
+    @staticmethod
+    def parse_batch(json_data: Any,
+                    adapter: AdapterType,
+                    shift_point: ShiftPointType = None,
+                    validate: ValidationMode | str = ValidationMode.FULL,
+                    dtype: Any = "float64") -> ShapeBatch:
+        """
+            Преобразует json-данные аннотаций в колоночный ShapeBatch через указанный адаптер.
+            Адаптеры без load_batch обрабатываются через parse и ShapeBatch.from_shapes.
+            Args:
+                json_data: Загруженный json-словарь/список аннотаций.
+                adapter: Класс-адаптер.
+                shift_point: Дополнительная информация для смещения точек (по необходимости).
+                validate: Строгость проверки данных (см. ValidationMode).
+                dtype: Тип координат (np.float64 или np.float32).
+            Returns:
+                ShapeBatch: Фигуры в колоночном представлении.
+        """
+        if not hasattr(adapter, "load_batch"):
+            from ..shape_batch import ShapeBatch
+            shapes = AnnotationParser.parse(json_data, adapter, shift_point=shift_point, validate=validate)
+            return ShapeBatch.from_shapes(shapes, dtype=dtype)
+        return adapter.load_batch(json_data, shift_point=shift_point, validate=validate, dtype=dtype)
@@ -1,13 +1,24 @@
 __all__ = ['AnnotationSaver']
 
+import mmap
+import os
+import re
 import shutil
-from datetime import datetime
-import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple, Any, Union
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Any, Union
 
 from ..adapters.base_adapter import AdapterType
+from ..public_enums import PipelineStage
 from ..shape import Shape
+from ..utils import JsonCodec, JsonStreamReader, JsonStreamWriter, stage
+from .backup import BackupManager, BackupPolicy
+
+_COLON = re.compile(rb'\s*:\s*')
+# Начало документа: пробелы после открывающей скобки показывают, с отступами ли он записан
+_OPENING = re.compile(rb'\s*\{(\s*)')
+_COMMA = re.compile(rb'\s*,\s*')
+_WS = re.compile(rb'\s*')
 
 
 class AnnotationSaver:
@@ -23,7 +34,8 @@ class AnnotationSaver:
             adapter: AdapterType,
             file_path: Union[str, Path],
             json_data: Any,
-            backup: bool = False) -> None:
+            backup: Union[bool, BackupPolicy] = False,
+            pretty: bool = True) -> None:
         """
             Сохраняет кортеж фигур в файл разметки указанного формата.
             Args:
@@ -31,42 +43,278 @@ class AnnotationSaver:
                 adapter: Строка или элемент Adapters, указывающий формат.
                 file_path: Путь для сохранения файла.
                 json_data: Оригинальный JSON (если есть, для поддержки дополнительных полей).
-                backup: Делать ли резервную копию перед перезаписью (по умолчанию — да).
+                backup: Резервная копия перед перезаписью: True — полная копия рядом с файлом,
+                        BackupPolicy — способ, каталог и retention копий (см. BackupPolicy).
+                pretty: True — JSON с отступом в 2 пробела, False — компактный JSON без пробелов.
             Raises:
                 NotImplementedError: Если адаптер не реализует метод shapes_to_json.
                 ValueError: Если адаптер не найден.
         """
         if not hasattr(adapter, "shapes_to_json"):
             raise NotImplementedError(f"{adapter.__name__} must implement shapes_to_json()")
-        if backup:
-            AnnotationSaver._make_backup(file_path)
-        new_json = adapter.shapes_to_json(json_data, shapes)
-        AnnotationSaver._write_json_to_file(new_json, file_path)
+        with stage(PipelineStage.SAVE, shapes=len(shapes)):
+            with stage(PipelineStage.TO_JSON, shapes=len(shapes)):
+                new_json = adapter.shapes_to_json(json_data, shapes)
+            backup_path = AnnotationSaver._make_backup(file_path, backup) if backup else None
+            AnnotationSaver._write_json_to_file(new_json, file_path, pretty=pretty, mode_from=backup_path)
+
+    @staticmethod
+    def save_stream(
+            shapes: Iterable[Shape],
+            adapter: AdapterType,
+            file_path: Union[str, Path],
+            json_data: Any = None,
+            backup: Union[bool, BackupPolicy] = False,
+            pretty: bool = True,
+            source: Union[str, Path, None] = None,
+            source_state: Optional[Tuple[int, int]] = None) -> int:
+        """
+            Потоковое сохранение: поля заголовка пишутся как есть, а список фигур (adapter.items_key) —
+            поэлементно по мере обхода shapes. Весь документ в памяти не собирается: shapes может быть генератором,
+            а json_data — только заголовком (см. read_header). Файл пишется во временный и подменяется атомарно,
+            так что при ошибке посреди записи прежний файл остаётся целым.
+            С source (файл, из которого прочитан json_data, не изменённый с тех пор) и заголовком, который адаптер
+            вернул без изменений (те же объекты, что в json_data), всё, кроме списка фигур, копируется байтами
+            из source без декодирования и перекодирования — стоимость сохранения определяется списком фигур.
+            Перенос выполняется, только если форматирование source совпадает с pretty (отступы или компактный JSON),
+            иначе документ сериализуется заново.
+            Args:
+                shapes: Фигуры (любой итерируемый объект).
+                adapter: Класс адаптера с items_key и iter_json.
+                file_path: Путь для сохранения файла.
+                json_data: Оригинальный json или его заголовок (None — пустой).
+                backup: Резервная копия перед перезаписью (True или BackupPolicy, см. save).
+                pretty: True — JSON с отступом в 2 пробела, False — компактный JSON.
+                source: Исходный файл json_data для побайтового переноса неизменённых секций.
+                source_state: (size, mtime_ns) source в момент чтения json_data; если файл с тех пор изменился,
+                              перенос не выполняется.
+            Returns:
+                int: Число записанных фигур.
+            Raises:
+                NotImplementedError: Если адаптер не поддерживает потоковую запись (нет items_key).
+        """
+        items_key = getattr(adapter, "items_key", "")
+        if not items_key:
+            raise NotImplementedError(f"{adapter.__name__} does not support streaming save (no items_key)")
+        with stage(PipelineStage.SAVE) as timer:
+            count = AnnotationSaver._save_stream(shapes, adapter, file_path, json_data, backup, pretty, source,
+                                                 source_state, items_key)
+            timer.set(shapes=count)
+        return count
+
+    @staticmethod
+    def _save_stream(shapes: Iterable[Shape],
+                     adapter: AdapterType,
+                     file_path: Union[str, Path],
+                     json_data: Any,
+                     backup: Union[bool, BackupPolicy],
+                     pretty: bool,
+                     source: Union[str, Path, None],
+                     source_state: Optional[Tuple[int, int]],
+                     items_key: str) -> int:
+        """ Тело save_stream. Сериализация фигур идёт вместе с записью и замеряется как этап WRITE. """
+        header, items = adapter.iter_json(json_data, shapes)
+        span = None
+        if source is not None and AnnotationSaver._header_untouched(header, json_data, items_key):
+            span = AnnotationSaver._items_span(source, list(json_data), items_key, pretty, source_state)
+        backup_path = AnnotationSaver._make_backup(file_path, backup) if backup else None
+        if span is not None and backup_path is not None and not os.path.exists(source):
+            # BackupStrategy.RENAME: исходный файл теперь лежит под именем копии
+            source = backup_path
+        with stage(PipelineStage.WRITE) as timer, \
+                AnnotationSaver._open_atomic(file_path, mode_from=backup_path) as f:
+            writer = JsonStreamWriter(f, pretty=pretty)
+            if span is not None:
+                with open(source, "rb") as src:
+                    AnnotationSaver._copy_range(src, f, 0, span[0])
+                    count = writer.write_items(items)
+                    AnnotationSaver._copy_range(src, f, span[1], None)
+            else:
+                count = None
+                for key, value in header.items():
+                    if key == items_key:
+                        count = writer.write_array(key, items)
+                    else:
+                        writer.write_field(key, value)
+                if count is None:
+                    count = writer.write_array(items_key, items)
+                writer.close()
+            timer.set(nbytes=f.tell(), shapes=count)
+        return count
+
+    @staticmethod
+    def read_header(file_path: Union[str, Path], items_key: str) -> Dict[str, Any]:
+        """
+            Читает JSON-документ без списка items_key (он пропускается без декодирования потоковым читателем).
+            Место пропущенного ключа сохраняется пустым списком, чтобы save_stream сохранил порядок полей.
+            Args:
+                file_path: Путь к JSON-файлу.
+                items_key: Ключ списка фигур ("annotations", "shapes", ...).
+            Returns:
+                dict: Заголовок документа.
+        """
+        header: Dict[str, Any] = {}
+        with open(file_path, "rb") as f:
+            reader = JsonStreamReader(f)
+            for key in reader.iter_object():
+                if key == items_key:
+                    reader.skip_value()
+                    header[key] = []
+                else:
+                    header[key] = reader.read_value()
+        return header
+
+    @staticmethod
+    def _header_untouched(header: Dict[str, Any], json_data: Any, items_key: str) -> bool:
+        """ True, если адаптер вернул поля оригинала без изменений: те же ключи в том же порядке и те же объекты. """
+        if not isinstance(json_data, dict) or items_key not in json_data or list(header) != list(json_data):
+            return False
+        return all(value is json_data[key] for key, value in header.items() if key != items_key)
+
+    @staticmethod
+    def _items_span(file_path: Union[str, Path],
+                    keys: Sequence[str],
+                    items_key: str,
+                    pretty: bool,
+                    state: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int]]:
+        """
+            Байтовый диапазон значения списка фигур верхнего уровня в файле или None, если переносить байты нельзя.
+            Границы ищутся поиском байтов, без обхода и декодирования документа: начало — за единственным
+            вхождением ключа items_key, конец — перед единственным вхождением следующего ключа верхнего уровня
+            (или перед закрывающей скобкой документа, если список последний). Оба ключа в файле точно есть
+            (их содержит json_data, прочитанный из этого файла), поэтому единственные вхождения — это они.
+            Неизменность файла проверяется по state, а не сравнением содержимого.
+            Args:
+                file_path: Исходный файл.
+                keys: Ключи верхнего уровня json_data в порядке файла.
+                items_key: Ключ списка фигур.
+                pretty: Требуемое форматирование; файл в другом форматировании не переносится.
+                state: Ожидаемые (size, mtime_ns) файла; None — без проверки.
+        """
+        keys = list(keys)
+        following = keys[keys.index(items_key) + 1:]
+        try:
+            with open(file_path, "rb") as f:
+                if state is not None:
+                    stat = os.fstat(f.fileno())
+                    if (stat.st_size, stat.st_mtime_ns) != tuple(state):
+                        return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    opening = _OPENING.match(mm)
+                    position = AnnotationSaver._unique(mm, items_key)
+                    if opening is None or position is None:
+                        return None
+                    colon = _COLON.match(mm, position)
+                    if colon is None:
+                        return None
+                    if pretty:
+                        # Отступ в 2 пробела, как у JsonStreamWriter: иначе вставленный список выбился бы из файла
+                        layout_matches = opening.group(1) == b"\n  " and colon.group() == b": "
+                    else:
+                        layout_matches = not opening.group(1) and colon.group() == b":"
+                    if not layout_matches or mm[colon.end():colon.end() + 1] != b"[":
+                        return None
+                    if following:
+                        limit = AnnotationSaver._unique(mm, following[0])
+                        if limit is None:
+                            return None
+                        limit -= len(JsonCodec.dumps(following[0], pretty=False))
+                        separator = _COMMA
+                    else:
+                        limit = mm.rfind(b"}")
+                        separator = _WS
+                    end = mm.rfind(b"]", colon.end(), limit) + 1
+                    if end <= colon.end() or not separator.fullmatch(mm, end, limit):
+                        return None
+        except (OSError, ValueError):
+            return None
+        return colon.end(), end
+
+    @staticmethod
+    def _unique(mm: mmap.mmap, key: str) -> Optional[int]:
+        """ Позиция сразу за ключом key (строкой JSON), если он встречается в файле ровно один раз, иначе None. """
+        token = JsonCodec.dumps(key, pretty=False)
+        position = mm.find(token)
+        if position < 0 or mm.find(token, position + 1) >= 0:
+            return None
+        return position + len(token)
+
+    @staticmethod
+    def _copy_range(src: BinaryIO, dst: BinaryIO, start: int, end: Optional[int], chunk_size: int = 1 << 20) -> None:
+        """ Копирует байты [start, end) из src в dst блоками (end=None — до конца файла). """
+        src.seek(start)
+        remaining = None if end is None else end - start
+        while remaining is None or remaining > 0:
+            chunk = src.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                if remaining:
+                    raise OSError("Исходный файл укорочен во время сохранения")
+                return
+            dst.write(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    @staticmethod
+    @contextmanager
+    def _open_atomic(file_path: Union[str, Path], mode_from: Union[str, Path, None] = None) -> Iterator[BinaryIO]:
+        """
+            Файл на запись рядом с целевым; после успешной записи подменяет целевой через os.replace.
+            Права берутся у прежнего файла, а если его нет — у mode_from (копия после BackupStrategy.RENAME).
+        """
+        path = Path(file_path)
+        tmp_path = path.with_name(f".{path.name}.{os.urandom(6).hex()}.tmp")
+        # Права как у обычного open(..., "wb") (0666 с учётом umask), а не 0600, как у mkstemp
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            if path.exists():
+                shutil.copymode(path, tmp_path)
+            elif mode_from is not None and os.path.exists(mode_from):
+                shutil.copymode(mode_from, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
     @staticmethod
-    def _make_backup(path: Union[str, Path]) -> None:
+    def _make_backup(path: Union[str, Path], policy: Union[bool, BackupPolicy, None] = True) -> Optional[Path]:
         """
             Создаёт резервную копию файла с добавлением временной метки к имени.
             Args:
                 path: Путь к исходному файлу для резервирования.
+                policy: True — полная копия рядом с файлом, BackupPolicy — по её настройкам.
+            Returns:
+                Optional[Path]: Путь копии или None, если файла нет.
             Raises:
                 OSError: если не удалось скопировать файл.
         """
-        orig_path = Path(path)
-        if orig_path.exists():
-            backup_path = orig_path.with_name(
-                f"{orig_path.stem}_backup_{datetime.now():%Y%m%d_%H%M%S}{orig_path.suffix}")
-            shutil.copy2(orig_path, backup_path)
+        manager = BackupManager.resolve(policy)
+        if manager is None:
+            return None
+        with stage(PipelineStage.BACKUP):
+            return manager.backup(path)
 
     @staticmethod
-    def _write_json_to_file(data: dict, file_path: str | Path) -> None:
+    def _write_json_to_file(data: dict, file_path: str | Path, pretty: bool = True,
+                            mode_from: Union[str, Path, None] = None) -> None:
         """
-            Записывает словарь (json-объект) в файл в формате JSON.
+            Записывает словарь (json-объект) в файл в формате JSON через JsonCodec.
+            Запись атомарная (см. _open_atomic): жёсткие ссылки на прежний файл (копии HARDLINK/DEDUP) не меняются.
             Args:
                 data (dict): Данные для сохранения.
                 file_path (str | Path): Куда писать.
+                pretty (bool): True — с отступами, False — компактно.
+                mode_from: Файл, права которого взять, если file_path ещё не существует.
             Raises:
                 OSError: при ошибках доступа к файлу.
         """
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with stage(PipelineStage.ENCODE) as timer:
+            payload = JsonCodec.dumps(data, pretty=pretty)
+            timer.set(nbytes=len(payload))
+        with stage(PipelineStage.WRITE, nbytes=len(payload)), \
+                AnnotationSaver._open_atomic(file_path, mode_from=mode_from) as f:
+            f.write(payload)
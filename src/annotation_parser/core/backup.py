@@ -0,0 +1,278 @@
+__all__ = ['BackupPolicy', 'BackupManager']
+
+import errno
+import hashlib
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from ..public_enums import BackupStrategy
+
+# Имя резервной копии: <stem>_backup_<YYYYmmdd_HHMMSS[_ffffff]><suffix> (формат без микросекунд — от прежних версий)
+_STAMP = re.compile(r"_backup_(\d{8}_\d{6})(?:_(\d{6}))?")
+_STORE_DIR = ".annotation_backups"
+# ioctl FICLONE (Linux): reflink-копия файла на btrfs/xfs/... без копирования данных
+_FICLONE = 0x40049409
+
+
+@dataclass(frozen=True, slots=True)
+class BackupPolicy:
+    """
+        Настройки резервного копирования при сохранении разметки.
+        Args:
+            strategy (BackupStrategy): Способ создания копии:
+                COPY — полная копия (shutil.copy2, как раньше);
+                RENAME — исходный файл переименовывается в копию, новый пишется на его место (без копирования данных);
+                HARDLINK — жёсткая ссылка на исходный файл (запись идёт в новый файл, старый inode остаётся копией);
+                REFLINK — copy-on-write копия там, где ФС это умеет (btrfs, xfs), иначе обычная копия;
+                DEDUP — контентно-адресуемое хранилище: одинаковые версии хранятся один раз,
+                        копия, совпадающая с последней, не создаётся.
+            directory (Path, optional): Каталог копий. None — рядом с файлом
+                (для DEDUP — подкаталог .annotation_backups рядом с файлом).
+            keep_last (int, optional): Сколько последних копий файла хранить.
+            max_age (float, optional): Максимальный возраст копии в секундах.
+            max_bytes (int, optional): Предельный общий объём копий файла (уникальное содержимое для DEDUP).
+        Ограничения retention применяются вместе, за один проход после каждой новой копии (см. BackupManager.prune).
+    """
+    strategy: BackupStrategy = BackupStrategy.COPY
+    directory: Optional[Path] = None
+    keep_last: Optional[int] = None
+    max_age: Optional[float] = None
+    max_bytes: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'strategy', BackupStrategy(self.strategy))
+        if self.directory is not None:
+            object.__setattr__(self, 'directory', Path(self.directory))
+        for name in ('keep_last', 'max_age', 'max_bytes'):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must be >= 0, got {value}")
+
+
+class BackupManager:
+    """
+        Резервные копии файлов разметки по BackupPolicy: создание, список версий, восстановление и retention.
+        Копия делается до записи нового содержимого. Запись в AnnotationSaver атомарная (временный файл + os.replace),
+        поэтому HARDLINK и DEDUP не копируют данные: после замены файла старый inode остаётся только у копии.
+        Samples:
+            policy = BackupPolicy(BackupStrategy.DEDUP, keep_last=10, max_age=7 * 86400)
+            save(shapes, 'file.json', 'labelme', backup=policy)
+            BackupManager(policy).versions('file.json')
+    """
+
+    def __init__(self, policy: Optional[BackupPolicy] = None) -> None:
+        self._policy = policy or BackupPolicy()
+
+    @staticmethod
+    def resolve(backup: Union[BackupPolicy, bool, None]) -> Optional["BackupManager"]:
+        """ Приводит аргумент backup (BackupPolicy, True/False, None) к менеджеру копий или None. """
+        if backup is True:
+            return BackupManager()
+        if backup is None or backup is False:
+            return None
+        if not isinstance(backup, BackupPolicy):
+            raise TypeError(f"backup must be BackupPolicy, bool or None, got {type(backup).__name__}")
+        return BackupManager(backup)
+
+    @property
+    def policy(self) -> BackupPolicy:
+        return self._policy
+
+    def backup(self, file_path: Union[str, Path]) -> Optional[Path]:
+        """
+            Создаёт резервную копию файла перед перезаписью и применяет retention.
+            Args:
+                file_path: Путь к файлу.
+            Returns:
+                Optional[Path]: Путь копии (для DEDUP при совпадении с последней версией — путь этой версии)
+                                или None, если файла нет.
+            Raises:
+                OSError: Если не удалось создать копию.
+        """
+        path = Path(file_path)
+        if not path.is_file():
+            return None
+        strategy = self._policy.strategy
+        if strategy is BackupStrategy.DEDUP:
+            target = self._store_version(path)
+        else:
+            target = self._new_version_path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if strategy is BackupStrategy.RENAME:
+                os.replace(path, target)
+            elif strategy is BackupStrategy.HARDLINK:
+                _link_or_copy(path, target)
+            elif strategy is BackupStrategy.REFLINK:
+                _reflink_or_copy(path, target)
+            else:
+                shutil.copy2(path, target)
+        self.prune(path)
+        return target
+
+    def versions(self, file_path: Union[str, Path]) -> List[Path]:
+        """ Резервные копии файла, от старых к новым. """
+        return [entry for entry, _ in self._versions(Path(file_path))]
+
+    def restore(self, file_path: Union[str, Path], version: Union[str, Path, None] = None) -> Path:
+        """
+            Восстанавливает файл из копии (атомарно: временный файл + os.replace). Копия при этом сохраняется.
+            Args:
+                file_path: Путь к файлу.
+                version: Путь копии (см. versions). None — последняя.
+            Returns:
+                Path: Использованная копия.
+            Raises:
+                FileNotFoundError: Если копий нет.
+        """
+        path = Path(file_path)
+        if version is None:
+            versions = self.versions(path)
+            if not versions:
+                raise FileNotFoundError(f"Резервных копий нет: {path}")
+            version = versions[-1]
+        version = Path(version)
+        tmp_path = path.with_name(f".{path.name}.restore.tmp")
+        shutil.copy2(version, tmp_path)
+        os.replace(tmp_path, path)
+        return version
+
+    def prune(self, file_path: Union[str, Path]) -> int:
+        """
+            Применяет retention за один проход по копиям от новых к старым: копия остаётся, только если укладывается
+            во все заданные ограничения (keep_last, max_age, max_bytes). Для DEDUP удаляются и объекты хранилища,
+            на которые больше не ссылается ни одна версия.
+            Returns:
+                int: Число удалённых копий.
+        """
+        policy = self._policy
+        if policy.keep_last is None and policy.max_age is None and policy.max_bytes is None:
+            return 0
+        now = time.time()
+        kept = 0
+        total = 0
+        seen = set()
+        removed = 0
+        for entry, stamp in reversed(self._versions(Path(file_path))):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            # Версии DEDUP с одинаковым содержимым — ссылки на один объект: объём считается один раз
+            key = (stat.st_dev, stat.st_ino)
+            size = 0 if key in seen else stat.st_size
+            keep = ((policy.keep_last is None or kept < policy.keep_last)
+                    and (policy.max_age is None or now - stamp <= policy.max_age)
+                    and (policy.max_bytes is None or total + size <= policy.max_bytes))
+            if keep:
+                kept += 1
+                total += size
+                seen.add(key)
+                continue
+            obj = self._object_of(entry) if policy.strategy is BackupStrategy.DEDUP else None
+            entry.unlink()
+            removed += 1
+            # Объект хранилища удаляется вместе с последней ссылающейся на него версией
+            if obj is not None and obj.exists() and obj.stat().st_nlink <= 1:
+                obj.unlink()
+        return removed
+
+    def _directory(self, path: Path) -> Path:
+        if self._policy.strategy is BackupStrategy.DEDUP:
+            store = self._policy.directory or path.parent / _STORE_DIR
+            # Версии каждого файла — в своём подкаталоге хранилища (имя + хэш полного пути)
+            return store / "versions" / f"{path.name}-{_sha256(str(path.resolve()).encode())[:12]}"
+        return self._policy.directory or path.parent
+
+    def _new_version_path(self, path: Path) -> Path:
+        directory = self._directory(path)
+        stamp = datetime.now()
+        while True:
+            target = directory / f"{path.stem}_backup_{stamp:%Y%m%d_%H%M%S_%f}{path.suffix}"
+            if not target.exists():
+                return target
+            stamp = datetime.fromtimestamp(stamp.timestamp() + 1e-6)
+
+    def _versions(self, path: Path) -> List[Tuple[Path, float]]:
+        """ (копия, время создания по имени) от старых к новым. """
+        directory = self._directory(path)
+        if not directory.is_dir():
+            return []
+        prefix = f"{path.stem}_backup_"
+        result = []
+        for entry in directory.iterdir():
+            name = entry.name
+            if not (name.startswith(prefix) and name.endswith(path.suffix)):
+                continue
+            match = _STAMP.fullmatch(name[len(path.stem):len(name) - len(path.suffix)])
+            if match is None:
+                continue
+            stamp = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+            result.append((entry, stamp + int(match.group(2) or 0) / 1e6))
+        result.sort(key=lambda item: item[1])
+        return result
+
+    def _store_version(self, path: Path) -> Path:
+        """ DEDUP: кладёт содержимое в хранилище объектов (если его там нет) и добавляет версию-ссылку на объект. """
+        digest = _file_sha256(path)
+        store = self._policy.directory or path.parent / _STORE_DIR
+        obj = store / "objects" / digest[:2] / digest
+        versions = self._versions(path)
+        if versions and obj.exists() and os.path.samefile(versions[-1][0], obj):
+            # Содержимое совпадает с последней версией — новая копия не нужна
+            return versions[-1][0]
+        if not obj.exists():
+            # Объект — копия, а не ссылка на рабочий файл: правка файла на месте не должна менять историю
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            _reflink_or_copy(path, obj)
+        target = self._new_version_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(obj, target)
+        except OSError:
+            # ФС без жёстких ссылок: версия хранится копией (дедупликация теряется, но копия корректна)
+            _reflink_or_copy(obj, target)
+        return target
+
+    @staticmethod
+    def _object_of(entry: Path) -> Path:
+        """ Объект хранилища DEDUP для версии: <store>/versions/<file>/<version> -> <store>/objects/<hh>/<sha256>. """
+        digest = _file_sha256(entry)
+        return entry.parents[2] / "objects" / digest[:2] / digest
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno == errno.EEXIST:
+            raise
+        # Другой диск или ФС без жёстких ссылок
+        _reflink_or_copy(src, dst)
+
+
+def _reflink_or_copy(src: Path, dst: Path) -> None:
+    try:
+        import fcntl
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+    except (ImportError, OSError):
+        shutil.copy2(src, dst)
+
+
+def _file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
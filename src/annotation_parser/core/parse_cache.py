@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+__all__ = ['ParseCache']
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from ..public_enums import ValidationMode
+from ..utils import to_point
+from ..version import __version__
+
+if TYPE_CHECKING:
+    from ..shape_batch import ShapeBatch
+
+_SUFFIX = ".pkl"
+_ENV_DIR = "ANNOTATION_PARSER_CACHE_DIR"
+
+
+class ParseCache:
+    """
+        Дисковый кэш результатов парсинга файлов разметки.
+        Ключ — отпечаток файла: (абсолютный путь, размер, mtime_ns, имя адаптера, версия библиотеки)
+        плюс параметры парсинга, влияющие на результат (shift_point, validate).
+        Запись лежит в <directory>/<hh>/<хэш пути>-<хэш версии файла>-<хэш адаптера и параметров>.pkl.
+        Значение — ShapeBatch, сериализованный pickle (компактные numpy-колонки).
+        Изменённый файл получает новый ключ, а старые записи того же пути удаляются при записи новой.
+        Общий объём ограничен max_bytes: при превышении удаляются давно не читанные записи (LRU по mtime записи).
+        Samples:
+            cache = ParseCache("/tmp/annotation-cache")
+            shapes = parse("file.json", "labelme", cache=cache)   # холодный прогон: парсинг и запись
+            shapes = parse("file.json", "labelme", cache=cache)   # тёплый прогон: чтение из кэша
+            cache.invalidate("file.json"); cache.clear()
+    """
+
+    _default: Optional["ParseCache"] = None
+
+    def __init__(self, directory: Union[str, Path, None] = None, max_bytes: int = 1 << 30) -> None:
+        """
+            Args:
+                directory: Каталог кэша. None — $ANNOTATION_PARSER_CACHE_DIR или ~/.cache/annotation_parser.
+                max_bytes: Предельный объём кэша в байтах.
+        """
+        if directory is None:
+            directory = os.environ.get(_ENV_DIR) or Path.home() / ".cache" / "annotation_parser"
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default() -> "ParseCache":
+        """ Общий кэш процесса в каталоге по умолчанию (используется при cache=True). """
+        if ParseCache._default is None:
+            ParseCache._default = ParseCache()
+        return ParseCache._default
+
+    @staticmethod
+    def resolve(cache: Union["ParseCache", bool, None]) -> Optional["ParseCache"]:
+        """ Приводит аргумент cache (ParseCache, True/False, None) к объекту кэша или None. """
+        if cache is True:
+            return ParseCache.default()
+        if cache is None or cache is False:
+            return None
+        if not isinstance(cache, ParseCache):
+            raise TypeError(f"cache must be ParseCache, bool or None, got {type(cache).__name__}")
+        return cache
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def key(self,
+            file_path: Union[str, Path],
+            adapter_name: str,
+            shift_point: Any = None,
+            validate: ValidationMode | str = ValidationMode.FULL,
+            state: Optional[Tuple[int, int]] = None) -> Optional[Path]:
+        """
+            Путь записи кэша для текущей версии файла (по stat файла).
+            Ключ стоит брать до чтения файла: если файл изменится во время парсинга, результат
+            сохранится под старым отпечатком и не будет выдан для новой версии.
+            Args:
+                state: (size, mtime_ns) файла, если stat уже сделан вызывающим; None — stat берётся здесь.
+            Returns:
+                Optional[Path]: Путь записи или None, если параметры не поддаются кэшированию (например, shift_point-функция).
+            Raises:
+                FileNotFoundError: Если файла разметки нет.
+        """
+        options = self._options_key(shift_point, validate)
+        if options is None:
+            return None
+        path = os.path.abspath(file_path)
+        if state is None:
+            stat = os.stat(path)
+            state = stat.st_size, stat.st_mtime_ns
+        # Имя записи: <путь>-<версия файла и библиотеки>-<адаптер и параметры>
+        path_hash = self._path_hash(path)
+        state_hash = _sha1(repr((*state, __version__)))[:16]
+        options_hash = _sha1(repr((adapter_name, options)))[:16]
+        return self._directory / path_hash[:2] / f"{path_hash}-{state_hash}-{options_hash}{_SUFFIX}"
+
+    def get(self,
+            file_path: Union[str, Path],
+            adapter_name: str,
+            shift_point: Any = None,
+            validate: ValidationMode | str = ValidationMode.FULL) -> Optional[ShapeBatch]:
+        """
+            Возвращает закэшированный результат парсинга или None (нет записи, файл изменился, запись повреждена).
+            Raises:
+                FileNotFoundError: Если файла разметки нет.
+        """
+        return self.load(self.key(file_path, adapter_name, shift_point, validate))
+
+    def put(self,
+            file_path: Union[str, Path],
+            adapter_name: str,
+            batch: ShapeBatch,
+            shift_point: Any = None,
+            validate: ValidationMode | str = ValidationMode.FULL) -> bool:
+        """
+            Сохраняет результат парсинга файла. См. store.
+            Returns:
+                bool: True — запись сохранена; False — параметры не поддаются кэшированию.
+        """
+        return self.store(self.key(file_path, adapter_name, shift_point, validate), batch)
+
+    def load(self, entry: Optional[Path]) -> Optional[ShapeBatch]:
+        """ Читает запись по ключу (см. key); None — промах. """
+        if entry is None:
+            return None
+        try:
+            with open(entry, "rb") as f:
+                batch = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Повреждённая или несовместимая запись — удаляем и считаем промахом
+            self._remove(entry)
+            return None
+        from ..shape_batch import ShapeBatch
+        if not isinstance(batch, ShapeBatch):
+            self._remove(entry)
+            return None
+        try:
+            # Время доступа для LRU: отмечаем чтение через mtime записи
+            os.utime(entry)
+        except OSError:
+            pass
+        return batch
+
+    def store(self, entry: Optional[Path], batch: ShapeBatch) -> bool:
+        """
+            Сохраняет запись по ключу (см. key) атомарно: временный файл + os.replace.
+            Записи того же пути от прошлых версий файла удаляются; при превышении max_bytes запускается evict.
+            Returns:
+                bool: True — запись сохранена; False — ключ None (не кэшируется).
+        """
+        if entry is None:
+            return False
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            self._remove(Path(tmp_path))
+            raise
+        freed = self._remove_stale(entry)
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data) - freed
+        if self._current_size() > self._max_bytes:
+            self.evict()
+        return True
+
+    def invalidate(self, file_path: Union[str, Path]) -> int:
+        """
+            Удаляет все записи для файла (любые версии, адаптеры и параметры).
+            Returns:
+                int: Число удалённых записей.
+        """
+        path_hash = self._path_hash(file_path)
+        entries = list((self._directory / path_hash[:2]).glob(f"{path_hash}-*{_SUFFIX}"))
+        freed = sum(self._remove(entry) for entry in entries)
+        with self._lock:
+            if self._size is not None:
+                self._size -= freed
+        return len(entries)
+
+    def clear(self) -> None:
+        """ Удаляет все записи кэша. """
+        for entry, _, _ in self._scan():
+            self._remove(entry)
+        with self._lock:
+            self._size = 0
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """
+            Удаляет давно не читанные записи, пока объём кэша не станет не больше target_bytes.
+            Args:
+                target_bytes: Целевой объём. None — 90% от max_bytes (запас, чтобы не вытеснять на каждой записи).
+            Returns:
+                int: Число удалённых записей.
+        """
+        if target_bytes is None:
+            target_bytes = self._max_bytes * 9 // 10
+        entries = sorted(self._scan(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for entry, size, _ in entries:
+            if total <= target_bytes:
+                break
+            total -= self._remove(entry) or size
+            removed += 1
+        with self._lock:
+            self._size = total
+        return removed
+
+    def size(self) -> int:
+        """ Текущий объём записей кэша в байтах. """
+        return sum(size for _, size, _ in self._scan())
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Для передачи в процессы-воркеры parse_many: блокировка и счётчик объёма локальны для процесса
+        return {'_directory': self._directory, '_max_bytes': self._max_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._size = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ParseCache(directory={str(self._directory)!r}, max_bytes={self._max_bytes})"
+
+    @staticmethod
+    def _options_key(shift_point: Any, validate: ValidationMode | str) -> Optional[Tuple[Any, ...]]:
+        try:
+            point = to_point(shift_point)
+        except TypeError:
+            return None
+        return (None if point is None else (point.x, point.y)), ValidationMode(validate).value
+
+    @staticmethod
+    def _path_hash(file_path: Union[str, Path]) -> str:
+        return _sha1(os.path.abspath(file_path))
+
+    def _remove_stale(self, entry: Path) -> int:
+        """ Удаляет записи того же пути от других версий файла (любых параметров). Возвращает освобождённые байты. """
+        path_hash, state_hash, _ = entry.name.split("-", 2)
+        freed = 0
+        for other in entry.parent.glob(f"{path_hash}-*{_SUFFIX}"):
+            if other.name.split("-", 2)[1] != state_hash:
+                freed += self._remove(other)
+        return freed
+
+    def _current_size(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            return self._size
+
+    def _scan(self) -> List[Tuple[Path, int, int]]:
+        """ Все записи кэша: (путь, размер, mtime_ns). """
+        entries = []
+        if not self._directory.is_dir():
+            return entries
+        for sub in os.scandir(self._directory):
+            if not sub.is_dir():
+                continue
+            for item in os.scandir(sub.path):
+                if item.name.endswith(_SUFFIX):
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((Path(item.path), stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    @staticmethod
+    def _remove(entry: Path) -> int:
+        """ Удаляет файл записи; возвращает его размер (0, если файла уже нет). """
+        try:
+            size = entry.stat().st_size
+            entry.unlink()
+            return size
+        except OSError:
+            return 0
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
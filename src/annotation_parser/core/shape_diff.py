@@ -0,0 +1,105 @@
+__all__ = ['ShapeDiff']
+
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from ..shape import Shape
+
+
+@dataclass(frozen=True, slots=True)
+class ShapeDiff:
+    """
+        Разница между двумя версиями фигур файла разметки (см. AnnotationFile.refresh).
+        Args:
+            added (Tuple[Shape, ...]): Новые фигуры.
+            removed (Tuple[Shape, ...]): Удалённые фигуры (объекты прежней версии).
+            modified (Tuple[Tuple[Shape, Shape], ...]): Пары (было, стало) для фигур с тем же label, number
+                и wz_number, у которых изменилось содержимое (координаты, тип, flags, meta, ...).
+            unchanged (int): Число фигур без изменений (в новой версии это те же объекты Shape, что в прежней).
+    """
+    added: Tuple[Shape, ...] = ()
+    removed: Tuple[Shape, ...] = ()
+    modified: Tuple[Tuple[Shape, Shape], ...] = ()
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """ True, если есть добавленные, удалённые или изменённые фигуры. """
+        return bool(self.added or self.removed or self.modified)
+
+    def __bool__(self) -> bool:
+        return self.changed
+
+    @staticmethod
+    def compute(old: Sequence[Shape], new: Sequence[Shape]) -> Tuple["ShapeDiff", Tuple[Shape, ...]]:
+        """
+            Сравнивает версии и собирает новую версию с переиспользованием неизменённых объектов.
+            Фигура без изменений — равная (==) фигуре прежней версии; каждая прежняя фигура сопоставляется
+            не более одного раза. Оставшиеся фигуры с одинаковыми (label, number, wz_number) попарно, по порядку
+            в файле, считаются изменёнными; остальные — добавленными или удалёнными.
+            Args:
+                old: Фигуры прежней версии.
+                new: Фигуры новой версии (в порядке файла).
+            Returns:
+                Tuple[ShapeDiff, Tuple[Shape, ...]]: Разница и фигуры новой версии в порядке new, где на местах
+                неизменённых фигур стоят объекты из old.
+        """
+        candidates: Dict[Hashable, List[int]] = {}
+        for i, shape in enumerate(old):
+            candidates.setdefault(_content_key(shape), []).append(i)
+        matched = [False] * len(old)
+        merged: List[Shape] = list(new)
+        unmatched_new: List[int] = []
+        for j, shape in enumerate(new):
+            bucket = candidates.get(_content_key(shape))
+            found = _pop_equal(bucket, old, shape) if bucket else None
+            if found is None:
+                unmatched_new.append(j)
+                continue
+            matched[found] = True
+            merged[j] = old[found]
+
+        # Несопоставленные прежние фигуры по «идентичности» — кандидаты в изменённые
+        by_identity: Dict[Hashable, List[int]] = {}
+        for i, shape in enumerate(old):
+            if not matched[i]:
+                by_identity.setdefault(_identity(shape), []).append(i)
+        added: List[Shape] = []
+        modified: List[Tuple[Shape, Shape]] = []
+        for j in unmatched_new:
+            shape = new[j]
+            previous = by_identity.get(_identity(shape))
+            if previous:
+                i = previous.pop(0)
+                matched[i] = True
+                modified.append((old[i], shape))
+            else:
+                added.append(shape)
+        removed = tuple(shape for i, shape in enumerate(old) if not matched[i])
+        diff = ShapeDiff(added=tuple(added), removed=removed, modified=tuple(modified),
+                         unchanged=len(new) - len(unmatched_new))
+        return diff, tuple(merged)
+
+
+def _content_key(shape: Shape) -> Hashable:
+    """ Дешёвый ключ для поиска равных фигур: полное сравнение (==) выполняется только внутри корзины. """
+    coords = shape.coords
+    n = len(coords)
+    ends = (_point(coords[0]), _point(coords[-1])) if n else ()
+    return getattr(shape.type, 'value', shape.type), shape.label, shape.number, shape.wz_number, n, ends
+
+
+def _identity(shape: Shape) -> Hashable:
+    return shape.label, shape.number, shape.wz_number
+
+
+def _point(point: Any) -> Tuple[float, float]:
+    return float(point[0]), float(point[1])
+
+
+def _pop_equal(bucket: List[int], old: Sequence[Shape], shape: Shape) -> Optional[int]:
+    for position, i in enumerate(bucket):
+        if old[i] == shape:
+            del bucket[position]
+            return i
+    return None
@@ -0,0 +1,6 @@
+from ..utils.lazy_import import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.spatial_index': ('ShapeSpatialIndex',),
+    '.shape_index': ('ShapeIndex',),
+})
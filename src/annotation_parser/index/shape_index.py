@@ -0,0 +1,185 @@
+__all__ = ['ShapeIndex']
+
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..public_enums import ShapeType
+from ..shape import Shape
+from ..shape_batch import ShapeBatch, MISSING
+
+ShapesInput = Union[Sequence[Shape], ShapeBatch]
+
+
+class _Any:
+    """ Маркер «поле не фильтруется» (None — допустимое значение number/wz_number). """
+
+    def __repr__(self) -> str:
+        return 'ANY'
+
+
+ANY = _Any()
+# Сколько результатов select хранить; при переполнении кэш очищается целиком
+_RESULT_CACHE_SIZE = 4096
+
+
+class ShapeIndex:
+    """
+        Индекс фигур по атрибутам: фигуры один раз раскладываются по корзинам label, number, wz_number, type
+        и individual/common, после чего выборки (в том числе комбинированные) отвечают по корзинам,
+        без полного прохода по фигурам. Результаты повторных одинаковых запросов кэшируются.
+        Функции get_shapes_by_label / get_shapes_by_number / get_shapes_by_wz_number / filter_shapes
+        принимают ShapeIndex вместо кортежа фигур и дают тот же результат.
+        Индекс неизменяем: фигуры хранятся кортежем (или ShapeBatch), порядок в выборках — как во входном наборе.
+        Samples:
+            index = ShapeIndex(shapes)
+            get_shapes_by_label(index, 'person')               # то же, что по кортежу, но по корзине
+            index.select(label='zone', wz_number=3, common=False)
+    """
+
+    __slots__ = ('_shapes', '_buckets', '_individual', '_results')
+
+    def __init__(self, shapes: ShapesInput) -> None:
+        """
+            Args:
+                shapes: Фигуры (последовательность Shape/ShapeRow или ShapeBatch).
+        """
+        self._shapes = shapes if isinstance(shapes, ShapeBatch) else tuple(shapes)
+        labels, numbers, wz_numbers, types = _columns(self._shapes)
+        self._buckets: Dict[str, Dict[Hashable, Tuple[int, ...]]] = {
+            'label': _group(labels),
+            'number': _group(numbers),
+            'wz_number': _group(wz_numbers),
+            'type': _group(types),
+        }
+        self._individual: Dict[bool, Tuple[int, ...]] = _group([number is not None for number in numbers])
+        self._results: Dict[Tuple[Any, ...], Tuple[Shape, ...]] = {}
+
+    @property
+    def shapes(self) -> ShapesInput:
+        """ Проиндексированные фигуры (кортеж Shape или ShapeBatch). """
+        return self._shapes
+
+    def keys(self, field: str) -> Tuple[Any, ...]:
+        """ Значения поля ('label', 'number', 'wz_number', 'type'), встречающиеся у фигур. """
+        return tuple(self._buckets[field])
+
+    def count(self, field: str, value: Any) -> int:
+        """ Число фигур с данным значением поля (без прохода по фигурам). """
+        return len(self._buckets[field].get(_key(field, value), ()))
+
+    def indices(self,
+                label: Any = ANY,
+                number: Any = ANY,
+                wz_number: Any = ANY,
+                type: Any = ANY,
+                individual: bool = True,
+                common: bool = True) -> Tuple[int, ...]:
+        """
+            Индексы фигур (по возрастанию), у которых совпадают все заданные поля.
+            Args:
+                label, number, wz_number, type: Значение поля; не указано — поле не фильтруется
+                                                (None для number/wz_number — «значение не задано»).
+                individual: Включать индивидуальные фигуры (с number).
+                common: Включать общие фигуры (без number).
+        """
+        if not individual and not common:
+            return ()
+        selected: List[Tuple[int, ...]] = [
+            self._buckets[field].get(_key(field, value), ())
+            for field, value in (('label', label), ('number', number), ('wz_number', wz_number), ('type', type))
+            if value is not ANY
+        ]
+        if not (individual and common):
+            selected.append(self._individual.get(individual, ()))
+        if not selected:
+            return tuple(range(len(self)))
+        selected.sort(key=len)
+        result = selected[0]
+        # Пересечение от самой маленькой корзины: стоимость определяется размером выборки, а не числом фигур
+        for other in selected[1:]:
+            if not result:
+                break
+            members = frozenset(other)
+            result = tuple(i for i in result if i in members)
+        return result
+
+    def select(self,
+               label: Any = ANY,
+               number: Any = ANY,
+               wz_number: Any = ANY,
+               type: Any = ANY,
+               individual: bool = True,
+               common: bool = True) -> Tuple[Shape, ...]:
+        """
+            Фигуры, у которых совпадают все заданные поля (см. indices), в порядке входного набора.
+            Повторный одинаковый запрос возвращает тот же кортеж из кэша.
+        """
+        key = (label, number, wz_number, type if type is ANY else _key('type', type), individual, common)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Нехешируемое значение поля: оно не может совпасть ни с одной корзиной
+            return ()
+        result = self._take(self.indices(label, number, wz_number, type, individual, common))
+        if len(self._results) >= _RESULT_CACHE_SIZE:
+            self._results.clear()
+        self._results[key] = result
+        return result
+
+    def filter(self,
+               predicate: Callable[[Shape], bool],
+               individual: bool = True,
+               common: bool = True) -> Tuple[Shape, ...]:
+        """ Фигуры, удовлетворяющие предикату; предикат вызывается только для фигур из корзины individual/common. """
+        return tuple(shape for shape in self.select(individual=individual, common=common) if predicate(shape))
+
+    def _take(self, indices: Sequence[int]) -> Tuple[Shape, ...]:
+        # Для ShapeBatch — строки ShapeRow, как при обходе батча функциями shapes_api
+        shapes = self._shapes
+        return tuple(shapes[i] for i in indices)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __iter__(self) -> Iterator[Shape]:
+        return iter(self._shapes)
+
+    def __getitem__(self, index: int) -> Shape:
+        return self._shapes[index]
+
+    def __repr__(self) -> str:
+        return (f"ShapeIndex(shapes={len(self)}, labels={len(self._buckets['label'])}, "
+                f"numbers={len(self._buckets['number'])}, wz_numbers={len(self._buckets['wz_number'])})")
+
+
+def _columns(shapes: ShapesInput) -> Tuple[List[Any], List[Optional[int]], List[Optional[int]], List[ShapeType]]:
+    """ Колонки label, number, wz_number, type (для ShapeBatch — из массивов, без построения строк). """
+    if isinstance(shapes, ShapeBatch):
+        numbers = [None if value == MISSING else value for value in shapes.numbers.tolist()]
+        wz_numbers = [None if value == MISSING else value for value in shapes.wz_numbers.tolist()]
+        return shapes.label_array().tolist(), numbers, wz_numbers, shapes.types.tolist()
+    return ([shape.label for shape in shapes], [shape.number for shape in shapes],
+            [shape.wz_number for shape in shapes], [ShapeType(shape.type) for shape in shapes])
+
+
+def _group(values: Sequence[Hashable]) -> Dict[Hashable, Tuple[int, ...]]:
+    """ Значение -> индексы фигур с ним (по возрастанию). """
+    groups: Dict[Hashable, List[int]] = {}
+    for i, value in enumerate(values):
+        groups.setdefault(value, []).append(i)
+    return {value: tuple(indices) for value, indices in groups.items()}
+
+
+def _key(field: str, value: Any) -> Any:
+    """ Ключ корзины: тип фигуры принимается и строкой ('polygon'), и ShapeType. """
+    if field == 'type' and not isinstance(value, ShapeType):
+        try:
+            return ShapeType(value)
+        except ValueError:
+            return value
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
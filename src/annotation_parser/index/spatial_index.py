@@ -0,0 +1,263 @@
+__all__ = ['ShapeSpatialIndex']
+
+from typing import Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry.base import BaseGeometry
+
+from ..public_enums import ShapeType
+from ..shape import Shape
+from ..shape_batch import ShapeBatch, SHAPE_TYPES
+
+ShapesInput = Union[Sequence[Shape], ShapeBatch]
+# Типы, которые индексируются как площадные фигуры (Polygon), а не как контур
+_AREA_CODES = np.array([SHAPE_TYPES.index(ShapeType.POLYGON), SHAPE_TYPES.index(ShapeType.RECTANGLE)], dtype=np.int8)
+
+
+class ShapeSpatialIndex:
+    """
+        Пространственный индекс (shapely 2 STRtree) над набором фигур: строится один раз, дальше запросы
+        «какие фигуры пересекают прямоугольник», «в какой зоне точка», «ближайшие k фигур» идут по дереву,
+        а не перебором. Пакетные запросы (многие прямоугольники/точки/геометрии за вызов) выполняются в shapely
+        векторно, без цикла Python.
+
+        Геометрия фигуры: polygon/rectangle — Polygon (точка внутри зоны пересекает её), line — LineString,
+        фигура из одной вершины — Point; polygon меньше чем из трёх вершин индексируется как линия,
+        фигура без вершин не индексируется.
+        Результаты — индексы фигур во входном наборе (по возрастанию) или сами фигуры (as_shapes=True).
+        Samples:
+            index = ShapeSpatialIndex(shapes)
+            index.query((0, 0, 100, 100))                  # индексы фигур, пересекающих прямоугольник
+            index.query((15, 20), as_shapes=True)          # зоны, содержащие точку
+            index.nearest((15, 20), k=3)                   # три ближайшие фигуры
+            pairs = index.query_points(points_array)       # (2, K): [номер точки, номер фигуры]
+    """
+
+    __slots__ = ('_shapes', '_geometries', '_tree', '_shifted')
+
+    def __init__(self, shapes: ShapesInput, shifted: bool = False, node_capacity: int = 10) -> None:
+        """
+            Args:
+                shapes: Фигуры (последовательность Shape/ShapeRow или ShapeBatch).
+                shifted: True — индексировать смещённые координаты (shifted_coords), иначе coords.
+                node_capacity: Число элементов в узле STRtree.
+        """
+        self._shapes = shapes if isinstance(shapes, ShapeBatch) else tuple(shapes)
+        self._shifted = shifted
+        self._geometries = _build_geometries(self._shapes, shifted)
+        self._geometries.flags.writeable = False
+        self._tree = STRtree(self._geometries, node_capacity=node_capacity)
+
+    @property
+    def shapes(self) -> ShapesInput:
+        """ Проиндексированные фигуры (кортеж Shape или ShapeBatch). """
+        return self._shapes
+
+    @property
+    def geometries(self) -> np.ndarray:
+        """ shapely-геометрии фигур (dtype=object, None — фигура без вершин), только для чтения. """
+        return self._geometries
+
+    @property
+    def shifted(self) -> bool:
+        return self._shifted
+
+    def __len__(self) -> int:
+        return len(self._geometries)
+
+    def take(self, indices: Union[Sequence[int], np.ndarray]) -> ShapesInput:
+        """ Фигуры по индексам: кортеж Shape или (для ShapeBatch) новый ShapeBatch. """
+        if isinstance(self._shapes, ShapeBatch):
+            return self._shapes.take(indices)
+        return tuple(self._shapes[i] for i in np.asarray(indices, dtype=np.int64).tolist())
+
+    def query(self,
+              geometry: Any,
+              predicate: Optional[str] = "intersects",
+              distance: Optional[float] = None,
+              as_shapes: bool = False) -> Union[np.ndarray, ShapesInput]:
+        """
+            Фигуры, для которых выполняется predicate(geometry, фигура).
+            Args:
+                geometry: shapely-геометрия, прямоугольник (x_min, y_min, x_max, y_max) или точка (x, y).
+                predicate: Предикат shapely ('intersects', 'contains', 'within', 'covers', 'dwithin', ...);
+                           None — только пересечение ограничивающих прямоугольников.
+                distance: Расстояние для predicate='dwithin'.
+                as_shapes: True — вернуть фигуры, иначе индексы.
+            Returns:
+                np.ndarray[int64] | фигуры: Индексы по возрастанию или фигуры в том же порядке.
+        """
+        hits = np.sort(self._tree.query(_to_geometry(geometry), predicate=predicate, distance=distance))
+        return self.take(hits) if as_shapes else hits
+
+    def query_many(self,
+                   geometries: Any,
+                   predicate: Optional[str] = "intersects",
+                   distance: Optional[float] = None) -> np.ndarray:
+        """
+            Пакетный запрос по многим геометриям за один вызов.
+            Args:
+                geometries: Массив/последовательность shapely-геометрий.
+                predicate: См. query.
+                distance: Расстояние для predicate='dwithin'.
+            Returns:
+                np.ndarray: Массив (2, K) int64: [номер входной геометрии, индекс фигуры],
+                            отсортирован по входу, затем по фигуре.
+        """
+        pairs = self._tree.query(np.asarray(geometries, dtype=object), predicate=predicate, distance=distance)
+        return _sort_pairs(pairs)
+
+    def query_boxes(self, boxes: Any, predicate: Optional[str] = "intersects") -> np.ndarray:
+        """ Пакетный запрос по прямоугольникам: boxes — массив (N, 4) [x_min, y_min, x_max, y_max]. См. query_many. """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        return self.query_many(shapely.box(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]), predicate)
+
+    def query_points(self, points: Any, predicate: Optional[str] = "intersects") -> np.ndarray:
+        """
+            Пакетный запрос по точкам: points — массив (N, 2). С predicate='intersects' находит фигуры,
+            содержащие точку (для зон — включая границу). См. query_many.
+        """
+        return self.query_many(shapely.points(np.asarray(points, dtype=np.float64).reshape(-1, 2)), predicate)
+
+    def nearest(self,
+                geometry: Any,
+                k: int = 1,
+                max_distance: Optional[float] = None,
+                as_shapes: bool = False) -> Union[np.ndarray, ShapesInput]:
+        """
+            k ближайших к geometry фигур (расстояние 0 — пересекающие её), от ближней к дальней;
+            при равных расстояниях — по возрастанию индекса.
+            Args:
+                geometry: shapely-геометрия, прямоугольник или точка (см. query).
+                k: Сколько фигур вернуть (меньше, если фигур в индексе или в пределах max_distance меньше).
+                max_distance: Не искать дальше этого расстояния.
+                as_shapes: True — вернуть фигуры, иначе индексы.
+            Returns:
+                np.ndarray[int64] | фигуры: До k индексов или фигур.
+        """
+        indices, _ = self.nearest_with_distance(geometry, k, max_distance)
+        return self.take(indices) if as_shapes else indices
+
+    def nearest_with_distance(self,
+                              geometry: Any,
+                              k: int = 1,
+                              max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """ То же, что nearest, но возвращает (индексы, расстояния). """
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+        geometry = _to_geometry(geometry)
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        found, dist = self._tree.query_nearest(geometry, max_distance=max_distance, return_distance=True)
+        if not len(found):
+            return empty
+        if k > 1:
+            # Радиус растёт, пока в нём не окажется k фигур: тогда k ближайших гарантированно внутри радиуса
+            total = int(np.count_nonzero(~shapely.is_missing(self._geometries)))
+            radius = float(dist[0]) or _scale(self._tree)
+            while True:
+                if max_distance is not None:
+                    radius = min(radius, max_distance)
+                found = self._tree.query(geometry, predicate="dwithin", distance=radius)
+                if len(found) >= min(k, total) or (max_distance is not None and radius >= max_distance):
+                    break
+                radius *= 2
+            dist = shapely.distance(self._geometries[found], geometry)
+        order = np.lexsort((found, dist))[:k]
+        return found[order].astype(np.int64), dist[order]
+
+    def nearest_many(self, geometries: Any, max_distance: Optional[float] = None) -> np.ndarray:
+        """
+            Ближайшая фигура для каждой из многих геометрий (одним вызовом дерева).
+            Args:
+                geometries: Массив shapely-геометрий или точек (N, 2).
+                max_distance: Не искать дальше этого расстояния.
+            Returns:
+                np.ndarray[int64]: Индекс фигуры на каждую входную геометрию, -1 — ничего не найдено.
+                                   При равных расстояниях — меньший индекс.
+        """
+        geometries = _to_geometries(geometries)
+        result = np.full(len(geometries), -1, dtype=np.int64)
+        pairs = _sort_pairs(self._tree.query_nearest(geometries, max_distance=max_distance))
+        if pairs.shape[1]:
+            # all_matches: при равенстве несколько пар на вход; после сортировки первая — с меньшим индексом
+            first = np.unique(pairs[0], return_index=True)[1]
+            result[pairs[0, first]] = pairs[1, first]
+        return result
+
+    def __repr__(self) -> str:
+        return f"ShapeSpatialIndex(shapes={len(self)}, shifted={self._shifted})"
+
+
+def _build_geometries(shapes: ShapesInput, shifted: bool) -> np.ndarray:
+    """ shapely-геометрии всех фигур, построенные векторно по склеенным координатам. """
+    coords, counts, type_codes = _columns(shapes, shifted)
+    geometries = np.full(len(counts), None, dtype=object)
+    area = np.isin(type_codes, _AREA_CODES) & (counts >= 3)
+    point = counts == 1
+    line = ~area & ~point & (counts >= 2)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    for mask, build in ((area, lambda c, i: shapely.polygons(shapely.linearrings(c, indices=i))),
+                        (line, lambda c, i: shapely.linestrings(c, indices=i)),
+                        (point, lambda c, i: shapely.points(c))):
+        selected = np.flatnonzero(mask)
+        if not len(selected):
+            continue
+        vertex_mask = mask[owner]
+        # indices для shapely: номер геометрии внутри группы для каждой вершины
+        group = np.repeat(np.arange(len(selected)), counts[selected])
+        geometries[selected] = build(coords[vertex_mask], group)
+    return geometries
+
+
+def _columns(shapes: ShapesInput, shifted: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Координаты всех фигур подряд (M, 2) float64, число вершин и коды типов фигур. """
+    if isinstance(shapes, ShapeBatch):
+        coords = shapes.coords.astype(np.float64, copy=False)
+        counts = shapes.counts
+        if shifted:
+            points = shapes.column('shift_point')
+            shifts = np.array([(p.x, p.y) if p is not None else (0.0, 0.0) for p in points],
+                              dtype=np.float64).reshape(-1, 2)
+            coords = coords - np.repeat(shifts, counts, axis=0)
+        return coords, counts, shapes.type_codes
+    parts = [np.asarray(shape.shifted_coords if shifted else shape.coords, dtype=np.float64).reshape(-1, 2)
+             for shape in shapes]
+    counts = np.fromiter((len(part) for part in parts), dtype=np.int64, count=len(parts))
+    codes = np.fromiter((SHAPE_TYPES.index(ShapeType(shape.type)) for shape in shapes), dtype=np.int8,
+                        count=len(parts))
+    coords = np.concatenate(parts) if parts else np.empty((0, 2))
+    return coords, counts, codes
+
+
+def _to_geometry(value: Any) -> BaseGeometry:
+    """ shapely-геометрия из геометрии, прямоугольника (x_min, y_min, x_max, y_max) или точки (x, y). """
+    if isinstance(value, BaseGeometry):
+        return value
+    values = np.asarray(value, dtype=np.float64).ravel()
+    if len(values) == 4:
+        return shapely.box(*values)
+    if len(values) == 2:
+        return shapely.Point(*values)
+    raise ValueError(f"Expected a shapely geometry, a box (x_min, y_min, x_max, y_max) or a point (x, y), got {value!r}")
+
+
+def _to_geometries(values: Any) -> np.ndarray:
+    """ Массив shapely-геометрий из последовательности геометрий или массива точек (N, 2). """
+    array = np.asarray(values)
+    if array.dtype != object:
+        return shapely.points(array.astype(np.float64).reshape(-1, 2))
+    return array.ravel()
+
+
+def _sort_pairs(pairs: np.ndarray) -> np.ndarray:
+    order = np.lexsort((pairs[1], pairs[0]))
+    return pairs[:, order].astype(np.int64, copy=False)
+
+
+def _scale(tree: STRtree) -> float:
+    """ Стартовый радиус поиска k ближайших, когда ближайшая фигура пересекает геометрию запроса. """
+    bounds = shapely.total_bounds(tree.geometries)
+    extent = float(np.nanmax(bounds[2:] - bounds[:2])) if np.isfinite(bounds).all() else 0.0
+    return extent * 1e-6 or 1e-9
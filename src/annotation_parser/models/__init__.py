@@ -1,3 +1,8 @@
-from .labelme_model import *
-from .coco_model import *
-from .voc_model import *
+from ..utils.lazy_import import lazy_exports
+
+# Модели pydantic загружаются по формату: адаптеру LabelMe не нужны модели COCO и VOC
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.labelme_model': ('JsonLabelmeShape', 'JsonLabelme', 'LabelmeShapeDict'),
+    '.coco_model': ('JsonCocoAnnotation', 'JsonCoco', 'CocoAnnotationDict'),
+    '.voc_model': ('JsonVocObject', 'JsonVoc', 'VocObjectDict'),
+})
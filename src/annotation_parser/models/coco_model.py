@@ -1,7 +1,8 @@
-__all__ = ['JsonCocoAnnotation', 'JsonCoco']
+__all__ = ['JsonCocoAnnotation', 'JsonCoco', 'CocoAnnotationDict']
 
-from typing import Optional, Any, List, Dict, Union
+from typing import Optional, Any, List, Dict, Union, Tuple
 from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import TypedDict
 
 
 class JsonCocoAnnotation(BaseModel):
@@ -40,3 +41,14 @@ class JsonCoco(BaseModel):
     categories: List[Dict[str, Any]]
 
     model_config = ConfigDict(extra="allow")
+
+
+class CocoAnnotationDict(TypedDict):
+    """
+        Облегчённая схема аннотации COCO для списковой проверки через TypeAdapter (ValidationMode.LIGHT).
+        Проверяет только поля, из которых строится Shape; дополнительные поля игнорируются.
+    """
+    id: int
+    image_id: int
+    category_id: int
+    bbox: Tuple[float, float, float, float]
@@ -1,7 +1,8 @@
-__all__ = ['JsonLabelmeShape', 'JsonLabelme']
+__all__ = ['JsonLabelmeShape', 'JsonLabelme', 'LabelmeShapeDict']
 
-from typing import Optional, Any, List
-from pydantic import BaseModel, ConfigDict
+from typing import Optional, Any, List, Annotated
+from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import TypedDict, NotRequired
 
 
 class JsonLabelmeShape(BaseModel):
@@ -33,3 +34,16 @@ class JsonLabelme(BaseModel):
     fillColor: tuple[int, int, int, int] = (255, 0, 0, 128)
 
     model_config = ConfigDict(extra="allow")
+
+
+class LabelmeShapeDict(TypedDict):
+    """
+        Облегчённая схема фигуры LabelMe для списковой проверки через TypeAdapter (ValidationMode.LIGHT).
+        Проверяет типы ключевых полей и то, что points — список пар чисел; дополнительные поля игнорируются.
+    """
+    label: str
+    points: List[Annotated[List[float], Field(min_length=2, max_length=2)]]
+    shape_type: str
+    group_id: NotRequired[Optional[int]]
+    description: NotRequired[Optional[str]]
+    flags: NotRequired[Optional[dict]]
@@ -1,7 +1,8 @@
-__all__ = ['JsonVocObject', 'JsonVoc']
+__all__ = ['JsonVocObject', 'JsonVoc', 'VocObjectDict']
 
 from typing import List, Optional, Any, Dict
 from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import TypedDict
 
 
 class JsonVocObject(BaseModel):
@@ -38,3 +39,15 @@ class JsonVoc(BaseModel):
     segmented: Optional[int] = None
 
     model_config = ConfigDict(extra="allow")
+
+
+class VocObjectDict(TypedDict):
+    """
+        Облегчённая схема объекта VOC для списковой проверки через TypeAdapter (ValidationMode.LIGHT).
+        Дополнительные поля игнорируются.
+    """
+    name: str
+    bndbox_xmin: float
+    bndbox_ymin: float
+    bndbox_xmax: float
+    bndbox_ymax: float
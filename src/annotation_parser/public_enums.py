@@ -1,4 +1,5 @@
-__all__ = ['ShapeType', 'ShapePosition', 'Adapters']
+__all__ = ['ShapeType', 'ShapePosition', 'Adapters', 'JsonBackend', 'ValidationMode', 'BackupStrategy',
+           'PipelineStage']
 
 from enum import Enum
 
@@ -25,3 +26,41 @@ class ShapeType(str, Enum):
     POINT = 'point'
     POLYGON = 'polygon'
     RECTANGLE = 'rectangle'
+
+
+class JsonBackend(str, Enum):
+    """ Библиотеки для чтения/записи JSON (см. utils.JsonCodec) """
+    ORJSON = 'orjson'
+    UJSON = 'ujson'
+    STDLIB = 'json'
+
+
+class ValidationMode(str, Enum):
+    """ Строгость проверки входных данных при парсинге """
+    NONE = 'none'    # доверенные файлы: Shape строится из сырых dict без проверок и нормализации
+    LIGHT = 'light'  # одна проверка структуры всего списка (TypeAdapter), без pydantic-модели на каждый элемент
+    FULL = 'full'    # pydantic-модель на каждый элемент + нормализация в Shape (по умолчанию)
+
+
+class BackupStrategy(str, Enum):
+    """ Способ создания резервной копии перед перезаписью файла (см. core.backup.BackupPolicy) """
+    COPY = 'copy'          # полная копия (по умолчанию)
+    RENAME = 'rename'      # исходный файл переименовывается в копию, данные не копируются
+    HARDLINK = 'hardlink'  # жёсткая ссылка на прежний файл (запись атомарная, старый inode остаётся копией)
+    REFLINK = 'reflink'    # copy-on-write копия (btrfs, xfs), иначе обычная копия
+    DEDUP = 'dedup'        # контентно-адресуемое хранилище: одинаковые версии хранятся один раз
+
+
+class PipelineStage(str, Enum):
+    """ Этапы парсинга и сохранения, замеряемые инструментированием (см. utils.instrumentation) """
+    PARSE = 'parse'        # весь парсинг файла (включает этапы ниже)
+    READ = 'read'          # чтение байтов файла
+    DECODE = 'decode'      # декодирование JSON (XML для VOC)
+    CACHE = 'cache'        # загрузка фигур из ParseCache
+    VALIDATE = 'validate'  # проверка структуры (pydantic-модели, TypeAdapter)
+    BUILD = 'build'        # построение Shape / ShapeBatch
+    SAVE = 'save'          # всё сохранение файла (включает этапы ниже)
+    TO_JSON = 'to_json'    # adapter.shapes_to_json
+    ENCODE = 'encode'      # сериализация JSON в байты
+    BACKUP = 'backup'      # резервная копия
+    WRITE = 'write'        # запись на диск (при потоковом сохранении — вместе с сериализацией)
@@ -0,0 +1,7 @@
+from ..utils.lazy_import import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.conditions': ('Condition', 'Field', 'F', 'has_meta', 'where_fn'),
+    '.where': ('parse_where',),
+    '.shape_query': ('ShapeQuery',),
+})
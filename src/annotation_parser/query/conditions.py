@@ -0,0 +1,378 @@
+__all__ = ['Condition', 'Field', 'F', 'has_meta', 'where_fn']
+
+import operator
+from itertools import chain
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..public_enums import ShapeType
+from ..shape import Shape
+from ..shape_batch import ShapeBatch, SHAPE_TYPES, MISSING
+
+ShapesInput = Union[Tuple[Shape, ...], List[Shape], ShapeBatch]
+
+_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+# Поля, по которым строятся условия: атрибуты фигуры и производные от bounding box
+FIELDS = ('label', 'number', 'wz_number', 'type', 'area', 'width', 'height', 'vertices')
+_INT_FIELDS = ('number', 'wz_number')
+
+
+class Columns:
+    """
+        Колонки набора фигур для векторной проверки условий. Считаются лениво и один раз на набор:
+        у ShapeBatch берутся его массивы, у последовательности Shape — собираются одним проходом по нужному полю.
+    """
+
+    def __init__(self, shapes: ShapesInput) -> None:
+        self.shapes = shapes
+        self.size = len(shapes)
+        self._cache: Dict[str, Any] = {}
+
+    def labels(self) -> Tuple[np.ndarray, Tuple[str, ...]]:
+        """ Коды меток и словарь меток: условие на label проверяется по словарю, а не по каждой фигуре. """
+        if 'labels' not in self._cache:
+            if isinstance(self.shapes, ShapeBatch):
+                self._cache['labels'] = self.shapes.label_codes, self.shapes.labels
+            else:
+                vocab: Dict[str, int] = {}
+                codes = np.fromiter((vocab.setdefault(s.label, len(vocab)) for s in self.shapes), dtype=np.int32,
+                                    count=self.size)
+                self._cache['labels'] = codes, tuple(vocab)
+        return self._cache['labels']
+
+    def ints(self, name: str) -> np.ndarray:
+        """ number / wz_number массивом int64, MISSING — значение не задано. """
+        if name not in self._cache:
+            if isinstance(self.shapes, ShapeBatch):
+                self._cache[name] = self.shapes.numbers if name == 'number' else self.shapes.wz_numbers
+            else:
+                values = (getattr(s, name) for s in self.shapes)
+                self._cache[name] = np.fromiter((MISSING if v is None else v for v in values), dtype=np.int64,
+                                                count=self.size)
+        return self._cache[name]
+
+    def type_codes(self) -> np.ndarray:
+        if 'type' not in self._cache:
+            if isinstance(self.shapes, ShapeBatch):
+                self._cache['type'] = self.shapes.type_codes
+            else:
+                self._cache['type'] = np.fromiter((SHAPE_TYPES.index(ShapeType(s.type)) for s in self.shapes),
+                                                  dtype=np.int8, count=self.size)
+        return self._cache['type']
+
+    def offsets(self) -> np.ndarray:
+        self._coords()
+        return self._cache['offsets']
+
+    def bounds(self) -> np.ndarray:
+        """ Bounding box фигур (N, 4) [x_min, y_min, x_max, y_max]; NaN у фигур без вершин. """
+        if 'bounds' not in self._cache:
+            coords = self._coords()
+            offsets = self._cache['offsets']
+            bounds = np.full((self.size, 4), np.nan)
+            nonempty = np.flatnonzero(np.diff(offsets) > 0)
+            if len(nonempty):
+                # Пустые фигуры вершин не занимают, поэтому сегменты между началами непустых — ровно их вершины
+                starts = offsets[nonempty]
+                bounds[nonempty, :2] = np.minimum.reduceat(coords, starts, axis=0)
+                bounds[nonempty, 2:] = np.maximum.reduceat(coords, starts, axis=0)
+            self._cache['bounds'] = bounds
+        return self._cache['bounds']
+
+    def metric(self, name: str) -> np.ndarray:
+        """ Производные числовые поля: area, width, height (по bounding box) и vertices. """
+        if name == 'vertices':
+            return np.diff(self.offsets())
+        bounds = self.bounds()
+        width = bounds[:, 2] - bounds[:, 0]
+        height = bounds[:, 3] - bounds[:, 1]
+        return {'width': width, 'height': height, 'area': width * height}[name]
+
+    def meta(self) -> List[Any]:
+        if 'meta' not in self._cache:
+            if isinstance(self.shapes, ShapeBatch):
+                self._cache['meta'] = self.shapes.column('meta')
+            else:
+                self._cache['meta'] = [s.meta for s in self.shapes]
+        return self._cache['meta']
+
+    def row(self, index: int) -> Shape:
+        return self.shapes[index]
+
+    def _coords(self) -> np.ndarray:
+        if 'coords' not in self._cache:
+            if isinstance(self.shapes, ShapeBatch):
+                coords, offsets = self.shapes.coords, self.shapes.offsets
+            else:
+                counts = np.fromiter((len(s.coords) for s in self.shapes), dtype=np.int64, count=self.size)
+                offsets = np.zeros(self.size + 1, dtype=np.int64)
+                np.cumsum(counts, out=offsets[1:])
+                if any(isinstance(s.coords, np.ndarray) for s in self.shapes):
+                    parts = [np.asarray(s.coords, dtype=np.float64).reshape(-1, 2) for s in self.shapes]
+                    coords = np.concatenate(parts) if parts else np.empty((0, 2))
+                else:
+                    # Списки координат разворачиваются одним fromiter, без массива numpy на каждую фигуру
+                    flat = chain.from_iterable(chain.from_iterable(s.coords for s in self.shapes))
+                    coords = np.fromiter(flat, dtype=np.float64, count=2 * int(offsets[-1])).reshape(-1, 2)
+            self._cache['coords'], self._cache['offsets'] = coords, offsets
+        return self._cache['coords']
+
+
+class Condition:
+    """
+        Условие отбора фигур. Условия собираются из полей F (F.label == 'car', F.area.between(10, 100)),
+        has_meta и where_fn и комбинируются операторами &, |, ~. Проверка идёт булевыми масками numpy
+        по колонкам (см. ShapeQuery); Python вызывается только для where_fn и только на ещё не отсеянных фигурах.
+    """
+
+    # Условия, требующие вызова Python на каждую фигуру, в And проверяются последними
+    opaque = False
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        """
+            Маска фигур, удовлетворяющих условию. Значения вне where не важны (их отсекает вызывающий).
+            Args:
+                columns: Колонки набора фигур.
+                where: Фигуры, для которых результат нужен.
+        """
+        raise NotImplementedError
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return And(_parts(self, And) + _parts(_check(other), And))
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return Or(_parts(self, Or) + _parts(_check(other), Or))
+
+    def __invert__(self) -> "Condition":
+        return self.condition if isinstance(self, Not) else Not(self)
+
+
+@dataclass(frozen=True)
+class Compare(Condition):
+    """ Сравнение поля с константой: field op value. """
+    field: str
+    op: str
+    value: Any
+
+    def __post_init__(self) -> None:
+        _check_field(self.field)
+        if self.op not in _OPS:
+            raise ValueError(f"Unsupported operator {self.op!r}")
+        if (self.field == 'type' or self.value is None) and self.op not in ('==', '!='):
+            raise ValueError(f"Only == and != are supported for {self.field} {self.op} {self.value!r}")
+        if self.field == 'type':
+            object.__setattr__(self, 'value', ShapeType(self.value))
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        op = _OPS[self.op]
+        if self.field == 'label':
+            codes, vocab = columns.labels()
+            return _vocab_mask(vocab, lambda label: op(label, self.value))[codes]
+        if self.field == 'type':
+            return op(columns.type_codes(), SHAPE_TYPES.index(self.value))
+        if self.field in _INT_FIELDS:
+            values = columns.ints(self.field)
+            if self.value is None:
+                return op(values, MISSING)
+            result = op(values, self.value)
+            # None == 3 -> False, None != 3 -> True, а сравнения порядка с None ложны
+            return result if self.op == '!=' else result & (values != MISSING)
+        return op(columns.metric(self.field), self.value)
+
+
+@dataclass(frozen=True)
+class IsIn(Condition):
+    """ Значение поля входит в набор констант. """
+    field: str
+    values: FrozenSet[Any]
+
+    def __post_init__(self) -> None:
+        _check_field(self.field)
+        values = frozenset(ShapeType(v) for v in self.values) if self.field == 'type' else frozenset(self.values)
+        object.__setattr__(self, 'values', values)
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        if self.field == 'label':
+            codes, vocab = columns.labels()
+            return _vocab_mask(vocab, lambda label: label in self.values)[codes]
+        if self.field == 'type':
+            return np.isin(columns.type_codes(), [SHAPE_TYPES.index(v) for v in self.values])
+        if self.field in _INT_FIELDS:
+            values = columns.ints(self.field)
+            # Нецелые константы (1.5, 'x') не равны ни одному номеру: отбрасываются, а не усекаются до int64
+            wanted = [MISSING if v is None else int(v) for v in self.values if v is None or _is_integral(v)]
+            return np.isin(values, np.asarray(wanted, dtype=np.int64))
+        return np.isin(columns.metric(self.field), list(self.values))
+
+
+@dataclass(frozen=True)
+class HasMeta(Condition):
+    """ В meta фигуры есть ключ. """
+    key: str
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        metas = columns.meta()
+        result = np.zeros(columns.size, dtype=bool)
+        for i in np.flatnonzero(where).tolist():
+            meta = metas[i]
+            result[i] = bool(meta) and self.key in meta
+        return result
+
+
+@dataclass(frozen=True)
+class Predicate(Condition):
+    """ Непрозрачное условие: функция Shape -> bool, вызывается на каждую ещё не отсеянную фигуру. """
+    fn: Callable[[Shape], bool]
+    opaque = True
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        result = np.zeros(columns.size, dtype=bool)
+        for i in np.flatnonzero(where).tolist():
+            result[i] = bool(self.fn(columns.row(i)))
+        return result
+
+
+@dataclass(frozen=True)
+class And(Condition):
+    conditions: Tuple[Condition, ...]
+
+    @property
+    def opaque(self) -> bool:
+        return any(c.opaque for c in self.conditions)
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        mask = where.copy()
+        # Векторные условия первыми: непрозрачные проверяются только на том, что осталось
+        for condition in sorted(self.conditions, key=lambda c: c.opaque):
+            if not mask.any():
+                break
+            mask &= condition.evaluate(columns, mask)
+        return mask
+
+
+@dataclass(frozen=True)
+class Or(Condition):
+    conditions: Tuple[Condition, ...]
+
+    @property
+    def opaque(self) -> bool:
+        return any(c.opaque for c in self.conditions)
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        result = np.zeros(columns.size, dtype=bool)
+        for condition in sorted(self.conditions, key=lambda c: c.opaque):
+            remaining = where & ~result
+            if not remaining.any():
+                break
+            result |= condition.evaluate(columns, remaining) & remaining
+        return result
+
+
+@dataclass(frozen=True)
+class Not(Condition):
+    condition: Condition
+
+    @property
+    def opaque(self) -> bool:
+        return self.condition.opaque
+
+    def evaluate(self, columns: Columns, where: np.ndarray) -> np.ndarray:
+        return ~self.condition.evaluate(columns, where)
+
+
+class Field:
+    """ Поле фигуры в условиях: операторы сравнения возвращают Condition (F.number >= 3). """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        _check_field(name)
+        self.name = name
+
+    def __eq__(self, value: Any) -> Condition:  # type: ignore[override]
+        return Compare(self.name, '==', value)
+
+    def __ne__(self, value: Any) -> Condition:  # type: ignore[override]
+        return Compare(self.name, '!=', value)
+
+    def __lt__(self, value: Any) -> Condition:
+        return Compare(self.name, '<', value)
+
+    def __le__(self, value: Any) -> Condition:
+        return Compare(self.name, '<=', value)
+
+    def __gt__(self, value: Any) -> Condition:
+        return Compare(self.name, '>', value)
+
+    def __ge__(self, value: Any) -> Condition:
+        return Compare(self.name, '>=', value)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def isin(self, values: Any) -> Condition:
+        return IsIn(self.name, frozenset(values))
+
+    def between(self, low: Optional[float] = None, high: Optional[float] = None) -> Condition:
+        """ low <= поле <= high (границы включаются; None — граница не задана). """
+        parts = [Compare(self.name, op, bound) for op, bound in (('>=', low), ('<=', high)) if bound is not None]
+        if not parts:
+            raise ValueError("between() needs at least one bound")
+        return parts[0] if len(parts) == 1 else And(tuple(parts))
+
+    def __repr__(self) -> str:
+        return f"F.{self.name}"
+
+
+class _Fields:
+    """ Поля для условий: F.label, F.number, F.wz_number, F.type, F.area, F.width, F.height, F.vertices. """
+
+    def __getattr__(self, name: str) -> Field:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return Field(name)
+
+    def __dir__(self) -> List[str]:
+        return list(FIELDS)
+
+
+F = _Fields()
+
+
+def has_meta(key: str) -> Condition:
+    """ Условие: в meta фигуры есть ключ key. """
+    return HasMeta(key)
+
+
+def where_fn(fn: Callable[[Shape], bool]) -> Condition:
+    """ Непрозрачное условие из произвольной функции Shape -> bool (запасной путь, вызывается по фигурам). """
+    return Predicate(fn)
+
+
+def _is_integral(value: Any) -> bool:
+    """ Константа, равная целому числу (3, 3.0), с которой можно сравнивать колонку номеров int64. """
+    if isinstance(value, (int, np.integer)):
+        return True
+    return isinstance(value, (float, np.floating)) and float(value).is_integer()
+
+
+def _check_field(name: str) -> None:
+    if name not in FIELDS:
+        raise ValueError(f"Unknown field {name!r}, expected one of {FIELDS}")
+
+
+def _check(other: Any) -> Condition:
+    if not isinstance(other, Condition):
+        raise TypeError(f"Expected a Condition, got {type(other).__name__}")
+    return other
+
+
+def _parts(condition: Condition, kind: type) -> Tuple[Condition, ...]:
+    return condition.conditions if isinstance(condition, kind) else (condition,)
+
+
+def _vocab_mask(vocab: Tuple[str, ...], test: Callable[[str], bool]) -> np.ndarray:
+    return np.fromiter((bool(test(label)) for label in vocab), dtype=bool, count=len(vocab))
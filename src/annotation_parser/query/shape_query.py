@@ -0,0 +1,82 @@
+__all__ = ['ShapeQuery']
+
+from typing import Callable, Tuple, Union
+
+import numpy as np
+
+from ..shape import Shape
+from ..shape_batch import ShapeBatch
+from .conditions import Columns, Condition, Predicate, ShapesInput
+from .where import parse_where
+
+QueryInput = Union["ShapeQuery", Condition, str, Callable[[Shape], bool]]
+
+
+class ShapeQuery:
+    """
+        Запрос к набору фигур: условие разбирается и проверяется один раз при создании,
+        а применяется к любому числу наборов как булевы маски numpy по колонкам (ShapeBatch — без построения строк).
+        Samples:
+            query = ShapeQuery(F.label.isin({'car', 'bus'}) & F.area.between(100, 5000))
+            query = ShapeQuery("label in {'car', 'bus'} and 100 <= area <= 5000 and 'score' in meta")
+            cars = query.filter(batch)          # ShapeBatch
+            mask = query.mask(shapes)           # np.ndarray[bool]
+    """
+
+    __slots__ = ('_condition',)
+
+    def __init__(self, condition: QueryInput) -> None:
+        """
+            Args:
+                condition: Condition, текст условия (см. parse_where), ShapeQuery
+                           или функция Shape -> bool (вызывается по фигурам).
+            Raises:
+                ValueError: Если текст условия не разбирается.
+                TypeError: Если condition другого типа.
+        """
+        if isinstance(condition, ShapeQuery):
+            condition = condition.condition
+        elif isinstance(condition, str):
+            condition = parse_where(condition)
+        elif not isinstance(condition, Condition):
+            if not callable(condition):
+                raise TypeError(f"Expected a Condition, a where expression or a callable, got {condition!r}")
+            condition = Predicate(condition)
+        self._condition = condition
+
+    @property
+    def condition(self) -> Condition:
+        return self._condition
+
+    def mask(self, shapes: ShapesInput) -> np.ndarray:
+        """ Булева маска длины len(shapes): True — фигура удовлетворяет условию. """
+        return self.evaluate(Columns(shapes))
+
+    def evaluate(self, columns: Columns, where: Union[np.ndarray, None] = None) -> np.ndarray:
+        """ Маска по готовым колонкам (where — фигуры, для которых проверять; None — все). """
+        if where is None:
+            where = np.ones(columns.size, dtype=bool)
+        return self._condition.evaluate(columns, where) & where
+
+    def indices(self, shapes: ShapesInput) -> np.ndarray:
+        """ Индексы подходящих фигур по возрастанию. """
+        return np.flatnonzero(self.mask(shapes))
+
+    def filter(self, shapes: ShapesInput) -> Union[Tuple[Shape, ...], ShapeBatch]:
+        """ Подходящие фигуры: ShapeBatch для ShapeBatch (без построения Shape), иначе кортеж. """
+        mask = self.mask(shapes)
+        if isinstance(shapes, ShapeBatch):
+            return shapes.take(mask)
+        return tuple(shape for shape, keep in zip(shapes, mask.tolist()) if keep)
+
+    def __and__(self, other: QueryInput) -> "ShapeQuery":
+        return ShapeQuery(self._condition & ShapeQuery(other).condition)
+
+    def __or__(self, other: QueryInput) -> "ShapeQuery":
+        return ShapeQuery(self._condition | ShapeQuery(other).condition)
+
+    def __invert__(self) -> "ShapeQuery":
+        return ShapeQuery(~self._condition)
+
+    def __repr__(self) -> str:
+        return f"ShapeQuery({self._condition!r})"
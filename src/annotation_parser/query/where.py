@@ -0,0 +1,116 @@
+__all__ = ['parse_where']
+
+import ast
+from typing import Any
+
+from .conditions import FIELDS, And, Compare, Condition, HasMeta, IsIn, Not, Or
+
+# Операторы ast -> операторы Compare и их зеркальные (для записи «константа op поле»)
+_AST_OPS = {ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>='}
+_MIRROR = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+# Поля со строковыми значениями; остальные сравниваются с числами
+_TEXT_FIELDS = ('label', 'type')
+
+
+def parse_where(expression: str) -> Condition:
+    """
+        Разбирает текстовое условие (синтаксис выражений Python) в Condition. Выражение не исполняется:
+        дерево ast переводится в условия, всё, кроме перечисленного ниже, отклоняется.
+        Поддерживается:
+            - поля label, number, wz_number, type, area, width, height, vertices;
+            - сравнения ==, !=, <, <=, >, >= с константами, в том числе цепочки (10 <= area < 500);
+            - field in {...} / field not in [...] (набор констант), field is None / is not None;
+            - 'key' in meta / 'key' not in meta;
+            - and, or, not и скобки.
+        Samples:
+            parse_where("label in {'car', 'bus'} and 100 <= area <= 5000 and wz_number == 2")
+            parse_where("type == 'polygon' and number is not None and 'score' in meta")
+        Raises:
+            ValueError: Если выражение синтаксически неверно, содержит неподдерживаемые конструкции
+                или константу не того типа (label == 3, number in {'x'}).
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid where expression {expression!r}: {e.msg}") from None
+    return _convert(tree.body)
+
+
+def _convert(node: ast.AST) -> Condition:
+    if isinstance(node, ast.BoolOp):
+        parts = tuple(_convert(value) for value in node.values)
+        return And(parts) if isinstance(node.op, ast.And) else Or(parts)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return Not(_convert(node.operand))
+    if isinstance(node, ast.Compare):
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(_compare(left, op, right))
+            left = right
+        return parts[0] if len(parts) == 1 else And(tuple(parts))
+    raise _unsupported(node)
+
+
+def _compare(left: ast.AST, op: ast.cmpop, right: ast.AST) -> Condition:
+    if isinstance(op, (ast.In, ast.NotIn)):
+        if _is_name(right, 'meta'):
+            condition: Condition = HasMeta(_literal(left))
+        else:
+            field = _field(left)
+            values = _literal(right)
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                raise ValueError(f"Expected a set, list or tuple of constants, got {_source(right)!r}")
+            condition = IsIn(field, frozenset(_typed(field, value) for value in values))
+        return Not(condition) if isinstance(op, ast.NotIn) else condition
+    if isinstance(op, (ast.Is, ast.IsNot)):
+        if _literal(right) is not None:
+            raise _unsupported(right)
+        return Compare(_field(left), '==' if isinstance(op, ast.Is) else '!=', None)
+    if type(op) not in _AST_OPS:
+        raise _unsupported(op)
+    symbol = _AST_OPS[type(op)]
+    if isinstance(left, ast.Name):
+        field = _field(left)
+        return Compare(field, symbol, _typed(field, _literal(right)))
+    # Константа слева: 100 < area -> area > 100
+    field = _field(right)
+    return Compare(field, _MIRROR[symbol], _typed(field, _literal(left)))
+
+
+def _field(node: ast.AST) -> str:
+    if isinstance(node, ast.Name) and node.id in FIELDS:
+        return node.id
+    raise ValueError(f"Expected a field ({', '.join(FIELDS)}), got {_source(node)!r}")
+
+
+def _literal(node: ast.AST) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise ValueError(f"Expected a constant, got {_source(node)!r}") from None
+
+
+def _typed(field: str, value: Any) -> Any:
+    """ Проверяет тип константы для поля: строка для label и type, число для остальных (None допустим везде). """
+    if value is None:
+        return value
+    text = field in _TEXT_FIELDS
+    if isinstance(value, bool) or not isinstance(value, str if text else (int, float)):
+        raise ValueError(f"Expected {'a string' if text else 'a number'} for {field}, got {value!r}")
+    return value
+
+
+def _is_name(node: ast.AST, name: str) -> bool:
+    return isinstance(node, ast.Name) and node.id == name
+
+
+def _unsupported(node: ast.AST) -> ValueError:
+    return ValueError(f"Unsupported where expression: {_source(node)!r}")
+
+
+def _source(node: ast.AST) -> str:
+    try:
+        return ast.unparse(node)
+    except Exception:
+        return type(node).__name__
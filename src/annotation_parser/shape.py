@@ -2,14 +2,19 @@ from __future__ import annotations
 
 __all__ = ['Shape']
 
-from dataclasses import dataclass, field
-from typing import Optional, Any, Dict, Tuple, List, Callable
-import numpy as np
-from shapely.geometry import LineString as Line, Polygon, Point
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Optional, Any, Dict, Tuple, List, Callable, TYPE_CHECKING
 
 from .public_enums import ShapeType, ShapePosition
 from .types import Coords
-from .utils import to_point, to_coords, two_coords_to_four
+from .utils import (to_point, to_coords, to_coord_array, two_coords_to_four, coords_bounds, coords_contour,
+                    coords_line, is_ndarray)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from shapely.geometry import LineString as Line, Point
+    from .utils.mask_codec import LazyMask
 
 
 @dataclass(frozen=True, slots=True)
@@ -20,17 +25,22 @@ class Shape:
         Основные возможности:
             - Унифицированное представление любой фигуры из разметки (LabelMe, COCO, VOC и др.).
             - Быстрый доступ к ключевым геометрическим свойствам: контур, bounding box, линия и др.
+              Производные значения вычисляются при первом обращении и кэшируются в экземпляре
+              (фигура неизменяема, поэтому кэш не устаревает); возвращаемые массивы только для чтения.
             - Поддержка смещения (shift_point) для расчёта относительных координат.
             - Расширяемость через meta (можно хранить любые дополнительные атрибуты).
 
         Args:
             label (str): Метка фигуры (например, 'person', 'car').
-            coords (Coords): Список координат [[x, y], ...], определяющих фигуру.
+            coords (Coords | np.ndarray): Список координат [[x, y], ...], определяющих фигуру.
+                Если передан np.ndarray, координаты хранятся как неизменяемый массив (N, 2) float64
+                (одно векторное преобразование вместо поэлементного to_coords).
             type (ShapeType): Тип фигуры (line, polygon, rectangle, point).
             number (Optional[int]): Номер или идентификатор фигуры (если есть).
             description (Optional[str]): Описание фигуры.
             flags (Optional[Dict]): Произвольные флаги, экспортируемые из разметки.
-            mask (Optional[np.ndarray]): Маска сегментации (если присутствует).
+            mask (Optional[np.ndarray | LazyMask]): Маска сегментации (если присутствует). Маски LabelMe
+                приходят как LazyMask: base64 PNG декодируется в массив bool при первом обращении к mask.array.
             position (Optional[ShapePosition]): Положение фигуры (см. ShapePosition).
             wz_number (Optional[int]): Номер рабочей зоны (если разметка по зонам).
             shift_point (Optional[Point]): Точка смещения для относительных координат (shapely.geometry.Point и др.).
@@ -43,23 +53,69 @@ class Shape:
     number: Optional[int] = None
     description: Optional[str] = None
     flags: Optional[Dict[str, Any]] = None
-    mask: Optional[np.ndarray] = None
+    mask: Optional[np.ndarray | LazyMask] = None
     position: Optional[ShapePosition] = None
     wz_number: Optional[int] = None
     shift_point: Optional[Point] = None
     meta: Dict[str, Any] = field(default_factory=dict)
+    # Кэш производной геометрии (contour, rect, line, shifted_*): не участвует в __init__, repr и сравнении
+    _cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def construct(
+            cls,
+            label: str,
+            coords: Coords,
+            type: ShapeType,
+            number: Optional[int] = None,
+            description: Optional[str] = None,
+            flags: Optional[Dict[str, Any]] = None,
+            mask: Optional[np.ndarray | LazyMask] = None,
+            position: Optional[ShapePosition] = None,
+            wz_number: Optional[int] = None,
+            shift_point: Any = None,
+            meta: Optional[Dict[str, Any]] = None) -> "Shape":
+        """
+            Быстрый конструктор для доверенных данных (аналог pydantic model_construct).
+            coords не проверяются и не приводятся к float — ожидается уже готовый список пар [[x, y], ...].
+            Прямоугольник из двух точек по-прежнему разворачивается в четыре угла, shift_point приводится к Point.
+            Returns:
+                Shape: Новый объект без прохода через __post_init__.
+        """
+        shape = object.__new__(cls)
+        set_field = object.__setattr__
+        set_field(shape, 'label', label)
+        if is_ndarray(coords):
+            set_field(shape, 'coords', to_coord_array(coords, type))
+        else:
+            set_field(shape, 'coords', two_coords_to_four(coords, type))
+        set_field(shape, 'type', type)
+        set_field(shape, 'number', number)
+        set_field(shape, 'description', description)
+        set_field(shape, 'flags', flags)
+        set_field(shape, 'mask', mask)
+        set_field(shape, 'position', position)
+        set_field(shape, 'wz_number', wz_number)
+        set_field(shape, 'shift_point', to_point(shift_point))
+        set_field(shape, 'meta', {} if meta is None else meta)
+        set_field(shape, '_cache', {})
+        return shape
 
     def __post_init__(self) -> None:
         """
             Приводит поля к внутреннему формату и гарантирует корректность структуры Shape.
               - shift_point всегда приводится к Point (или None).
-              - coords всегда приводится к List[List[float]], числа приводятся к float.
+              - coords приводится к List[List[float]], числа приводятся к float;
+                np.ndarray приводится к неизменяемому массиву (N, 2) float64.
               - Для прямоугольника с двумя точками coords автоматически преобразуются в четыре угла.
             Raises:
                 ValueError: coords не могут быть преобразованы в корректную фигуру.
                 TypeError: shift_point передан в неподдерживаемом формате.
         """
         object.__setattr__(self, 'shift_point', to_point(self.shift_point))
+        if is_ndarray(self.coords):
+            object.__setattr__(self, 'coords', to_coord_array(self.coords, self.type))
+            return
         norm_coords = to_coords(self.coords)
         norm_coords = two_coords_to_four(norm_coords, self.type)
         object.__setattr__(self, 'coords', norm_coords)
@@ -71,54 +127,82 @@ class Shape:
 
     @property
     def contour(self) -> np.ndarray:
-        """ Контур (np.ndarray) из coords, shape (N, 1, 2) для OpenCV. """
-        return np.array(self.coords, dtype=np.float32).reshape((-1, 1, 2))
+        """ Контур (np.ndarray) из coords, shape (N, 1, 2) для OpenCV. Только для чтения, кэшируется. """
+        return self._cached('contour', lambda: coords_contour(self.coords))
 
     @property
     def rect(self) -> Tuple[float, float, float, float]:
-        """ Ограничивающий прямоугольник (bounding box). """
-        if not self.coords:
-            raise ValueError("Shape.coords is empty, cannot compute bounds")
-        poly = Polygon(self.coords)
-        return poly.bounds
+        """ Ограничивающий прямоугольник (bounding box), считается numpy без shapely. Кэшируется. """
+        return self._cached('rect', lambda: coords_bounds(self.coords))
 
     @property
     def line(self) -> Line:
-        """ shapely.geometry.LineString по coords. """
-        return Line(self.coords)
+        """ shapely.geometry.LineString по coords. Кэшируется. """
+        return self._cached('line', lambda: coords_line(self.coords))
 
     @property
     def shifted_coords(self) -> Coords:
         """
-            Смещённые координаты (если shift_point задан).
-            Supports nested coords (recursively).
+            Смещённые координаты (если shift_point задан). Кэшируются: возвращается один и тот же список,
+            изменять его нельзя.
         """
-        if self.shift_point:
-            def shift_pair(pair):
-                # [x, y], любые числа (int, float, str)
-                return [float(pair[0]) - self.shift_point.x, float(pair[1]) - self.shift_point.y]
-            # Вложенные списки пока не поддерживаем, но можно рекурсивно
-            # Если надо, напиши -- добавим рекурсию для многомерных случаев
-            return [shift_pair(pair) for pair in self.coords]
-        return self.coords
+        if not self.shift_point:
+            return self.coords
+        return self._cached('shifted_coords', self._shift_coords)
 
     @property
     def shifted_contour(self) -> np.ndarray:
-        """ Контур по смещённым координатам. """
-        return np.array(self.shifted_coords, dtype=np.float32).reshape((-1, 1, 2))
+        """ Контур по смещённым координатам. Только для чтения, кэшируется. """
+        return self._cached('shifted_contour', lambda: coords_contour(self.shifted_coords))
 
     @property
     def shifted_rect(self) -> Tuple[float, float, float, float]:
-        """ Bounding box по смещённым координатам. """
-        if not self.shifted_coords:
-            raise ValueError("Shape.shifted_coords is empty, cannot compute bounds")
-        poly = Polygon(self.shifted_coords)
-        return poly.bounds
+        """ Bounding box по смещённым координатам. Кэшируется. """
+        if not self.shift_point:
+            return self.rect
+        return self._cached('shifted_rect', lambda: coords_bounds(self.shifted_coords))
 
     @property
     def shifted_line(self) -> Line:
-        """ shapely.geometry.LineString по смещённым координатам. """
-        return Line(self.shifted_coords)
+        """ shapely.geometry.LineString по смещённым координатам. Кэшируется. """
+        return self._cached('shifted_line', lambda: coords_line(self.shifted_coords))
+
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        """ Значение из кэша экземпляра; при первом обращении вычисляется через build. """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = build()
+            return value
+
+    def __eq__(self, other: Any) -> bool:
+        # Поля-массивы (coords, mask) сравниваются поэлементно: фигуры со списком и с массивом координат равны
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if self is other:
+            return True
+        if self.mask is None and other.mask is None \
+                and not is_ndarray(self.coords) and not is_ndarray(other.coords):
+            # Без массивов numpy поля сравниваются одним сравнением кортежей
+            return _compare_values(self) == _compare_values(other)
+        return all(_values_equal(getattr(self, name), getattr(other, name)) for name in _COMPARE_FIELDS)
+
+    def __getstate__(self) -> List[Any]:
+        # Кэш не переносится через pickle (например, из процессов-воркеров parse_many) и copy
+        return [{} if f.name == '_cache' else getattr(self, f.name) for f in fields(self)]
+
+    def __setstate__(self, state: List[Any]) -> None:
+        for f, value in zip(fields(self), state):
+            object.__setattr__(self, f.name, value)
+
+    def _shift_coords(self) -> Coords:
+        x, y = self.shift_point.x, self.shift_point.y
+        if is_ndarray(self.coords):
+            shifted = self.coords - (x, y)
+            shifted.flags.writeable = False
+            return shifted
+        # [x, y], любые числа (int, float, str)
+        return [[float(px) - x, float(py) - y] for px, py in self.coords]
 
     def get(self, name: str, default: Any = None) -> Any:
         """ Универсальный getter: сначала стандартный атрибут, затем meta. """
@@ -164,23 +248,29 @@ class Shape:
                 return False
             return True
 
-        return [
-            shape if not match(shape) else
-            Shape(
-                label=shape.label,
-                coords=shape.coords,
-                type=shape.type,
-                number=shape.number,
-                description=shape.description,
-                flags=shape.flags,
-                mask=shape.mask,
-                position=shape.position,
-                wz_number=shape.wz_number,
-                shift_point=point,
-                meta=shape.meta.copy()
-            )
-            for shape in shapes
-        ]
+        return [shape._with_shift_point(point, shape.meta.copy()) if match(shape) else shape for shape in shapes]
+
+    def _with_shift_point(self, shift_point: Optional[Point], meta: Optional[Dict[str, Any]] = None) -> "Shape":
+        """
+            Копия фигуры с другим shift_point. coords уже нормализованы, поэтому переиспользуются
+            без повторного прохода через __post_init__.
+            Args:
+                shift_point: Новая точка смещения (Point или None).
+                meta: meta новой фигуры; None — тот же словарь, что у исходной.
+        """
+        return Shape.construct(
+            label=self.label,
+            coords=self.coords,
+            type=self.type,
+            number=self.number,
+            description=self.description,
+            flags=self.flags,
+            mask=self.mask,
+            position=self.position,
+            wz_number=self.wz_number,
+            shift_point=shift_point,
+            meta=self.meta if meta is None else meta,
+        )
 
     def __repr__(self) -> str:
         """ Краткое строковое представление для дебага. """
@@ -188,3 +278,18 @@ class Shape:
             f"Shape(label={self.label!r}, type={self.type!r}, "
             f"coords={self.coords!r}, number={self.number!r})"
         )
+
+
+# Поля, участвующие в ==: список считается один раз, а не через fields() при каждом сравнении
+_COMPARE_FIELDS = tuple(f.name for f in fields(Shape) if f.compare)
+_compare_values = attrgetter(*_COMPARE_FIELDS)
+
+
+def _values_equal(a: Any, b: Any) -> bool:
+    if is_ndarray(a) or is_ndarray(b):
+        import numpy as np
+        try:
+            return np.array_equal(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+        except (TypeError, ValueError):
+            return False
+    return a == b
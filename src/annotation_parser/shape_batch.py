@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+__all__ = ['ShapeBatch', 'ShapeBatchBuilder', 'ShapeRow']
+
+from array import array
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from shapely.geometry import LineString as Line
+
+from .public_enums import ShapeType, ShapePosition
+from .shape import Shape
+from .types import Coords
+from .utils import to_point, to_coord_array, two_coords_to_four, coords_bounds, coords_contour
+
+# Коды типов фигур: индекс в этом кортеже
+SHAPE_TYPES: Tuple[ShapeType, ...] = tuple(ShapeType)
+_TYPE_CODES = {shape_type: code for code, shape_type in enumerate(SHAPE_TYPES)}
+# Значение в колонках number/wz_number, означающее None
+MISSING = np.iinfo(np.int64).min
+# Редкие поля Shape, которые хранятся по строкам (список создаётся, только если хоть одно значение задано)
+OBJECT_FIELDS = ('description', 'flags', 'mask', 'position', 'shift_point', 'meta')
+
+
+class _EmptyDict:
+    """ Маркер пустого dict в колонках flags/meta: хранится один общий объект, при выдаче создаётся новый dict. """
+
+    def __reduce__(self) -> str:
+        # pickle сохраняет ссылку на модульный объект, поэтому проверка `is _EMPTY` переживает сериализацию
+        return '_EMPTY'
+
+
+_EMPTY = _EmptyDict()
+
+
+class ShapeBatch:
+    """
+        Колоночное (struct-of-arrays) представление большого набора фигур.
+
+        Вместо кортежа Shape, где у каждой фигуры свой список списков float и свои dict,
+        хранит:
+            - coords (np.ndarray): все вершины всех фигур подряд, форма (M, 2), float64 или float32;
+            - offsets (np.ndarray[int64]): границы фигур в coords, длина N + 1 (фигура i — coords[offsets[i]:offsets[i+1]]);
+            - label_codes (np.ndarray[int32]) + labels (Tuple[str, ...]): метки как категориальные коды;
+            - type_codes (np.ndarray[int8]): индекс типа в SHAPE_TYPES;
+            - numbers, wz_numbers (np.ndarray[int64]): MISSING вместо None;
+            - редкие поля (description, flags, mask, position, shift_point, meta) — по строкам, только если заданы.
+
+        Строка batch[i] — лёгкое представление ShapeRow с интерфейсом Shape.
+        Преобразование в кортеж Shape и обратно без потерь (для float64).
+        Samples:
+            batch = ShapeBatch.from_shapes(shapes)
+            row = batch[0]; row.label, row.rect
+            shapes = batch.to_shapes()
+    """
+
+    __slots__ = ('coords', 'offsets', 'label_codes', 'labels', 'type_codes', 'numbers', 'wz_numbers', '_objects')
+
+    def __init__(self,
+                 coords: np.ndarray,
+                 offsets: np.ndarray,
+                 label_codes: np.ndarray,
+                 labels: Sequence[str],
+                 type_codes: np.ndarray,
+                 numbers: np.ndarray,
+                 wz_numbers: np.ndarray,
+                 objects: Optional[Dict[str, List[Any]]] = None) -> None:
+        """
+            Args:
+                coords: Вершины всех фигур, форма (M, 2).
+                offsets: Границы фигур в coords, длина N + 1, offsets[0] == 0, offsets[-1] == M.
+                label_codes: Коды меток (индексы в labels), длина N.
+                labels: Словарь меток.
+                type_codes: Коды типов (индексы в SHAPE_TYPES), длина N.
+                numbers: number фигур (MISSING — нет), длина N.
+                wz_numbers: wz_number фигур (MISSING — нет), длина N.
+                objects: Поле -> список значений длины N для редких полей (см. OBJECT_FIELDS).
+            Raises:
+                ValueError: Если размеры колонок не согласованы.
+        """
+        self.coords = np.asarray(coords).reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.label_codes = np.asarray(label_codes, dtype=np.int32)
+        self.labels = tuple(labels)
+        self.type_codes = np.asarray(type_codes, dtype=np.int8)
+        self.numbers = np.asarray(numbers, dtype=np.int64)
+        self.wz_numbers = np.asarray(wz_numbers, dtype=np.int64)
+        self._objects: Dict[str, List[Any]] = dict(objects or {})
+        n = len(self.offsets) - 1
+        if n < 0 or self.offsets[-1] != len(self.coords):
+            raise ValueError("offsets must have N + 1 items and end at len(coords)")
+        for name in ('label_codes', 'type_codes', 'numbers', 'wz_numbers'):
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"Column '{name}' must have {n} items")
+        for name, values in self._objects.items():
+            if name not in OBJECT_FIELDS or len(values) != n:
+                raise ValueError(f"Object column '{name}' must be one of {OBJECT_FIELDS} with {n} items")
+
+    @staticmethod
+    def from_shapes(shapes: Iterable[Shape], dtype: Any = np.float64) -> "ShapeBatch":
+        """ Собирает ShapeBatch из фигур Shape (или ShapeRow). """
+        builder = ShapeBatchBuilder(dtype=dtype)
+        for shape in shapes:
+            builder.append(shape.label, shape.coords, shape.type, shape.number, shape.description, shape.flags,
+                           shape.mask, shape.position, shape.wz_number, shape.shift_point, shape.meta)
+        return builder.build()
+
+    def to_shapes(self, numpy_coords: bool = False) -> Tuple[Shape, ...]:
+        """
+            Преобразует батч в кортеж Shape (без потерь для float64).
+            Args:
+                numpy_coords: True — coords фигур — представления общего буфера (без копирования), иначе списки.
+        """
+        # Колонки разворачиваются целиком (один tolist на весь буфер), а не построчно через ShapeRow
+        if numpy_coords:
+            coords = self.coords.view()
+            coords.flags.writeable = False
+        else:
+            coords = self.coords.tolist()
+        offsets = self.offsets.tolist()
+        labels = [self.labels[code] for code in self.label_codes.tolist()]
+        types = [SHAPE_TYPES[code] for code in self.type_codes.tolist()]
+        numbers = [None if value == MISSING else value for value in self.numbers.tolist()]
+        wz_numbers = [None if value == MISSING else value for value in self.wz_numbers.tolist()]
+        objects = {name: [_restore(name, value) for value in self._objects[name]]
+                   if name in self._objects else [None] * len(self) for name in OBJECT_FIELDS}
+        return tuple(
+            Shape.construct(label=labels[i], coords=coords[offsets[i]:offsets[i + 1]], type=types[i],
+                            number=numbers[i], description=objects['description'][i], flags=objects['flags'][i],
+                            mask=objects['mask'][i], position=objects['position'][i], wz_number=wz_numbers[i],
+                            shift_point=objects['shift_point'][i], meta=objects['meta'][i])
+            for i in range(len(self))
+        )
+
+    @property
+    def counts(self) -> np.ndarray:
+        """ Число вершин каждой фигуры. """
+        return np.diff(self.offsets)
+
+    @property
+    def types(self) -> np.ndarray:
+        """ Типы фигур (массив ShapeType, dtype=object). """
+        return np.asarray(SHAPE_TYPES, dtype=object)[self.type_codes]
+
+    def label_array(self) -> np.ndarray:
+        """ Метки фигур (dtype=object). """
+        return np.asarray(self.labels, dtype=object)[self.label_codes]
+
+    def column(self, name: str) -> List[Any]:
+        """ Значения редкого поля (см. OBJECT_FIELDS) по всем строкам. """
+        if name not in OBJECT_FIELDS:
+            raise KeyError(name)
+        values = self._objects.get(name)
+        if values is None:
+            return [None] * len(self)
+        return [_restore(name, value) for value in values]
+
+    def astype(self, dtype: Any) -> "ShapeBatch":
+        """ Батч с координатами другого типа (np.float64 / np.float32); при совпадении типа — тот же объект. """
+        if self.coords.dtype == np.dtype(dtype):
+            return self
+        return ShapeBatch(self.coords.astype(dtype), self.offsets, self.label_codes, self.labels, self.type_codes,
+                          self.numbers, self.wz_numbers, self._objects)
+
+    def take(self, indices: Union[Sequence[int], np.ndarray]) -> "ShapeBatch":
+        """
+            Новый батч из выбранных строк.
+            Args:
+                indices: Индексы строк или булева маска длины N.
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.int64, copy=False)
+        starts = self.offsets[indices]
+        counts = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # Индексы вершин выбранных фигур одним векторным выражением
+        vertex_index = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1])
+        objects = {name: [values[i] for i in indices] for name, values in self._objects.items()}
+        return ShapeBatch(self.coords[vertex_index], offsets, self.label_codes[indices], self.labels,
+                          self.type_codes[indices], self.numbers[indices], self.wz_numbers[indices], objects)
+
+    @property
+    def nbytes(self) -> int:
+        """ Объём числовых колонок в байтах. """
+        return sum(getattr(self, name).nbytes for name in
+                   ('coords', 'offsets', 'label_codes', 'type_codes', 'numbers', 'wz_numbers'))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> "ShapeRow":
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("ShapeBatch index out of range")
+        return ShapeRow(self, index)
+
+    def __iter__(self) -> Iterator["ShapeRow"]:
+        return (ShapeRow(self, i) for i in range(len(self)))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"ShapeBatch(shapes={len(self)}, vertices={len(self.coords)}, labels={len(self.labels)})"
+
+
+class ShapeBatchBuilder:
+    """
+        Построитель ShapeBatch: адаптеры добавляют фигуры по одной, не создавая объектов Shape.
+        Координаты копятся в плоском array('d'), который в build() превращается в numpy без лишних копий.
+    """
+
+    def __init__(self, dtype: Any = np.float64) -> None:
+        self._dtype = np.dtype(dtype)
+        self._coords = array('d')
+        self._offsets = array('q', [0])
+        self._label_index: Dict[str, int] = {}
+        self._label_codes = array('i')
+        self._type_codes = array('b')
+        self._numbers = array('q')
+        self._wz_numbers = array('q')
+        self._objects: Dict[str, List[Any]] = {}
+
+    def append(self,
+               label: str,
+               coords: Coords,
+               type: ShapeType | str,
+               number: Optional[int] = None,
+               description: Optional[str] = None,
+               flags: Optional[Dict[str, Any]] = None,
+               mask: Any = None,
+               position: Optional[ShapePosition] = None,
+               wz_number: Optional[int] = None,
+               shift_point: Any = None,
+               meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+            Добавляет одну фигуру. Аргументы совпадают с Shape.construct;
+            прямоугольник из двух точек разворачивается в четыре угла, как в Shape.
+            Raises:
+                ValueError: Если coords не являются парами чисел.
+        """
+        shape_type = type if isinstance(type, ShapeType) else ShapeType(type)
+        if isinstance(coords, np.ndarray):
+            # Массив копируется в буфер одним блоком байтов
+            coords = to_coord_array(coords, shape_type)
+            self._coords.frombytes(np.ascontiguousarray(coords).tobytes())
+        else:
+            coords = two_coords_to_four(coords, shape_type)
+            before = len(self._coords)
+            self._coords.extend(chain.from_iterable(coords))
+            if (len(self._coords) - before) != 2 * len(coords):
+                del self._coords[before:]
+                raise ValueError(f"Each coordinate must be a pair of numbers, got: {coords}")
+        row = len(self._label_codes)
+        self._offsets.append(self._offsets[-1] + len(coords))
+        code = self._label_index.setdefault(label, len(self._label_index))
+        self._label_codes.append(code)
+        self._type_codes.append(_TYPE_CODES[shape_type])
+        self._numbers.append(MISSING if number is None else int(number))
+        self._wz_numbers.append(MISSING if wz_number is None else int(wz_number))
+        values = (description, flags, mask, position, to_point(shift_point), meta)
+        for name, value in zip(OBJECT_FIELDS, values):
+            if value is None:
+                if name in self._objects:
+                    self._objects[name].append(None)
+                continue
+            if name in ('flags', 'meta') and not value:
+                value = _EMPTY
+            column = self._objects.get(name)
+            if column is None:
+                column = self._objects[name] = [None] * row
+            column.append(value)
+
+    def __len__(self) -> int:
+        return len(self._label_codes)
+
+    def build(self) -> ShapeBatch:
+        """ Возвращает собранный ShapeBatch. """
+        coords = np.frombuffer(self._coords, dtype=np.float64).reshape(-1, 2)
+        if self._dtype != np.float64:
+            coords = coords.astype(self._dtype)
+        return ShapeBatch(
+            coords=coords,
+            offsets=np.frombuffer(self._offsets, dtype=np.int64),
+            label_codes=np.frombuffer(self._label_codes, dtype=np.int32) if self._label_codes else (),
+            labels=tuple(self._label_index),
+            type_codes=np.frombuffer(self._type_codes, dtype=np.int8) if self._type_codes else (),
+            numbers=np.frombuffer(self._numbers, dtype=np.int64) if self._numbers else (),
+            wz_numbers=np.frombuffer(self._wz_numbers, dtype=np.int64) if self._wz_numbers else (),
+            objects=self._objects,
+        )
+
+
+class ShapeRow:
+    """
+        Лёгкое представление одной строки ShapeBatch с интерфейсом Shape (только чтение).
+        coords — представление (view) общего буфера координат формы (N, 2), без копирования.
+    """
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: ShapeBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def label(self) -> str:
+        return self._batch.labels[self._batch.label_codes[self._index]]
+
+    @property
+    def coords(self) -> np.ndarray:
+        offsets = self._batch.offsets
+        view = self._batch.coords[offsets[self._index]:offsets[self._index + 1]]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def type(self) -> ShapeType:
+        return SHAPE_TYPES[self._batch.type_codes[self._index]]
+
+    @property
+    def number(self) -> Optional[int]:
+        return _from_int(self._batch.numbers[self._index])
+
+    @property
+    def wz_number(self) -> Optional[int]:
+        return _from_int(self._batch.wz_numbers[self._index])
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._object('description')
+
+    @property
+    def flags(self) -> Optional[Dict[str, Any]]:
+        return self._object('flags')
+
+    @property
+    def mask(self) -> Any:
+        return self._object('mask')
+
+    @property
+    def position(self) -> Optional[ShapePosition]:
+        return self._object('position')
+
+    @property
+    def shift_point(self) -> Any:
+        return self._object('shift_point')
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        meta = self._object('meta')
+        return {} if meta is None else meta
+
+    @property
+    def is_individual(self) -> bool:
+        return self._batch.numbers[self._index] != MISSING
+
+    @property
+    def contour(self) -> np.ndarray:
+        return coords_contour(self.coords)
+
+    @property
+    def rect(self) -> Tuple[float, float, float, float]:
+        return coords_bounds(self.coords)
+
+    @property
+    def line(self) -> Line:
+        return Line(self.coords)
+
+    @property
+    def shifted_coords(self) -> np.ndarray:
+        shift_point = self.shift_point
+        if shift_point is None:
+            return self.coords
+        return self.coords - np.array((shift_point.x, shift_point.y), dtype=self.coords.dtype)
+
+    @property
+    def shifted_contour(self) -> np.ndarray:
+        return coords_contour(self.shifted_coords)
+
+    @property
+    def shifted_rect(self) -> Tuple[float, float, float, float]:
+        return coords_bounds(self.shifted_coords)
+
+    @property
+    def shifted_line(self) -> Line:
+        return Line(self.shifted_coords)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """ Универсальный getter как у Shape: сначала атрибут, затем meta. """
+        if hasattr(self, name):
+            return getattr(self, name)
+        return self.meta.get(name, default)
+
+    def to_shape(self, numpy_coords: bool = False) -> Shape:
+        """ Полноценный Shape по этой строке (numpy_coords=True — coords как представление буфера батча). """
+        return Shape.construct(
+            label=self.label,
+            coords=self.coords if numpy_coords else self.coords.tolist(),
+            type=self.type,
+            number=self.number,
+            description=self.description,
+            flags=self.flags,
+            mask=self.mask,
+            position=self.position,
+            wz_number=self.wz_number,
+            shift_point=self.shift_point,
+            meta=self.meta,
+        )
+
+    def _object(self, name: str) -> Any:
+        values = self._batch._objects.get(name)
+        return None if values is None else _restore(name, values[self._index])
+
+    def __repr__(self) -> str:
+        return (
+            f"ShapeRow(label={self.label!r}, type={self.type!r}, "
+            f"coords={self.coords.tolist()!r}, number={self.number!r})"
+        )
+
+
+def _from_int(value: np.int64) -> Optional[int]:
+    return None if value == MISSING else int(value)
+
+
+def _restore(name: str, value: Any) -> Any:
+    """ Маркер пустого dict превращается в новый dict, чтобы строки не делили изменяемый объект. """
+    return {} if value is _EMPTY else value
@@ -0,0 +1,5 @@
+from ..utils.lazy_import import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.dataset_generator': ('DatasetSpec', 'GeneratedFile', 'DatasetGenerator'),
+})
@@ -0,0 +1,369 @@
+__all__ = ['DatasetSpec', 'GeneratedFile', 'DatasetGenerator']
+
+import base64
+import os
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from xml.etree.ElementTree import Element, SubElement, indent, tostring
+
+import numpy as np
+
+from ..core.annotation_batch import AnnotationBatch
+from ..public_enums import Adapters
+from ..utils.json_codec import JsonCodec
+
+DEFAULT_LABELS = ("person", "car", "truck", "bus", "bicycle", "motorcycle", "dog", "crop", "zone", "promt")
+VERTEX_DISTRIBUTIONS = ("uniform", "loguniform")
+# Минимальный и максимальный «радиус» фигуры в пикселях (доля от меньшей стороны изображения — для максимума)
+_MIN_RADIUS = 4.0
+_MAX_RADIUS_SHARE = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSpec:
+    """
+        Параметры синтетического набора разметки. Один и тот же spec (включая seed) всегда даёт
+        побайтно одинаковые файлы — независимо от числа процессов и порядка генерации.
+        Args:
+            markup_type (str | Adapters): Формат: 'labelme', 'coco' или 'voc'.
+            files (int): Число файлов.
+            shapes_per_file (int): Среднее число фигур в файле.
+            shapes_spread (float): Разброс числа фигур: равномерно в ±shapes_spread * shapes_per_file (0 — ровно).
+            labels (Tuple[str, ...]): Словарь меток.
+            label_skew (float): Показатель Ципфа для частот меток (0 — равновероятно, 1 — «длинный хвост»).
+            vertices (Tuple[int, int]): Минимум и максимум вершин полигона.
+            vertex_distribution (str): 'uniform' или 'loguniform' (много простых полигонов, мало сложных).
+            rectangle_share (float): Доля прямоугольников среди фигур LabelMe (COCO и VOC — всегда bbox).
+            group_id_share (float): Доля фигур с group_id (номером); остальные — общие.
+            max_group_id (int): group_id выбирается из 1..max_group_id.
+            wz_share (float): Доля фигур LabelMe с полем wz (номер рабочей зоны).
+            wz_count (int): wz выбирается из 1..wz_count.
+            image_data_bytes (int): Размер встроенного imageData LabelMe до base64 (0 — null).
+            image_size (Tuple[int, int]): Ширина и высота изображения.
+            images_per_file (int): Изображений в одном COCO-файле.
+            seed (int): Зерно генератора.
+            pretty (bool): True — JSON (или XML) с отступами, False — компактный (по умолчанию).
+            voc_xml (bool): VOC в формате Pascal VOC XML (файлы .xml), а не плоским JSON (только для 'voc').
+        Raises:
+            ValueError: Если параметры противоречивы.
+    """
+    markup_type: Union[str, Adapters] = Adapters.labelme
+    files: int = 10
+    shapes_per_file: int = 100
+    shapes_spread: float = 0.0
+    labels: Tuple[str, ...] = DEFAULT_LABELS
+    label_skew: float = 1.0
+    vertices: Tuple[int, int] = (4, 32)
+    vertex_distribution: str = "uniform"
+    rectangle_share: float = 0.2
+    group_id_share: float = 0.5
+    max_group_id: int = 100
+    wz_share: float = 0.0
+    wz_count: int = 4
+    image_data_bytes: int = 0
+    image_size: Tuple[int, int] = (1920, 1080)
+    images_per_file: int = 1
+    seed: int = 0
+    pretty: bool = False
+    voc_xml: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "markup_type", Adapters(self.markup_type))
+        object.__setattr__(self, "labels", tuple(self.labels))
+        object.__setattr__(self, "vertices", tuple(self.vertices))
+        object.__setattr__(self, "image_size", tuple(self.image_size))
+        if self.files < 0 or self.shapes_per_file < 0 or self.image_data_bytes < 0:
+            raise ValueError("files, shapes_per_file and image_data_bytes must be >= 0")
+        if not self.labels:
+            raise ValueError("labels must not be empty")
+        low, high = self.vertices
+        if not 3 <= low <= high:
+            raise ValueError(f"vertices must be (min, max) with 3 <= min <= max, got {self.vertices}")
+        if self.vertex_distribution not in VERTEX_DISTRIBUTIONS:
+            raise ValueError(f"vertex_distribution must be one of {VERTEX_DISTRIBUTIONS}, "
+                             f"got {self.vertex_distribution!r}")
+        for name in ("shapes_spread", "rectangle_share", "group_id_share", "wz_share"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1], got {getattr(self, name)}")
+        if self.label_skew < 0 or self.max_group_id < 1 or self.wz_count < 1 or self.images_per_file < 1:
+            raise ValueError("label_skew must be >= 0; max_group_id, wz_count and images_per_file must be >= 1")
+        if min(self.image_size) < 1:
+            raise ValueError(f"image_size must be positive, got {self.image_size}")
+        if self.voc_xml and self.markup_type is not Adapters.voc:
+            raise ValueError(f"voc_xml requires markup_type 'voc', got '{self.markup_type.value}'")
+
+
+@dataclass(frozen=True, slots=True)
+class GeneratedFile:
+    """
+        Записанный файл набора.
+        Args:
+            path (str): Путь к файлу.
+            shapes (int): Число фигур (аннотаций, объектов) в файле.
+            size (int): Размер файла в байтах.
+    """
+    path: str
+    shapes: int
+    size: int
+
+
+class DatasetGenerator:
+    """
+        Генератор синтетических наборов разметки LabelMe, COCO и VOC для нагрузочных тестов и бенчмарков.
+        Координаты всех фигур файла строятся одним векторным проходом numpy и сериализуются как массивы
+        (orjson пишет их без промежуточных списков), файлы генерируются параллельно в процессах.
+        Samples:
+            spec = DatasetSpec('labelme', files=1000, shapes_per_file=500, vertices=(4, 256),
+                               vertex_distribution='loguniform', wz_share=0.3, seed=42)
+            for item in DatasetGenerator.write(spec, 'data/labelme', workers=8):
+                print(item.path, item.shapes, item.size)
+    """
+
+    @staticmethod
+    def file_name(spec: DatasetSpec, index: int) -> str:
+        """ Имя файла с номером index. """
+        return f"{spec.markup_type.value}_{index:06d}{'.xml' if spec.voc_xml else '.json'}"
+
+    @staticmethod
+    def document(spec: DatasetSpec, index: int) -> Dict[str, Any]:
+        """
+            Документ разметки для файла с номером index (детерминирован по spec.seed и index).
+            Координаты — массивы numpy (поддерживаются JsonCodec); для обычных списков используйте tolist().
+        """
+        rng = np.random.default_rng([spec.seed, index])
+        stem = DatasetGenerator.file_name(spec, index).rsplit(".", 1)[0]
+        if spec.markup_type is Adapters.labelme:
+            return _labelme_document(spec, rng, stem)
+        if spec.markup_type is Adapters.coco:
+            return _coco_document(spec, rng, index)
+        if spec.markup_type is Adapters.voc:
+            return _voc_document(spec, rng, stem)
+        raise ValueError(f"Synthetic datasets are not supported for '{spec.markup_type.value}'")
+
+    @staticmethod
+    def write_file(spec: DatasetSpec, index: int, output_dir: Union[str, Path]) -> GeneratedFile:
+        """ Генерирует и записывает один файл набора. """
+        document = DatasetGenerator.document(spec, index)
+        path = os.path.join(output_dir, DatasetGenerator.file_name(spec, index))
+        data = _voc_xml(document, spec.pretty) if spec.voc_xml else JsonCodec.dumps(document, pretty=spec.pretty)
+        with open(path, "wb") as f:
+            f.write(data)
+        return GeneratedFile(path=path, shapes=_shape_total(spec, document), size=len(data))
+
+    @staticmethod
+    def write(spec: DatasetSpec,
+              output_dir: Union[str, Path],
+              workers: Optional[int] = None,
+              chunksize: Optional[int] = None) -> Iterator[GeneratedFile]:
+        """
+            Записывает набор в output_dir (каталог создаётся), выдавая файлы по мере готовности.
+            Args:
+                spec: Параметры набора.
+                output_dir: Каталог для файлов.
+                workers: Число процессов. None — по числу CPU; 0 или 1 — в текущем процессе.
+                chunksize: Файлов на одну задачу процесса. None — автоматически.
+            Returns:
+                Iterator[GeneratedFile]: Записанные файлы в порядке завершения.
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        task = partial(_write_task, spec, str(output_dir))
+        yield from AnnotationBatch.run(task, range(spec.files), workers=workers, chunksize=chunksize, ordered=False)
+
+
+def _write_task(spec: DatasetSpec, output_dir: str, index: int) -> GeneratedFile:
+    return DatasetGenerator.write_file(spec, index, output_dir)
+
+
+def _labelme_document(spec: DatasetSpec, rng: np.random.Generator, stem: str) -> Dict[str, Any]:
+    n = _shape_count(spec, rng)
+    width, height = spec.image_size
+    labels = _labels(spec, rng, n)
+    is_rect = rng.random(n) < spec.rectangle_share
+    counts = np.where(is_rect, 2, _vertex_counts(spec, rng, n))
+    xy, offsets = _geometry(rng, counts, is_rect, width, height)
+    group_ids = _optional_ints(rng, n, spec.group_id_share, spec.max_group_id)
+    wz = _optional_ints(rng, n, spec.wz_share, spec.wz_count)
+    ends, rects = offsets.tolist(), is_rect.tolist()
+    shapes = []
+    for i in range(n):
+        shape = {
+            "label": labels[i],
+            # Срез-представление массива: JsonCodec (orjson) пишет его без промежуточного списка
+            "points": xy[ends[i]:ends[i + 1]],
+            "group_id": group_ids[i],
+            "description": "",
+            "shape_type": "rectangle" if rects[i] else "polygon",
+            "flags": {},
+            "mask": None,
+        }
+        if wz[i] is not None:
+            shape["wz"] = wz[i]
+        shapes.append(shape)
+    image_data = None
+    if spec.image_data_bytes:
+        image_data = base64.b64encode(rng.bytes(spec.image_data_bytes)).decode("ascii")
+    return {"version": "5.5.0", "flags": {}, "shapes": shapes, "imagePath": f"{stem}.jpg",
+            "imageData": image_data, "imageHeight": height, "imageWidth": width}
+
+
+def _coco_document(spec: DatasetSpec, rng: np.random.Generator, index: int) -> Dict[str, Any]:
+    n = _shape_count(spec, rng)
+    width, height = spec.image_size
+    categories = _label_indices(spec, rng, n).tolist()
+    counts = _vertex_counts(spec, rng, n)
+    xy, offsets = _geometry(rng, counts, np.zeros(n, dtype=bool), width, height)
+    extent = _bounds(xy, offsets)
+    boxes = np.column_stack((extent[:, :2], extent[:, 2:] - extent[:, :2]))
+    areas = _polygon_areas(xy, offsets).tolist()
+    first_image = index * spec.images_per_file
+    image_ids = (first_image + rng.integers(0, spec.images_per_file, n)).tolist()
+    # COCO-сегментация — плоский список [x1, y1, x2, y2, ...]
+    flat, ends = xy.reshape(-1), (2 * offsets).tolist()
+    annotations = [
+        {"id": i + 1, "image_id": image_ids[i], "category_id": categories[i] + 1, "bbox": boxes[i],
+         "segmentation": [flat[ends[i]:ends[i + 1]]], "area": areas[i], "iscrowd": 0}
+        for i in range(n)
+    ]
+    images = [{"id": first_image + k, "file_name": f"{first_image + k:012d}.jpg", "width": width, "height": height}
+              for k in range(spec.images_per_file)]
+    return {"images": images, "annotations": annotations,
+            "categories": [{"id": k + 1, "name": name, "supercategory": "object"}
+                           for k, name in enumerate(spec.labels)]}
+
+
+def _voc_document(spec: DatasetSpec, rng: np.random.Generator, stem: str) -> Dict[str, Any]:
+    n = _shape_count(spec, rng)
+    width, height = spec.image_size
+    labels = _labels(spec, rng, n)
+    xy, offsets = _geometry(rng, np.full(n, 2), np.ones(n, dtype=bool), width, height)
+    bounds = _bounds(xy, offsets).tolist()
+    objects = [
+        {"name": labels[i], "pose": "Unspecified", "truncated": 0, "difficult": 0,
+         "bndbox_xmin": bounds[i][0], "bndbox_ymin": bounds[i][1],
+         "bndbox_xmax": bounds[i][2], "bndbox_ymax": bounds[i][3]}
+        for i in range(n)
+    ]
+    return {"folder": "VOC", "filename": f"{stem}.jpg", "size": {"width": width, "height": height, "depth": 3},
+            "segmented": 0, "objects": objects}
+
+
+def _voc_xml(document: Dict[str, Any], pretty: bool) -> bytes:
+    """ VOC-документ в Pascal VOC XML: объекты — теги <object>, поля bndbox_* собираются в <bndbox>. """
+    root = Element("annotation")
+    for key, value in document.items():
+        if key != "objects":
+            _xml_value(SubElement(root, key), value)
+    for obj in document["objects"]:
+        elem = SubElement(root, "object")
+        bndbox = {}
+        for key, value in obj.items():
+            if key.startswith("bndbox_"):
+                bndbox[key[len("bndbox_"):]] = value
+            else:
+                _xml_value(SubElement(elem, key), value)
+        _xml_value(SubElement(elem, "bndbox"), bndbox)
+    if pretty:
+        indent(root)
+    return tostring(root, encoding="utf-8")
+
+
+def _xml_value(elem: Element, value: Any) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _xml_value(SubElement(elem, key), item)
+    else:
+        elem.text = str(value)
+
+
+def _shape_count(spec: DatasetSpec, rng: np.random.Generator) -> int:
+    if not spec.shapes_spread:
+        return spec.shapes_per_file
+    spread = spec.shapes_spread * spec.shapes_per_file
+    return max(0, int(round(rng.uniform(spec.shapes_per_file - spread, spec.shapes_per_file + spread))))
+
+
+def _label_indices(spec: DatasetSpec, rng: np.random.Generator, n: int) -> np.ndarray:
+    weights = 1.0 / np.arange(1, len(spec.labels) + 1) ** spec.label_skew
+    return rng.choice(len(spec.labels), size=n, p=weights / weights.sum())
+
+
+def _labels(spec: DatasetSpec, rng: np.random.Generator, n: int) -> list:
+    labels = spec.labels
+    return [labels[k] for k in _label_indices(spec, rng, n).tolist()]
+
+
+def _vertex_counts(spec: DatasetSpec, rng: np.random.Generator, n: int) -> np.ndarray:
+    low, high = spec.vertices
+    if spec.vertex_distribution == "loguniform":
+        return np.exp(rng.uniform(np.log(low), np.log(high + 1), n)).astype(np.int64).clip(low, high)
+    return rng.integers(low, high + 1, n)
+
+
+def _optional_ints(rng: np.random.Generator, n: int, share: float, maximum: int) -> list:
+    """ Значения 1..maximum у доли share фигур, у остальных None. """
+    values = rng.integers(1, maximum + 1, n).tolist()
+    present = (rng.random(n) < share).tolist()
+    return [value if keep else None for value, keep in zip(values, present)]
+
+
+def _geometry(rng: np.random.Generator,
+              counts: np.ndarray,
+              is_rect: np.ndarray,
+              width: int,
+              height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+        Вершины всех фигур одним массивом (V, 2) и смещения фигур в нём (n + 1).
+        Полигоны — звёздчатые (углы по возрастанию вокруг центра), поэтому без самопересечений;
+        прямоугольники — две точки (левый верхний и правый нижний углы), как пишет LabelMe.
+    """
+    n = len(counts)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    if not n:
+        return np.empty((0, 2)), offsets
+    max_radius = max(_MIN_RADIUS, _MAX_RADIUS_SHARE * min(width, height))
+    centers = rng.uniform((0.0, 0.0), (width, height), (n, 2))
+    radii = np.exp(rng.uniform(np.log(_MIN_RADIUS), np.log(max_radius), n))
+
+    owner = np.repeat(np.arange(n), counts)
+    steps = rng.uniform(0.5, 1.5, len(owner))
+    cumulative = np.cumsum(steps)
+    before = np.concatenate(([0.0], cumulative))[offsets[:-1]]
+    totals = cumulative[offsets[1:] - 1] - before
+    angles = 2 * np.pi * (cumulative - before[owner]) / totals[owner]
+    distance = radii[owner] * rng.uniform(0.6, 1.0, len(owner))
+    xy = centers[owner] + distance[:, None] * np.column_stack((np.cos(angles), np.sin(angles)))
+
+    if is_rect.any():
+        rects = np.flatnonzero(is_rect)
+        half = radii[rects, None] * rng.uniform(0.4, 1.0, (len(rects), 2))
+        xy[offsets[rects]] = centers[rects] - half
+        xy[offsets[rects] + 1] = centers[rects] + half
+    np.clip(xy, (0.0, 0.0), (width, height), out=xy)
+    return xy, offsets
+
+
+def _bounds(xy: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """ (n, 4) xmin, ymin, xmax, ymax по смещениям фигур (у каждой фигуры хотя бы одна вершина). """
+    if len(offsets) < 2:
+        return np.empty((0, 4))
+    starts = offsets[:-1]
+    return np.column_stack((np.minimum.reduceat(xy, starts), np.maximum.reduceat(xy, starts)))
+
+
+def _polygon_areas(xy: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """ Площади полигонов по формуле шнурков, для всех фигур сразу. """
+    if len(offsets) < 2:
+        return np.empty(0)
+    following = np.arange(1, len(xy) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    x, y = xy[:, 0], xy[:, 1]
+    cross = x * y[following] - x[following] * y
+    return 0.5 * np.abs(np.add.reduceat(cross, offsets[:-1]))
+
+
+def _shape_total(spec: DatasetSpec, document: Dict[str, Any]) -> int:
+    key = {Adapters.labelme: "shapes", Adapters.coco: "annotations", Adapters.voc: "objects"}[spec.markup_type]
+    return len(document[key])
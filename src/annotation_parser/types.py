@@ -1,10 +1,12 @@
 __all__ = ['ShiftPointType', 'Coords', 'CoordsInput']
 
-from typing import List, Tuple, Union, Sequence, Any, Optional
-from shapely.geometry import Point
+from typing import List, Tuple, Union, Sequence, Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from shapely.geometry import Point
 
 # То, как можно передать shift_point
-ShiftPointType = Optional[Union[Point, Tuple[float, float], List[float], Any]]
+ShiftPointType = Optional[Union["Point", Tuple[float, float], List[float], Any]]
 
 # Координаты: [[x, y], ...]
 Coords = List[List[float]]
@@ -1 +1,10 @@
-from .geometry import *
+from .lazy_import import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    '.geometry': ('to_point', 'to_coords', 'to_coord_array', 'coords_to_list', 'two_coords_to_four', 'coords_bounds',
+                  'coords_contour', 'coords_line', 'shift_coords_many', 'is_ndarray'),
+    '.json_codec': ('JsonCodec',),
+    '.json_stream': ('JsonStreamReader', 'JsonStreamWriter'),
+    '.mask_codec': ('MaskCodec', 'LazyMask'),
+    '.instrumentation': ('StageHook', 'StageStats', 'PipelineCollector', 'instrument', 'stage', 'active_hook'),
+})
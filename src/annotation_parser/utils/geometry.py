@@ -1,11 +1,19 @@
-__all__ = ['to_point', 'to_coords', 'two_coords_to_four']
+from __future__ import annotations
 
-from shapely.geometry import Point
-from typing import overload, Tuple, List, Any, Optional
+__all__ = ['to_point', 'to_coords', 'to_coord_array', 'coords_to_list', 'two_coords_to_four', 'coords_bounds',
+           'coords_contour', 'coords_line', 'shift_coords_many', 'is_ndarray']
+
+import sys
+from typing import overload, Tuple, List, Any, Optional, TYPE_CHECKING
 
 from ..public_enums import ShapeType
 from ..types import ShiftPointType, CoordsInput, Coords
 
+# numpy и shapely импортируются внутри функций: import пакета и разбор списков координат обходятся без них
+if TYPE_CHECKING:
+    import numpy as np
+    from shapely.geometry import LineString, Point
+
 
 @overload
 def to_point(obj: None) -> None: ...
@@ -29,6 +37,7 @@ def to_point(obj: Any) -> ShiftPointType:
     """
     if obj is None:
         return None
+    from shapely.geometry import Point
     if isinstance(obj, Point):
         return obj
     if isinstance(obj, (list, tuple)) and len(obj) == 2:
@@ -61,11 +70,103 @@ def to_coords(coords: Any) -> Optional[Coords]:
     return out
 
 
+def to_coord_array(coords: Any, shape_type: str | ShapeType | None = None) -> np.ndarray:
+    """
+        Преобразует координаты в неизменяемый массив (N, 2) float64 одним векторным вызовом numpy
+        (без цикла по парам, как в to_coords). Неизменяемый массив float64 формы (N, 2) переиспользуется,
+        изменяемый копируется.
+        Для прямоугольника из двух точек строит четыре угла, как two_coords_to_four.
+        Raises:
+            ValueError: Если координаты не являются парами чисел.
+    """
+    import numpy as np
+    try:
+        array = np.asarray(coords, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Each coordinate must be a pair of numbers, got: {coords!r}") from e
+    if array.size == 0:
+        array = array.reshape(0, 2)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"Each coordinate must be a pair of numbers, got array of shape {array.shape}")
+    if shape_type is not None and _is_rectangle(shape_type) and len(array) == 2:
+        (x1, y1), (x2, y2) = array
+        array = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+    elif not array.flags.writeable:
+        # Уже неизменяемый массив (например, coords другой Shape) — переиспользуем как есть
+        return array
+    elif array is coords or not array.flags.owndata:
+        # Изменяемый массив вызывающего: копия, иначе его правки меняли бы «неизменяемую» фигуру
+        array = array.copy()
+    array.flags.writeable = False
+    return array
+
+
+def coords_to_list(coords: Any) -> Coords:
+    """ Координаты в виде списка пар [[x, y], ...] (для сериализации); списки возвращаются как есть. """
+    if is_ndarray(coords):
+        return coords.tolist()
+    return coords
+
+
 def two_coords_to_four(coords: list, shape_type: str | ShapeType) -> list:
     """ Для прямоугольника: если передано 2 точки — строит 4 угла. """
-    stype = shape_type.value if isinstance(shape_type, ShapeType) else shape_type
-    if (stype.lower() == "rectangle" or stype == ShapeType.RECTANGLE) and len(coords) == 2:
+    if _is_rectangle(shape_type) and len(coords) == 2:
         x1, y1 = coords[0]
         x2, y2 = coords[1]
         return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
     return coords
+
+
+def _is_rectangle(shape_type: str | ShapeType) -> bool:
+    stype = shape_type.value if isinstance(shape_type, ShapeType) else shape_type
+    return stype.lower() == "rectangle" or stype == ShapeType.RECTANGLE
+
+
+def coords_bounds(coords: Any) -> Tuple[float, float, float, float]:
+    """
+        Ограничивающий прямоугольник (min_x, min_y, max_x, max_y) по координатам — одним проходом numpy,
+        без построения shapely-геометрии. Работает для фигур любого типа, включая точки и линии.
+        Raises:
+            ValueError: Если coords пустые.
+    """
+    import numpy as np
+    points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if not len(points):
+        raise ValueError("Shape.coords is empty, cannot compute bounds")
+    x_min, y_min = points.min(axis=0)
+    x_max, y_max = points.max(axis=0)
+    return float(x_min), float(y_min), float(x_max), float(y_max)
+
+
+def coords_contour(coords: Any) -> np.ndarray:
+    """ Контур формы (N, 1, 2) float32 для OpenCV, только для чтения (может кэшироваться и разделяться). """
+    import numpy as np
+    contour = np.array(coords, dtype=np.float32).reshape((-1, 1, 2))
+    contour.flags.writeable = False
+    return contour
+
+
+def shift_coords_many(coords: np.ndarray, counts: Any, shifts: np.ndarray) -> np.ndarray:
+    """
+        Сдвигает склеенные координаты многих фигур на их точки смещения одной операцией numpy.
+        Args:
+            coords: Координаты всех фигур подряд, форма (M, 2).
+            counts: Число вершин каждой фигуры, длина N (сумма — M).
+            shifts: Точка смещения каждой фигуры, форма (N, 2).
+        Returns:
+            np.ndarray: Новый массив (M, 2): coords[j] - shifts[фигура вершины j].
+    """
+    import numpy as np
+    return coords - np.repeat(shifts, counts, axis=0)
+
+
+def coords_line(coords: Any) -> LineString:
+    """ shapely.geometry.LineString по координатам. """
+    from shapely.geometry import LineString
+    return LineString(coords)
+
+
+def is_ndarray(obj: Any) -> bool:
+    """ True, если obj — np.ndarray. numpy не импортирует: пока он не загружен, массивов быть не может. """
+    np = sys.modules.get('numpy')
+    return np is not None and isinstance(obj, np.ndarray)
@@ -0,0 +1,235 @@
+__all__ = ['StageHook', 'StageStats', 'PipelineCollector', 'instrument', 'stage', 'active_hook']
+
+import math
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# hook(stage, seconds, nbytes, shapes): вызывается по завершении каждого этапа
+StageHook = Callable[[str, float, int, int], Any]
+
+_HOOK: ContextVar[Optional[StageHook]] = ContextVar("annotation_parser_stage_hook", default=None)
+
+# Гистограмма длительностей: 4 корзины на октаву (шаг ~19%) от 1 мкс до ~12 суток; корзина 0 — меньше 1 мкс,
+# корзина k >= 1 — [2^((k-1)/4), 2^(k/4)) мкс
+_PER_OCTAVE = 4
+_BUCKETS = 1 + 40 * _PER_OCTAVE
+
+
+class StageStats:
+    """
+        Накопленная статистика одного этапа: число замеров, суммарное/минимальное/максимальное время,
+        байты, фигуры и логарифмическая гистограмма длительностей (перцентили — по ней, с точностью ~19%).
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', 'nbytes', 'shapes', 'buckets')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: float = float("inf")
+        self.max: float = 0.0
+        self.nbytes: int = 0
+        self.shapes: int = 0
+        self.buckets: List[int] = [0] * _BUCKETS
+
+    def add(self, seconds: float, nbytes: int = 0, shapes: int = 0) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.nbytes += nbytes
+        self.shapes += shapes
+        self.buckets[_bucket(seconds)] += 1
+
+    def merge(self, other: "StageStats") -> None:
+        """ Добавляет статистику other (например, собранную в другом процессе). """
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.nbytes += other.nbytes
+        self.shapes += other.shapes
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """ Приближённый перцентиль длительности (q в 0..100), секунды: середина корзины, ограниченная min/max. """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(max(_bucket_middle(k), self.min), self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count, "total_s": self.total, "mean_s": self.mean,
+            "min_s": self.min if self.count else 0.0, "max_s": self.max,
+            "p50_s": self.percentile(50), "p90_s": self.percentile(90), "p99_s": self.percentile(99),
+            "bytes": self.nbytes, "shapes": self.shapes,
+            # Нижняя граница корзины в мкс -> число замеров
+            "histogram_us": {_bucket_floor_us(k): n for k, n in enumerate(self.buckets) if n},
+        }
+
+
+class PipelineCollector:
+    """
+        Хук инструментирования, собирающий статистику по этапам (см. instrument).
+        Потокобезопасен; статистику из процессов-воркеров AnnotationBatch переносит в родительский сборщик сам.
+        Samples:
+            with instrument() as collector:
+                results = list(parse_many('data/', 'labelme', workers=8))
+            print(collector.summary())
+            collector.stats('decode').percentile(99)
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stage: str, seconds: float, nbytes: int = 0, shapes: int = 0) -> None:
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                stats = self._stats[stage] = StageStats()
+            stats.add(seconds, nbytes, shapes)
+
+    def stats(self, stage: str) -> StageStats:
+        """ Статистика этапа (пустая, если этап не встречался). """
+        return self._stats.get(getattr(stage, "value", stage)) or StageStats()
+
+    @property
+    def stages(self) -> Dict[str, StageStats]:
+        """ Все этапы в порядке первого появления. """
+        return dict(self._stats)
+
+    def merge(self, other: "PipelineCollector") -> None:
+        with self._lock:
+            for name, stats in other.stages.items():
+                self._stats.setdefault(name, StageStats()).merge(stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def summary(self) -> str:
+        """ Таблица по этапам: число, суммарное время, перцентили, пропускная способность. """
+        lines = [f"{'stage':<10} {'count':>7} {'total':>9} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} "
+                 f"{'max':>9} {'MB/s':>8} {'shapes/s':>11}"]
+        for name, s in self._stats.items():
+            rate = f"{s.nbytes / 2 ** 20 / s.total:8.1f}" if s.nbytes and s.total else f"{'':>8}"
+            shapes = f"{s.shapes / s.total:11,.0f}" if s.shapes and s.total else f"{'':>11}"
+            lines.append(f"{name:<10} {s.count:>7} {s.total:8.3f}s " + " ".join(
+                _ms(v) for v in (s.mean, s.percentile(50), s.percentile(90), s.percentile(99), s.max))
+                + f" {rate} {shapes}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def instrument(hook: Optional[StageHook] = None) -> Iterator[StageHook]:
+    """
+        Включает инструментирование этапов парсинга и сохранения в текущем контексте (поток, задача asyncio).
+        Args:
+            hook: Функция hook(stage, seconds, nbytes, shapes) или PipelineCollector. None — новый PipelineCollector.
+        Returns:
+            Хук (для None — созданный PipelineCollector).
+    """
+    hook = PipelineCollector() if hook is None else hook
+    token = _HOOK.set(hook)
+    try:
+        yield hook
+    finally:
+        _HOOK.reset(token)
+
+
+def active_hook() -> Optional[StageHook]:
+    """ Хук текущего контекста или None, если инструментирование выключено. """
+    return _HOOK.get()
+
+
+def stage(name: str, nbytes: int = 0, shapes: int = 0) -> "_StageTimer":
+    """
+        Замер этапа: with stage(PipelineStage.DECODE, nbytes=size): ...
+        Без активного хука возвращает общий пустой замер (накладные расходы — одно чтение ContextVar).
+        Счётчики можно задать после выполнения: timer.set(shapes=len(result)).
+    """
+    hook = _HOOK.get()
+    if hook is None:
+        return _NULL_TIMER
+    return _StageTimer(hook, getattr(name, "value", name), nbytes, shapes)
+
+
+class _StageTimer:
+    __slots__ = ('_hook', '_name', '_nbytes', '_shapes', '_start')
+
+    def __init__(self, hook: StageHook, name: str, nbytes: int, shapes: int) -> None:
+        self._hook = hook
+        self._name = name
+        self._nbytes = nbytes
+        self._shapes = shapes
+        self._start = 0.0
+
+    def set(self, nbytes: Optional[int] = None, shapes: Optional[int] = None) -> None:
+        if nbytes is not None:
+            self._nbytes = nbytes
+        if shapes is not None:
+            self._shapes = shapes
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Неудачные этапы не записываются: их время не характеризует этап
+        if exc_type is None:
+            self._hook(self._name, perf_counter() - self._start, self._nbytes, self._shapes)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def set(self, nbytes: Optional[int] = None, shapes: Optional[int] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _bucket(seconds: float) -> int:
+    us = seconds * 1e6
+    if us < 1.0:
+        return 0
+    return min(int(math.log2(us) * _PER_OCTAVE) + 1, _BUCKETS - 1)
+
+
+def _bucket_middle(k: int) -> float:
+    """ Середина корзины (геометрическая), секунды. """
+    return 0.5e-6 if k == 0 else 2 ** ((k - 0.5) / _PER_OCTAVE) * 1e-6
+
+
+def _bucket_floor_us(k: int) -> float:
+    return 0.0 if k == 0 else round(2 ** ((k - 1) / _PER_OCTAVE), 3)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:7.2f}ms"
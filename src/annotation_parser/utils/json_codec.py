@@ -0,0 +1,160 @@
+__all__ = ['JsonCodec']
+
+import json
+import mmap
+import os
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..public_enums import JsonBackend, PipelineStage
+from .instrumentation import stage
+
+# Порядок автоматического выбора: самый быстрый из установленных
+_PREFERRED = (JsonBackend.ORJSON, JsonBackend.UJSON, JsonBackend.STDLIB)
+# Переменная окружения для выбора библиотеки без изменения кода ('orjson', 'ujson', 'json')
+ENV_VAR = "ANNOTATION_PARSER_JSON"
+
+
+class JsonCodec:
+    """
+        Единая точка чтения/записи JSON для всей библиотеки.
+        Использует orjson или ujson, если они установлены, иначе стандартный json.
+        Файлы читаются байтами (крупные — через mmap), без промежуточного текстового потока.
+        Samples:
+            JsonCodec.set_backend("json")          # принудительно stdlib
+            data = JsonCodec.load_file("file.json")
+            JsonCodec.dump_file(data, "out.json", pretty=False)
+    """
+
+    # Файлы не меньше этого размера читаются через mmap
+    MMAP_THRESHOLD: int = 16 * 1024 * 1024
+
+    _backend: Optional[JsonBackend] = None
+    _modules: Dict[JsonBackend, Any] = {}
+
+    @staticmethod
+    def available_backends() -> List[JsonBackend]:
+        """ Список установленных библиотек в порядке предпочтения. """
+        return [backend for backend in _PREFERRED if JsonCodec._module(backend) is not None]
+
+    @staticmethod
+    def get_backend() -> JsonBackend:
+        """ Текущая библиотека JSON (при первом вызове выбирается автоматически или по ANNOTATION_PARSER_JSON). """
+        if JsonCodec._backend is None:
+            JsonCodec.set_backend(os.environ.get(ENV_VAR) or None)
+        return JsonCodec._backend
+
+    @staticmethod
+    def set_backend(backend: Union[str, JsonBackend, None] = None) -> JsonBackend:
+        """
+            Выбирает библиотеку JSON.
+            Args:
+                backend: 'orjson', 'ujson', 'json' или JsonBackend. None — самая быстрая из установленных.
+            Returns:
+                JsonBackend: Выбранная библиотека.
+            Raises:
+                ValueError: Если библиотека неизвестна или не установлена.
+        """
+        if backend is None:
+            JsonCodec._backend = JsonCodec.available_backends()[0]
+            return JsonCodec._backend
+        try:
+            backend = JsonBackend(backend)
+        except ValueError:
+            raise ValueError(f"Unknown JSON backend: {backend}. Known: {', '.join(b.value for b in JsonBackend)}")
+        if JsonCodec._module(backend) is None:
+            raise ValueError(f"JSON backend '{backend.value}' is not installed")
+        JsonCodec._backend = backend
+        return backend
+
+    @staticmethod
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """
+            Декодирует JSON из байтов или строки.
+            Raises:
+                json.JSONDecodeError: Если данные некорректный JSON (для любой библиотеки).
+        """
+        backend = JsonCodec.get_backend()
+        module = JsonCodec._modules[backend]
+        if backend is JsonBackend.ORJSON:
+            return module.loads(data)
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if backend is JsonBackend.UJSON:
+            try:
+                return module.loads(data)
+            except ValueError as e:
+                raise json.JSONDecodeError(str(e), "", 0) from e
+        return module.loads(data)
+
+    @staticmethod
+    def dumps(obj: Any, pretty: bool = True) -> bytes:
+        """
+            Сериализует объект в JSON (UTF-8 байты, без экранирования не-ASCII символов).
+            Args:
+                obj: Объект для сериализации. numpy-массивы и скаляры поддерживаются.
+                pretty: True — с отступом в 2 пробела (как раньше), False — компактно, без пробелов.
+        """
+        backend = JsonCodec.get_backend()
+        module = JsonCodec._modules[backend]
+        if backend is JsonBackend.ORJSON:
+            option = module.OPT_SERIALIZE_NUMPY | module.OPT_NON_STR_KEYS
+            if pretty:
+                option |= module.OPT_INDENT_2
+            return module.dumps(obj, option=option, default=_to_builtin)
+        if backend is JsonBackend.UJSON:
+            text = module.dumps(obj, ensure_ascii=False, indent=2 if pretty else 0, default=_to_builtin)
+        elif pretty:
+            text = json.dumps(obj, ensure_ascii=False, indent=2, default=_to_builtin)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_to_builtin)
+        return text.encode("utf-8")
+
+    @staticmethod
+    def load_file(file_path: Union[str, Path]) -> Any:
+        """
+            Читает и декодирует JSON-файл. Файлы от MMAP_THRESHOLD байт отображаются в память через mmap.
+            Raises:
+                FileNotFoundError, OSError: Ошибки доступа к файлу.
+                json.JSONDecodeError: Если файл некорректный JSON.
+        """
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < JsonCodec.MMAP_THRESHOLD or size == 0:
+                with stage(PipelineStage.READ, nbytes=size):
+                    data = f.read()
+                with stage(PipelineStage.DECODE, nbytes=size):
+                    return JsonCodec.loads(data)
+            # Страницы mmap подгружаются при разборе: чтение входит в этап DECODE
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view, stage(PipelineStage.DECODE, nbytes=size):
+                    return JsonCodec.loads(view)
+
+    @staticmethod
+    def dump_file(obj: Any, file_path: Union[str, Path], pretty: bool = True) -> None:
+        """
+            Сериализует объект и записывает его в файл одним вызовом write.
+            Raises:
+                OSError: При ошибках доступа к файлу.
+        """
+        data = JsonCodec.dumps(obj, pretty=pretty)
+        with open(file_path, "wb") as f:
+            f.write(data)
+
+    @staticmethod
+    def _module(backend: JsonBackend) -> Any:
+        """ Модуль библиотеки или None, если она не установлена. """
+        if backend not in JsonCodec._modules:
+            try:
+                JsonCodec._modules[backend] = import_module(backend.value)
+            except ImportError:
+                JsonCodec._modules[backend] = None
+        return JsonCodec._modules[backend]
+
+
+def _to_builtin(obj: Any) -> Any:
+    """ Приводит numpy-массивы/скаляры и подобные объекты к встроенным типам. """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,347 @@
+__all__ = ['JsonStreamReader', 'JsonStreamWriter']
+
+import json
+import re
+from typing import Any, BinaryIO, Iterable, Iterator, NoReturn, Tuple
+
+from .json_codec import JsonCodec
+
+# Строка JSON целиком (развёрнутый цикл — быстрый и для многомегабайтных строк вроде imageData)
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+# Токены, влияющие на вложенность: строки целиком, незакрытая кавычка (строка обрезана концом буфера), скобки
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|"|[\[\]{}]')
+# Для пропуска значения: всё, что не меняет вложенность (включая строки целиком), и тело строки до кавычки
+_FLAT = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_WS = re.compile(rb'[ \t\n\r]*')
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+_QUOTE, _OPEN_ARRAY, _OPEN_OBJECT, _BACKSLASH = 0x22, 0x5b, 0x7b, 0x5c
+
+
+class JsonStreamReader:
+    """
+        Потоковый читатель JSON поверх бинарного файла.
+        Держит в памяти только текущий блок и текущее значение, поэтому позволяет обходить
+        многогигабайтные документы (например, COCO instances_*.json) с ограниченным потреблением памяти.
+        Позиции (tell, skip_value) — абсолютные смещения в байтах от начала файла.
+        Samples:
+            with open(path, "rb") as f:
+                reader = JsonStreamReader(f)
+                for key in reader.iter_object():
+                    if key == "annotations":
+                        for ann in reader.iter_array_values():
+                            ...
+                    else:
+                        reader.skip_value()
+    """
+
+    def __init__(self, fp: BinaryIO, chunk_size: int = 1 << 20) -> None:
+        """
+            Args:
+                fp: Файл, открытый в бинарном режиме. Чтение начинается с текущей позиции fp.
+                chunk_size: Размер блока чтения в байтах.
+        """
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = bytearray()
+        self._pos = 0
+        self._base = fp.tell()
+        self._eof = False
+
+    def tell(self) -> int:
+        """ Абсолютное смещение (в байтах) текущей позиции чтения. """
+        return self._base + self._pos
+
+    def peek(self) -> bytes:
+        """ Пропускает пробелы и возвращает следующий значимый байт (b'' в конце файла). """
+        self._skip_ws()
+        return bytes(self._buf[self._pos:self._pos + 1])
+
+    def iter_object(self) -> Iterator[str]:
+        """
+            Обходит JSON-объект в текущей позиции, выдавая ключи.
+            После каждого ключа вызывающий обязан прочитать значение (read_value, skip_value, iter_array, ...).
+            Raises:
+                json.JSONDecodeError: Если в текущей позиции не объект или он некорректен.
+        """
+        self._expect(b"{")
+        if self.peek() == b"}":
+            self._pos += 1
+            return
+        while True:
+            self._skip_ws()
+            end = self._scan_value()
+            if self._buf[self._pos] != _QUOTE:
+                self._error("Expecting property name enclosed in double quotes")
+            key = JsonCodec.loads(self._buf[self._pos:end])
+            self._pos = end
+            self._expect(b":")
+            yield key
+            if self._next_item(b"}"):
+                return
+
+    def iter_array(self) -> Iterator[None]:
+        """
+            Обходит JSON-массив в текущей позиции. На каждой итерации читатель стоит на очередном элементе,
+            вызывающий обязан прочитать его (read_value, skip_value, ...). Позицию элемента можно взять через tell().
+            Raises:
+                json.JSONDecodeError: Если в текущей позиции не массив или он некорректен.
+        """
+        self._expect(b"[")
+        if self.peek() == b"]":
+            self._pos += 1
+            return
+        while True:
+            self._skip_ws()
+            yield None
+            if self._next_item(b"]"):
+                return
+
+    def iter_array_values(self) -> Iterator[Any]:
+        """ Обходит JSON-массив в текущей позиции, выдавая декодированные элементы по одному. """
+        for _ in self.iter_array():
+            yield self.read_value()
+
+    def read_value(self) -> Any:
+        """ Читает и декодирует значение в текущей позиции. """
+        self._skip_ws()
+        end = self._scan_value()
+        value = JsonCodec.loads(self._buf[self._pos:end])
+        self._pos = end
+        return value
+
+    def skip_value(self) -> Tuple[int, int]:
+        """
+            Пропускает значение в текущей позиции без декодирования.
+            Массивы, объекты и строки просматриваются блоками: прочитанная часть сразу отбрасывается, а между
+            блоками хранится только глубина вложенности и признаки «внутри строки» / «после обратной косой черты»,
+            поэтому пропуск секции любого размера (images, annotations) не держит её в памяти.
+            Returns:
+                Tuple[int, int]: Абсолютные смещения начала и конца (не включая) значения.
+        """
+        self._skip_ws()
+        start = self.tell()
+        if self._pos >= len(self._buf) and not self._fill():
+            self._error("Expecting value")
+        if self._buf[self._pos] not in (_QUOTE, _OPEN_ARRAY, _OPEN_OBJECT):
+            self._pos = self._scan_value()
+            return start, self.tell()
+        # Строка верхнего уровня сразу разбирается как тело строки: глубина 0, конец — закрывающая кавычка
+        in_string = self._buf[self._pos] == _QUOTE
+        depth, escape = 0, False
+        pos = self._pos + in_string
+        while True:
+            buf = self._buf
+            end = len(buf)
+            if escape and pos < end:
+                # Символ после обратной косой черты, пришедшей последним байтом прошлого блока
+                pos += 1
+                escape = False
+            while pos < end:
+                if in_string:
+                    pos = _STRING_BODY.match(buf, pos).end()
+                    if pos == end:
+                        break
+                    if buf[pos] == _BACKSLASH:
+                        # Обратная косая черта — последний байт блока
+                        pos += 1
+                        escape = True
+                        break
+                    pos += 1
+                    in_string = False
+                    if depth == 0:
+                        self._pos = pos
+                        return start, self.tell()
+                    continue
+                pos = _FLAT.match(buf, pos).end()
+                if pos == end:
+                    break
+                char = buf[pos]
+                pos += 1
+                if char == _QUOTE:
+                    # Строка обрезана концом блока
+                    in_string = True
+                elif char in (_OPEN_ARRAY, _OPEN_OBJECT):
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = pos
+                        return start, self.tell()
+            self._pos = pos
+            if not self._fill():
+                self._error("Unterminated string" if in_string else "Unterminated array or object")
+            pos = self._pos
+
+    def _next_item(self, closing: bytes) -> bool:
+        """ После элемента: ',' — есть следующий (False), закрывающая скобка — конец контейнера (True). """
+        char = self.peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != b",":
+            self._error(f"Expecting ',' or {closing.decode()!r} delimiter")
+        return False
+
+    def _expect(self, char: bytes) -> None:
+        if self.peek() != char:
+            self._error(f"Expecting {char.decode()!r}")
+        self._pos += 1
+
+    def _skip_ws(self) -> None:
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _fill(self) -> bool:
+        """ Дочитывает следующий блок, отбрасывая уже прочитанную часть буфера. False — конец файла. """
+        if self._eof:
+            return False
+        data = self._fp.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        del self._buf[:self._pos]
+        self._base += self._pos
+        self._pos = 0
+        self._buf += data
+        return True
+
+    def _scan_value(self) -> int:
+        """
+            Находит конец значения, начинающегося в текущей позиции, дочитывая файл по мере необходимости.
+            Позиция при этом не сдвигается (но буфер может быть перестроен — индексы считаются от self._pos).
+            Returns:
+                int: Индекс в буфере сразу за концом значения.
+        """
+        if self._pos >= len(self._buf) and not self._fill():
+            self._error("Expecting value")
+        first = self._buf[self._pos]
+        if first == _QUOTE:
+            while True:
+                match = _STRING.match(self._buf, self._pos)
+                if match:
+                    return match.end()
+                if not self._fill():
+                    self._error("Unterminated string")
+        if first not in (_OPEN_ARRAY, _OPEN_OBJECT):
+            offset = 0
+            while True:
+                match = _SCALAR_END.search(self._buf, self._pos + offset)
+                if match:
+                    return match.start()
+                offset = len(self._buf) - self._pos
+                if not self._fill():
+                    return len(self._buf)
+        depth = 0
+        offset = 0
+        while True:
+            for match in _TOKEN.finditer(self._buf, self._pos + offset):
+                char = self._buf[match.start()]
+                if char == _QUOTE:
+                    if match.end() - match.start() == 1:
+                        # Строка обрезана концом буфера: продолжим с её начала после дочитывания
+                        offset = match.start() - self._pos
+                        break
+                    continue
+                if char in (_OPEN_ARRAY, _OPEN_OBJECT):
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return match.end()
+            else:
+                offset = len(self._buf) - self._pos
+            if not self._fill():
+                self._error("Unterminated array or object")
+
+    def _error(self, msg: str) -> NoReturn:
+        raise json.JSONDecodeError(msg, "", self.tell())
+
+
+class JsonStreamWriter:
+    """
+        Потоковая запись JSON-объекта верхнего уровня в бинарный файл.
+        Поля пишутся по одному, а массив (например, annotations) — поэлементно из итератора,
+        поэтому весь документ в памяти не собирается. Вывод побайтно совпадает с JsonCodec.dumps
+        того же документа (pretty — отступ в 2 пробела, иначе компактно).
+        Samples:
+            with open(path, "wb") as f:
+                writer = JsonStreamWriter(f)
+                writer.write_field("images", images)
+                writer.write_array("annotations", (to_dict(shape) for shape in shapes))
+                writer.close()
+    """
+
+    def __init__(self, fp: BinaryIO, pretty: bool = True) -> None:
+        """
+            Args:
+                fp: Файл, открытый в бинарном режиме на запись.
+                pretty: True — с отступом в 2 пробела, False — компактно.
+        """
+        self._fp = fp
+        self._pretty = pretty
+        self._fields = 0
+        self._closed = False
+
+    def write_field(self, key: str, value: Any) -> None:
+        """ Пишет поле key: value целиком. """
+        self._write_key(key)
+        self._fp.write(self._dumps(value, b"\n  "))
+
+    def write_array(self, key: str, items: Iterable[Any]) -> int:
+        """
+            Пишет поле key: [...], сериализуя элементы items по одному.
+            Returns:
+                int: Число записанных элементов.
+        """
+        self._write_key(key)
+        return self.write_items(items)
+
+    def write_items(self, items: Iterable[Any]) -> int:
+        """
+            Пишет массив элементов items в текущую позицию файла (без ключа) с отступами поля верхнего уровня.
+            Используется и для подстановки массива в байты исходного документа.
+            Returns:
+                int: Число записанных элементов.
+        """
+        fp = self._fp
+        fp.write(b"[")
+        separator = b",\n    " if self._pretty else b","
+        count = 0
+        for item in items:
+            if count:
+                fp.write(separator)
+            elif self._pretty:
+                fp.write(b"\n    ")
+            fp.write(self._dumps(item, b"\n    "))
+            count += 1
+        fp.write(b"\n  ]" if self._pretty and count else b"]")
+        return count
+
+    def close(self) -> None:
+        """ Закрывает объект верхнего уровня (сам файл не закрывается). """
+        if self._closed:
+            return
+        if self._fields == 0:
+            self._fp.write(b"{}")
+        else:
+            self._fp.write(b"\n}" if self._pretty else b"}")
+        self._closed = True
+
+    def _write_key(self, key: str) -> None:
+        if self._closed:
+            raise ValueError("JsonStreamWriter is closed")
+        if self._fields == 0:
+            prefix = b"{\n  " if self._pretty else b"{"
+        else:
+            prefix = b",\n  " if self._pretty else b","
+        self._fp.write(prefix + JsonCodec.dumps(str(key), pretty=False) + (b": " if self._pretty else b":"))
+        self._fields += 1
+
+    def _dumps(self, value: Any, newline: bytes) -> bytes:
+        data = JsonCodec.dumps(value, pretty=self._pretty)
+        # Вложенные строки сдвигаются на уровень вложенности поля или элемента массива
+        return data.replace(b"\n", newline) if self._pretty else data
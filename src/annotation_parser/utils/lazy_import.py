@@ -0,0 +1,44 @@
+__all__ = ['lazy_exports']
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_exports(package: str,
+                 exports: Dict[str, Iterable[str]]) -> Tuple[List[str], Callable[[str], Any], Callable[[], List[str]]]:
+    """
+        Ленивые реэкспорты пакета (PEP 562): модуль с именем загружается при первом обращении к этому имени,
+        поэтому import пакета не тянет numpy, shapely, pydantic и все адаптеры сразу.
+        Загруженное значение сохраняется в пространстве имён пакета — повторные обращения идут без __getattr__.
+        Подмодули пакета доступны как атрибуты и без явного импорта (annotation_parser.core.annotation_file).
+        Args:
+            package: __name__ пакета.
+            exports: Относительное имя модуля ('.shape') -> экспортируемые им имена (его __all__).
+        Returns:
+            (__all__, __getattr__, __dir__) для пакета.
+        Samples:
+            __all__, __getattr__, __dir__ = lazy_exports(__name__, {
+                '.shape': ('Shape',),
+            })
+    """
+    origins = {name: module for module, names in exports.items() for name in names}
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = origins.get(name)
+        if module is not None:
+            value = namespace[name] = getattr(import_module(module, package), name)
+            return value
+        if not name.startswith('__'):
+            try:
+                return import_module(f"{package}.{name}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{package}.{name}":
+                    raise
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(origins))
+
+    return list(origins), __getattr__, __dir__
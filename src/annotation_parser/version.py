@@ -0,0 +1,4 @@
+__all__ = ['__version__']
+
+# Версия библиотеки (совпадает с pyproject.toml); входит, например, в ключ ParseCache
+__version__ = "0.1.0"
@@ -0,0 +1,100 @@
+import json
+
+import numpy as np
+import pytest
+
+from annotation_parser.adapters.coco_adapter import CocoAdapter
+from annotation_parser.api.parser_api import iter_parse_coco
+from annotation_parser.public_enums import ShapeType
+
+
+def make_coco(n=25):
+    return {
+        "info": {"description": "test"},
+        "images": [{"id": 1, "file_name": "a.jpg"}, {"id": 2, "file_name": "b.jpg"}],
+        "annotations": [
+            {"id": i, "image_id": 1 + i % 2, "category_id": 1 + i % 3, "bbox": [i, i, 10, 20], "score": 0.5}
+            for i in range(n)
+        ],
+        "categories": [{"id": 1, "name": "person"}, {"id": 2, "name": "car"}],
+    }
+
+
+@pytest.fixture
+def coco_json():
+    return make_coco()
+
+
+def write_coco(path, data, categories_first=False):
+    if categories_first:
+        data = {"categories": data["categories"], **{k: v for k, v in data.items() if k != "categories"}}
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+def test_load_coco(coco_json):
+    shapes = CocoAdapter.load(coco_json)
+    assert len(shapes) == 25
+    assert shapes[0].label == "person"
+    assert shapes[1].label == "car"
+    assert shapes[2].label == "3"  # категория без имени
+    assert shapes[0].type == ShapeType.RECTANGLE
+    assert shapes[3].coords == [[3.0, 3.0], [13.0, 3.0], [13.0, 23.0], [3.0, 23.0]]
+    assert shapes[0].meta == {"score": 0.5, "image_id": 1, "category_id": 1}
+
+
+def test_load_invalid_json():
+    with pytest.raises(ValueError):
+        CocoAdapter.load({"images": []})
+
+
+@pytest.mark.parametrize("categories_first", [False, True])
+@pytest.mark.parametrize("chunk_size", [7, 1 << 20])
+def test_iter_load_matches_load(tmp_path, coco_json, categories_first, chunk_size):
+    path = write_coco(tmp_path / "coco.json", coco_json, categories_first)
+    expected = CocoAdapter.load(coco_json)
+    streamed = list(CocoAdapter.iter_load(path, chunk_size=chunk_size))
+    assert streamed == list(expected)
+
+
+def test_iter_load_shift_point(tmp_path, coco_json):
+    path = write_coco(tmp_path / "coco.json", coco_json)
+    first = next(iter_parse_coco(path, shift_point=(1, 2)))
+    assert first.shifted_coords[0] == [-1.0, -2.0]
+
+
+def test_iter_load_without_annotations_raises(tmp_path):
+    path = write_coco(tmp_path / "coco.json", {"images": [], "categories": []})
+    with pytest.raises(ValueError):
+        list(CocoAdapter.iter_load(path))
+
+
+@pytest.mark.parametrize("validate", ["light", "none"])
+def test_fast_validation_modes_match_full(coco_json, validate):
+    assert CocoAdapter.load(coco_json, validate=validate) == CocoAdapter.load(coco_json)
+
+
+def test_light_validation_coerces_like_full(coco_json):
+    coco_json["annotations"][0]["category_id"] = "2"
+    shapes = CocoAdapter.load(coco_json, validate="light")
+    assert shapes[0].label == "car"
+    assert shapes == CocoAdapter.load(coco_json)
+
+
+def test_light_validation_rejects_bad_bbox(coco_json):
+    coco_json["annotations"][0]["bbox"] = [1, 2]
+    with pytest.raises(ValueError):
+        CocoAdapter.load(coco_json, validate="light")
+
+
+def test_iter_load_validation_mode(tmp_path, coco_json):
+    path = write_coco(tmp_path / "coco.json", coco_json)
+    assert list(CocoAdapter.iter_load(path, validate="none")) == list(CocoAdapter.load(coco_json))
+
+
+@pytest.mark.parametrize("validate", ["full", "light", "none"])
+def test_numpy_coords(coco_json, validate):
+    """Проверяет режим numpy_coords: те же фигуры, координаты массивом."""
+    shapes = CocoAdapter.load(coco_json, validate=validate, numpy_coords=True)
+    assert all(isinstance(shape.coords, np.ndarray) for shape in shapes)
+    assert shapes == CocoAdapter.load(coco_json)
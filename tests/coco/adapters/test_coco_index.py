@@ -0,0 +1,76 @@
+import json
+import pickle
+
+import pytest
+
+from annotation_parser.adapters.coco_adapter import CocoAdapter
+from annotation_parser.adapters.coco_index import CocoIndex
+
+
+@pytest.fixture
+def coco_json():
+    return {
+        "images": [{"id": 1, "file_name": "a.jpg"}, {"id": 2, "file_name": "b.jpg"}, {"id": 3, "file_name": "c.jpg"}],
+        "annotations": [
+            {"id": i, "image_id": 1 + i % 2, "category_id": 1 + i % 2, "bbox": [i, i, 10, 20]} for i in range(10)
+        ],
+        "categories": [{"id": 1, "name": "person"}, {"id": 2, "name": "car"}],
+    }
+
+
+@pytest.fixture
+def coco_path(tmp_path, coco_json):
+    path = tmp_path / "coco.json"
+    path.write_text(json.dumps(coco_json, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def test_index_matches_full_parse(coco_path, coco_json):
+    expected = CocoAdapter.load(coco_json)
+    with CocoIndex(coco_path, chunk_size=16) as index:
+        assert index.categories == {1: "person", 2: "car"}
+        assert index.image_ids == (1, 2, 3)
+        assert len(index) == 3
+        assert index.shapes(1) == expected[0::2]
+        assert index["b.jpg"] == expected[1::2]
+        assert index.shapes(3) == ()
+
+
+def test_index_offsets_point_to_annotations(coco_path, coco_json):
+    data = coco_path.read_bytes()
+    index = CocoIndex(coco_path)
+    for start, length in index.offsets("a.jpg"):
+        ann = json.loads(data[start:start + length])
+        assert ann["image_id"] == 1
+
+
+def test_index_lru_cache(coco_path):
+    index = CocoIndex(coco_path, cache_size=1)
+    first = index.shapes(1)
+    assert index.shapes(1) is first
+    index.shapes(2)  # вытесняет изображение 1
+    assert index.shapes(1) is not first
+    assert index.shapes(1) == first
+
+
+def test_index_unknown_image(coco_path):
+    index = CocoIndex(coco_path)
+    assert "missing.jpg" not in index
+    with pytest.raises(KeyError):
+        index.shapes("missing.jpg")
+
+
+def test_index_is_picklable(coco_path):
+    index = CocoIndex(coco_path)
+    index.shapes(1)
+    clone = pickle.loads(pickle.dumps(index))
+    assert clone.shapes(2) == index.shapes(2)
+    index.close()
+    clone.close()
+
+
+def test_index_without_annotations_raises(tmp_path):
+    path = tmp_path / "coco.json"
+    path.write_text('{"images": [], "categories": []}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        CocoIndex(path)
@@ -0,0 +1,207 @@
+import json
+import os
+
+import pytest
+
+from annotation_parser.adapters.coco_adapter import CocoAdapter
+from annotation_parser.api.parser_api import iter_parse_coco, parse_coco
+from annotation_parser.api.convert_api import convert_many
+from annotation_parser.api.saver_api import save_coco, save_stream
+from annotation_parser.core.annotation_saver import AnnotationSaver
+
+
+def make_coco(n=30):
+    return {
+        "info": {"description": "test"},
+        "images": [{"id": 7, "file_name": "a.jpg", "width": 640, "height": 480}],
+        "annotations": [{"id": i, "image_id": 7, "category_id": 1 + i % 2, "bbox": [i, i, 10, 20]} for i in range(n)],
+        "categories": [{"id": 1, "name": "person"}, {"id": 2, "name": "car"}],
+    }
+
+
+@pytest.fixture
+def coco_file(tmp_path):
+    path = tmp_path / "coco.json"
+    path.write_text(json.dumps(make_coco()), encoding="utf-8")
+    return path
+
+
+def test_shapes_to_json_roundtrip():
+    """Проверяет, что category_id восстанавливается по label, а image_id — по единственному изображению."""
+    data = make_coco()
+    out = CocoAdapter.shapes_to_json(data, CocoAdapter.load(data))
+    assert out == data | {"annotations": [dict(a, segmentation=None, area=None, iscrowd=None)
+                                          for a in data["annotations"]]}
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_save_stream_matches_save(tmp_path, coco_file, pretty):
+    """Проверяет, что потоковая запись из генератора даёт тот же файл, что обычное сохранение."""
+    shapes = parse_coco(coco_file)
+    expected = tmp_path / "expected.json"
+    AnnotationSaver.save(shapes, CocoAdapter, expected, json_data=make_coco(), pretty=pretty)
+
+    header = AnnotationSaver.read_header(coco_file, "annotations")
+    assert header["annotations"] == [] and list(header) == list(make_coco())
+    out = tmp_path / "out.json"
+    count = save_stream(iter_parse_coco(coco_file), out, "coco", header=header, pretty=pretty)
+    assert count == len(shapes)
+    assert out.read_bytes() == expected.read_bytes()
+
+
+def test_save_stream_in_place_reads_header_from_file(coco_file):
+    """Проверяет перезапись того же файла: заголовок берётся из него без декодирования аннотаций."""
+    shapes = [shape for shape in parse_coco(coco_file) if shape.label == "car"]
+    assert save_stream(iter(shapes), coco_file, "coco") == len(shapes)
+    data = json.loads(coco_file.read_text(encoding="utf-8"))
+    assert data["images"] == make_coco()["images"]
+    assert [a["category_id"] for a in data["annotations"]] == [2] * len(shapes)
+
+
+def test_save_stream_failure_keeps_original(coco_file):
+    """Проверяет атомарность: ошибка посреди записи не портит исходный файл и не оставляет временных."""
+    original = coco_file.read_bytes()
+
+    def broken():
+        yield from list(parse_coco(coco_file))[:3]
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        save_stream(broken(), coco_file, "coco")
+    assert coco_file.read_bytes() == original
+    assert os.listdir(coco_file.parent) == [coco_file.name]
+
+
+def test_shapes_to_json_does_not_copy_original():
+    """Проверяет, что оригинал не копируется глубоко и не изменяется."""
+    data = make_coco()
+    annotations = data["annotations"]
+    out = CocoAdapter.shapes_to_json(data, CocoAdapter.load(data)[:2])
+    assert out["images"] is data["images"] and out["categories"] is data["categories"]
+    assert data["annotations"] is annotations and len(annotations) == 30
+    assert len(out["annotations"]) == 2
+
+
+def test_annotation_file_save_passes_untouched_sections_through(coco_file):
+    """Проверяет, что при save секции кроме annotations переносятся байтами из исходного файла."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    data = make_coco()
+    images = '[ {"id": 7,   "file_name": "a.jpg", "width": 640, "height": 480} ]'
+    text = json.dumps(data, indent=2).replace(json.dumps(data["images"], indent=2).replace("\n", "\n  "), images)
+    coco_file.write_text(text, encoding="utf-8")
+    af = AnnotationFile(coco_file, "coco", keep_json=True)
+    shapes = af.parse()
+    af.save(shapes[:5])
+    saved = coco_file.read_text(encoding="utf-8")
+    assert images in saved
+    assert json.loads(saved) == data | {"annotations": [dict(a, segmentation=None, area=None, iscrowd=None)
+                                                        for a in data["annotations"][:5]]}
+
+
+def assert_saved(path, data, pretty):
+    """ В файле первые 5 аннотаций data, и весь документ записан в одном форматировании. """
+    from annotation_parser.utils import JsonCodec
+    saved = path.read_bytes()
+    assert json.loads(saved) == data | {"annotations": [dict(a, segmentation=None, area=None, iscrowd=None)
+                                                        for a in data["annotations"][:5]]}
+    assert saved == JsonCodec.dumps(JsonCodec.loads(saved), pretty=pretty)
+
+
+@pytest.mark.parametrize("last", [False, True])
+@pytest.mark.parametrize("pretty", [True, False])
+def test_passthrough_only_when_formatting_matches(coco_file, pretty, last, monkeypatch):
+    """Проверяет, что байты переносятся только при совпадении форматирования, и без декодирования annotations."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    from annotation_parser.utils import JsonCodec
+    data = make_coco()
+    if last:
+        data = {**{k: v for k, v in data.items() if k != "annotations"}, "annotations": data["annotations"]}
+    coco_file.write_bytes(JsonCodec.dumps(data, pretty=pretty))
+    af = AnnotationFile(coco_file, "coco", keep_json=True)
+    shapes = af.parse()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("исходный файл не должен декодироваться")
+
+    monkeypatch.setattr(JsonCodec, "loads", staticmethod(fail))
+    assert AnnotationSaver._items_span(coco_file, list(data), "annotations", pretty, af._source_state) is not None
+    af.save(shapes[:5], pretty=pretty)
+    monkeypatch.undo()
+    assert_saved(coco_file, data, pretty)
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_formatting_mismatch_reserialises(coco_file, pretty):
+    """Проверяет, что при другом pretty документ сериализуется заново целиком, а не смешивает форматирование."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    from annotation_parser.utils import JsonCodec
+    data = make_coco()
+    coco_file.write_bytes(JsonCodec.dumps(data, pretty=not pretty))
+    af = AnnotationFile(coco_file, "coco", keep_json=True)
+    assert AnnotationSaver._items_span(coco_file, list(data), "annotations", pretty) is None
+    af.save(af.parse()[:5], pretty=pretty)
+    assert_saved(coco_file, data, pretty)
+
+
+
+def test_other_indent_reserialises(coco_file):
+    """Проверяет, что файл с отступом 4 не переносится байтами: иначе annotations выбились бы из отступов файла."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    data = make_coco()
+    coco_file.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    af = AnnotationFile(coco_file, "coco", keep_json=True)
+    assert AnnotationSaver._items_span(coco_file, list(data), "annotations", pretty=True) is None
+    af.save(af.parse()[:5], pretty=True)
+    assert_saved(coco_file, data, pretty=True)
+
+def test_annotation_file_save_after_external_change_reserialises(coco_file):
+    """Проверяет, что если файл изменён после чтения, байты из него не переносятся."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    af = AnnotationFile(coco_file, "coco", keep_json=True)
+    shapes = af.parse()
+    coco_file.write_text(json.dumps({"images": [], "annotations": [], "categories": []}), encoding="utf-8")
+    af.save(shapes)
+    assert json.loads(coco_file.read_text(encoding="utf-8"))["images"] == make_coco()["images"]
+
+
+def test_passthrough_falls_back_when_key_is_ambiguous(coco_file):
+    """Проверяет, что вложенный ключ "annotations" отключает перенос байтами, а результат остаётся верным."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    data = make_coco()
+    data["info"]["annotations"] = "nested"
+    coco_file.write_text(json.dumps(data), encoding="utf-8")
+    af = AnnotationFile(coco_file, "coco", keep_json=True)
+    shapes = af.parse()
+    assert AnnotationSaver._items_span(coco_file, list(data), "annotations", pretty=True) is None
+    af.save(shapes[:1])
+    saved = json.loads(coco_file.read_text(encoding="utf-8"))
+    assert saved["info"] == data["info"] and len(saved["annotations"]) == 1
+
+
+@pytest.mark.parametrize("validate", ["full", "light", "none"])
+def test_multi_image_roundtrip(tmp_path, validate):
+    """Проверяет, что image_id и category_id аннотаций сохраняются при записи файла с несколькими изображениями."""
+    data = make_coco(12)
+    data["images"].append({"id": 8, "file_name": "b.jpg", "width": 640, "height": 480})
+    for i, ann in enumerate(data["annotations"]):
+        ann["image_id"] = 7 + i % 2
+    data["annotations"][0]["category_id"] = 5  # категории нет в categories
+    source = tmp_path / "src" / "coco.json"
+    source.parent.mkdir()
+    source.write_text(json.dumps(data), encoding="utf-8")
+    expected = [(a["image_id"], a["category_id"]) for a in data["annotations"]]
+
+    def pairs(path):
+        return [(a["image_id"], a["category_id"]) for a in json.loads(path.read_text())["annotations"]]
+
+    shapes = parse_coco(source, validate=validate)
+    assert [(s.meta["image_id"], s.meta["category_id"]) for s in shapes] == expected
+    target = tmp_path / "saved.json"
+    target.write_text(source.read_text())
+    save_coco(shapes, target)
+    assert pairs(target) == expected
+    save_stream(shapes, target, "coco")
+    assert pairs(target) == expected
+    results = list(convert_many(source.parent, tmp_path / "out", "coco", "coco", workers=0, validate=validate))
+    assert all(r.ok for r in results)
+    assert pairs(tmp_path / "out" / "coco.json") == expected
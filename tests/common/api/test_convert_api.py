@@ -0,0 +1,72 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from annotation_parser.api.convert_api import convert, convert_many
+from annotation_parser.api.parser_api import parse
+
+SAMPLE = Path(__file__).resolve().parents[2] / "labelme" / "labelme_test.json"
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """ Два уровня каталогов с копиями тестового LabelMe-файла. """
+    root = tmp_path / "in"
+    for rel in ("a.json", "b.json", "sub/c.json"):
+        target = root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(SAMPLE, target)
+    return root
+
+
+def test_convert_single_file(tmp_path):
+    """Проверяет конвертацию одного файла: фигуры читаются обратно из результата."""
+    target = tmp_path / "nested" / "out.json"
+    count = convert(SAMPLE, target, "labelme", "voc")
+    shapes = parse(target, "voc")
+    assert count == len(shapes) > 0
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_convert_many_mirrors_tree(dataset, tmp_path, workers):
+    """Проверяет, что структура входного каталога повторяется в выходном и все файлы сконвертированы."""
+    out = tmp_path / "out"
+    results = list(convert_many(dataset, out, "labelme", "labelme", workers=workers))
+    assert sorted(Path(r.target).relative_to(out).as_posix() for r in results) == ["a.json", "b.json", "sub/c.json"]
+    assert all(r.ok and not r.skipped for r in results)
+    expected = parse(SAMPLE, "labelme")
+    assert parse(out / "sub" / "c.json", "labelme") == expected
+
+
+def test_convert_many_skips_up_to_date(dataset, tmp_path):
+    """Проверяет пропуск актуальных результатов, пересборку устаревших и --force."""
+    out = tmp_path / "out"
+    list(convert_many(str(dataset / "**" / "*.json"), out, "labelme", "voc", workers=0))
+    results = list(convert_many(str(dataset / "**" / "*.json"), out, "labelme", "voc", workers=0))
+    assert len(results) == 3 and all(r.skipped for r in results)
+
+    stale = dataset / "b.json"
+    newer = os.stat(out / "b.json").st_mtime_ns + 10**9
+    os.utime(stale, ns=(newer, newer))
+    results = list(convert_many(str(dataset / "**" / "*.json"), out, "labelme", "voc", workers=0))
+    assert [Path(r.source).name for r in results if not r.skipped] == ["b.json"]
+
+    results = list(convert_many(dataset, out, "labelme", "voc", workers=0, skip_up_to_date=False))
+    assert not any(r.skipped for r in results)
+
+
+def test_convert_many_reports_failures(dataset, tmp_path):
+    """Проверяет, что ошибка в одном файле возвращается в результате и не прерывает остальные."""
+    (dataset / "broken.json").write_text("{not json", encoding="utf-8")
+    results = list(convert_many(dataset, tmp_path / "out", "labelme", "labelme", workers=2))
+    failed = [r for r in results if not r.ok]
+    assert [Path(r.source).name for r in failed] == ["broken.json"]
+    assert sum(r.ok for r in results) == 3
+
+
+def test_convert_many_unknown_adapter(dataset, tmp_path):
+    """Проверяет, что неизвестный адаптер отклоняется до запуска пула."""
+    with pytest.raises(ValueError):
+        list(convert_many(dataset, tmp_path / "out", "labelme", "no_such_format"))
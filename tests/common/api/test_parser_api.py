@@ -20,3 +20,106 @@ def test_parse_invalid_path_raises(monkeypatch):
     monkeypatch.setattr(parser_api_mod, "AnnotationFile", raise_file_not_found)
     with pytest.raises(FileNotFoundError):
         parse("not_exists.json", "labelme")
+
+
+def _write_labelme(path, label):
+    import json
+    path.write_text(json.dumps({"shapes": [{"label": label, "points": [[0, 0], [1, 1]],
+                                            "shape_type": "rectangle"}]}), encoding="utf-8")
+    return path
+
+
+def test_aparse_matches_parse(tmp_path):
+    """Проверяет, что aparse возвращает то же, что parse."""
+    import asyncio
+    from annotation_parser.api.parser_api import aparse
+    path = _write_labelme(tmp_path / "a.json", "cat")
+    assert asyncio.run(aparse(path, "labelme")) == parse(path, "labelme")
+
+
+def test_aparse_many_ordered_with_errors(tmp_path):
+    """Проверяет порядок результатов и то, что ошибка одного файла не прерывает пакет."""
+    import asyncio
+    from annotation_parser.api.parser_api import aparse_many
+    paths = [_write_labelme(tmp_path / f"{i}.json", f"l{i}") for i in range(5)]
+    paths.insert(2, tmp_path / "missing.json")
+
+    async def collect():
+        return [r async for r in aparse_many(paths, "labelme", concurrency=2)]
+
+    results = asyncio.run(collect())
+    assert [r.file_path for r in results] == [str(p) for p in paths]
+    assert [r.ok for r in results] == [True, True, False, True, True, True]
+    assert results[2].error.startswith("FileNotFoundError")
+    assert results[0].shapes[0].label == "l0"
+
+
+def test_aparse_many_bounds_concurrency_and_times_out(monkeypatch):
+    """Проверяет ограничение числа одновременных разборов и таймаут на файл."""
+    import asyncio
+    import threading
+    import time
+    from annotation_parser.api.parser_api import aparse_many
+    lock = threading.Lock()
+    state = {"now": 0, "max": 0}
+
+    def slow_parse(file_path, *a, **kw):
+        with lock:
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+        time.sleep(0.5 if file_path == "slow" else 0.02)
+        with lock:
+            state["now"] -= 1
+        return ()
+
+    monkeypatch.setattr(parser_api_mod, "parse", slow_parse)
+    paths = ["slow"] + [f"f{i}" for i in range(9)]
+
+    async def collect():
+        return [r async for r in aparse_many(paths, "labelme", concurrency=3, ordered=False, timeout=0.2)]
+
+    results = asyncio.run(collect())
+    assert state["max"] <= 3
+    assert sorted(r.file_path for r in results) == sorted(paths)
+    assert [r.file_path for r in results if not r.ok] == ["slow"]
+    assert next(r for r in results if not r.ok).error.startswith("TimeoutError")
+
+
+def test_aparse_many_break_cancels_in_flight(monkeypatch):
+    """Проверяет, что выход из цикла отменяет ещё не завершённые разборы."""
+    import asyncio
+    from annotation_parser.api.parser_api import aparse_many
+    started, cancelled = [], []
+
+    async def fake_aparse(file_path, *a, **kw):
+        started.append(file_path)
+        try:
+            await asyncio.sleep(0 if file_path == "first" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(file_path)
+            raise
+        return ()
+
+    monkeypatch.setattr(parser_api_mod, "aparse", fake_aparse)
+
+    async def first_only():
+        results = aparse_many(["first", "a", "b", "c"], "labelme", concurrency=2)
+        async for result in results:
+            await results.aclose()
+            return result
+
+    result = asyncio.run(asyncio.wait_for(first_only(), 2))
+    assert result.file_path == "first" and result.ok
+    assert started == ["first", "a"]  # "b" отменён до старта
+    assert cancelled == ["a"]
+
+
+def test_aparse_many_rejects_bad_concurrency():
+    import asyncio
+    from annotation_parser.api.parser_api import aparse_many
+
+    async def collect():
+        return [r async for r in aparse_many([], "labelme", concurrency=0)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
@@ -28,3 +28,14 @@ def test_save_invalid_path_raises(monkeypatch):
     monkeypatch.setattr(saver_api_mod, "AnnotationFile", DummyAF)
     with pytest.raises(FileNotFoundError):
         save((DummyShape(),), "not_exists/file.json", "labelme")
+
+
+def test_asave_calls_save(monkeypatch, tmp_path):
+    """Проверяет, что asave выполняет save в пуле и передаёт параметры."""
+    import asyncio
+    from annotation_parser.api.saver_api import asave
+    calls = []
+    monkeypatch.setattr(saver_api_mod, "save", lambda *a, **kw: calls.append((a, kw)))
+    shapes = (DummyShape(),)
+    asyncio.run(asave(shapes, tmp_path / "a.json", "labelme", backup=False, semaphore=asyncio.Semaphore(1)))
+    assert calls == [((shapes, tmp_path / "a.json", "labelme"), {"backup": False, "pretty": True})]
@@ -1,9 +1,13 @@
 import pytest
 
+import numpy as np
+
 from annotation_parser.api.shapes_api import (
-    set_shift_point, get_shapes_by_label, get_shapes_by_number, get_shapes_by_wz_number
+    set_shift_point, get_shapes_by_label, get_shapes_by_number, get_shapes_by_wz_number,
+    resolve_shift_points, shifted_coords_many, apply_shift_points
 )
 from annotation_parser.shape import Shape
+from annotation_parser.shape_batch import ShapeBatch
 
 
 def point_eq(p, exp):
@@ -79,3 +83,51 @@ def test_get_shapes_by_wz_number(sample_shapes):
     filtered = get_shapes_by_wz_number(sample_shapes, 3)
     assert all(getattr(s, "wz_number", None) == 3 for s in filtered)
     assert len(filtered) == 1
+
+
+
+def test_set_shift_point_keeps_coords_object(sample_shapes):
+    new_shapes = set_shift_point(sample_shapes, (1, 2))
+    assert all(new.coords is old.coords for new, old in zip(new_shapes, sample_shapes))
+    assert new_shapes[0].meta is not sample_shapes[0].meta
+
+
+def test_resolve_shift_points_variants(sample_shapes):
+    assert resolve_shift_points(sample_shapes, (1, 2)).tolist() == [[1, 2]] * 3
+    by_label = resolve_shift_points(sample_shapes, {"a": (5, 5)}, by="label")
+    assert by_label[[0, 2]].tolist() == [[5, 5], [5, 5]]
+    assert np.isnan(by_label[1]).all()
+    aligned = resolve_shift_points(sample_shapes, [[1, 1], [np.nan, np.nan], [3, 3]])
+    assert aligned[0].tolist() == [1, 1] and np.isnan(aligned[1]).all()
+    with pytest.raises(ValueError):
+        resolve_shift_points(sample_shapes, {"a": (5, 5)})
+    with pytest.raises(ValueError):
+        resolve_shift_points(sample_shapes, [[1, 1]])
+
+
+def test_shifted_coords_many_matches_shape(sample_shapes):
+    shapes = set_shift_point(sample_shapes, (1, 1), label="a")
+    shifted = shifted_coords_many(shapes)
+    for coords, shape in zip(shifted, shapes):
+        assert coords.tolist() == shape.shifted_coords
+    by_wz = shifted_coords_many(sample_shapes, {3: (9, 10)}, by="wz_number")
+    assert by_wz[2][0].tolist() == [0.0, 0.0]
+    assert by_wz[0].tolist() == sample_shapes[0].coords
+
+
+def test_apply_shift_points_reuses_storage(sample_shapes):
+    shapes = [Shape(label=s.label, coords=np.array(s.coords), type=s.type, wz_number=s.wz_number) for s in sample_shapes]
+    result = apply_shift_points(shapes, {"a": (1, 2)}, by="label")
+    assert result[1] is shapes[1]
+    assert np.shares_memory(result[0].coords, shapes[0].coords)
+    assert point_eq(result[0].shift_point, (1, 2))
+    assert result[0].shifted_coords.tolist() == (shapes[0].coords - (1, 2)).tolist()
+
+
+def test_apply_shift_points_on_batch(sample_shapes):
+    batch = ShapeBatch.from_shapes(sample_shapes)
+    result = apply_shift_points(batch, [[1, 1], [2, 2], [3, 3]])
+    assert np.shares_memory(result.coords, batch.coords)
+    assert [point_eq(row.shift_point, xy) for row, xy in zip(result, [(1, 1), (2, 2), (3, 3)])] == [True] * 3
+    shifted = shifted_coords_many(result)
+    assert shifted[2].tolist() == (batch[2].coords - (3, 3)).tolist()
@@ -0,0 +1,55 @@
+import pytest
+
+from annotation_parser.core.annotation_batch import AnnotationBatch, ParseResult
+
+
+def square(x):
+    return x * x
+
+
+def fail_on_three(x):
+    if x == 3:
+        raise ValueError("three")
+    return x
+
+
+def test_resolve_paths_directory(tmp_path):
+    for name in ("b.json", "a.json", "c.txt"):
+        (tmp_path / name).write_text("{}", encoding="utf-8")
+    paths = AnnotationBatch.resolve_paths(tmp_path)
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["a.json", "b.json"]
+
+
+def test_resolve_paths_glob_and_list(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "x.json").write_text("{}", encoding="utf-8")
+    assert AnnotationBatch.resolve_paths(str(tmp_path / "**" / "*.json")) == [str(sub / "x.json")]
+    assert AnnotationBatch.resolve_paths([sub / "x.json"]) == [str(sub / "x.json")]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_keeps_input_order(workers):
+    assert list(AnnotationBatch.run(square, range(10), workers=workers, chunksize=3)) == [x * x for x in range(10)]
+
+
+def test_run_unordered_returns_all():
+    assert sorted(AnnotationBatch.run(square, range(10), workers=2, chunksize=2, ordered=False)) == \
+           sorted(x * x for x in range(10))
+
+
+def test_run_on_error_inline():
+    result = list(AnnotationBatch.run(fail_on_three, range(5), workers=1, on_error=lambda item, e: str(e)))
+    assert result == [0, 1, 2, "three", 4]
+
+
+def test_run_without_on_error_raises():
+    with pytest.raises(ValueError):
+        list(AnnotationBatch.run(fail_on_three, range(5), workers=1))
+
+
+def test_parse_result_from_exception():
+    result = ParseResult.from_exception("f.json", FileNotFoundError("missing"))
+    assert not result.ok
+    assert result.shapes == ()
+    assert result.error == "FileNotFoundError: missing"
@@ -0,0 +1,137 @@
+import json
+import os
+
+import pytest
+
+from annotation_parser.core.annotation_file import AnnotationFile
+from annotation_parser.core.parse_cache import ParseCache
+from annotation_parser.core.shape_diff import ShapeDiff
+from annotation_parser.shape import Shape
+
+
+def _write(path, shapes):
+    path.write_text(json.dumps({"shapes": shapes}), encoding="utf-8")
+    # Гарантированно другой mtime_ns, даже на ФС с грубым разрешением времени
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def _raw(label, x, group_id=None):
+    return {"label": label, "points": [[x, 0], [x + 1, 0], [x, 1]], "shape_type": "polygon", "group_id": group_id}
+
+
+@pytest.fixture
+def labelme_file(tmp_path):
+    path = tmp_path / "a.json"
+    _write(path, [_raw("car", 0, 1), _raw("bus", 10, 2), _raw("person", 20)])
+    return path
+
+
+def test_refresh_without_changes_does_not_read(labelme_file, monkeypatch):
+    """Проверяет, что неизменённый файл не перечитывается и фигуры остаются теми же объектами."""
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True)
+    shapes = af.parse()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("файл не должен читаться")
+
+    monkeypatch.setattr(AnnotationFile, "_load_json", staticmethod(fail))
+    diff = af.refresh()
+    assert not diff and diff.unchanged == 3
+    assert af.parse() is shapes
+
+
+def test_refresh_returns_diff_and_reuses_objects(labelme_file):
+    """Проверяет added/removed/modified и переиспользование неизменённых Shape."""
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True)
+    car, bus, person = af.parse()
+    _write(labelme_file, [_raw("truck", 30), _raw("car", 0, 1), _raw("bus", 15, 2)])
+    diff = af.refresh()
+    assert diff.changed and diff.unchanged == 1
+    assert [s.label for s in diff.added] == ["truck"]
+    assert diff.removed == (person,)
+    assert len(diff.modified) == 1 and diff.modified[0][0] is bus and diff.modified[0][1].coords[0] == [15.0, 0.0]
+    shapes = af.parse()
+    assert [s.label for s in shapes] == ["truck", "car", "bus"]
+    assert shapes[1] is car
+    assert af.last_diff is diff
+
+
+def test_refresh_updates_json_for_save(labelme_file):
+    """Проверяет, что после refresh сохранение использует json новой версии файла."""
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True)
+    af.parse()
+    data = {"imagePath": "new.png", "shapes": [_raw("car", 0, 1)]}
+    labelme_file.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(labelme_file, ns=(0, os.stat(labelme_file).st_mtime_ns + 10 ** 9))
+    af.refresh()
+    af.save(af.parse())
+    assert json.loads(labelme_file.read_text(encoding="utf-8"))["imagePath"] == "new.png"
+
+
+def test_auto_refresh_with_cache(labelme_file, tmp_path):
+    """Проверяет auto_refresh: parse видит изменения файла, в том числе при работе через ParseCache."""
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True, cache=ParseCache(tmp_path / "cache"),
+                        auto_refresh=True)
+    first = af.parse()
+    assert af.parse() is first
+    _write(labelme_file, [_raw("car", 0, 1)])
+    shapes = af.parse()
+    assert [s.label for s in shapes] == ["car"] and shapes[0] is first[0]
+    assert [s.label for s in af.last_diff.removed] == ["bus", "person"]
+
+
+def test_refresh_before_parse_and_deleted_file(labelme_file):
+    """Проверяет первый refresh (всё в added) и ошибку для удалённого файла."""
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True)
+    assert len(af.refresh().added) == 3
+    labelme_file.unlink()
+    with pytest.raises(FileNotFoundError):
+        af.refresh()
+
+
+def test_compute_matches_duplicates_once():
+    """Проверяет, что одинаковые фигуры сопоставляются по одной и лишние попадают в added/removed."""
+    a = Shape(label="x", coords=[[0, 0], [1, 1]], type="line")
+    b = Shape(label="x", coords=[[0, 0], [1, 1]], type="line")
+    c = Shape(label="y", coords=[[0, 0], [1, 1]], type="line")
+    diff, merged = ShapeDiff.compute((a, b), (Shape(label="x", coords=[[0, 0], [1, 1]], type="line"), c))
+    assert merged[0] is a and merged[1] is c
+    assert diff.removed == (b,) and diff.added == (c,) and diff.unchanged == 1
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_change_between_init_and_parse(labelme_file, tmp_path, cache):
+    """Проверяет, что изменение файла после чтения json и до первого parse() замечает refresh."""
+    cache = ParseCache(tmp_path / "cache") if cache else None
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True, cache=cache)
+    if cache is not None:
+        af.parse_batch()  # с кэшем json читается лениво: здесь — до parse, как в __init__ без кэша
+    _write(labelme_file, [_raw("car", 0, 1)])
+    assert len(af.parse()) == 3
+    diff = af.refresh()
+    assert diff.changed and len(diff.removed) == 2
+    assert [s.label for s in af.parse()] == ["car"]
+    if cache is not None:
+        # В кэш не попал результат старого json под ключом новой версии файла
+        assert [s.label for s in AnnotationFile(labelme_file, "labelme", keep_json=True, cache=cache).parse()] \
+            == ["car"]
+
+
+def test_change_between_init_and_parse_xml(tmp_path):
+    """Проверяет то же для VOC XML: состояние файла запоминается при чтении XML."""
+    path = tmp_path / "a.xml"
+
+    def write_xml(names):
+        objects = "".join(f"<object><name>{n}</name><bndbox><xmin>1</xmin><ymin>1</ymin><xmax>5</xmax>"
+                          f"<ymax>5</ymax></bndbox></object>" for n in names)
+        path.write_text(f"<annotation><filename>a.jpg</filename>{objects}</annotation>", encoding="utf-8")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    write_xml(["car", "bus"])
+    af = AnnotationFile(path, "voc", keep_json=True)
+    write_xml(["car"])
+    assert len(af.parse()) == 2
+    assert af.refresh().changed
+    assert [s.label for s in af.parse()] == ["car"]
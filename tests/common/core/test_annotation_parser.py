@@ -1,6 +1,7 @@
 import pytest
 from annotation_parser.core.annotation_parser import AnnotationParser
 from annotation_parser.shape import Shape
+from annotation_parser.public_enums import ValidationMode
 
 
 class DummyAdapter:
@@ -52,3 +53,32 @@ def test_adapter_returns_not_iterable_raises():
     with pytest.raises(ValueError) as e:
         AnnotationParser.parse({}, BadAdapter)
     assert "returned unsupported type" in str(e.value)
+
+
+def test_validate_is_passed_only_when_not_full():
+    captured = {}
+
+    class CapturingAdapter(DummyAdapter):
+        @staticmethod
+        def load(json_data, shift_point=None, **kwargs):
+            captured.update(kwargs)
+            return ()
+    AnnotationParser.parse({}, CapturingAdapter)
+    assert captured == {}
+    AnnotationParser.parse({}, CapturingAdapter, validate="light")
+    assert captured == {"validate": ValidationMode.LIGHT}
+
+
+def test_numpy_coords_is_passed_only_when_enabled():
+    captured = {}
+
+    class CapturingAdapter(DummyAdapter):
+        @staticmethod
+        def load(json_data, shift_point=None, **kwargs):
+            captured.clear()
+            captured.update(kwargs)
+            return ()
+    AnnotationParser.parse({}, CapturingAdapter, numpy_coords=False)
+    assert captured == {}
+    AnnotationParser.parse({}, CapturingAdapter, numpy_coords=True)
+    assert captured == {"numpy_coords": True}
@@ -0,0 +1,137 @@
+import json
+import os
+
+import pytest
+
+from annotation_parser.api.saver_api import save
+from annotation_parser.core.annotation_file import AnnotationFile
+from annotation_parser.core.backup import BackupManager, BackupPolicy
+from annotation_parser.public_enums import BackupStrategy
+from annotation_parser.shape import Shape
+
+
+def _shapes(*labels):
+    return tuple(Shape(label=label, coords=[[0, 0], [1, 0], [1, 1], [0, 1]], type="rectangle", number=i)
+                 for i, label in enumerate(labels, 1))
+
+
+@pytest.fixture
+def labelme_file(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps({"imagePath": "a.png", "shapes": []}), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("strategy", list(BackupStrategy))
+def test_strategy_keeps_previous_content(labelme_file, strategy):
+    """Проверяет, что при любом способе копия хранит содержимое до перезаписи, а файл — новое."""
+    before = labelme_file.read_bytes()
+    policy = BackupPolicy(strategy)
+    save(_shapes("car"), labelme_file, "labelme", backup=policy)
+    versions = BackupManager(policy).versions(labelme_file)
+    assert len(versions) == 1
+    assert versions[0].read_bytes() == before
+    data = json.loads(labelme_file.read_text(encoding="utf-8"))
+    assert [s["label"] for s in data["shapes"]] == ["car"] and data["imagePath"] == "a.png"
+
+
+def test_hardlink_copy_is_not_changed_by_save(labelme_file):
+    """Проверяет, что атомарная запись не меняет жёсткую ссылку на прежний файл."""
+    policy = BackupPolicy(BackupStrategy.HARDLINK)
+    manager = BackupManager(policy)
+    link = manager.backup(labelme_file)
+    assert os.path.samefile(link, labelme_file)
+    before = link.read_bytes()
+    save(_shapes("car"), labelme_file, "labelme", backup=False)
+    assert link.read_bytes() == before
+    assert not os.path.samefile(link, labelme_file)
+
+
+def test_rename_keeps_permissions_and_passthrough(tmp_path):
+    """Проверяет RENAME при побайтовом переносе секций: источник берётся из копии, права сохраняются."""
+    path = tmp_path / "coco.json"
+    path.write_text(json.dumps({"images": [{"id": 1, "file_name": "a.png"}],
+                                "categories": [{"id": 1, "name": "car"}],
+                                "annotations": []}, indent=2).replace('"id": 1,', '"id":   1,', 1), encoding="utf-8")
+    os.chmod(path, 0o640)
+    af = AnnotationFile(path, "coco", keep_json=True)
+    af.save(_shapes("car"), backup=BackupPolicy(BackupStrategy.RENAME))
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["images"][0]["file_name"] == "a.png" and len(data["annotations"]) == 1
+    assert '"id":   1,' in path.read_text(encoding="utf-8")  # исходное форматирование заголовка
+
+
+def test_dedup_skips_identical_versions(labelme_file):
+    """Проверяет, что DEDUP не создаёт копию, совпадающую с последней, и хранит одинаковое содержимое один раз."""
+    policy = BackupPolicy(BackupStrategy.DEDUP)
+    manager = BackupManager(policy)
+    first = manager.backup(labelme_file)
+    assert manager.backup(labelme_file) == first
+    assert len(manager.versions(labelme_file)) == 1
+
+    save(_shapes("car"), labelme_file, "labelme", backup=policy)
+    save(_shapes("car"), labelme_file, "labelme", backup=policy)
+    versions = manager.versions(labelme_file)
+    assert len(versions) == 2
+    objects = list((labelme_file.parent / ".annotation_backups" / "objects").glob("*/*"))
+    assert len(objects) == 2
+    assert all(v.stat().st_nlink == 2 for v in versions)
+
+
+def test_retention_keep_last_and_max_bytes(labelme_file, tmp_path):
+    """Проверяет, что keep_last и max_bytes применяются вместе, начиная с самых старых копий."""
+    policy = BackupPolicy(BackupStrategy.COPY, directory=tmp_path / "bak", keep_last=3)
+    for label in "abcde":
+        save(_shapes(label), labelme_file, "labelme", backup=policy)
+    versions = BackupManager(policy).versions(labelme_file)
+    assert len(versions) == 3
+    assert '"d"' in versions[-1].read_text(encoding="utf-8")
+
+    size = versions[-1].stat().st_size
+    tight = BackupPolicy(BackupStrategy.COPY, directory=tmp_path / "bak", max_bytes=size)
+    assert BackupManager(tight).prune(labelme_file) == 2
+    assert BackupManager(tight).versions(labelme_file) == versions[-1:]
+
+
+def test_retention_max_age_uses_name_timestamp(labelme_file, tmp_path):
+    """Проверяет удаление копий старше max_age (время берётся из имени, включая старый формат без микросекунд)."""
+    old = tmp_path / "a_backup_20000101_000000.json"
+    old.write_text("{}", encoding="utf-8")
+    policy = BackupPolicy(max_age=3600)
+    manager = BackupManager(policy)
+    assert manager.versions(labelme_file) == [old]
+    fresh = manager.backup(labelme_file)
+    assert manager.versions(labelme_file) == [fresh]
+    assert not old.exists()
+
+
+def test_dedup_prune_collects_unreferenced_objects(labelme_file):
+    """Проверяет, что при удалении последней версии с данным содержимым удаляется и объект хранилища."""
+    policy = BackupPolicy(BackupStrategy.DEDUP, keep_last=1)
+    for label in "abc":
+        save(_shapes(label), labelme_file, "labelme", backup=policy)
+    objects = list((labelme_file.parent / ".annotation_backups" / "objects").glob("*/*"))
+    assert len(BackupManager(policy).versions(labelme_file)) == 1
+    assert len(objects) == 1
+
+
+def test_restore_latest(labelme_file):
+    """Проверяет восстановление файла из последней копии."""
+    before = labelme_file.read_bytes()
+    policy = BackupPolicy(BackupStrategy.HARDLINK)
+    save(_shapes("car"), labelme_file, "labelme", backup=policy)
+    BackupManager(policy).restore(labelme_file)
+    assert labelme_file.read_bytes() == before
+
+
+def test_resolve_and_validation():
+    """Проверяет разбор аргумента backup и проверку параметров политики."""
+    assert BackupManager.resolve(False) is None
+    assert BackupManager.resolve(None) is None
+    assert BackupManager.resolve(True).policy == BackupPolicy()
+    assert BackupPolicy("dedup").strategy is BackupStrategy.DEDUP
+    with pytest.raises(TypeError):
+        BackupManager.resolve("copy")
+    with pytest.raises(ValueError):
+        BackupPolicy(keep_last=-1)
@@ -0,0 +1,162 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from annotation_parser.api.parser_api import parse, parse_batch
+from annotation_parser.core.annotation_file import AnnotationFile
+from annotation_parser.core.parse_cache import ParseCache
+from annotation_parser.shape_batch import ShapeBatch
+
+
+def _write_labelme(path, labels):
+    shapes = [{"label": label, "points": [[i, i], [i + 2, i + 3], [i + 1, i + 5]], "shape_type": "polygon"}
+              for i, label in enumerate(labels)]
+    path.write_text(json.dumps({"shapes": shapes}), encoding="utf-8")
+
+
+def _touch_later(path):
+    # Гарантированно другой mtime_ns, даже на ФС с грубым разрешением времени
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def labelme_file(tmp_path):
+    path = tmp_path / "a.json"
+    _write_labelme(path, ["car", "person"])
+    return path
+
+
+def test_warm_parse_reads_cache_not_file(cache, labelme_file, monkeypatch):
+    """Проверяет, что повторный парсинг берёт результат из кэша, не читая json."""
+    cold = parse(labelme_file, "labelme", cache=cache)
+    assert cache.size() > 0
+
+    def fail(*args, **kwargs):
+        raise AssertionError("json не должен читаться при попадании в кэш")
+
+    monkeypatch.setattr(AnnotationFile, "_load_json", staticmethod(fail))
+    warm = parse(labelme_file, "labelme", cache=cache)
+    assert warm == cold
+
+
+def test_file_change_invalidates_entry(cache, labelme_file):
+    """Проверяет, что изменённый файл парсится заново, а старая запись удаляется."""
+    parse(labelme_file, "labelme", cache=cache)
+    _write_labelme(labelme_file, ["dog"])
+    _touch_later(labelme_file)
+    shapes = parse(labelme_file, "labelme", cache=cache)
+    assert [s.label for s in shapes] == ["dog"]
+    assert len(list(cache.directory.rglob("*.pkl"))) == 1
+
+
+def test_options_are_part_of_key(cache, labelme_file):
+    """Проверяет, что разные shift_point/validate/адаптер не делят одну запись."""
+    plain = parse(labelme_file, "labelme", cache=cache)
+    shifted = parse(labelme_file, "labelme", shift_point=(1, 1), cache=cache)
+    parse(labelme_file, "labelme", validate="none", cache=cache)
+    assert shifted[0].shift_point is not None and plain[0].shift_point is None
+    assert len(list(cache.directory.rglob("*.pkl"))) == 3
+    assert cache.key(labelme_file, "labelme") != cache.key(labelme_file, "coco")
+
+
+def test_unhashable_shift_point_is_not_cached(cache, labelme_file):
+    """Проверяет, что shift_point, не приводимый к точке, отключает кэш (результат нельзя описать ключом)."""
+    assert cache.key(labelme_file, "labelme", shift_point=lambda shape: (0, 0)) is None
+    assert cache.put(labelme_file, "labelme", ShapeBatch.from_shapes(()), shift_point=object()) is False
+    assert cache.size() == 0
+
+
+def test_parse_batch_uses_cache_and_dtype(cache, labelme_file):
+    """Проверяет parse_batch с кэшем: запись в float64, выдача в запрошенном dtype."""
+    cold = parse_batch(labelme_file, "labelme", dtype=np.float32, cache=cache)
+    warm = parse_batch(labelme_file, "labelme", cache=cache)
+    assert cold.coords.dtype == np.float32 and warm.coords.dtype == np.float64
+    assert warm.to_shapes() == parse(labelme_file, "labelme")
+
+
+def test_numpy_coords_from_cache(cache, labelme_file):
+    """Проверяет, что numpy_coords соблюдается и при чтении из кэша."""
+    parse(labelme_file, "labelme", cache=cache)
+    shapes = parse(labelme_file, "labelme", numpy_coords=True, cache=cache)
+    assert isinstance(shapes[0].coords, np.ndarray)
+    assert shapes == parse(labelme_file, "labelme")
+
+
+def test_invalidate_and_clear(cache, tmp_path, labelme_file):
+    """Проверяет явный сброс записей файла и всего кэша."""
+    other = tmp_path / "b.json"
+    _write_labelme(other, ["x"])
+    parse(labelme_file, "labelme", cache=cache)
+    parse(labelme_file, "labelme", validate="light", cache=cache)
+    parse(other, "labelme", cache=cache)
+    assert cache.invalidate(labelme_file) == 2
+    assert cache.get(labelme_file, "labelme") is None
+    assert isinstance(cache.get(other, "labelme"), ShapeBatch)
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_lru_eviction_keeps_size_bounded(tmp_path):
+    """Проверяет вытеснение давно не читанных записей при превышении max_bytes."""
+    files = []
+    for i in range(4):
+        path = tmp_path / f"{i}.json"
+        _write_labelme(path, ["car"] * 50)
+        files.append(path)
+    probe = ParseCache(tmp_path / "probe")
+    parse(files[0], "labelme", cache=probe)
+    entry_size = probe.size()
+
+    cache = ParseCache(tmp_path / "cache", max_bytes=entry_size * 3)
+    for i, path in enumerate(files[:3]):
+        parse(path, "labelme", cache=cache)
+        entry = cache.key(path, "labelme")
+        os.utime(entry, ns=(i * 10 ** 9, i * 10 ** 9))
+    assert cache.get(files[0], "labelme") is not None  # чтение обновляет время доступа
+    parse(files[3], "labelme", cache=cache)
+    assert cache.size() <= cache.max_bytes
+    assert cache.get(files[1], "labelme") is None
+    assert cache.get(files[0], "labelme") is not None
+
+
+def test_corrupt_entry_is_a_miss(cache, labelme_file):
+    """Проверяет, что повреждённая запись удаляется и файл парсится заново."""
+    expected = parse(labelme_file, "labelme", cache=cache)
+    entry = cache.key(labelme_file, "labelme")
+    entry.write_bytes(b"not a pickle")
+    assert cache.get(labelme_file, "labelme") is None
+    assert not entry.exists()
+    assert parse(labelme_file, "labelme", cache=cache) == expected
+
+
+def test_resolve():
+    """Проверяет разбор аргумента cache."""
+    assert ParseCache.resolve(None) is None
+    assert ParseCache.resolve(False) is None
+    assert ParseCache.resolve(True) is ParseCache.default()
+    with pytest.raises(TypeError):
+        ParseCache.resolve("yes")
+
+
+def test_default_directory_from_env(tmp_path, monkeypatch):
+    """Проверяет каталог по умолчанию из ANNOTATION_PARSER_CACHE_DIR."""
+    monkeypatch.setenv("ANNOTATION_PARSER_CACHE_DIR", str(tmp_path / "env"))
+    assert ParseCache().directory == tmp_path / "env"
+
+
+def test_save_with_cache_loads_json_lazily(cache, labelme_file):
+    """Проверяет, что с кэшем сохранение по-прежнему сохраняет поля исходного json."""
+    data = json.loads(labelme_file.read_text(encoding="utf-8"))
+    data["imagePath"] = "img.png"
+    labelme_file.write_text(json.dumps(data), encoding="utf-8")
+    af = AnnotationFile(labelme_file, "labelme", keep_json=True, cache=cache)
+    af.save(af.parse())
+    assert json.loads(labelme_file.read_text(encoding="utf-8"))["imagePath"] == "img.png"
@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from annotation_parser.api.shapes_api import (
+    get_shapes_by_label, get_shapes_by_number, get_shapes_by_wz_number, filter_shapes
+)
+from annotation_parser.index import ShapeIndex
+from annotation_parser.public_enums import ShapeType
+from annotation_parser.shape import Shape
+from annotation_parser.shape_batch import ShapeBatch
+
+
+@pytest.fixture(scope="module")
+def shapes():
+    rng = np.random.default_rng(0)
+    result = []
+    for i in range(300):
+        number = None if i % 3 == 0 else int(rng.integers(1, 6))
+        wz_number = None if i % 5 == 0 else int(rng.integers(1, 4))
+        shape_type, coords = (("point", [[i, i]]) if i % 4 == 0 else ("polygon", [[i, 0], [i + 1, 0], [i, 1]]))
+        result.append(Shape(label=f"l{i % 7}", coords=coords, type=shape_type, number=number, wz_number=wz_number))
+    return tuple(result)
+
+
+FLAGS = list(itertools.product([True, False], repeat=2))
+
+
+@pytest.mark.parametrize("individual,common", FLAGS)
+def test_filters_accept_index(shapes, individual, common):
+    """Проверяет, что функции фильтрации дают по ShapeIndex тот же результат, что по кортежу."""
+    index = ShapeIndex(shapes)
+    for label in ("l0", "l3", "missing"):
+        assert get_shapes_by_label(index, label, individual, common) == \
+               get_shapes_by_label(shapes, label, individual, common)
+    for number in (None, 1, 4, 99):
+        assert get_shapes_by_number(index, number, individual, common) == \
+               get_shapes_by_number(shapes, number, individual, common)
+    for wz_number in (None, 2, 99):
+        assert get_shapes_by_wz_number(index, wz_number, individual, common) == \
+               get_shapes_by_wz_number(shapes, wz_number, individual, common)
+    predicate = lambda s: s.type == ShapeType.POINT  # noqa: E731
+    assert filter_shapes(index, predicate, individual, common) == filter_shapes(shapes, predicate, individual, common)
+
+
+def test_combined_select_matches_scan(shapes):
+    """Проверяет комбинированные выборки (label + number + wz_number + type) против полного прохода."""
+    index = ShapeIndex(shapes)
+    for label, number, wz_number, shape_type in itertools.product(("l1", "l2"), (None, 2), (None, 1, 3),
+                                                                  ("polygon", ShapeType.POINT)):
+        expected = tuple(s for s in shapes if s.label == label and s.number == number
+                         and s.wz_number == wz_number and s.type == shape_type)
+        assert index.select(label=label, number=number, wz_number=wz_number, type=shape_type) == expected
+    assert index.select(wz_number=1, common=False) == tuple(s for s in shapes
+                                                            if s.wz_number == 1 and s.is_individual)
+    assert index.select() == shapes
+    assert index.select(individual=False, common=False) == ()
+
+
+def test_repeated_select_is_cached(shapes):
+    """Проверяет, что повторный запрос возвращает тот же кортеж без пересчёта."""
+    index = ShapeIndex(shapes)
+    first = get_shapes_by_wz_number(index, 2)
+    assert get_shapes_by_wz_number(index, 2) is first
+    assert index.select(label=["unhashable"]) == ()
+
+
+def test_index_over_batch(shapes):
+    """Проверяет индекс над ShapeBatch: выборка — строки батча с теми же фигурами."""
+    batch = ShapeBatch.from_shapes(shapes)
+    index = ShapeIndex(batch)
+    rows = index.select(label="l2", number=None)
+    expected = tuple(s for s in shapes if s.label == "l2" and s.number is None)
+    assert tuple(row.to_shape() for row in rows) == expected
+    assert index.count("number", None) == sum(s.number is None for s in shapes)
+    assert set(index.keys("wz_number")) == {s.wz_number for s in shapes}
+    assert len(index) == len(shapes) and index[0].label == shapes[0].label
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString, Point, Polygon, box
+
+from annotation_parser.index import ShapeSpatialIndex
+from annotation_parser.shape import Shape
+from annotation_parser.shape_batch import ShapeBatch
+
+
+def _random_shapes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    shapes = []
+    for i in range(n):
+        x, y = rng.uniform(0, 1000, 2)
+        w, h = rng.uniform(1, 40, 2)
+        kind = i % 4
+        if kind == 0:
+            shapes.append(Shape(label="zone", coords=[[x, y], [x + w, y], [x + w / 2, y + h]], type="polygon"))
+        elif kind == 1:
+            shapes.append(Shape(label="box", coords=[[x, y], [x + w, y + h]], type="rectangle", number=i))
+        elif kind == 2:
+            shapes.append(Shape(label="line", coords=[[x, y], [x + w, y + h], [x, y + h]], type="line"))
+        else:
+            shapes.append(Shape(label="point", coords=[[x, y]], type="point"))
+    return tuple(shapes)
+
+
+def _reference_geometry(shape):
+    coords = shape.coords
+    if len(coords) == 1:
+        return Point(coords[0])
+    if shape.type in ("polygon", "rectangle") and len(coords) >= 3:
+        return Polygon(coords)
+    return LineString(coords)
+
+
+@pytest.fixture(scope="module")
+def shapes():
+    return _random_shapes(400)
+
+
+@pytest.fixture(scope="module")
+def reference(shapes):
+    return [_reference_geometry(shape) for shape in shapes]
+
+
+@pytest.mark.parametrize("as_batch", [False, True])
+def test_box_and_point_queries_match_brute_force(shapes, reference, as_batch):
+    """Проверяет, что запросы по прямоугольнику и точке совпадают с полным перебором (и для ShapeBatch)."""
+    index = ShapeSpatialIndex(ShapeBatch.from_shapes(shapes) if as_batch else shapes)
+    rng = np.random.default_rng(1)
+    for x, y in rng.uniform(0, 1000, (50, 2)):
+        query = box(x, y, x + 60, y + 60)
+        expected = [i for i, geom in enumerate(reference) if geom.intersects(query)]
+        assert index.query((x, y, x + 60, y + 60)).tolist() == expected
+        point = Point(x, y)
+        expected = [i for i, geom in enumerate(reference) if geom.intersects(point)]
+        assert index.query((x, y)).tolist() == expected
+
+
+def test_point_inside_zone(shapes):
+    """Проверяет, что точка внутри полигона находит зону, а фигуры возвращаются с as_shapes."""
+    zone = shapes[0]
+    centroid = Polygon(zone.coords).centroid
+    found = ShapeSpatialIndex(shapes).query(centroid, predicate="within", as_shapes=True)
+    assert zone in found
+    assert all(shape.type in ("polygon", "rectangle") for shape in found)
+
+
+def test_bulk_queries_match_single(shapes):
+    """Проверяет, что пакетные запросы по прямоугольникам и точкам дают те же пары, что одиночные."""
+    index = ShapeSpatialIndex(shapes)
+    rng = np.random.default_rng(2)
+    corners = rng.uniform(0, 1000, (30, 2))
+    boxes = np.hstack([corners, corners + 80])
+    pairs = index.query_boxes(boxes)
+    expected = [(q, i) for q, b in enumerate(boxes) for i in index.query(tuple(b)).tolist()]
+    assert list(zip(*pairs.tolist())) == expected
+    pairs = index.query_points(corners)
+    expected = [(q, i) for q, p in enumerate(corners) for i in index.query(tuple(p)).tolist()]
+    assert list(zip(*pairs.tolist())) == expected
+
+
+def test_knn_matches_brute_force(shapes, reference):
+    """Проверяет k ближайших (порядок по расстоянию, затем по индексу) против перебора."""
+    index = ShapeSpatialIndex(shapes)
+    rng = np.random.default_rng(3)
+    for x, y in rng.uniform(0, 1000, (30, 2)):
+        point = Point(x, y)
+        distances = np.array([geom.distance(point) for geom in reference])
+        expected = np.lexsort((np.arange(len(reference)), distances))[:5]
+        found, dist = index.nearest_with_distance(point, k=5)
+        assert found.tolist() == expected.tolist()
+        assert np.allclose(dist, distances[expected])
+        assert index.nearest(point).tolist() == expected[:1].tolist()
+
+
+def test_nearest_many_and_max_distance(shapes, reference):
+    """Проверяет пакетный поиск ближайшей фигуры и ограничение max_distance."""
+    index = ShapeSpatialIndex(shapes)
+    points = np.random.default_rng(4).uniform(0, 1000, (40, 2))
+    nearest = index.nearest_many(points)
+    for (x, y), found in zip(points, nearest):
+        distances = np.array([geom.distance(Point(x, y)) for geom in reference])
+        assert found == int(np.flatnonzero(distances == distances.min())[0])
+    far = index.nearest_many([[-1e6, -1e6]], max_distance=10)
+    assert far.tolist() == [-1]
+    assert index.nearest((-1e6, -1e6), k=3, max_distance=10).tolist() == []
+
+
+def test_knn_more_than_available():
+    """Проверяет, что k больше числа фигур возвращает все фигуры, включая пересекающие точку запроса."""
+    shapes = _random_shapes(7)
+    index = ShapeSpatialIndex(shapes)
+    assert sorted(index.nearest(shapes[3].coords[0], k=100).tolist()) == list(range(7))
+    assert index.nearest(shapes[3].coords[0], k=1).tolist() == [3]
+
+
+def test_shifted_coordinates():
+    """Проверяет индекс по смещённым координатам."""
+    shape = Shape(label="zone", coords=[[10, 10], [20, 10], [20, 20], [10, 20]], type="polygon", shift_point=(10, 10))
+    for shapes in ((shape,), ShapeBatch.from_shapes([shape])):
+        assert ShapeSpatialIndex(shapes).query((5, 5)).tolist() == []
+        assert ShapeSpatialIndex(shapes, shifted=True).query((5, 5)).tolist() == [0]
+
+
+def test_degenerate_shapes_and_errors():
+    """Проверяет фигуры без площади и пустые: короткий полигон — линия, без вершин — не индексируется."""
+    shapes = (Shape(label="a", coords=[[0, 0], [5, 5]], type="polygon"),
+              Shape(label="b", coords=[], type="line"))
+    index = ShapeSpatialIndex(shapes)
+    assert isinstance(index.geometries[0], LineString) and index.geometries[1] is None
+    assert index.query((0, 0, 10, 10)).tolist() == [0]
+    assert shapely.is_geometry(index.geometries).tolist() == [True, False]
+    with pytest.raises(ValueError):
+        index.query((1, 2, 3))
+    with pytest.raises(ValueError):
+        index.nearest((0, 0), k=0)
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from annotation_parser.api.shapes_api import filter_shapes
+from annotation_parser.index import ShapeIndex
+from annotation_parser.query import F, ShapeQuery, has_meta, parse_where, where_fn
+from annotation_parser.shape import Shape
+from annotation_parser.shape_batch import ShapeBatch
+
+
+@pytest.fixture(scope="module")
+def shapes():
+    rng = np.random.default_rng(0)
+    result = []
+    for i in range(500):
+        x, y = rng.uniform(0, 500, 2)
+        w, h = rng.uniform(1, 80, 2)
+        if i % 3:
+            coords, shape_type = [[x, y], [x + w, y + h]], "rectangle"
+        else:
+            coords, shape_type = [[x, y], [x + w, y], [x, y + h]], "polygon"
+        result.append(Shape(label=("car", "bus", "person")[i % 3 if i % 7 else 1], coords=coords, type=shape_type,
+                            number=None if i % 4 == 0 else int(rng.integers(1, 6)),
+                            wz_number=None if i % 5 == 0 else int(rng.integers(1, 4)),
+                            meta={"score": 0.5} if i % 6 == 0 else {}))
+    return tuple(result)
+
+
+def _area(shape):
+    xs = [p[0] for p in shape.coords]
+    ys = [p[1] for p in shape.coords]
+    return (max(xs) - min(xs)) * (max(ys) - min(ys))
+
+
+CASES = [
+    ("label == 'car'", lambda s: s.label == "car"),
+    ("label in {'car', 'bus'} and 100 <= area <= 2000", lambda s: s.label in ("car", "bus") and 100 <= _area(s) <= 2000),
+    ("number is None or wz_number >= 2", lambda s: s.number is None or (s.wz_number is not None and s.wz_number >= 2)),
+    ("number != 3 and not type == 'polygon'", lambda s: s.number != 3 and s.type != "polygon"),
+    ("'score' in meta and number in [1, 2, None]", lambda s: "score" in s.meta and s.number in (1, 2, None)),
+    ("3 < number < 5 or width > 70", lambda s: (s.number is not None and 3 < s.number < 5)
+                                               or max(p[0] for p in s.coords) - min(p[0] for p in s.coords) > 70),
+    ("vertices == 3 and 'score' not in meta", lambda s: len(s.coords) == 3 and "score" not in s.meta),
+]
+
+
+@pytest.mark.parametrize("expression,reference", CASES)
+@pytest.mark.parametrize("as_batch", [False, True])
+def test_where_matches_python_reference(shapes, expression, reference, as_batch):
+    """Проверяет, что текстовое условие даёт ту же выборку, что построчная проверка Python (и на ShapeBatch)."""
+    data = ShapeBatch.from_shapes(shapes) if as_batch else shapes
+    expected = [i for i, s in enumerate(shapes) if reference(s)]
+    assert ShapeQuery(expression).indices(data).tolist() == expected
+
+
+def test_builder_equals_expression(shapes):
+    """Проверяет, что условия из F и текст дают одно и то же, а filter на батче возвращает ShapeBatch."""
+    built = F.label.isin({"car", "bus"}) & F.area.between(100, 2000) & (F.wz_number != None)  # noqa: E711
+    text = ShapeQuery("label in {'car', 'bus'} and 100 <= area <= 2000 and wz_number is not None")
+    batch = ShapeBatch.from_shapes(shapes)
+    assert ShapeQuery(built).indices(shapes).tolist() == text.indices(shapes).tolist()
+    filtered = text.filter(batch)
+    assert isinstance(filtered, ShapeBatch)
+    assert filtered.to_shapes() == text.filter(shapes)
+    assert (~text).mask(shapes).tolist() == (~text.mask(shapes)).tolist()
+
+
+def test_opaque_predicate_runs_only_on_survivors(shapes):
+    """Проверяет, что функция вызывается только для фигур, прошедших векторные условия."""
+    calls = []
+
+    def opaque(shape):
+        calls.append(shape)
+        return shape.number == 2
+
+    query = ShapeQuery(where_fn(opaque) & (F.label == "person") & has_meta("score"))
+    expected = [i for i, s in enumerate(shapes) if s.label == "person" and "score" in s.meta and s.number == 2]
+    assert query.indices(shapes).tolist() == expected
+    assert len(calls) == sum(s.label == "person" and "score" in s.meta for s in shapes)
+
+
+def test_filter_shapes_accepts_conditions(shapes):
+    """Проверяет filter_shapes с декларативным условием и флагами individual/common, в том числе по ShapeIndex."""
+    condition = F.area > 1000
+    for individual, common in ((True, True), (True, False), (False, True)):
+        expected = filter_shapes(shapes, lambda s: _area(s) > 1000, individual, common)
+        assert filter_shapes(shapes, condition, individual, common) == expected
+        assert filter_shapes(ShapeIndex(shapes), ShapeQuery(condition), individual, common) == expected
+    assert filter_shapes(shapes, condition, False, False) == ()
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')", "label.startswith('c')", "area > width", "unknown == 1", "label ==", "type < 'polygon'",
+    "number is 3", "number in {'x'}", "label == 3", "area > 'big'", "number in 5", "label in 'car'",
+])
+def test_invalid_where_is_rejected(expression):
+    """Проверяет, что неподдерживаемые конструкции отклоняются, а не исполняются."""
+    with pytest.raises(ValueError):
+        parse_where(expression)
+
+
+
+@pytest.mark.parametrize("as_batch", [False, True])
+def test_isin_non_integer_number_matches_like_equality(shapes, as_batch):
+    """Проверяет, что number in {1.5} не усекается до 1 и совпадает с number == 1.5, а 2.0 равно 2."""
+    data = ShapeBatch.from_shapes(shapes) if as_batch else shapes
+    assert ShapeQuery("number in {1.5}").indices(data).tolist() == ShapeQuery("number == 1.5").indices(data).tolist()
+    assert ShapeQuery("number in {1.5}").indices(data).tolist() == []
+    assert ShapeQuery("number in {2.0, 1.5}").indices(data).tolist() == ShapeQuery("number == 2").indices(data).tolist()
+    assert ShapeQuery(F.number.isin({"x", None})).indices(data).tolist() == [i for i, s in enumerate(shapes)
+                                                                             if s.number is None]
+
+def test_empty_input_and_degenerate_shapes():
+    """Проверяет пустой набор и фигуру без вершин (area не определена — условие ложно)."""
+    assert ShapeQuery("area > 0").indices(()).tolist() == []
+    shapes = (Shape(label="a", coords=[], type="line"), Shape(label="b", coords=[[0, 0], [2, 3]], type="line"))
+    assert ShapeQuery("area > 0").indices(shapes).tolist() == [1]
+    assert ShapeQuery("vertices == 0").indices(ShapeBatch.from_shapes(shapes)).tolist() == [0]
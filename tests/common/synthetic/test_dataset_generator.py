@@ -0,0 +1,76 @@
+import base64
+
+import pytest
+
+from annotation_parser.api.parser_api import parse, parse_voc_dir
+from annotation_parser.synthetic import DatasetGenerator, DatasetSpec
+from annotation_parser.utils.json_codec import JsonCodec
+
+
+@pytest.mark.parametrize("markup_type", ["labelme", "coco", "voc"])
+def test_generated_files_parse(tmp_path, markup_type):
+    """Проверяет, что файлы каждого формата читаются адаптером и число фигур совпадает с отчётом."""
+    spec = DatasetSpec(markup_type, files=3, shapes_per_file=40, shapes_spread=0.5, images_per_file=3,
+                       vertex_distribution="loguniform", seed=1)
+    generated = sorted(DatasetGenerator.write(spec, tmp_path, workers=0), key=lambda item: item.path)
+    assert [item.path for item in generated] == [str(tmp_path / DatasetGenerator.file_name(spec, i))
+                                                 for i in range(3)]
+    for item in generated:
+        shapes = parse(item.path, markup_type)
+        assert len(shapes) == item.shapes
+        assert {shape.label for shape in shapes} <= set(spec.labels)
+
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_voc_xml_files_parse(tmp_path, pretty):
+    """Проверяет VOC в формате XML: parse_voc_dir читает те же фигуры, что и JSON-вариант набора."""
+    spec = DatasetSpec("voc", files=3, shapes_per_file=20, shapes_spread=0.5, seed=3, pretty=pretty, voc_xml=True)
+    generated = {item.path: item.shapes for item in DatasetGenerator.write(spec, tmp_path / "xml", workers=0)}
+    assert sorted(generated) == [str(tmp_path / "xml" / f"voc_{i:06d}.xml") for i in range(3)]
+    json_spec = DatasetSpec("voc", files=3, shapes_per_file=20, shapes_spread=0.5, seed=3)
+    expected = {item.path.rsplit("/", 1)[-1][:-len(".json")]: parse(item.path, "voc")
+                for item in DatasetGenerator.write(json_spec, tmp_path / "json", workers=0)}
+    results = list(parse_voc_dir(tmp_path / "xml", workers=0))
+    assert all(result.ok for result in results) and len(results) == 3
+    for result in results:
+        assert len(result.shapes) == generated[result.file_path]
+        assert result.shapes == expected[result.file_path.rsplit("/", 1)[-1][:-len(".xml")]]
+
+def test_output_is_deterministic(tmp_path):
+    """Проверяет побайтное совпадение файлов при одном seed независимо от числа процессов."""
+    spec = DatasetSpec("labelme", files=4, shapes_per_file=30, wz_share=0.5, seed=42)
+    inline = {item.path.rsplit("/", 1)[-1]: open(item.path, "rb").read()
+              for item in DatasetGenerator.write(spec, tmp_path / "a", workers=0)}
+    pooled = {item.path.rsplit("/", 1)[-1]: open(item.path, "rb").read()
+              for item in DatasetGenerator.write(spec, tmp_path / "b", workers=2)}
+    assert inline == pooled
+    other = DatasetGenerator.document(DatasetSpec("labelme", files=4, shapes_per_file=30, seed=43), 0)
+    assert JsonCodec.dumps(other) != JsonCodec.dumps(DatasetGenerator.document(spec, 0))
+
+
+def test_labelme_parameters_are_respected():
+    """Проверяет вершины, group_id, wz, прямоугольники и imageData в документе LabelMe."""
+    spec = DatasetSpec("labelme", shapes_per_file=500, vertices=(5, 9), rectangle_share=0.3, group_id_share=0.0,
+                       wz_share=1.0, wz_count=2, image_data_bytes=300, image_size=(640, 480), labels=("a", "b"))
+    doc = DatasetGenerator.document(spec, 0)
+    shapes = doc["shapes"]
+    assert len(shapes) == 500
+    polygons = [s for s in shapes if s["shape_type"] == "polygon"]
+    assert 0 < len(polygons) < 500 and all(5 <= len(s["points"]) <= 9 for s in polygons)
+    assert all(len(s["points"]) == 2 for s in shapes if s["shape_type"] == "rectangle")
+    assert all(s["group_id"] is None and s["wz"] in (1, 2) for s in shapes)
+    assert all(0 <= x <= 640 and 0 <= y <= 480 for s in shapes for x, y in s["points"].tolist())
+    assert len(base64.b64decode(doc["imageData"])) == 300
+    assert (doc["imageWidth"], doc["imageHeight"]) == (640, 480)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"markup_type": "yolo"}, {"vertices": (2, 8)}, {"vertices": (9, 4)}, {"rectangle_share": 1.5},
+    {"labels": ()}, {"vertex_distribution": "normal"}, {"files": -1},
+    {"markup_type": "coco", "voc_xml": True},
+])
+def test_invalid_spec(kwargs):
+    """Проверяет отклонение противоречивых параметров."""
+    with pytest.raises(ValueError):
+        DatasetSpec(**kwargs)
@@ -0,0 +1,101 @@
+import importlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+import annotation_parser
+
+SRC = Path(annotation_parser.__file__).resolve().parents[1]
+SAMPLE = Path(__file__).resolve().parents[1] / "labelme" / "labelme_test.json"
+
+# Бюджет на import annotation_parser (кумулятивно по -X importtime). Сейчас около 20 мс на холодном старте:
+# запас на медленные CI-машины, но загрузка numpy/shapely/pydantic (сотни мс) в него уже не помещается
+IMPORT_BUDGET_US = 100_000
+HEAVY = ("numpy", "shapely", "pydantic", "asyncio", "multiprocessing", "concurrent.futures")
+ADAPTERS = tuple(f"annotation_parser.adapters.{name}_adapter" for name in ("labelme", "coco", "voc"))
+LAZY_PACKAGES = ("", ".adapters", ".api", ".core", ".index", ".models", ".query", ".synthetic", ".utils")
+
+
+def import_profile(code: str) -> Tuple[Dict[str, int], List[str]]:
+    """
+        Выполняет code в новом интерпретаторе с -X importtime.
+        Returns:
+            (модуль -> кумулятивное время импорта в мкс, все загруженные модули). Модули, загруженные через
+            importlib.import_module (ленивые реэкспорты, реестр адаптеров), -X importtime не показывает,
+            поэтому список модулей берётся из sys.modules.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (str(SRC), os.environ.get("PYTHONPATH"))))}
+    code += "\nimport sys; print('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, cwd=SRC.parent,
+                            capture_output=True, text=True, check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        profile[module.strip()] = int(cumulative)
+    return profile, result.stdout.split()
+
+
+def heavy_modules(modules: List[str]) -> List[str]:
+    return sorted(name for name in modules if name in HEAVY or name in ADAPTERS)
+
+
+def test_import_is_light_and_within_budget():
+    """Проверяет, что import annotation_parser не загружает тяжёлые зависимости и укладывается в бюджет."""
+    profile, modules = import_profile("import annotation_parser")
+    assert heavy_modules(modules) == []
+    assert profile["annotation_parser"] < IMPORT_BUDGET_US, f"import took {profile['annotation_parser']} us"
+
+
+def test_public_api_import_is_light():
+    """Проверяет, что импорт функций верхнего уровня не тянет numpy, shapely, pydantic и адаптеры."""
+    _, modules = import_profile("from annotation_parser import parse, parse_labelme, save, create, convert_many, "
+                                "Shape, ShapeType, ValidationMode, instrument")
+    assert heavy_modules(modules) == []
+
+
+def test_first_use_loads_only_needed_adapter():
+    """Проверяет, что разбор LabelMe загружает pydantic и только адаптер LabelMe, без numpy и shapely."""
+    _, modules = import_profile(f"from annotation_parser import parse_labelme; parse_labelme({str(SAMPLE)!r})")
+    assert heavy_modules(modules) == ["annotation_parser.adapters.labelme_adapter", "pydantic"]
+
+
+def test_cli_import_is_light():
+    """Проверяет, что модуль CLI (точка входа annotation-parser) загружается без тяжёлых зависимостей."""
+    _, modules = import_profile(f"import {SRC.name}.annotation_parser.cli")
+    assert [name for name in modules if name.split(".")[0] in ("numpy", "shapely", "pydantic", "asyncio")] == []
+
+
+@pytest.mark.parametrize("package", LAZY_PACKAGES)
+def test_lazy_exports_match_modules(package):
+    """Проверяет, что каждое имя из __all__ пакета разрешается и берётся из модуля, где оно объявлено."""
+    module = importlib.import_module(f"annotation_parser{package}")
+    for name in module.__all__:
+        value = getattr(module, name)
+        origin = getattr(value, "__module__", None)
+        if origin is not None and origin.startswith("annotation_parser."):
+            assert name in importlib.import_module(origin).__all__
+    assert set(module.__all__) <= set(dir(module))
+    with pytest.raises(AttributeError):
+        getattr(module, "no_such_name")
+
+
+def test_star_import_exports_public_names():
+    """Проверяет, что from annotation_parser import * по-прежнему отдаёт публичные имена."""
+    namespace = {}
+    exec("from annotation_parser import *", namespace)
+    for name in ("Shape", "ShapeBatch", "ShapeQuery", "F", "ParseCache", "parse", "save", "convert_many",
+                 "ShapeIndex", "ShapeSpatialIndex", "PipelineCollector", "Coords", "ShapeType"):
+        assert name in namespace
+
+
+def test_adapters_register_on_first_lookup():
+    """Проверяет, что встроенные адаптеры видны в реестре до импорта и загружаются по имени."""
+    from annotation_parser.adapters import AdapterFactory
+    assert {"labelme", "coco", "voc"} <= set(AdapterFactory.list_adapters())
+    assert AdapterFactory.get_adapter("VOC").adapter_name == "voc"
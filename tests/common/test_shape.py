@@ -0,0 +1,105 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from annotation_parser.public_enums import ShapeType
+from annotation_parser.shape import Shape
+
+
+@pytest.fixture
+def polygon():
+    return Shape(label="zone", coords=[[0, 0], [4, 0], [4, 3], [0, 3], [1, 1]], type=ShapeType.POLYGON,
+                 shift_point=(1, 1))
+
+
+def test_derived_geometry_is_cached(polygon):
+    """Проверяет, что производная геометрия вычисляется один раз на экземпляр."""
+    for name in ("contour", "rect", "line", "shifted_coords", "shifted_contour", "shifted_rect", "shifted_line"):
+        assert getattr(polygon, name) is getattr(polygon, name)
+
+
+def test_rect_matches_shapely_bounds(polygon):
+    """Проверяет, что bounding box без shapely совпадает с Polygon.bounds."""
+    assert polygon.rect == Polygon(polygon.coords).bounds
+    assert polygon.shifted_rect == Polygon(polygon.shifted_coords).bounds
+
+
+def test_rect_for_point_and_line():
+    """Проверяет bounding box для точки и линии (не строятся через Polygon)."""
+    point = Shape(label="p", coords=[[2, 3]], type=ShapeType.POINT)
+    line = Shape(label="l", coords=[[0, 5], [3, 1]], type=ShapeType.LINE)
+    assert point.rect == (2.0, 3.0, 2.0, 3.0)
+    assert line.rect == (0.0, 1.0, 3.0, 5.0)
+
+
+def test_contour_is_readonly(polygon):
+    """Проверяет, что закэшированный контур нельзя изменить на месте."""
+    with pytest.raises(ValueError):
+        polygon.contour[0, 0, 0] = 10
+
+
+def test_cache_ignored_by_eq_and_pickle(polygon):
+    """Проверяет, что кэш не влияет на сравнение и не переносится через pickle/copy."""
+    other = Shape(label="zone", coords=polygon.coords, type=ShapeType.POLYGON, shift_point=(1, 1))
+    _ = polygon.rect
+    assert polygon == other
+    restored = pickle.loads(pickle.dumps(polygon))
+    assert restored == polygon
+    assert restored._cache == {}
+    assert copy.copy(polygon)._cache == {}
+    assert "_cache" not in repr(polygon)
+
+
+def test_construct_has_empty_cache():
+    """Проверяет, что быстрый конструктор тоже заводит кэш."""
+    shape = Shape.construct(label="a", coords=[[0, 0], [2, 2]], type=ShapeType.RECTANGLE)
+    assert shape.rect == (0.0, 0.0, 2.0, 2.0)
+    assert shape.rect is shape.rect
+
+
+def test_numpy_coords_are_readonly_array():
+    """Проверяет хранение координат массивом (N, 2) float64 только для чтения."""
+    shape = Shape(label="a", coords=np.array([[0, 0], [2, 1], [1, 3]]), type=ShapeType.POLYGON, shift_point=(1, 1))
+    assert isinstance(shape.coords, np.ndarray)
+    assert shape.coords.dtype == np.float64 and shape.coords.shape == (3, 2)
+    with pytest.raises(ValueError):
+        shape.coords[0, 0] = 5
+    assert shape.shifted_coords.tolist() == [[-1.0, -1.0], [1.0, 0.0], [0.0, 2.0]]
+    assert shape.rect == (0.0, 0.0, 2.0, 3.0)
+
+
+def test_numpy_coords_do_not_alias_writable_input():
+    """Проверяет, что изменяемый массив вызывающего копируется, а неизменяемый переиспользуется."""
+    coords = np.array([[0, 0], [2, 1], [1, 3]], dtype=np.float64)
+    for shape in (Shape(label="a", coords=coords, type=ShapeType.POLYGON),
+                  Shape.construct(label="a", coords=coords, type=ShapeType.POLYGON)):
+        assert not np.shares_memory(shape.coords, coords)
+        coords[0, 0] = 5
+        assert shape.coords[0, 0] == 0
+        coords[0, 0] = 0
+    assert coords.flags.writeable
+    frozen = Shape(label="a", coords=coords, type=ShapeType.POLYGON).coords
+    assert Shape(label="b", coords=frozen, type=ShapeType.POLYGON).coords is frozen
+
+
+def test_numpy_rectangle_expands_to_four_corners():
+    """Проверяет, что прямоугольник из двух точек разворачивается и в режиме numpy."""
+    shape = Shape.construct(label="r", coords=np.array([[0, 0], [2, 1]]), type=ShapeType.RECTANGLE)
+    assert shape.coords.tolist() == [[0.0, 0.0], [2.0, 0.0], [2.0, 1.0], [0.0, 1.0]]
+
+
+def test_numpy_and_list_shapes_are_equal():
+    """Проверяет, что фигуры со списком и с массивом одинаковых координат равны."""
+    as_list = Shape(label="a", coords=[[0, 0], [1, 1]], type=ShapeType.LINE)
+    as_array = Shape(label="a", coords=np.array([[0, 0], [1, 1]]), type=ShapeType.LINE)
+    assert as_list == as_array
+    assert as_list != Shape(label="a", coords=np.array([[0, 0], [1, 2]]), type=ShapeType.LINE)
+
+
+def test_numpy_coords_reject_bad_shape():
+    """Проверяет, что массив не из пар чисел отклоняется."""
+    with pytest.raises(ValueError):
+        Shape(label="a", coords=np.zeros((2, 3)), type=ShapeType.POLYGON)
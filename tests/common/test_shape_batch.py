@@ -0,0 +1,106 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from annotation_parser.public_enums import ShapeType, ShapePosition
+from annotation_parser.shape import Shape
+from annotation_parser.shape_batch import ShapeBatch, ShapeBatchBuilder, ShapeRow
+
+
+@pytest.fixture
+def shapes():
+    return (
+        Shape(label="car", coords=[[0, 0], [10, 5]], type=ShapeType.RECTANGLE, number=1, flags={}),
+        Shape(label="person", coords=[[1, 1], [2, 3], [4, 1]], type=ShapeType.POLYGON,
+              description="d", flags={"occluded": True}, position=ShapePosition.LEFT, wz_number=7,
+              meta={"custom": 1}),
+        Shape(label="car", coords=[[5, 5]], type=ShapeType.POINT, shift_point=(1, 2)),
+    )
+
+
+def test_roundtrip_is_lossless(shapes):
+    """Проверяет, что Shape -> ShapeBatch -> Shape не теряет полей."""
+    batch = ShapeBatch.from_shapes(shapes)
+    assert len(batch) == 3
+    assert batch.to_shapes() == shapes
+
+
+def test_columns(shapes):
+    """Проверяет колоночную раскладку: общий буфер координат, offsets, коды меток и типов."""
+    batch = ShapeBatch.from_shapes(shapes)
+    assert batch.coords.shape == (8, 2)
+    assert batch.offsets.tolist() == [0, 4, 7, 8]
+    assert batch.labels == ("car", "person")
+    assert batch.label_codes.tolist() == [0, 1, 0]
+    assert list(batch.types) == [ShapeType.RECTANGLE, ShapeType.POLYGON, ShapeType.POINT]
+    assert batch.column("description") == [None, "d", None]
+
+
+def test_row_view_behaves_like_shape(shapes):
+    """Проверяет, что строка батча отдаёт те же значения, что и Shape."""
+    batch = ShapeBatch.from_shapes(shapes)
+    for row, shape in zip(batch, shapes):
+        assert isinstance(row, ShapeRow)
+        assert row.label == shape.label
+        assert row.type == shape.type
+        assert row.coords.tolist() == shape.coords
+        assert row.number == shape.number
+        assert row.wz_number == shape.wz_number
+        assert row.flags == shape.flags
+        assert row.meta == shape.meta
+        assert row.rect == shape.rect
+        assert row.is_individual == shape.is_individual
+        assert row.shifted_coords.tolist() == shape.shifted_coords
+    assert batch[-1].get("custom") is None
+    assert batch[1].get("custom") == 1
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_row_coords_are_readonly_views(shapes):
+    """Проверяет, что coords строки — представление общего буфера без копирования и только для чтения."""
+    batch = ShapeBatch.from_shapes(shapes)
+    coords = batch[1].coords
+    assert np.shares_memory(coords, batch.coords)
+    with pytest.raises(ValueError):
+        coords[0, 0] = 100
+
+
+def test_empty_flags_are_not_shared(shapes):
+    """Проверяет, что пустые dict flags не делятся между фигурами после обратного преобразования."""
+    result = ShapeBatch.from_shapes(shapes).to_shapes()
+    assert result[0].flags == {}
+    assert result[0].flags is not ShapeBatch.from_shapes(shapes).to_shapes()[0].flags
+
+
+def test_take_with_indices_and_mask(shapes):
+    """Проверяет выборку строк по индексам и по булевой маске."""
+    batch = ShapeBatch.from_shapes(shapes)
+    assert batch.take([2, 0]).to_shapes() == (shapes[2], shapes[0])
+    mask = batch.label_codes == batch.labels.index("car")
+    assert batch.take(mask).to_shapes() == (shapes[0], shapes[2])
+    assert len(batch.take([])) == 0
+
+
+def test_float32_and_pickle(shapes):
+    """Проверяет float32-координаты и сериализацию pickle."""
+    batch = ShapeBatch.from_shapes(shapes, dtype=np.float32)
+    assert batch.coords.dtype == np.float32
+    restored = pickle.loads(pickle.dumps(batch))
+    assert restored.to_shapes() == shapes
+
+
+def test_builder_rejects_bad_coords():
+    """Проверяет, что построитель не принимает координаты не парами и не портит буфер."""
+    builder = ShapeBatchBuilder()
+    with pytest.raises(ValueError):
+        builder.append("a", [[1, 2, 3]], ShapeType.POINT)
+    builder.append("a", [[1, 2]], "point")
+    assert builder.build().coords.tolist() == [[1.0, 2.0]]
+
+
+def test_inconsistent_columns_raise():
+    """Проверяет, что несогласованные колонки отклоняются."""
+    with pytest.raises(ValueError):
+        ShapeBatch(np.zeros((2, 2)), [0, 1], [0], ("a",), [0], [0], [0])
@@ -1,7 +1,10 @@
+import numpy as np
 import pytest
 from shapely.geometry import Point
 
-from annotation_parser.utils import to_point, to_coords, two_coords_to_four
+from annotation_parser.utils import (
+    to_point, to_coords, two_coords_to_four, coords_bounds, coords_contour, shift_coords_many
+)
 from annotation_parser.public_enums import ShapeType
 
 
@@ -54,3 +57,33 @@ def test_to_coords_invalid():
 ])
 def test_two_coords_to_four(coords, stype, expected):
     assert two_coords_to_four(coords, stype) == expected
+
+
+# --- coords_bounds / coords_contour ---
+@pytest.mark.parametrize("coords,expected", [
+    ([[1, 2]], (1.0, 2.0, 1.0, 2.0)),
+    ([[0, 5], [3, 1]], (0.0, 1.0, 3.0, 5.0)),
+    ([[0, 0], [4, 0], [4, 3], [0, 3]], (0.0, 0.0, 4.0, 3.0)),
+])
+def test_coords_bounds(coords, expected):
+    assert coords_bounds(coords) == expected
+
+
+def test_coords_bounds_empty():
+    with pytest.raises(ValueError):
+        coords_bounds([])
+
+
+def test_coords_contour_is_readonly():
+    contour = coords_contour([[1, 2], [3, 4]])
+    assert contour.shape == (2, 1, 2)
+    assert contour.dtype == np.float32
+    with pytest.raises(ValueError):
+        contour[0, 0, 0] = 5
+
+
+
+def test_shift_coords_many():
+    coords = np.array([[1, 1], [2, 2], [10, 10]], dtype=float)
+    shifted = shift_coords_many(coords, [2, 1], np.array([[1, 1], [10, 0]], dtype=float))
+    assert shifted.tolist() == [[0, 0], [1, 1], [0, 10]]
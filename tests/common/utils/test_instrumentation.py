@@ -0,0 +1,127 @@
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from annotation_parser import PipelineCollector, PipelineStage, instrument
+from annotation_parser.api.parser_api import aparse, parse, parse_many
+from annotation_parser.api.saver_api import asave, save, save_stream
+from annotation_parser.utils import StageStats, active_hook, stage
+
+SAMPLE = Path(__file__).resolve().parents[2] / "labelme" / "labelme_test.json"
+
+
+def test_disabled_by_default_records_nothing():
+    """Проверяет, что без instrument хук не установлен и замер этапа ничего не вызывает."""
+    assert active_hook() is None
+    with stage(PipelineStage.DECODE) as timer:
+        timer.set(nbytes=10, shapes=1)
+    parse(SAMPLE, "labelme")
+    assert active_hook() is None
+
+
+def test_parse_and_save_stages(tmp_path):
+    """Проверяет этапы парсинга и сохранения, число фигур и байт."""
+    target = tmp_path / "out.json"
+    with instrument() as collector:
+        shapes = parse(SAMPLE, "labelme")
+        save(shapes, target, "labelme", backup=False)
+    names = set(collector.stages)
+    assert {"read", "decode", "validate", "build", "parse", "save", "to_json", "encode", "write"} <= names
+    assert "backup" not in names and "cache" not in names
+    assert collector.stats(PipelineStage.PARSE).shapes == len(shapes)
+    assert collector.stats("build").shapes == len(shapes)
+    assert collector.stats("read").nbytes == SAMPLE.stat().st_size
+    assert collector.stats("write").nbytes == target.stat().st_size
+    assert active_hook() is None
+
+
+def test_async_stages(tmp_path):
+    """Проверяет, что aparse и asave внутри instrument() передают хук в поток исполнителя."""
+    target = tmp_path / "out.json"
+
+    async def run():
+        shapes = await aparse(SAMPLE, "labelme")
+        await asave(shapes, target, "labelme", backup=False)
+        return shapes
+
+    with instrument() as collector:
+        shapes = asyncio.run(run())
+    assert {"read", "decode", "parse", "save", "write"} <= set(collector.stages)
+    assert collector.stats("parse").shapes == len(shapes)
+    assert collector.stats("write").nbytes == target.stat().st_size
+
+def test_save_stream_and_backup(tmp_path):
+    """Проверяет этапы потокового сохранения и резервной копии."""
+    target = tmp_path / "out.json"
+    shutil.copy(SAMPLE, target)
+    shapes = parse(SAMPLE, "labelme")
+    with instrument() as collector:
+        save_stream(shapes, target, "labelme", backup=True)
+    assert collector.stats("save").count == 1
+    assert collector.stats("backup").count == 1
+    assert collector.stats("write").nbytes == target.stat().st_size
+
+
+def test_failed_stage_is_not_recorded():
+    """Проверяет, что этап, завершившийся исключением, не попадает в статистику."""
+    with instrument() as collector:
+        with pytest.raises(RuntimeError):
+            with stage("decode"):
+                raise RuntimeError("boom")
+    assert collector.stages == {}
+
+
+def test_custom_hook():
+    """Проверяет, что вместо PipelineCollector можно передать любую функцию."""
+    calls = []
+    with instrument(lambda *args: calls.append(args)) as hook:
+        assert active_hook() is hook
+        with stage(PipelineStage.ENCODE, nbytes=5) as timer:
+            timer.set(shapes=2)
+    assert len(calls) == 1
+    name, seconds, nbytes, shapes = calls[0]
+    assert (name, nbytes, shapes) == ("encode", 5, 2) and seconds >= 0
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_parse_many_collects_from_workers(tmp_path, workers):
+    """Проверяет, что статистика из процессов-воркеров переносится в сборщик родителя."""
+    paths = []
+    for i in range(4):
+        paths.append(tmp_path / f"{i}.json")
+        shutil.copy(SAMPLE, paths[-1])
+    with instrument() as collector:
+        results = list(parse_many(paths, "labelme", workers=workers, chunksize=1))
+    assert all(r.error is None for r in results)
+    assert collector.stats("parse").count == 4
+    assert collector.stats("parse").shapes == sum(len(r.shapes) for r in results)
+    assert collector.stats("read").nbytes == 4 * SAMPLE.stat().st_size
+
+
+def test_stage_stats_percentiles_and_merge():
+    """Проверяет перцентили по гистограмме (точность корзины) и объединение статистики."""
+    stats = StageStats()
+    for i in range(1, 1001):
+        stats.add(i * 1e-4, nbytes=1)
+    assert stats.count == 1000 and stats.nbytes == 1000
+    assert stats.mean == pytest.approx(0.05005)
+    assert stats.percentile(50) == pytest.approx(0.05, rel=0.2)
+    assert stats.percentile(90) == pytest.approx(0.09, rel=0.2)
+    assert stats.percentile(100) == stats.max == pytest.approx(0.1)
+    assert sum(stats.as_dict()["histogram_us"].values()) == 1000
+
+    collector = PipelineCollector()
+    collector("decode", 0.001)
+    other = PipelineCollector()
+    other("decode", 0.003)
+    other("write", 0.002)
+    collector.merge(other)
+    assert collector.stats("decode").count == 2
+    assert collector.stats("decode").min == pytest.approx(0.001)
+    assert collector.stats("decode").max == pytest.approx(0.003)
+    assert list(collector.stages) == ["decode", "write"]
+    assert "decode" in collector.summary()
+    collector.reset()
+    assert collector.stages == {}
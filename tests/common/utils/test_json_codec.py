@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pytest
+
+from annotation_parser.public_enums import JsonBackend
+from annotation_parser.utils import JsonCodec
+
+DATA = {"label": "кошка", "points": [[1.5, 2.0], [3.0, 4.25]], "group_id": None, "flags": {}, "ok": True}
+
+
+@pytest.fixture(params=JsonCodec.available_backends(), ids=lambda b: b.value)
+def backend(request):
+    previous = JsonCodec.get_backend()
+    JsonCodec.set_backend(request.param)
+    yield request.param
+    JsonCodec.set_backend(previous)
+
+
+def test_stdlib_always_available():
+    assert JsonBackend.STDLIB in JsonCodec.available_backends()
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        JsonCodec.set_backend("simplejson-xxl")
+
+
+def test_round_trip(backend):
+    assert JsonCodec.loads(JsonCodec.dumps(DATA)) == DATA
+    assert JsonCodec.loads(JsonCodec.dumps(DATA, pretty=False)) == DATA
+    assert JsonCodec.loads(memoryview(JsonCodec.dumps(DATA))) == DATA
+
+
+def test_pretty_matches_stdlib_layout(backend):
+    expected = json.dumps(DATA, ensure_ascii=False, indent=2).encode("utf-8")
+    assert JsonCodec.dumps(DATA) == expected
+
+
+def test_compact_has_no_whitespace(backend):
+    assert b" " not in JsonCodec.dumps({"a": [1, 2], "b": {"c": 3}}, pretty=False)
+
+
+def test_numpy_values(backend):
+    data = {"points": np.array([[1.0, 2.0], [3.0, 4.0]]), "n": np.int64(7)}
+    assert JsonCodec.loads(JsonCodec.dumps(data)) == {"points": [[1.0, 2.0], [3.0, 4.0]], "n": 7}
+
+
+def test_invalid_json_raises_json_decode_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        JsonCodec.loads(b"{not valid json]")
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1 << 30])
+def test_file_round_trip(backend, tmp_path, monkeypatch, mmap_threshold):
+    monkeypatch.setattr(JsonCodec, "MMAP_THRESHOLD", mmap_threshold)
+    path = tmp_path / "data.json"
+    JsonCodec.dump_file(DATA, path, pretty=False)
+    assert JsonCodec.load_file(path) == DATA
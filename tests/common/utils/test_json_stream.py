@@ -0,0 +1,125 @@
+import io
+import json
+
+import pytest
+
+from annotation_parser.utils import JsonCodec, JsonStreamReader, JsonStreamWriter
+
+DOC = {
+    "info": {"note": "brackets ]} and \"quotes\" inside strings"},
+    "items": [{"id": i, "text": "a\\\"{[" * (i % 3), "values": [1.5, -2, 3e2]} for i in range(20)],
+    "number": 123456,
+    "flag": True,
+    "nothing": None,
+    "empty_list": [],
+    "empty_obj": {},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_reads_whole_document(chunk_size, indent):
+    data = json.dumps(DOC, indent=indent).encode("utf-8")
+    reader = JsonStreamReader(io.BytesIO(data), chunk_size=chunk_size)
+    result = {}
+    for key in reader.iter_object():
+        if key == "items":
+            result[key] = list(reader.iter_array_values())
+        else:
+            result[key] = reader.read_value()
+    assert result == DOC
+
+
+@pytest.mark.parametrize("chunk_size", [2, 1 << 20])
+def test_skip_value_returns_byte_span(chunk_size):
+    data = json.dumps(DOC, ensure_ascii=False).encode("utf-8")
+    reader = JsonStreamReader(io.BytesIO(data), chunk_size=chunk_size)
+    spans = {}
+    for key in reader.iter_object():
+        spans[key] = reader.skip_value()
+    for key, (start, end) in spans.items():
+        assert json.loads(data[start:end]) == DOC[key]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7])
+def test_skip_value_across_chunk_boundaries(chunk_size):
+    """Проверяет пропуск строк с экранированием, скобками и кавычками внутри на любых границах блоков."""
+    values = ['a\\', '\\"]}', {"k": ['[', '\\', '"{"', []]}, [[], {}, "x\\\"y"], "plain", 12.5, None]
+    data = json.dumps({"v": values}).encode()
+    reader = JsonStreamReader(io.BytesIO(data), chunk_size=chunk_size)
+    for key in reader.iter_object():
+        spans = []
+        for _ in reader.iter_array():
+            spans.append(reader.skip_value())
+    assert [json.loads(data[start:end]) for start, end in spans] == values
+
+
+def test_skip_value_memory_is_bounded():
+    """Проверяет, что пропуск большого массива не держит его в буфере: буфер не больше пары блоков."""
+    items = [{"id": i, "bbox": [i, i, 5, 5], "note": "a\\\"b]"} for i in range(5000)]
+    data = json.dumps({"annotations": items, "categories": [{"id": 1}]}).encode()
+    sizes = []
+
+    class Recording(JsonStreamReader):
+        def _fill(self):
+            sizes.append(len(self._buf))
+            return super()._fill()
+
+    reader = Recording(io.BytesIO(data), chunk_size=1024)
+    header = {}
+    for key in reader.iter_object():
+        if key == "annotations":
+            start, end = reader.skip_value()
+            assert json.loads(data[start:end]) == items
+        else:
+            header[key] = reader.read_value()
+    assert header == {"categories": [{"id": 1}]}
+    assert len(data) > 100 * 1024 and max(sizes) <= 2 * 1024
+
+
+def test_array_element_offsets():
+    data = b'[{"a": 1}, {"b": "\xd0\xb6"}, 3]'
+    reader = JsonStreamReader(io.BytesIO(data), chunk_size=4)
+    offsets = []
+    for _ in reader.iter_array():
+        offsets.append(reader.tell())
+        reader.skip_value()
+    # Смещения — в байтах, с учётом многобайтных символов UTF-8
+    assert offsets == [1, 11, 24]
+    assert data[offsets[1]:offsets[2] - 2] == b'{"b": "\xd0\xb6"}'
+
+
+@pytest.mark.parametrize("bad", [b'{"a": [1, 2}', b'{"a" 1}', b'[1, 2', b'{"a": "unterminated}'])
+def test_invalid_json_raises(bad):
+    reader = JsonStreamReader(io.BytesIO(bad), chunk_size=4)
+    with pytest.raises(json.JSONDecodeError):
+        for _ in reader.iter_object() if bad.startswith(b"{") else reader.iter_array():
+            reader.read_value()
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+@pytest.mark.parametrize("pretty", [True, False])
+@pytest.mark.parametrize("doc", [DOC, {}, {"items": []}, {"only": {"nested": [1, {"a": "ё"}]}}])
+def test_writer_matches_dumps(backend, pretty, doc):
+    """Проверяет, что потоковая запись побайтно совпадает с JsonCodec.dumps всего документа."""
+    previous = JsonCodec.get_backend()
+    JsonCodec.set_backend(backend)
+    try:
+        out = io.BytesIO()
+        writer = JsonStreamWriter(out, pretty=pretty)
+        for key, value in doc.items():
+            if isinstance(value, list):
+                assert writer.write_array(key, iter(value)) == len(value)
+            else:
+                writer.write_field(key, value)
+        writer.close()
+        assert out.getvalue() == JsonCodec.dumps(doc, pretty=pretty)
+    finally:
+        JsonCodec.set_backend(previous)
+
+
+def test_writer_rejects_fields_after_close():
+    writer = JsonStreamWriter(io.BytesIO())
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write_field("a", 1)
@@ -0,0 +1,152 @@
+import base64
+import json
+import pickle
+import struct
+import zlib
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from annotation_parser import LazyMask, ShapeBatch, decode_masks, parse, save
+from annotation_parser.core.parse_cache import ParseCache
+from annotation_parser.utils import MaskCodec
+
+MASK = np.array([[0, 1, 1, 0, 0],
+                 [1, 1, 1, 1, 0],
+                 [0, 0, 1, 0, 1]], dtype=bool)
+
+
+def png(pixels: np.ndarray, colour: int = 0, depth: int = 8, filters=(0,)) -> str:
+    """ base64 PNG с заданными фильтрами строк (по кругу) — как у сторонних кодировщиков. """
+    height = pixels.shape[0]
+    if depth < 8:
+        lines = np.packbits(pixels.reshape(height, -1).astype(np.uint8) & 1, axis=1)
+    else:
+        lines = pixels.reshape(height, -1).astype(f">u{depth // 8}").view(np.uint8).reshape(height, -1)
+    bpp = max(1, lines.shape[1] // pixels.shape[1]) if depth >= 8 else 1
+    prev = np.zeros(lines.shape[1], dtype=np.int64)
+    raw = bytearray()
+    for y, line in enumerate(lines.astype(np.int64)):
+        kind = filters[y % len(filters)]
+        left = np.concatenate([np.zeros(bpp, np.int64), line[:-bpp]])
+        upper_left = np.concatenate([np.zeros(bpp, np.int64), prev[:-bpp]])
+        if kind == 0:
+            predictor = 0
+        elif kind == 1:
+            predictor = left
+        elif kind == 2:
+            predictor = prev
+        elif kind == 3:
+            predictor = (left + prev) // 2
+        else:
+            p = left + prev - upper_left
+            pa, pb, pc = abs(p - left), abs(p - prev), abs(p - upper_left)
+            predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, prev, upper_left))
+        raw += bytes([kind]) + ((line - predictor) % 256).astype(np.uint8).tobytes()
+        prev = line
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    header = struct.pack(">IIBBBBB", pixels.shape[1], height, depth, colour, 0, 0, 0)
+    data = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(raw))) \
+        + chunk(b"IEND", b"")
+    return base64.b64encode(data).decode("ascii")
+
+
+def labelme_doc(masks) -> dict:
+    shapes = [{"label": f"obj{i}", "points": [[0, 0], [4, 2]], "group_id": None, "description": "",
+               "shape_type": "polygon", "flags": {}, "mask": mask} for i, mask in enumerate(masks)]
+    return {"version": "5.5.0", "flags": {}, "shapes": shapes, "imagePath": "img.png", "imageData": None,
+            "imageHeight": 10, "imageWidth": 10}
+
+
+@pytest.mark.parametrize("filters", [(0,), (1,), (2,), (3,), (4,), (0, 1, 2, 3, 4)])
+def test_decode_png_filters(filters):
+    """Проверяет снятие всех фильтров строк PNG встроенным декодером."""
+    pixels = (np.arange(60).reshape(6, 10) * 37 % 7 > 3).astype(np.uint8) * 255
+    mask = MaskCodec.decode(png(pixels, filters=filters))
+    assert mask.dtype == bool and not mask.flags.writeable
+    assert np.array_equal(mask, pixels > 0)
+
+
+@pytest.mark.parametrize("colour, depth, channels", [(0, 1, 1), (0, 16, 1), (2, 8, 3), (4, 8, 2), (6, 8, 4),
+                                                     (3, 8, 1)])
+def test_decode_png_formats(colour, depth, channels):
+    """Проверяет глубины и типы цвета: ненулевой цветовой канал — истина, альфа-канал не учитывается."""
+    pixels = np.zeros((3, 5, channels), dtype=np.uint16 if depth == 16 else np.uint8)
+    pixels[..., 0] = MASK
+    if channels in (2, 4):
+        pixels[..., -1] = 255
+    mask = MaskCodec.decode(png(pixels[..., 0] if channels == 1 else pixels, colour, depth, filters=(1, 4)))
+    assert np.array_equal(mask, MASK)
+
+
+def test_encode_round_trip_and_errors():
+    """Проверяет кодирование в 1-битный PNG и обратно, а также ошибки на плохих данных."""
+    encoded = MaskCodec.encode(MASK.astype(np.uint8) * 3)
+    assert np.array_equal(MaskCodec.decode(encoded), MASK)
+    assert struct.unpack(">IIBB", base64.b64decode(encoded)[16:26]) == (5, 3, 1, 0)
+    wide = np.arange(300 * 7).reshape(7, 300) % 3 == 0
+    assert np.array_equal(MaskCodec.decode(MaskCodec.encode(wide)), wide)
+    with pytest.raises(ValueError):
+        MaskCodec.encode(np.zeros(3))
+    with pytest.raises(ValueError):
+        MaskCodec.decode("not base64!")
+    with pytest.raises(ValueError):
+        MaskCodec.decode(base64.b64encode(b"GIF89a").decode())
+
+
+def test_lazy_mask_decodes_once(monkeypatch):
+    """Проверяет, что маска декодируется при первом обращении один раз, а pickle переносит только текст."""
+    calls = []
+    decode = MaskCodec.decode
+    monkeypatch.setattr(MaskCodec, "decode", staticmethod(lambda data: calls.append(data) or decode(data)))
+    mask = LazyMask(MaskCodec.encode(MASK))
+    assert not mask.is_decoded and calls == []
+    assert mask.array is mask.array and len(calls) == 1
+    assert np.array_equal(np.asarray(mask), MASK) and np.asarray(mask, dtype=float).sum() == MASK.sum()
+    assert mask == MASK and mask == LazyMask(mask.encoded) and mask != None  # noqa: E711
+    restored = pickle.loads(pickle.dumps(mask))
+    assert not restored.is_decoded and restored.encoded == mask.encoded
+    assert len(calls) == 1
+
+
+def test_parse_keeps_mask_encoded_and_saves_unchanged(tmp_path):
+    """Проверяет, что разбор не декодирует маски, а сохранение без изменений не перекодирует их."""
+    encoded = png(MASK.astype(np.uint8) * 255, filters=(4,))
+    source = tmp_path / "a.json"
+    source.write_text(json.dumps(labelme_doc([encoded, None])))
+    for validate in ("full", "light", "none"):
+        shapes = parse(source, "labelme", validate=validate)
+        assert isinstance(shapes[0].mask, LazyMask) and not shapes[0].mask.is_decoded
+        assert shapes[1].mask is None
+    assert np.array_equal(shapes[0].mask.array, MASK)
+    target = tmp_path / "b.json"
+    save(shapes, target, "labelme", backup=False)
+    assert [s["mask"] for s in json.loads(target.read_text())["shapes"]] == [encoded, None]
+
+
+def test_changed_mask_is_reencoded(tmp_path):
+    """Проверяет, что маска, заменённая массивом, кодируется в PNG при сохранении."""
+    source = tmp_path / "a.json"
+    source.write_text(json.dumps(labelme_doc([MaskCodec.encode(MASK)])))
+    shape = parse(source, "labelme")[0]
+    target = tmp_path / "b.json"
+    save([replace(shape, mask=~shape.mask.array)], target, "labelme", backup=False)
+    assert np.array_equal(MaskCodec.decode(json.loads(target.read_text())["shapes"][0]["mask"]), ~MASK)
+
+
+@pytest.mark.parametrize("workers", [None, 0, 4])
+def test_decode_masks_across_threads(tmp_path, workers):
+    """Проверяет массовое декодирование масок файла, в том числе из кэша разбора и ShapeBatch."""
+    masks = [np.roll(MASK, i, axis=1) for i in range(6)]
+    source = tmp_path / "a.json"
+    source.write_text(json.dumps(labelme_doc([MaskCodec.encode(m) for m in masks] + [None])))
+    cache = ParseCache(tmp_path / "cache")
+    parse(source, "labelme", cache=cache)
+    shapes = parse(source, "labelme", cache=cache)
+    assert decode_masks(ShapeBatch.from_shapes(shapes), workers=workers) == 6
+    assert all(s.mask.is_decoded and np.array_equal(s.mask.array, m) for s, m in zip(shapes, masks))
+    assert decode_masks(shapes, workers=workers) == 0
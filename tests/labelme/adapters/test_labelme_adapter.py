@@ -99,3 +99,39 @@ def test_shapes_to_json_type_preserved(labelme_json):
     for shape_json in out_json["shapes"]:
         assert "shape_type" in shape_json
         assert shape_json["shape_type"] in [st.value for st in ShapeType]
+
+
+@pytest.mark.parametrize("validate", ["light", "none"])
+def test_fast_validation_modes_match_full(labelme_json, validate):
+    """Проверяет, что облегчённые режимы проверки дают те же фигуры, что и полный."""
+    shape_dict = dict(labelme_json["shapes"][0], position="left", wz=2, custom="x")
+    test_json = dict(labelme_json, shapes=[shape_dict] + labelme_json["shapes"])
+    expected = LabelMeAdapter.load(test_json)
+    shapes = LabelMeAdapter.load(test_json, validate=validate)
+    assert shapes == expected
+    assert shapes[0].meta == {"position": "left", "wz": 2, "custom": "x"}
+    assert shapes[0].wz_number == 2
+
+
+def test_light_validation_rejects_bad_points(labelme_json):
+    """Проверяет, что режим light ловит некорректные координаты одной проверкой списка."""
+    bad_json = dict(labelme_json, shapes=[dict(labelme_json["shapes"][0], points=[[1, 2, 3]])])
+    with pytest.raises(ValueError):
+        LabelMeAdapter.load(bad_json, validate="light")
+
+
+@pytest.mark.parametrize("validate", ["full", "light", "none"])
+def test_load_batch_matches_load(labelme_json, validate):
+    """Проверяет, что load_batch заполняет ShapeBatch теми же фигурами, что и load."""
+    batch = LabelMeAdapter.load_batch(labelme_json, validate=validate)
+    assert batch.to_shapes() == LabelMeAdapter.load(labelme_json)
+
+
+@pytest.mark.parametrize("validate", ["full", "light", "none"])
+def test_numpy_coords_roundtrip(labelme_json, validate):
+    """Проверяет режим numpy_coords: массивы вместо списков и сериализация обратно в списки."""
+    shapes = LabelMeAdapter.load(labelme_json, validate=validate, numpy_coords=True)
+    assert all(isinstance(shape.coords, np.ndarray) for shape in shapes)
+    assert shapes == LabelMeAdapter.load(labelme_json)
+    out_json = LabelMeAdapter.shapes_to_json(labelme_json, shapes)
+    assert all(isinstance(shape_json["points"], list) for shape_json in out_json["shapes"])
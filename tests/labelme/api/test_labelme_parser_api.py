@@ -0,0 +1,43 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from annotation_parser.api.parser_api import parse_labelme, parse_many
+
+LABELME_JSON = Path(__file__).parent.parent / "labelme_test.json"
+
+
+@pytest.fixture
+def labelme_dir(tmp_path):
+    """Директория с несколькими копиями тестового LabelMe-файла и одним битым файлом."""
+    for i in range(4):
+        shutil.copy(LABELME_JSON, tmp_path / f"file_{i}.json")
+    (tmp_path / "file_broken.json").write_text("{not valid json]", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_directory(labelme_dir, workers):
+    expected = parse_labelme(LABELME_JSON)
+    results = list(parse_many(labelme_dir, "labelme", workers=workers, chunksize=2))
+    assert [Path(r.file_path).name for r in results] == [
+        "file_0.json", "file_1.json", "file_2.json", "file_3.json", "file_broken.json"]
+    for result in results[:4]:
+        assert result.ok
+        assert [s.label for s in result.shapes] == [s.label for s in expected]
+
+
+def test_parse_many_reports_failures_without_aborting(labelme_dir):
+    results = list(parse_many(labelme_dir, "labelme", workers=2, ordered=False))
+    failed = [r for r in results if not r.ok]
+    assert len(results) == 5
+    assert [Path(r.file_path).name for r in failed] == ["file_broken.json"]
+    assert failed[0].error.startswith("JSONDecodeError")
+
+
+def test_parse_many_glob_and_missing_file(labelme_dir):
+    results = list(parse_many([labelme_dir / "file_0.json", labelme_dir / "missing.json"], "labelme", workers=1))
+    assert results[0].ok
+    assert results[1].error.startswith("FileNotFoundError")
+    assert len(list(parse_many(str(labelme_dir / "file_*.json"), "labelme", workers=1))) == 5
@@ -105,3 +105,49 @@ def test_save_invalid_file_path(tmp_path, minimal_labelme_json, minimal_shape):
             json_data=minimal_labelme_json,
             backup=False
         )
+
+
+def test_save_stream_matches_save(tmp_path, minimal_labelme_json, minimal_shape):
+    """Проверяет, что потоковая запись LabelMe побайтно совпадает с обычным сохранением."""
+    shapes = (minimal_shape, Shape(label="dog", coords=[[0, 0], [5, 5], [0, 5]], type=ShapeType.POLYGON,
+                                   flags={"x": True}))
+    expected, streamed = tmp_path / "expected.json", tmp_path / "streamed.json"
+    AnnotationSaver.save(shapes, LabelMeAdapter, expected, json_data=minimal_labelme_json)
+    count = AnnotationSaver.save_stream(iter(shapes), LabelMeAdapter, streamed, json_data=minimal_labelme_json)
+    assert count == 2
+    assert streamed.read_bytes() == expected.read_bytes()
+
+
+def test_annotation_file_save_passes_header_through(tmp_path, monkeypatch):
+    """Проверяет, что AnnotationFile.save переносит заголовок LabelMe (imageData) байтами, а shapes пишет заново."""
+    from annotation_parser.core.annotation_file import AnnotationFile
+    from annotation_parser.utils import JsonCodec
+    data = {"version": "5.0.1", "flags": {}, "shapes": [
+                {"label": f"s{i}", "points": [[i, i], [i + 1, i + 1]], "shape_type": "rectangle"} for i in range(5)],
+            "imagePath": "img.png", "imageData": "QUJD" * 50_000, "imageHeight": 100, "imageWidth": 200,
+            "lineColor": [0, 255, 0, 128], "fillColor": [255, 0, 0, 128], "custom": {"a": 1}}
+    path = tmp_path / "labelme.json"
+    path.write_bytes(JsonCodec.dumps(data, pretty=True))
+    af = AnnotationFile(path, "labelme", keep_json=True)
+    shapes = af.parse()
+    spans = []
+    items_span = AnnotationSaver._items_span
+
+    def spy(*args, **kwargs):
+        spans.append(items_span(*args, **kwargs))
+        return spans[-1]
+
+    monkeypatch.setattr(AnnotationSaver, "_items_span", staticmethod(spy))
+    af.save(shapes[:2])
+    assert len(spans) == 1 and spans[0] is not None
+    saved = json.loads(path.read_bytes())
+    assert saved == data | {"shapes": LabelMeAdapter.shapes_to_json(data, shapes[:2])["shapes"]}
+    assert [s["label"] for s in saved["shapes"]] == ["s0", "s1"]
+
+    # Без обязательных полей заголовок дополняется дефолтами модели и записывается целиком
+    del data["lineColor"]
+    path.write_bytes(JsonCodec.dumps(data, pretty=True))
+    af = AnnotationFile(path, "labelme", keep_json=True)
+    af.save(af.parse())
+    assert len(spans) == 1  # перенос байтами не выбирался
+    assert json.loads(path.read_bytes())["lineColor"] == [0, 255, 0, 128]
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from annotation_parser.adapters.voc_adapter import VocAdapter
+from annotation_parser.public_enums import ShapeType
+
+
+@pytest.fixture
+def voc_json():
+    return {
+        "filename": "img.jpg",
+        "objects": [
+            {"name": "dog", "bndbox_xmin": 1, "bndbox_ymin": 2, "bndbox_xmax": 30, "bndbox_ymax": 40, "pose": "Left"},
+            {"name": "cat", "bndbox_xmin": 5.5, "bndbox_ymin": 6, "bndbox_xmax": 7, "bndbox_ymax": 8},
+        ],
+    }
+
+
+def test_load_voc(voc_json):
+    shapes = VocAdapter.load(voc_json)
+    assert [s.label for s in shapes] == ["dog", "cat"]
+    assert shapes[0].type == ShapeType.RECTANGLE
+    assert shapes[0].coords == [[1.0, 2.0], [30.0, 2.0], [30.0, 40.0], [1.0, 40.0]]
+    assert shapes[0].meta == {"pose": "Left"}
+
+
+def test_load_invalid_json():
+    with pytest.raises(ValueError):
+        VocAdapter.load({"shapes": []})
+
+
+@pytest.mark.parametrize("validate", ["light", "none"])
+def test_fast_validation_modes_match_full(voc_json, validate):
+    assert VocAdapter.load(voc_json, validate=validate) == VocAdapter.load(voc_json)
+
+
+def test_light_validation_rejects_missing_field(voc_json):
+    del voc_json["objects"][1]["bndbox_xmax"]
+    with pytest.raises(ValueError):
+        VocAdapter.load(voc_json, validate="light")
+
+
+def test_shapes_to_json_round_trip(voc_json):
+    shapes = VocAdapter.load(voc_json)
+    out = VocAdapter.shapes_to_json(voc_json, shapes)
+    assert out["filename"] == "img.jpg"
+    assert [s.coords for s in VocAdapter.load(out)] == [s.coords for s in shapes]
+
+
+@pytest.mark.parametrize("validate", ["full", "light", "none"])
+def test_numpy_coords_round_trip(voc_json, validate):
+    """Проверяет режим numpy_coords и сериализацию фигур с массивом координат."""
+    shapes = VocAdapter.load(voc_json, validate=validate, numpy_coords=True)
+    assert all(isinstance(shape.coords, np.ndarray) for shape in shapes)
+    assert shapes == VocAdapter.load(voc_json)
+    assert VocAdapter.shapes_to_json(voc_json, shapes) == VocAdapter.shapes_to_json(voc_json, VocAdapter.load(voc_json))
+
+
+VOC_XML = """<annotation>
+    <folder>VOC2012</folder>
+    <filename>2007_000027.jpg</filename>
+    <size><width>486</width><height>500</height><depth>3</depth></size>
+    <segmented>0</segmented>
+    <object>
+        <name>person</name>
+        <pose>Unspecified</pose>
+        <truncated>0</truncated>
+        <difficult>0</difficult>
+        <bndbox><xmin>174</xmin><ymin>101</ymin><xmax>349.5</xmax><ymax>351</ymax></bndbox>
+        <part><name>head</name><bndbox><xmin>169</xmin><ymin>104</ymin><xmax>209</xmax><ymax>146</ymax></bndbox></part>
+        <part><name>hand</name><bndbox><xmin>278</xmin><ymin>210</ymin><xmax>297</xmax><ymax>233</ymax></bndbox></part>
+    </object>
+    <object>
+        <name>dog</name>
+        <bndbox><xmin>1</xmin><ymin>2</ymin><xmax>30</xmax><ymax>40</ymax></bndbox>
+    </object>
+</annotation>
+"""
+
+
+@pytest.fixture
+def voc_xml(tmp_path):
+    path = tmp_path / "2007_000027.xml"
+    path.write_text(VOC_XML, encoding="utf-8")
+    return path
+
+
+def test_read_xml(voc_xml):
+    """Проверяет чтение XML в ту же структуру, что принимает load (size, объекты с bndbox_*)."""
+    data = VocAdapter.read_xml(voc_xml)
+    assert data["filename"] == "2007_000027.jpg"
+    assert data["size"] == {"width": 486, "height": 500, "depth": 3}
+    person = data["objects"][0]
+    assert person["bndbox_xmax"] == 349.5 and person["pose"] == "Unspecified"
+    assert [part["name"] for part in person["part"]] == ["head", "hand"]
+    assert VocAdapter.load(data)[1].coords == [[1, 2], [30, 2], [30, 40], [1, 40]]
+
+
+
+def test_read_xml_converts_only_numeric_tags(tmp_path):
+    """Проверяет, что к числам приводятся только стандартные числовые теги, а прочий текст остаётся строкой."""
+    path = tmp_path / "000123.xml"
+    path.write_text("""<annotation>
+        <folder>2012</folder><filename>000123</filename>
+        <size><width>10</width><height>20</height><depth>3</depth></size>
+        <object>
+            <name>42</name><pose>1</pose><occluded>1</occluded><difficult>0</difficult><note> 07 </note>
+            <bndbox><xmin>1</xmin><ymin>2.5</ymin><xmax>3</xmax><ymax>4</ymax></bndbox>
+            <part><name>7</name><bndbox><xmin>1</xmin><ymin>1</ymin><xmax>2</xmax><ymax>2</ymax></bndbox></part>
+        </object>
+    </annotation>""", encoding="utf-8")
+    data = VocAdapter.read_xml(path)
+    assert data["folder"] == "2012" and data["filename"] == "000123"
+    assert data["size"] == {"width": 10, "height": 20, "depth": 3}
+    obj = data["objects"][0]
+    assert (obj["name"], obj["pose"], obj["note"]) == ("42", "1", "07")
+    assert (obj["occluded"], obj["difficult"], obj["bndbox_ymin"]) == (1, 0, 2.5)
+    assert obj["part"] == {"name": "7", "bndbox": {"xmin": 1, "ymin": 1, "xmax": 2, "ymax": 2}}
+    assert next(VocAdapter.iter_xml(path)).label == "42"
+
+@pytest.mark.parametrize("validate", ["full", "light", "none"])
+def test_iter_xml_matches_load(voc_xml, validate):
+    """Проверяет, что потоковое чтение даёт те же фигуры, что load по read_xml."""
+    streamed = list(VocAdapter.iter_xml(voc_xml, shift_point=(1, 1), validate=validate))
+    assert streamed == list(VocAdapter.load(VocAdapter.read_xml(voc_xml), shift_point=(1, 1)))
+    assert streamed[0].meta["truncated"] == 0
+
+
+def test_iter_xml_rejects_missing_bndbox(tmp_path):
+    path = tmp_path / "bad.xml"
+    path.write_text("<annotation><object><name>x</name></object></annotation>", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(VocAdapter.iter_xml(path))
@@ -0,0 +1,45 @@
+import pytest
+
+from annotation_parser.api.parser_api import parse_voc, parse_voc_dir, iter_parse_voc
+from annotation_parser.core.annotation_file import AnnotationFile
+
+VOC_XML = ("<annotation><filename>{name}.jpg</filename>"
+           "<size><width>10</width><height>10</height><depth>3</depth></size>"
+           "<object><name>{name}</name><bndbox><xmin>1</xmin><ymin>2</ymin><xmax>3</xmax><ymax>4</ymax></bndbox>"
+           "</object></annotation>")
+
+
+@pytest.fixture
+def annotations_dir(tmp_path):
+    folder = tmp_path / "Annotations"
+    folder.mkdir()
+    for name in ("a", "b", "c"):
+        (folder / f"{name}.xml").write_text(VOC_XML.format(name=name), encoding="utf-8")
+    (folder / "broken.xml").write_text("<annotation><object>", encoding="utf-8")
+    (folder / "notes.txt").write_text("not an annotation", encoding="utf-8")
+    return folder
+
+
+def test_parse_voc_xml(annotations_dir):
+    """Проверяет, что parse_voc читает .xml напрямую."""
+    shapes = parse_voc(annotations_dir / "a.xml")
+    assert [s.label for s in shapes] == ["a"]
+    assert shapes[0].coords == [[1, 2], [3, 2], [3, 4], [1, 4]]
+    assert list(iter_parse_voc(annotations_dir / "a.xml")) == list(shapes)
+
+
+def test_parse_voc_dir(annotations_dir):
+    """Проверяет разбор папки Annotations/: только *.xml, ошибки — в ParseResult."""
+    results = list(parse_voc_dir(annotations_dir, workers=2))
+    assert [r.file_path.rsplit("/", 1)[-1] for r in results] == ["a.xml", "b.xml", "broken.xml", "c.xml"]
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert results[3].shapes[0].label == "c"
+
+
+def test_save_to_xml_is_rejected(annotations_dir):
+    """Проверяет, что сохранение поверх XML не пишет JSON в .xml-файл."""
+    path = annotations_dir / "a.xml"
+    af = AnnotationFile(path, "voc", keep_json=True)
+    with pytest.raises(NotImplementedError):
+        af.save(af.parse())
+    assert path.read_text(encoding="utf-8") == VOC_XML.format(name="a")